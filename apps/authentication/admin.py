@@ -165,6 +165,9 @@ class CustomUserAdmin(UserAdmin):
     
     def marcar_como_pendientes(self, request, queryset):
         count = queryset.update(status='pendiente')
+        # update() no emite señales: invalidar los desplegables cacheados del panel
+        from apps.custom_admin.fragmentos import invalidar, USUARIOS
+        invalidar(USUARIOS)
         self.message_user(request, f'{count} usuario(s) marcado(s) como pendientes.')
     marcar_como_pendientes.short_description = "Marcar como pendientes"
 
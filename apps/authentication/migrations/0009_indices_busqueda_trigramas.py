@@ -0,0 +1,44 @@
+# Índices de trigramas (pg_trgm) para la búsqueda de listados; solo PostgreSQL
+
+from django.db import migrations
+
+TABLA = 'authentication_customuser'
+
+# (índice, columna) sobre UPPER(columna::text), la expresión de icontains
+INDICES = [
+    ('authentication_customuser_username_trgm', 'username'),
+    ('authentication_customuser_email_trgm', 'email'),
+    ('authentication_customuser_first_name_trgm', 'first_name'),
+    ('authentication_customuser_last_name_trgm', 'last_name'),
+    ('authentication_customuser_empresa_trgm', 'empresa'),
+    ('authentication_customuser_ruc_dni_trgm', 'ruc_dni'),
+]
+
+
+def crear_indices(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for indice, columna in INDICES:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS "{indice}" ON "{TABLA}" '
+            f'USING gin ((UPPER("{columna}"::text)) gin_trgm_ops)'
+        )
+
+
+def eliminar_indices(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for indice, _ in INDICES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS "{indice}"')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0008_alter_customuser_rol'),
+    ]
+
+    operations = [
+        migrations.RunPython(crear_indices, eliminar_indices),
+    ]
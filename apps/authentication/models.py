@@ -317,6 +317,9 @@ class CustomUser(AbstractUser):
             old_user = CustomUser.objects.get(pk=self.pk)
             if old_user.email != self.email:
                 self.fecha_verificacion = None
+            if old_user.rol != self.rol or old_user.is_active != self.is_active or old_user.status != self.status:
+                from .resolver import limpiar_permisos_resueltos
+                limpiar_permisos_resueltos(self)
         
         if self.rol == 'vendedor' and not self.comision_porcentaje:
             self.comision_porcentaje = Decimal('10.00')
@@ -396,17 +399,12 @@ class CustomUser(AbstractUser):
         if not self.is_active or self.status != 'activo':
             return False
         
+        # Los superusuarios pasan aunque el código no tenga un Permission cargado
         if self.is_superuser:
             return True
         
-        try:
-            role = Role.objects.get(codename=self.rol, is_active=True)
-            return role.permissions.filter(
-                codename=permission_codename,
-                is_active=True
-            ).exists()
-        except Role.DoesNotExist:
-            return False
+        from .resolver import resolver_permisos
+        return permission_codename in resolver_permisos(self)
 
     def has_module_access(self, module_name):
         """Verifica si el usuario tiene acceso a un módulo"""
@@ -416,43 +414,23 @@ class CustomUser(AbstractUser):
         if self.is_superuser:
             return True
         
-        module_permissions = {
-            'authentication': ['admin'],
-            'content_management': ['admin', 'vendedor', 'productor', 'vtr'],
-            'financial_management': ['admin'],
-            'traffic_light_system': ['admin', 'vendedor'],
-            'transmission_control': ['admin', 'vendedor', 'productor', 'vtr'],
-            'notifications': ['admin', 'vendedor', 'productor', 'vtr'],
-            'sales_management': ['admin', 'vendedor'],
-            'reports_analytics': ['admin', 'vendedor'],
-            'system_configuration': ['admin'],
-        }
-        
-        return self.rol in module_permissions.get(module_name, [])
+        from .resolver import MODULOS_POR_ROL
+        return self.rol in MODULOS_POR_ROL.get(module_name, ())
 
     def get_user_permissions(self):
-        """Retorna todos los permisos del usuario"""
-        if not self.is_active or self.status != 'activo':
-            return Permission.objects.none()
-        
-        if self.is_superuser:
-            return Permission.objects.filter(is_active=True) if Permission.objects.exists() else Permission.objects.none()
-        
-        try:
-            role = Role.objects.get(codename=self.rol, is_active=True)
-            return role.permissions.filter(is_active=True)
-        except Role.DoesNotExist:
-            return Permission.objects.none()
+        """Retorna todos los permisos del usuario (instancias de Permission)"""
+        from .resolver import resolver_permisos
+        return resolver_permisos(self).permisos()
+
+    def get_user_permission_codenames(self):
+        """Retorna los códigos de permiso del usuario como frozenset"""
+        from .resolver import resolver_permisos
+        return resolver_permisos(self).codenames
 
     def get_permissions_by_module(self):
         """Retorna permisos del usuario agrupados por módulo"""
-        from collections import defaultdict
-        perms_by_module = defaultdict(list)
-        
-        for perm in self.get_user_permissions():
-            perms_by_module[perm.module].append(perm)
-        
-        return dict(perms_by_module)
+        from .resolver import resolver_permisos
+        return resolver_permisos(self).por_modulo()
 
     def can_manage_users(self):
         """Verifica si puede gestionar usuarios"""
@@ -246,8 +246,7 @@ def get_user_permissions_for_module(user, module_name):
     if not user or not user.is_authenticated:
         return []
     
-    permissions = user.get_user_permissions().filter(module=module_name)
-    return [perm.codename for perm in permissions]
+    return [perm.codename for perm in user.get_permissions_by_module().get(module_name, [])]
 
 def get_available_modules_for_user(user):
     """
@@ -256,9 +255,8 @@ def get_available_modules_for_user(user):
     if not user or not user.is_authenticated:
         return []
     
-    permissions = user.get_user_permissions()
-    modules = set(perm.module for perm in permissions)
-    return list(modules)
+    from .resolver import resolver_permisos
+    return list(resolver_permisos(user).modulos)
 
 def user_can_access_object(user, obj, action='view'):
     """
@@ -320,8 +318,12 @@ def permissions_context(request):
     if not request.user.is_authenticated:
         return {}
     
+    from .resolver import resolver_permisos
+    permisos = resolver_permisos(request.user)
+    
     return {
-        'user_permissions': request.user.get_user_permissions(),
-        'user_modules': get_available_modules_for_user(request.user),
-        'permissions_by_module': request.user.get_permissions_by_module(),
+        'user_permissions': permisos.permisos(),
+        'user_permission_codenames': permisos.codenames,
+        'user_modules': list(permisos.modulos),
+        'permissions_by_module': permisos.por_modulo(),
     }
\ No newline at end of file
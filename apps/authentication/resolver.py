@@ -0,0 +1,132 @@
+"""
+Resolución cacheada de permisos efectivos de PubliTrack
+Los permisos de cada rol se guardan en cache versionada y se memorizan en la
+instancia del usuario durante la petición.
+"""
+
+from collections import defaultdict
+
+from django.core.cache import cache
+
+PERMISOS_CACHE_TIMEOUT = 60 * 60 * 24
+PERMISOS_VERSION_KEY = 'auth:permisos:version'
+
+# Campos de Permission que se guardan en cache por rol
+CAMPOS_PERMISO = ('id', 'name', 'codename', 'module', 'action', 'description')
+
+# Acceso a módulos por rol
+MODULOS_POR_ROL = {
+    'authentication': ['admin'],
+    'content_management': ['admin', 'vendedor', 'productor', 'vtr'],
+    'financial_management': ['admin'],
+    'traffic_light_system': ['admin', 'vendedor'],
+    'transmission_control': ['admin', 'vendedor', 'productor', 'vtr'],
+    'notifications': ['admin', 'vendedor', 'productor', 'vtr'],
+    'sales_management': ['admin', 'vendedor'],
+    'reports_analytics': ['admin', 'vendedor'],
+    'system_configuration': ['admin'],
+}
+
+
+class PermisosUsuario:
+    """
+    Permisos efectivos de un usuario: códigos en un frozenset para consultas
+    O(1) y las filas de Permission para agrupar por módulo. Un superusuario
+    tiene cualquier código, aunque no exista su Permission.
+    """
+
+    __slots__ = ('filas', 'codenames', 'modulos', 'superusuario')
+
+    def __init__(self, filas=(), superusuario=False):
+        self.filas = tuple(filas)
+        self.codenames = frozenset(fila['codename'] for fila in self.filas)
+        self.modulos = frozenset(fila['module'] for fila in self.filas)
+        self.superusuario = superusuario
+
+    def __contains__(self, codename):
+        return self.superusuario or codename in self.codenames
+
+    def permisos(self):
+        """Instancias de Permission (sin consultar la base de datos)"""
+        from .models import Permission
+        return [Permission(**fila) for fila in self.filas]
+
+    def por_modulo(self):
+        """Instancias de Permission agrupadas por módulo"""
+        agrupados = defaultdict(list)
+        for permiso in self.permisos():
+            agrupados[permiso.module].append(permiso)
+        return dict(agrupados)
+
+
+SIN_PERMISOS = PermisosUsuario()
+
+
+# ==================== VERSIÓN DE CACHE ====================
+
+def _version_permisos():
+    """
+    Obtiene la versión vigente de los permisos en cache
+    """
+    cache.add(PERMISOS_VERSION_KEY, 1, timeout=None)
+    return cache.get(PERMISOS_VERSION_KEY, 1)
+
+
+def invalidar_permisos():
+    """
+    Invalida los permisos cacheados de todos los roles incrementando su versión
+    """
+    try:
+        cache.incr(PERMISOS_VERSION_KEY)
+    except ValueError:
+        cache.set(PERMISOS_VERSION_KEY, 2, timeout=None)
+
+
+# ==================== RESOLUCIÓN ====================
+
+def _filas_permisos(clave_rol):
+    """
+    Filas de permisos activos de un rol (o de todos para superusuarios),
+    leídas de cache o de la base de datos con una sola consulta
+    """
+    from .models import Permission
+
+    clave = f'auth:permisos:v{_version_permisos()}:{clave_rol}'
+    filas = cache.get(clave)
+    if filas is None:
+        permisos = Permission.objects.filter(is_active=True)
+        if clave_rol != '__superusuario__':
+            permisos = permisos.filter(
+                roles__codename=clave_rol,
+                roles__is_active=True
+            )
+        filas = list(permisos.order_by('module', 'action', 'name').values(*CAMPOS_PERMISO))
+        cache.set(clave, filas, timeout=PERMISOS_CACHE_TIMEOUT)
+    return filas
+
+
+def resolver_permisos(usuario):
+    """
+    Permisos efectivos del usuario. Se calculan una vez por instancia (es decir,
+    por petición para request.user) y por rol en cache compartida.
+    """
+    permisos = getattr(usuario, '_permisos_resueltos', None)
+    if permisos is not None:
+        return permisos
+
+    if not usuario.is_active or getattr(usuario, 'status', 'activo') != 'activo':
+        permisos = SIN_PERMISOS
+    elif usuario.is_superuser:
+        permisos = PermisosUsuario(_filas_permisos('__superusuario__'), superusuario=True)
+    else:
+        permisos = PermisosUsuario(_filas_permisos(usuario.rol))
+
+    usuario._permisos_resueltos = permisos
+    return permisos
+
+
+def limpiar_permisos_resueltos(usuario):
+    """
+    Descarta los permisos memorizados en la instancia (p. ej. al cambiar de rol)
+    """
+    usuario.__dict__.pop('_permisos_resueltos', None)
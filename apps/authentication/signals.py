@@ -0,0 +1,32 @@
+"""
+Señales del sistema de permisos de PubliTrack
+Invalidan los permisos cacheados por rol cuando cambian roles o permisos
+"""
+
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+
+from .models import Permission, Role, RolePermission
+from .resolver import invalidar_permisos
+
+
+@receiver(post_save, sender=Permission)
+@receiver(post_delete, sender=Permission)
+@receiver(post_save, sender=Role)
+@receiver(post_delete, sender=Role)
+@receiver(post_save, sender=RolePermission)
+@receiver(post_delete, sender=RolePermission)
+def invalidar_permisos_por_cambio(sender, **kwargs):
+    """
+    Cualquier cambio en permisos, roles o sus asignaciones invalida la cache
+    """
+    invalidar_permisos()
+
+
+@receiver(m2m_changed, sender=Role.permissions.through)
+def invalidar_permisos_por_asignacion(sender, action, **kwargs):
+    """
+    role.permissions.add/remove/clear no emiten post_save de RolePermission
+    """
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        invalidar_permisos()
@@ -1,3 +1,151 @@
+"""
+Tests para el módulo de Autenticación
+Sistema PubliTrack - Resolución cacheada de permisos y selectores de clientes paginados
+"""
+
 from django.test import TestCase
+from django.urls import reverse
+from django.core.cache import cache
+from django.contrib.auth import get_user_model
+
+from .models import Permission, Role, RolePermission
+
+User = get_user_model()
+
+
+class ResolucionPermisosTest(TestCase):
+    """Tests del resolvedor de permisos por rol"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.ver = Permission.objects.create(
+            name='Ver usuarios', codename='view_users', module='authentication', action='view'
+        )
+        cls.exportar = Permission.objects.create(
+            name='Exportar reportes', codename='export_reports', module='reports_analytics', action='export'
+        )
+        cls.rol = Role.objects.create(name='Vendedor', codename='vendedor')
+        RolePermission.objects.create(role=cls.rol, permission=cls.ver)
+
+    def setUp(self):
+        cache.clear()
+        self.usuario = User.objects.create_user(
+            username='vendedor_permisos',
+            email='vendedor_permisos@test.com',
+            password='testpass123',
+            rol='vendedor'
+        )
+
+    def recargar(self):
+        return User.objects.get(pk=self.usuario.pk)
+
+    def test_permisos_sin_consultas_repetidas(self):
+        """Test que los permisos se resuelven una vez por instancia y luego salen de cache"""
+        usuario = self.recargar()
+        with self.assertNumQueries(1):
+            self.assertTrue(usuario.has_permission('view_users'))
+            self.assertFalse(usuario.has_permission('export_reports'))
+            self.assertEqual(set(usuario.get_permissions_by_module()), {'authentication'})
+            self.assertTrue(usuario.has_module_access('reports_analytics'))
+
+        # Otra petición (otra instancia) del mismo rol no consulta la base de datos
+        otra = self.recargar()
+        with self.assertNumQueries(0):
+            self.assertTrue(otra.has_permission('view_users'))
+
+    def test_invalidacion_por_cambio_de_rol_o_permiso(self):
+        """Test que asignar permisos o desactivar el rol invalida la cache"""
+        self.assertFalse(self.recargar().has_permission('export_reports'))
+
+        self.rol.permissions.add(self.exportar)
+        self.assertTrue(self.recargar().has_permission('export_reports'))
+
+        self.rol.is_active = False
+        self.rol.save()
+        self.assertFalse(self.recargar().has_permission('view_users'))
+
+    def test_usuario_inactivo_y_superusuario(self):
+        """Test que un usuario inactivo no tiene permisos y un superusuario los tiene todos"""
+        self.usuario.status = 'suspendido'
+        self.usuario.save()
+        self.assertFalse(self.usuario.has_permission('view_users'))
+
+        admin = User.objects.create_superuser(
+            username='admin_permisos', email='admin_permisos@test.com', password='testpass123'
+        )
+        self.assertEqual(admin.get_user_permission_codenames(), {'view_users', 'export_reports'})
+
+    def test_superusuario_con_codigo_sin_permiso_cargado(self):
+        """Test que un superusuario activo pasa aunque el código no tenga un Permission"""
+        admin = User.objects.create_superuser(
+            username='admin_sin_semilla', email='admin_sin_semilla@test.com', password='testpass123'
+        )
+        self.assertFalse(Permission.objects.filter(codename='manage_grilla').exists())
+        self.assertTrue(admin.has_permission('manage_grilla'))
+
+        from .resolver import resolver_permisos
+        self.assertIn('manage_grilla', resolver_permisos(admin))
+
+        admin.is_active = False
+        self.assertFalse(admin.has_permission('manage_grilla'))
+
+
+class ClientesPaginadosApiTest(TestCase):
+    """Tests de la paginación por cursor del selector de clientes"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.vendedor = User.objects.create_user(
+            username='vendedor_cursor',
+            email='vendedor_cursor@test.com',
+            password='testpass123',
+            rol='vendedor'
+        )
+        empresas = ['Beta', None, 'Alfa', 'Beta', '', 'Gamma', 'Alfa']
+        for i, empresa in enumerate(empresas):
+            User.objects.create_user(
+                username=f'cliente_cursor_{i}',
+                email=f'cliente_cursor_{i}@test.com',
+                password='testpass123',
+                rol='cliente',
+                empresa=empresa,
+                vendedor_asignado=cls.vendedor
+            )
+
+    def setUp(self):
+        self.client.force_login(self.vendedor)
+        self.url = reverse('authentication:vendedor_clientes_api')
+
+    def test_recorre_todas_las_paginas_sin_repetir(self):
+        """Test que las páginas siguen el orden estable (empresa, id) sin huecos ni repetidos"""
+        vistos, cursor = [], None
+        while True:
+            params = {'limite': 3}
+            if cursor:
+                params['cursor'] = cursor
+            data = self.client.get(self.url, params).json()
+            self.assertLessEqual(len(data['clientes']), 3)
+            vistos += [(c['empresa'] or '', c['id']) for c in data['clientes']]
+            cursor = data['siguiente_cursor']
+            if not data['hay_mas']:
+                break
+
+        self.assertEqual(len(vistos), 7)
+        self.assertEqual(vistos, sorted(vistos))
+
+    def test_busqueda_y_etag(self):
+        """Test la búsqueda incremental y la respuesta 304 con If-None-Match"""
+        respuesta = self.client.get(self.url, {'q': 'alf'})
+        self.assertEqual([c['empresa'] for c in respuesta.json()['clientes']], ['Alfa', 'Alfa'])
+
+        repetida = self.client.get(self.url, {'q': 'alf'}, HTTP_IF_NONE_MATCH=respuesta['ETag'])
+        self.assertEqual(repetida.status_code, 304)
+
+        self.assertEqual(self.client.get(self.url, {'cursor': 'no-es-un-cursor'}).status_code, 400)
 
-# Create your tests here.
+    def test_listado_de_contratos_no_precarga_clientes(self):
+        """Test que el listado de contratos deja los clientes al selector asíncrono"""
+        respuesta = self.client.get(reverse('custom_admin:contratos_generados_list'))
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertNotIn('clientes', respuesta.context)
+        self.assertNotContains(respuesta, 'cliente_cursor_0@test.com')
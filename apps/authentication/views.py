@@ -12,7 +12,11 @@ from django.db.models import Q, Count
 from django.core.paginator import Paginator
 from .models import CustomUser, UserLoginHistory
 from .forms import LoginForm, UserRegistrationForm, UserProfileForm, PasswordChangeForm
-from django.db.models import Count, Sum, Q, F, Avg
+from apps.paginacion import (
+    aplicar_busqueda, paginar_por_cursor, parametros_paginacion, respuesta_json_con_etag
+)
+from django.db.models import Count, Sum, Q, F, Avg, Value
+from django.db.models.functions import Coalesce
 from datetime import timedelta, datetime
 from decimal import Decimal
 import json
@@ -998,27 +1002,38 @@ def vendedor_editar_cliente(request, cliente_id):
 @login_required
 @user_passes_test(is_vendedor_or_admin)
 def vendedor_clientes_api(request):
-    """API para obtener lista de clientes (JSON)"""
+    """API para obtener lista de clientes (JSON), paginada por cursor con ?q= para buscar"""
     try:
+        cursor, limite, busqueda = parametros_paginacion(request)
         queryset = CustomUser.objects.filter(rol='cliente', is_active=True)
         
         # Si es vendedor, filtrar solo sus clientes asignados
         if request.user.es_vendedor:
             queryset = queryset.filter(vendedor_asignado=request.user)
-            
-        clientes = list(queryset.values(
-            'id', 'username', 'first_name', 'last_name', 'empresa', 'ruc_dni'
-        ).order_by('-date_joined'))
+        
+        queryset = aplicar_busqueda(
+            queryset, busqueda, ('empresa', 'first_name', 'last_name', 'username', 'ruc_dni')
+        ).annotate(
+            empresa_orden=Coalesce('empresa', Value(''))
+        ).values(
+            'id', 'username', 'first_name', 'last_name', 'empresa', 'ruc_dni', 'empresa_orden'
+        )
+        clientes, siguiente = paginar_por_cursor(queryset, ('empresa_orden', 'id'), cursor, limite)
         
         # Añadir nombre completo manualmente ya que no es un campo de base de datos directo en values
         for c in clientes:
+            c.pop('empresa_orden')
             nombre = f"{c['first_name']} {c['last_name']}".strip()
             c['nombre'] = nombre if nombre else c['username']
 
-        return JsonResponse({
+        return respuesta_json_con_etag(request, {
             'success': True,
-            'clientes': clientes
+            'clientes': clientes,
+            'siguiente_cursor': siguiente,
+            'hay_mas': siguiente is not None
         })
+    except ValueError as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=400)
     except Exception as e:
         return JsonResponse({'success': False, 'error': str(e)}, status=500)
 
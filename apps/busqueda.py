@@ -0,0 +1,61 @@
+# apps/busqueda.py
+"""
+Búsqueda de texto en listados del panel
+Sistema PubliTrack - En PostgreSQL los filtros icontains usan índices GIN de
+trigramas (pg_trgm) y los resultados se ordenan por similitud; en otros motores
+se aplica el mismo filtro sin ranking.
+"""
+
+from django.db import connections
+from django.db.models.functions import Greatest
+
+from .paginacion import aplicar_busqueda
+
+# Campos de búsqueda por listado. Deben coincidir con los índices de trigramas
+# creados en las migraciones de cada app.
+CAMPOS_BUSQUEDA = {
+    'parte_mortorio': (
+        'codigo', 'nombre_fallecido', 'dni_fallecido', 'nombre_esposa',
+        'nombres_hijos', 'familiares_adicionales',
+    ),
+    'cliente': ('username', 'first_name', 'last_name', 'empresa', 'ruc_dni', 'email'),
+    'usuario': ('username', 'email', 'first_name', 'last_name'),
+    'cuña': ('titulo', 'codigo'),
+    'orden_toma': ('codigo', 'nombre_cliente', 'ruc_dni_cliente', 'empresa_cliente'),
+}
+
+
+def soporta_trigramas(alias='default'):
+    """
+    Indica si la base de datos soporta pg_trgm (solo PostgreSQL)
+    """
+    return connections[alias].vendor == 'postgresql'
+
+
+def buscar(queryset, texto, campos, ordenar=True):
+    """
+    Filtra el queryset para que cada palabra de `texto` aparezca en alguno de
+    los `campos`. Si `ordenar` y el motor es PostgreSQL, los resultados se
+    ordenan por la mayor similitud de trigramas entre los campos, conservando
+    el orden previo como desempate.
+    """
+    texto = (texto or '').strip()
+    if not texto:
+        return queryset
+
+    if isinstance(campos, str):
+        campos = CAMPOS_BUSQUEDA[campos]
+
+    queryset = aplicar_busqueda(queryset, texto, campos)
+
+    if ordenar and soporta_trigramas(queryset.db):
+        from django.contrib.postgres.search import TrigramSimilarity
+
+        similitudes = [TrigramSimilarity(campo, texto) for campo in campos]
+        relevancia = Greatest(*similitudes) if len(similitudes) > 1 else similitudes[0]
+        orden_previo = queryset.query.order_by or queryset.model._meta.ordering
+        queryset = queryset.annotate(relevancia_busqueda=relevancia).order_by(
+            '-relevancia_busqueda', *orden_previo
+        )
+    return queryset
+
@@ -206,6 +206,7 @@ class ArchivoAudioAdmin(admin.ModelAdmin):
         'nombre_original',
         'formato',
         'duracion_segundos',
+        'duracion_ms',
         'tamaño_bytes',
         'bitrate',
         'sample_rate',
@@ -225,6 +226,7 @@ class ArchivoAudioAdmin(admin.ModelAdmin):
             'fields': (
                 'formato',
                 'duracion_segundos',
+                'duracion_ms',
                 'tamaño_bytes',
                 'bitrate',
                 'sample_rate',
@@ -0,0 +1,264 @@
+"""
+Análisis de audio decodificado
+Sistema PubliTrack - Decodifica cada archivo una sola vez a PCM y lo recorre
+por bloques con NumPy para obtener la duración exacta, los picos de la forma
+de onda, la sonoridad integrada y los silencios inicial y final. Los
+resultados se guardan en AnalisisAudio para que reproductores y programadores
+no vuelvan a leer el audio.
+"""
+
+import logging
+import shutil
+import subprocess
+import wave
+
+from django.db import transaction
+from django.db.models import F, Q
+
+logger = logging.getLogger(__name__)
+
+# Resolución del análisis: picos y silencios por bloques de 10 ms; la
+# sonoridad usa ventanas de 400 ms con pasos de 100 ms (BS.1770)
+MS_BLOQUE = 10
+BLOQUES_POR_PASO = 10
+PASOS_POR_VENTANA = 4
+
+PUNTOS_FORMA_ONDA = 1000
+UMBRAL_SILENCIO_DBFS = -50.0
+COMPUERTA_ABSOLUTA_LUFS = -70.0
+COMPUERTA_RELATIVA_LU = -10.0
+
+# Los formatos comprimidos se decodifican con ffmpeg a float32 intercalado
+SAMPLE_RATE_FFMPEG = 48000
+FRAMES_POR_LECTURA = 64 * 1024
+
+
+class AnalisisNoDisponible(Exception):
+    """El formato del archivo no se puede decodificar en este servidor"""
+
+
+# ==================== DECODIFICACIÓN ====================
+
+def _wav_a_flotante(np, datos, ancho, canales):
+    """
+    Convierte frames PCM enteros de un WAV a float32 en [-1, 1]
+    """
+    if ancho == 1:
+        muestras = (np.frombuffer(datos, dtype=np.uint8).astype(np.float32) - 128) / 128
+    elif ancho == 2:
+        muestras = np.frombuffer(datos, dtype='<i2').astype(np.float32) / 32768
+    elif ancho == 3:
+        crudos = np.frombuffer(datos, dtype=np.uint8).reshape(-1, 3)
+        ampliados = np.zeros((len(crudos), 4), dtype=np.uint8)
+        ampliados[:, 1:] = crudos
+        muestras = ampliados.view('<i4').ravel().astype(np.float32) / 2 ** 31
+    elif ancho == 4:
+        muestras = np.frombuffer(datos, dtype='<i4').astype(np.float32) / 2 ** 31
+    else:
+        raise AnalisisNoDisponible(f'WAV de {ancho * 8} bits no soportado')
+    return muestras.reshape(-1, canales)
+
+
+def _bloques_wav(np, archivo_wav):
+    with archivo_wav:
+        ancho = archivo_wav.getsampwidth()
+        canales = archivo_wav.getnchannels()
+        while True:
+            datos = archivo_wav.readframes(FRAMES_POR_LECTURA)
+            if not datos:
+                break
+            yield _wav_a_flotante(np, datos, ancho, canales)
+
+
+def _bloques_ffmpeg(np, proceso, canales):
+    bytes_frame = 4 * canales
+    try:
+        while True:
+            datos = proceso.stdout.read(FRAMES_POR_LECTURA * bytes_frame)
+            if not datos:
+                break
+            completos = len(datos) - len(datos) % bytes_frame
+            yield np.frombuffer(datos[:completos], dtype='<f4').reshape(-1, canales)
+    finally:
+        proceso.stdout.close()
+        error = proceso.stderr.read().decode('utf-8', 'replace').strip()
+        proceso.stderr.close()
+        if proceso.wait() != 0:
+            raise AnalisisNoDisponible(f'ffmpeg no pudo decodificar el archivo: {error}')
+
+
+def decodificar(ruta):
+    """
+    Abre el audio como flujo PCM. Devuelve (sample_rate, canales, bloques),
+    donde bloques es un generador de arrays float32 de forma (frames, canales).
+    Los WAV enteros se leen con la librería estándar; el resto requiere ffmpeg.
+    """
+    import numpy as np
+
+    if str(ruta).lower().endswith('.wav'):
+        try:
+            archivo_wav = wave.open(str(ruta), 'rb')
+        except (wave.Error, EOFError):
+            archivo_wav = None
+        if archivo_wav is not None:
+            return archivo_wav.getframerate(), archivo_wav.getnchannels(), _bloques_wav(np, archivo_wav)
+
+    ffmpeg = shutil.which('ffmpeg')
+    if not ffmpeg:
+        raise AnalisisNoDisponible('ffmpeg no está instalado; solo se analizan archivos WAV')
+
+    from mutagen import File as MutagenFile
+    try:
+        info = MutagenFile(str(ruta))
+        canales = min(max(getattr(info.info, 'channels', 2) or 2, 1), 2)
+    except Exception:
+        canales = 2
+
+    proceso = subprocess.Popen(
+        [ffmpeg, '-nostdin', '-v', 'error', '-i', str(ruta),
+         '-f', 'f32le', '-ac', str(canales), '-ar', str(SAMPLE_RATE_FFMPEG), '-'],
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE
+    )
+    return SAMPLE_RATE_FFMPEG, canales, _bloques_ffmpeg(np, proceso, canales)
+
+
+# ==================== ANÁLISIS ====================
+
+def _sonoridad_integrada(np, cuadrados, muestras_bloque):
+    """
+    Sonoridad integrada con las compuertas de BS.1770 (absoluta de -70 LUFS y
+    relativa de -10 LU) sobre ventanas de 400 ms con pasos de 100 ms. No se
+    aplica el prefiltro K, así que el valor es una aproximación en LUFS.
+    """
+    pasos = len(cuadrados) // BLOQUES_POR_PASO
+    if pasos == 0:
+        return None
+    energia_pasos = cuadrados[:pasos * BLOQUES_POR_PASO].reshape(
+        pasos, BLOQUES_POR_PASO, -1
+    ).sum(axis=1) / (muestras_bloque * BLOQUES_POR_PASO)
+
+    if pasos >= PASOS_POR_VENTANA:
+        acumulada = np.cumsum(np.vstack([np.zeros(energia_pasos.shape[1]), energia_pasos]), axis=0)
+        ventanas = (acumulada[PASOS_POR_VENTANA:] - acumulada[:-PASOS_POR_VENTANA]) / PASOS_POR_VENTANA
+    else:
+        ventanas = energia_pasos.mean(axis=0, keepdims=True)
+
+    # Suma de canales con ganancia 1 (mono y estéreo)
+    energia = ventanas.sum(axis=1)
+    with np.errstate(divide='ignore'):
+        sonoridad = -0.691 + 10 * np.log10(energia)
+
+    validas = energia[sonoridad > COMPUERTA_ABSOLUTA_LUFS]
+    if not len(validas):
+        return None
+    relativa = -0.691 + 10 * np.log10(validas.mean()) + COMPUERTA_RELATIVA_LU
+    with np.errstate(divide='ignore'):
+        validas = validas[-0.691 + 10 * np.log10(validas) > relativa]
+    return round(float(-0.691 + 10 * np.log10(validas.mean())), 2)
+
+
+def _picos_forma_onda(np, picos):
+    """
+    Reduce los picos por bloque a PUNTOS_FORMA_ONDA valores de un byte
+    """
+    if len(picos) > PUNTOS_FORMA_ONDA:
+        limites = np.linspace(0, len(picos), PUNTOS_FORMA_ONDA, endpoint=False).astype(np.int64)
+        picos = np.maximum.reduceat(picos, limites)
+    return np.clip(np.rint(picos * 255), 0, 255).astype(np.uint8).tobytes()
+
+
+def analizar_pcm(sample_rate, canales, bloques):
+    """
+    Recorre el flujo PCM una vez, por bloques de MS_BLOQUE, acumulando solo el
+    pico y la energía de cada bloque. Devuelve un dict con los campos de
+    AnalisisAudio.
+    """
+    import numpy as np
+
+    muestras_bloque = max(1, sample_rate * MS_BLOQUE // 1000)
+    pendiente = np.empty((0, canales), dtype=np.float32)
+    picos, cuadrados = [], []
+    frames = 0
+
+    for muestras in bloques:
+        frames += len(muestras)
+        if len(pendiente):
+            muestras = np.concatenate([pendiente, muestras])
+        completos = len(muestras) // muestras_bloque * muestras_bloque
+        if completos:
+            tramo = muestras[:completos].reshape(-1, muestras_bloque, canales)
+            picos.append(np.abs(tramo).max(axis=(1, 2)))
+            cuadrados.append(np.square(tramo, dtype=np.float64).sum(axis=1))
+        pendiente = muestras[completos:]
+
+    # El último bloque incompleto cuenta para picos y silencios, no para la sonoridad
+    if len(pendiente):
+        picos.append(np.abs(pendiente).max(keepdims=True).ravel())
+
+    picos = np.concatenate(picos) if picos else np.zeros(0, dtype=np.float32)
+    cuadrados = np.concatenate(cuadrados) if cuadrados else np.zeros((0, canales))
+    duracion_ms = round(frames * 1000 / sample_rate) if sample_rate else 0
+
+    umbral = 10 ** (UMBRAL_SILENCIO_DBFS / 20)
+    sonoros = np.flatnonzero(picos > umbral)
+    if len(sonoros):
+        silencio_inicio_ms = min(int(sonoros[0]) * MS_BLOQUE, duracion_ms)
+        silencio_fin_ms = min((len(picos) - 1 - int(sonoros[-1])) * MS_BLOQUE, duracion_ms - silencio_inicio_ms)
+    else:
+        silencio_inicio_ms, silencio_fin_ms = duracion_ms, 0
+
+    pico_maximo = float(picos.max()) if len(picos) else 0.0
+    return {
+        'duracion_ms': duracion_ms,
+        'sample_rate': sample_rate,
+        'canales': canales,
+        'picos': _picos_forma_onda(np, picos),
+        'loudness_lufs': _sonoridad_integrada(np, cuadrados, muestras_bloque),
+        'pico_dbfs': round(20 * float(np.log10(pico_maximo)), 2) if pico_maximo > 0 else None,
+        'silencio_inicio_ms': silencio_inicio_ms,
+        'silencio_fin_ms': silencio_fin_ms,
+    }
+
+
+# ==================== PERSISTENCIA ====================
+
+def analizar_archivo(audio, forzar=False):
+    """
+    Analiza un ArchivoAudio y guarda el resultado. Si ya existe un análisis
+    del mismo contenido (mismo hash) lo devuelve sin decodificar, salvo con
+    `forzar`. Actualiza además la duración exacta del archivo.
+    """
+    from .models import AnalisisAudio, ArchivoAudio
+
+    existente = AnalisisAudio.objects.filter(archivo_audio=audio).first()
+    if existente and not forzar and audio.hash_archivo and existente.hash_archivo == audio.hash_archivo:
+        return existente
+
+    resultado = analizar_pcm(*decodificar(audio.archivo.path))
+
+    with transaction.atomic():
+        analisis, _ = AnalisisAudio.objects.update_or_create(
+            archivo_audio=audio,
+            defaults=dict(resultado, hash_archivo=audio.hash_archivo or ''),
+        )
+        audio.duracion_ms = resultado['duracion_ms']
+        audio.duracion_segundos = resultado['duracion_ms'] // 1000
+        ArchivoAudio.objects.filter(pk=audio.pk).update(
+            duracion_ms=audio.duracion_ms, duracion_segundos=audio.duracion_segundos
+        )
+    return analisis
+
+
+def audios_pendientes():
+    """
+    Archivos sin análisis o cuyo contenido cambió desde el último. Es la cola
+    del análisis: las subidas no decodifican el audio, lo procesa
+    `manage.py analizar_audios --continuo` fuera de las peticiones.
+    """
+    from .models import ArchivoAudio
+
+    return ArchivoAudio.objects.filter(
+        Q(analisis__isnull=True) |
+        Q(hash_archivo__isnull=False) & ~Q(analisis__hash_archivo=F('hash_archivo'))
+    ).exclude(archivo='')
+
@@ -165,6 +165,14 @@ class ArchivoAudioForm(forms.ModelForm):
                 raise ValidationError(
                     f'Formato de archivo no válido. Formatos permitidos: {", ".join(extensiones_validas)}'
                 )
+            
+            # Rechazar duplicados antes de guardar (el hash viene de la subida)
+            from .storage.audio_handlers import buscar_duplicado
+            existente = buscar_duplicado(archivo, excluir_pk=self.instance.pk)
+            if existente:
+                raise ValidationError(
+                    f'Este audio ya fue subido como "{existente.nombre_original}".'
+                )
         
         return archivo
 
@@ -0,0 +1,93 @@
+"""
+Management command para analizar los archivos de audio
+Sistema PubliTrack - Duración exacta, picos, sonoridad y silencios de los
+archivos que aún no tienen análisis o cuyo contenido cambió. Con --continuo
+queda como proceso de fondo que atiende las subidas nuevas.
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.content_management.analisis_audio import AnalisisNoDisponible, analizar_archivo, audios_pendientes
+from apps.content_management.models import ArchivoAudio
+
+
+class Command(BaseCommand):
+    help = 'Analiza los archivos de audio pendientes (duración exacta, forma de onda, sonoridad, silencios)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--todos',
+            action='store_true',
+            help='Volver a analizar todos los archivos, no solo los pendientes'
+        )
+
+        parser.add_argument(
+            '--limite',
+            type=int,
+            help='Cantidad máxima de archivos a analizar'
+        )
+
+        parser.add_argument(
+            '--continuo',
+            action='store_true',
+            help='No terminar: revisar los pendientes cada --intervalo segundos'
+        )
+
+        parser.add_argument(
+            '--intervalo',
+            type=int,
+            default=30,
+            help='Segundos entre revisiones en modo continuo (por defecto: 30)'
+        )
+
+    def handle(self, *args, **options):
+        if not options['continuo']:
+            self.procesar(options)
+            return
+
+        # Los que fallan no se reintentan en cada vuelta mientras su contenido no cambie
+        fallidos = {}
+        self.stdout.write(f"Analizando audios pendientes cada {options['intervalo']}s...")
+        while True:
+            self.procesar(dict(options, todos=False), fallidos)
+            time.sleep(options['intervalo'])
+
+    def procesar(self, options, fallidos=None):
+        start_time = time.time()
+        archivos = ArchivoAudio.objects.exclude(archivo='') if options['todos'] else audios_pendientes()
+        archivos = archivos.order_by('pk')
+        if options['limite']:
+            archivos = archivos[:options['limite']]
+
+        analizados = omitidos = errores = 0
+        for audio in archivos.iterator():
+            if fallidos is not None and fallidos.get(audio.pk) == audio.hash_archivo:
+                continue
+            try:
+                analisis = analizar_archivo(audio, forzar=options['todos'])
+                analizados += 1
+                if options['verbosity'] > 1:
+                    self.stdout.write(
+                        f"  {audio.nombre_original}: {analisis.duracion_ms} ms, "
+                        f"{analisis.loudness_lufs} LUFS"
+                    )
+            except AnalisisNoDisponible as e:
+                omitidos += 1
+                if fallidos is not None:
+                    fallidos[audio.pk] = audio.hash_archivo
+                if options['verbosity'] > 1:
+                    self.stdout.write(self.style.WARNING(f"  {audio.nombre_original}: {e}"))
+            except Exception as e:
+                errores += 1
+                if fallidos is not None:
+                    fallidos[audio.pk] = audio.hash_archivo
+                self.stderr.write(f"  Error en {audio.nombre_original}: {e}")
+
+        if options['continuo'] and not (analizados or omitidos or errores):
+            return
+        self.stdout.write(self.style.SUCCESS(
+            f"Análisis completado en {time.time() - start_time:.2f}s: "
+            f"{analizados} analizados, {omitidos} omitidos, {errores} con error"
+        ))
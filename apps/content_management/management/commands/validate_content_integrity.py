@@ -4,7 +4,6 @@ Sistema PubliTrack - Validación de datos, archivos y consistencia
 """
 
 import os
-import hashlib
 from django.core.management.base import BaseCommand, CommandError
 from django.conf import settings
 from django.utils import timezone
@@ -49,6 +48,16 @@ class Command(BaseCommand):
             action='store_true',
             help='Busca registros huérfanos',
         )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            help='Hilos para calcular hashes (por defecto núcleos + 4, máximo 32)',
+        )
+        parser.add_argument(
+            '--full-hash',
+            action='store_true',
+            help='Recalcula el hash aunque el tamaño y la fecha del archivo no hayan cambiado',
+        )
         parser.add_argument(
             '--verbose',
             action='store_true',
@@ -58,6 +67,8 @@ class Command(BaseCommand):
     def handle(self, *args, **options):
         self.verbosity = options.get('verbosity', 1)
         self.verbose = options.get('verbose', False)
+        self.workers = options.get('workers')
+        self.full_hash = options.get('full_hash', False)
         
         # Resultados de validación
         self.validation_results = {
@@ -111,68 +122,49 @@ class Command(BaseCommand):
             )
     
     def validate_file_integrity(self, fix=False):
-        """Valida integridad de archivos de audio"""
+        """Valida integridad de archivos de audio (verificación en paralelo)"""
+        from apps.content_management.storage.integridad import (
+            ERROR, INEXISTENTE, MODIFICADO, SIN_CAMBIOS, SIN_HASH, escanear_archivos
+        )
+        
         self.stdout.write('📁 Validando integridad de archivos...')
         self.validation_results['checks_performed'].append('file_integrity')
         
-        archivos_problema = []
-        archivos_sin_hash = []
-        archivos_hash_incorrecto = []
-        archivos_inexistentes = []
-        
-        for archivo in ArchivoAudio.objects.all():
-            try:
-                # Verificar que el archivo físico existe
-                if not archivo.archivo or not os.path.isfile(archivo.archivo.path):
-                    archivos_inexistentes.append({
-                        'id': archivo.id,
-                        'nombre': archivo.nombre_original,
-                        'path': archivo.archivo.path if archivo.archivo else 'N/A'
-                    })
-                    continue
-                
-                # Verificar hash
-                if not archivo.hash_archivo:
-                    archivos_sin_hash.append(archivo)
-                else:
-                    # Calcular hash actual
-                    with archivo.archivo.open('rb') as f:
-                        file_hash = hashlib.sha256()
-                        for chunk in iter(lambda: f.read(4096), b""):
-                            file_hash.update(chunk)
-                        
-                        if file_hash.hexdigest() != archivo.hash_archivo:
-                            archivos_hash_incorrecto.append({
-                                'id': archivo.id,
-                                'nombre': archivo.nombre_original,
-                                'hash_db': archivo.hash_archivo,
-                                'hash_actual': file_hash.hexdigest()
-                            })
-                
-            except Exception as e:
-                archivos_problema.append({
-                    'id': archivo.id,
-                    'nombre': archivo.nombre_original,
-                    'error': str(e)
-                })
+        resultado = escanear_archivos(
+            trabajadores=self.workers,
+            forzar=self.full_hash,
+            corregir=fix,
+            progreso=self.show_progress
+        )
+        
+        archivos_inexistentes = resultado[INEXISTENTE]
+        archivos_sin_hash = resultado[SIN_HASH]
+        archivos_hash_incorrecto = resultado[MODIFICADO]
+        archivos_problema = resultado[ERROR]
+        
+        self.stdout.write(
+            f"  {resultado['total']} archivos en {resultado['segundos']:.1f}s "
+            f"({resultado['bytes_leidos'] / 1024 / 1024:.1f} MB leídos, {resultado['mb_por_segundo']:.1f} MB/s); "
+            f"{len(resultado[SIN_CAMBIOS])} sin cambios desde la última verificación"
+        )
         
         # Reportar problemas
         if archivos_inexistentes:
             self.add_error(f"Archivos físicos inexistentes: {len(archivos_inexistentes)}")
             if self.verbose:
                 for archivo in archivos_inexistentes:
-                    self.stdout.write(f"  - {archivo['nombre']} (ID: {archivo['id']})")
+                    self.stdout.write(f"  - {archivo['archivo'] or 'N/A'} (ID: {archivo['id']})")
         
         if archivos_sin_hash:
             self.add_warning(f"Archivos sin hash: {len(archivos_sin_hash)}")
             if fix:
-                self.fix_missing_hashes(archivos_sin_hash)
+                self.fix_missing_hashes(resultado)
         
         if archivos_hash_incorrecto:
             self.add_error(f"Archivos con hash incorrecto: {len(archivos_hash_incorrecto)}")
             if self.verbose:
                 for archivo in archivos_hash_incorrecto:
-                    self.stdout.write(f"  - {archivo['nombre']} (Hash modificado)")
+                    self.stdout.write(f"  - {archivo['archivo']} (Hash modificado)")
         
         if archivos_problema:
             self.add_error(f"Archivos con errores: {len(archivos_problema)}")
@@ -180,6 +172,15 @@ class Command(BaseCommand):
         if not any([archivos_inexistentes, archivos_sin_hash, archivos_hash_incorrecto, archivos_problema]):
             self.add_info("Todos los archivos están íntegros")
     
+    def show_progress(self, procesados, total, bytes_leidos, segundos):
+        """Muestra el avance de la verificación cada 5%"""
+        paso = max(total // 20, 1)
+        if self.verbosity >= 1 and (procesados % paso == 0 or procesados == total):
+            velocidad = bytes_leidos / 1024 / 1024 / segundos if segundos else 0
+            self.stdout.write(
+                f"  {procesados}/{total} ({procesados * 100 // total}%) - {velocidad:.1f} MB/s"
+            )
+    
     def validate_data_consistency(self, fix=False):
         """Valida consistencia de datos"""
         self.stdout.write('📊 Validando consistencia de datos...')
@@ -337,25 +338,13 @@ class Command(BaseCommand):
         except Exception:
             pass
     
-    def fix_missing_hashes(self, archivos):
-        """Corrige archivos sin hash"""
-        fixed_count = 0
-        for archivo in archivos:
-            try:
-                if archivo.archivo and os.path.isfile(archivo.archivo.path):
-                    with archivo.archivo.open('rb') as f:
-                        file_hash = hashlib.sha256()
-                        for chunk in iter(lambda: f.read(4096), b""):
-                            file_hash.update(chunk)
-                        
-                        archivo.hash_archivo = file_hash.hexdigest()
-                        archivo.save(update_fields=['hash_archivo'])
-                        fixed_count += 1
-            except Exception as e:
-                self.stdout.write(f"Error generando hash para {archivo.nombre_original}: {e}")
-        
-        if fixed_count > 0:
-            self.add_fix(f"Generados {fixed_count} hashes faltantes")
+    def fix_missing_hashes(self, resultado):
+        """Informa los hashes faltantes guardados durante la verificación"""
+        for archivo in resultado['duplicados']:
+            self.stdout.write(f"Hash de {archivo['archivo']} duplicado de otro archivo; no se guardó")
+        
+        if resultado['corregidos'] > 0:
+            self.add_fix(f"Generados {resultado['corregidos']} hashes faltantes")
     
     def fix_inconsistent_dates(self, cuñas):
         """Corrige fechas inconsistentes"""
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.5 on 2026-10-19 16:47
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def vincular_cuñas_por_tags(apps, schema_editor):
+    """
+    Enlaza las cuñas existentes con su parte mortorio a partir del tag
+    "parte_mortorio,transmision_fallecimiento,<codigo>"
+    """
+    CuñaPublicitaria = apps.get_model('content_management', 'CuñaPublicitaria')
+    ParteMortorio = apps.get_model('parte_mortorios', 'ParteMortorio')
+
+    cuñas = list(
+        CuñaPublicitaria.objects.filter(tags__contains='parte_mortorio').only('id', 'tags')
+    )
+    if not cuñas:
+        return
+
+    partes = dict(ParteMortorio.objects.values_list('codigo', 'id'))
+    vinculadas = []
+    for cuña in cuñas:
+        for tag in cuña.tags.split(','):
+            parte_id = partes.get(tag.strip())
+            if parte_id:
+                cuña.parte_mortorio_id = parte_id
+                vinculadas.append(cuña)
+                break
+
+    CuñaPublicitaria.objects.bulk_update(vinculadas, ['parte_mortorio'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('content_management', '0012_alter_cuñapublicitaria_cliente'),
+        ('parte_mortorios', '0006_partemortorio_nombre_contacto_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cuñapublicitaria',
+            name='parte_mortorio',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='cuñas', to='parte_mortorios.partemortorio', verbose_name='Parte Mortorio'),
+        ),
+        migrations.RunPython(vincular_cuñas_por_tags, migrations.RunPython.noop),
+    ]
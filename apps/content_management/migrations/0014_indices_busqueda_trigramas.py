@@ -0,0 +1,40 @@
+# Índices de trigramas (pg_trgm) para la búsqueda de listados; solo PostgreSQL
+
+from django.db import migrations
+
+TABLA = 'content_management_cuñapublicitaria'
+
+# (índice, columna) sobre UPPER(columna::text), la expresión de icontains
+INDICES = [
+    ('content_management_cuñapublicita_titulo_trgm', 'titulo'),
+    ('content_management_cuñapublicita_codigo_trgm', 'codigo'),
+]
+
+
+def crear_indices(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for indice, columna in INDICES:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS "{indice}" ON "{TABLA}" '
+            f'USING gin ((UPPER("{columna}"::text)) gin_trgm_ops)'
+        )
+
+
+def eliminar_indices(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for indice, _ in INDICES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS "{indice}"')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('content_management', '0013_cuñapublicitaria_parte_mortorio'),
+    ]
+
+    operations = [
+        migrations.RunPython(crear_indices, eliminar_indices),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.5 on 2026-10-19 17:07
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('content_management', '0014_indices_busqueda_trigramas'),
+        ('parte_mortorios', '0008_indices_consultas_frecuentes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='contratogenerado',
+            index=models.Index(fields=['estado', 'fecha_generacion'], name='content_man_estado_aa6fbd_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='cuñapublicitaria',
+            index=models.Index(fields=['estado', 'fecha_fin'], name='content_man_estado_009e6c_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='cuñapublicitaria',
+            index=models.Index(fields=['created_at'], name='content_man_created_af7720_idx'),
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.5 on 2026-10-19 17:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('content_management', '0015_indices_consultas_frecuentes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archivoaudio',
+            name='duracion_ms',
+            field=models.PositiveIntegerField(blank=True, help_text='Duración exacta en milisegundos (cabecera o análisis del audio)', null=True, verbose_name='Duración (ms)'),
+        ),
+        migrations.CreateModel(
+            name='AnalisisAudio',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('hash_archivo', models.CharField(blank=True, help_text='Hash del contenido analizado; si cambia, el análisis está desactualizado', max_length=64, verbose_name='Hash analizado')),
+                ('duracion_ms', models.PositiveIntegerField(verbose_name='Duración (ms)')),
+                ('sample_rate', models.PositiveIntegerField(verbose_name='Sample Rate (Hz)')),
+                ('canales', models.PositiveSmallIntegerField(verbose_name='Canales')),
+                ('picos', models.BinaryField(help_text='Pico absoluto por tramo, un byte por tramo (0-255)', verbose_name='Picos')),
+                ('loudness_lufs', models.FloatField(blank=True, help_text='Sonoridad integrada con compuertas BS.1770; None si todo es silencio', null=True, verbose_name='Sonoridad integrada (LUFS)')),
+                ('pico_dbfs', models.FloatField(blank=True, null=True, verbose_name='Pico máximo (dBFS)')),
+                ('silencio_inicio_ms', models.PositiveIntegerField(default=0, verbose_name='Silencio inicial (ms)')),
+                ('silencio_fin_ms', models.PositiveIntegerField(default=0, verbose_name='Silencio final (ms)')),
+                ('analizado_en', models.DateTimeField(auto_now=True, verbose_name='Analizado en')),
+                ('archivo_audio', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='analisis', to='content_management.archivoaudio', verbose_name='Archivo de Audio')),
+            ],
+            options={
+                'verbose_name': 'Análisis de Audio',
+                'verbose_name_plural': 'Análisis de Audio',
+            },
+        ),
+    ]
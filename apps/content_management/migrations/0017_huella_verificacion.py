@@ -0,0 +1,23 @@
+# Generated by Django 5.2.5 on 2026-10-19 17:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('content_management', '0016_analisis_audio'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archivoaudio',
+            name='fecha_verificacion',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='Fecha de verificación'),
+        ),
+        migrations.AddField(
+            model_name='archivoaudio',
+            name='mtime_verificado',
+            field=models.BigIntegerField(blank=True, editable=False, help_text='Fecha de modificación del archivo cuando se verificó su hash; con el tamaño forma la huella que evita volver a leerlo', null=True, verbose_name='mtime verificado (ns)'),
+        ),
+    ]
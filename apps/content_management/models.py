@@ -315,6 +315,13 @@ class ArchivoAudio(models.Model):
         help_text='Duración real del audio en segundos'
     )
     
+    duracion_ms = models.PositiveIntegerField(
+        'Duración (ms)',
+        null=True,
+        blank=True,
+        help_text='Duración exacta en milisegundos (cabecera o análisis del audio)'
+    )
+    
     tamaño_bytes = models.PositiveBigIntegerField(
         'Tamaño (bytes)',
         null=True,
@@ -361,6 +368,22 @@ class ArchivoAudio(models.Model):
         help_text='Hash SHA256 del archivo para detectar duplicados'
     )
     
+    mtime_verificado = models.BigIntegerField(
+        'mtime verificado (ns)',
+        null=True,
+        blank=True,
+        editable=False,
+        help_text='Fecha de modificación del archivo cuando se verificó su hash; '
+                  'con el tamaño forma la huella que evita volver a leerlo'
+    )
+    
+    fecha_verificacion = models.DateTimeField(
+        'Fecha de verificación',
+        null=True,
+        blank=True,
+        editable=False
+    )
+    
     metadatos_extra = models.JSONField(
         'Metadatos Adicionales',
         default=dict,
@@ -388,27 +411,36 @@ class ArchivoAudio(models.Model):
     
     def save(self, *args, **kwargs):
         """Override save para extraer metadatos automáticamente"""
-        if self.archivo and not self.duracion_segundos:
+        if self.archivo and not self.archivo._committed:
+            # Subida nueva: hash y metadatos desde el temporal, antes de guardarlo
+            from .storage.audio_handlers import preparar_subida
+            preparar_subida(self)
+        elif self.archivo and not self.duracion_segundos:
             self.extraer_metadatos()
         super().save(*args, **kwargs)
     
-    def extraer_metadatos(self):
+    def extraer_metadatos(self, origen=None):
         """
-        Extrae metadatos del archivo de audio usando mutagen
+        Extrae metadatos del archivo de audio usando mutagen.
+        `origen` (ruta u objeto archivo) permite leerlos del temporal de la
+        subida; sin él se lee el archivo ya guardado.
         """
         try:
-            if self.archivo and os.path.exists(self.archivo.path):
+            if origen is None and self.archivo and os.path.exists(self.archivo.path):
+                origen = self.archivo.path
                 self.tamaño_bytes = os.path.getsize(self.archivo.path)
                 self.nombre_original = os.path.basename(self.archivo.name)
-                
+            
+            if origen is not None:
                 ext = os.path.splitext(self.archivo.name)[1].lower().lstrip('.')
                 self.formato = ext if ext in dict(self.FORMATO_CHOICES) else 'mp3'
                 
-                audio_file = MutagenFile(self.archivo.path)
+                audio_file = MutagenFile(origen)
                 
                 if audio_file is not None:
                     if hasattr(audio_file, 'info') and hasattr(audio_file.info, 'length'):
                         self.duracion_segundos = int(audio_file.info.length)
+                        self.duracion_ms = round(audio_file.info.length * 1000)
                     
                     if hasattr(audio_file, 'info') and hasattr(audio_file.info, 'bitrate'):
                         self.bitrate = audio_file.info.bitrate
@@ -462,10 +494,84 @@ class ArchivoAudio(models.Model):
                 return f"{self.tamaño_bytes/(1024**3):.1f} GB"
         return "0 B"
     
+    @property
+    def duracion_exacta(self):
+        """Duración con precisión de milisegundos (timedelta), o None si no se conoce"""
+        if self.duracion_ms:
+            return timedelta(milliseconds=self.duracion_ms)
+        if self.duracion_segundos:
+            return timedelta(seconds=self.duracion_segundos)
+        return None
+    
     def get_absolute_url(self):
         return reverse('content:audio_detail', kwargs={'pk': self.pk})
 
 
+class AnalisisAudio(models.Model):
+    """
+    Resultado del análisis del audio decodificado (PCM): duración exacta,
+    picos para dibujar la forma de onda, sonoridad y silencios. Se calcula
+    una vez por contenido para que reproductores y programadores no vuelvan
+    a leer el archivo.
+    """
+    
+    archivo_audio = models.OneToOneField(
+        ArchivoAudio,
+        on_delete=models.CASCADE,
+        related_name='analisis',
+        verbose_name='Archivo de Audio'
+    )
+    
+    hash_archivo = models.CharField(
+        'Hash analizado',
+        max_length=64,
+        blank=True,
+        help_text='Hash del contenido analizado; si cambia, el análisis está desactualizado'
+    )
+    
+    duracion_ms = models.PositiveIntegerField('Duración (ms)')
+    
+    sample_rate = models.PositiveIntegerField('Sample Rate (Hz)')
+    
+    canales = models.PositiveSmallIntegerField('Canales')
+    
+    picos = models.BinaryField(
+        'Picos',
+        help_text='Pico absoluto por tramo, un byte por tramo (0-255)'
+    )
+    
+    loudness_lufs = models.FloatField(
+        'Sonoridad integrada (LUFS)',
+        null=True,
+        blank=True,
+        help_text='Sonoridad integrada con compuertas BS.1770; None si todo es silencio'
+    )
+    
+    pico_dbfs = models.FloatField('Pico máximo (dBFS)', null=True, blank=True)
+    
+    silencio_inicio_ms = models.PositiveIntegerField('Silencio inicial (ms)', default=0)
+    
+    silencio_fin_ms = models.PositiveIntegerField('Silencio final (ms)', default=0)
+    
+    analizado_en = models.DateTimeField('Analizado en', auto_now=True)
+    
+    class Meta:
+        verbose_name = 'Análisis de Audio'
+        verbose_name_plural = 'Análisis de Audio'
+    
+    def __str__(self):
+        return f"Análisis de {self.archivo_audio_id} ({self.duracion_ms} ms)"
+    
+    @property
+    def duracion_sonora_ms(self):
+        """Duración sin los silencios inicial y final"""
+        return max(self.duracion_ms - self.silencio_inicio_ms - self.silencio_fin_ms, 0)
+    
+    def lista_picos(self):
+        """Picos como lista de enteros 0-255 para la forma de onda"""
+        return list(bytes(self.picos))
+
+
 class CuñaPublicitaria(models.Model):
     """
     Modelo principal para las cuñas publicitarias
@@ -680,6 +786,16 @@ class CuñaPublicitaria(models.Model):
         help_text='Palabras clave separadas por comas para búsqueda'
     )
     
+    # Parte mortorio que originó la cuña (si aplica)
+    parte_mortorio = models.ForeignKey(
+        'parte_mortorios.ParteMortorio',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='cuñas',
+        verbose_name='Parte Mortorio'
+    )
+    
     # Metadatos
     created_by = models.ForeignKey(
         settings.AUTH_USER_MODEL,
@@ -701,6 +817,8 @@ class CuñaPublicitaria(models.Model):
             models.Index(fields=['cliente', 'estado']),
             models.Index(fields=['vendedor_asignado', 'estado']),
             models.Index(fields=['fecha_inicio', 'fecha_fin']),
+            models.Index(fields=['estado', 'fecha_fin']),  # vencimientos
+            models.Index(fields=['created_at']),  # listado y generar_codigo
         ]
     
     def __str__(self):
@@ -717,16 +835,9 @@ class CuñaPublicitaria(models.Model):
         super().save(*args, **kwargs)
     
     def generar_codigo(self):
-        """Genera un código único para la cuña"""
-        año = timezone.now().year
-        mes = timezone.now().month
-        
-        count = CuñaPublicitaria.objects.filter(
-            created_at__year=año,
-            created_at__month=mes
-        ).count() + 1
-        
-        return f"CP{año}{mes:02d}{count:04d}"
+        """Genera un código único para la cuña (CP + AAAAMM + contador)"""
+        from apps.system_configuration.secuencias import generar_codigo, periodo_mensual
+        return generar_codigo(CuñaPublicitaria, 'codigo', 'CP', 4, periodo_mensual())
     
     def clean(self):
         """Validaciones personalizadas"""
@@ -742,6 +853,18 @@ class CuñaPublicitaria(models.Model):
                     f'del archivo de audio ({self.archivo_audio.duracion_segundos}s).'
                 )
     
+    @property
+    def duracion_emision(self):
+        """
+        Duración al aire (timedelta): la exacta del audio si se conoce, si no
+        la planeada
+        """
+        if self.archivo_audio_id:
+            duracion = self.archivo_audio.duracion_exacta
+            if duracion:
+                return duracion
+        return timedelta(seconds=self.duracion_planeada or 0)
+    
     @property
     def dias_efectivos(self):
         """Calcula los días efectivos considerando exclusiones"""
@@ -1244,6 +1367,7 @@ class ContratoGenerado(models.Model):
             models.Index(fields=['vendedor_asignado', 'estado']),  # ✅ NUEVO ÍNDICE
             models.Index(fields=['cuña']),
             models.Index(fields=['fecha_generacion']),
+            models.Index(fields=['estado', 'fecha_generacion']),
         ]
 
     def __str__(self):
@@ -1268,40 +1392,22 @@ class ContratoGenerado(models.Model):
         super().save(*args, **kwargs)
 
     def generar_numero_contrato(self):
-        año = timezone.now().year
-        mes = timezone.now().month
-        
-        # Base count for the month
-        base_qs = ContratoGenerado.objects.filter(
-            fecha_generacion__year=año,
-            fecha_generacion__month=mes
-        )
-        count = base_qs.count() + 1
-        
-        # Loop checking existence to allow filling gaps or handling concurrency (basic)
-        for i in range(1000): # Limit iterations to prevent infinite loop
-            numero = f"CTR{año}{mes:02d}{count:04d}"
-            if not ContratoGenerado.objects.filter(numero_contrato=numero).exists():
-                return numero
-            count += 1
-            
-        # Fallback if too many conflicts (unlikely)
-        import uuid
-        return f"CTR{año}{mes:02d}-{str(uuid.uuid4())[:6].upper()}"
+        """Genera el número del contrato (CTR + AAAAMM + contador)"""
+        from apps.system_configuration.secuencias import generar_codigo, periodo_mensual
+        return generar_codigo(ContratoGenerado, 'numero_contrato', 'CTR', 4, periodo_mensual())
 
     def generar_contrato(self):
         try:
-            from docxtpl import DocxTemplate
-            from io import BytesIO
-            import os
-            import subprocess
-            from django.core.files.base import ContentFile
+            from apps.system_configuration.documentos import generar_documento
+
+            # Un contrato ya emitido (validado, firmado...) conserva su PDF
+            if self.archivo_contrato_pdf and not self.puede_regenerar:
+                return True
 
         # VALIDACIÓN
             if not self.plantilla_usada or not self.plantilla_usada.archivo_plantilla:
                 raise ValueError("No hay plantilla asignada")
 
-            doc = DocxTemplate(self.plantilla_usada.archivo_plantilla.path)
             cliente = self.cliente
             datos_gen = self.datos_generacion
 
@@ -1429,31 +1535,11 @@ class ContratoGenerado(models.Model):
             self.valor_iva = valor_iva
             self.valor_total = valor_total
 
-        # Generar Word temporal y convertir a PDF
-            buffer = BytesIO()
-            doc.render(context)
-            doc.save(buffer)
-            buffer.seek(0)
-
-            temp_docx_path = f"/tmp/contrato_{self.numero_contrato}.docx"
-            temp_pdf_path = f"/tmp/contrato_{self.numero_contrato}.pdf"
-            with open(temp_docx_path, 'wb') as tempdocx:
-                tempdocx.write(buffer.read())
-
-            subprocess.run([
-                "libreoffice",
-                "--headless",
-                "--convert-to", "pdf",
-                "--outdir", "/tmp",
-                temp_docx_path
-            ], check=True)
-
-            with open(temp_pdf_path, 'rb') as pdf_file:
-                pdf_filename = f"contrato_{self.numero_contrato}.pdf"
-                self.archivo_contrato_pdf.save(pdf_filename, ContentFile(pdf_file.read()), save=False)
-
-            os.remove(temp_docx_path)
-            os.remove(temp_pdf_path)
+        # Renderizar y convertir a PDF (o reutilizar el PDF de la misma plantilla y contexto)
+            ruta, _ = generar_documento(
+                'contrato', self.plantilla_usada.archivo_plantilla, context, f"contrato_{self.numero_contrato}"
+            )
+            self.archivo_contrato_pdf.name = ruta
 
             self.estado = 'generado'
             self.save()
@@ -204,6 +204,13 @@ def crear_notificacion_vencimiento(sender, instance, **kwargs):
     """
     Programa notificación de vencimiento para cuñas activas
     """
+    programar_notificacion_vencimiento(instance)
+
+def programar_notificacion_vencimiento(instance):
+    """
+    Crea las notificaciones de vencimiento de una cuña activa; la usan la
+    señal y las altas en lote (bulk_create no emite post_save)
+    """
     if instance.estado == 'activa' and instance.notificar_vencimiento:
         try:
             from apps.notifications.models import Notificacion, TipoNotificacion
@@ -347,40 +354,25 @@ def validar_integridad_archivos():
     Valida la integridad de todos los archivos de audio
     Útil para tareas de mantenimiento
     """
+    from .storage.integridad import ERROR, INEXISTENTE, MODIFICADO, escanear_archivos
     from .models import ArchivoAudio
     
-    archivos_problema = []
+    resultado = escanear_archivos()
+    problemas = {
+        INEXISTENTE: 'Archivo físico no existe',
+        MODIFICADO: 'Hash no coincide - archivo modificado',
+        ERROR: 'Error al validar',
+    }
+    ids = [r['id'] for estado in problemas for r in resultado[estado]]
+    nombres = dict(ArchivoAudio.objects.filter(pk__in=ids).values_list('pk', 'nombre_original'))
     
-    for archivo in ArchivoAudio.objects.all():
-        try:
-            # Verificar que el archivo físico existe
-            if not os.path.isfile(archivo.archivo.path):
-                archivos_problema.append({
-                    'id': archivo.id,
-                    'nombre': archivo.nombre_original,
-                    'problema': 'Archivo físico no existe'
-                })
-                continue
-            
-            # Verificar hash si existe
-            if archivo.hash_archivo:
-                with archivo.archivo.open('rb') as f:
-                    file_hash = hashlib.sha256()
-                    for chunk in iter(lambda: f.read(4096), b""):
-                        file_hash.update(chunk)
-                    
-                    if file_hash.hexdigest() != archivo.hash_archivo:
-                        archivos_problema.append({
-                            'id': archivo.id,
-                            'nombre': archivo.nombre_original,
-                            'problema': 'Hash no coincide - archivo modificado'
-                        })
-                        
-        except Exception as e:
+    archivos_problema = []
+    for estado, problema in problemas.items():
+        for r in resultado[estado]:
             archivos_problema.append({
-                'id': archivo.id,
-                'nombre': archivo.nombre_original,
-                'problema': f'Error al validar: {str(e)}'
+                'id': r['id'],
+                'nombre': nombres.get(r['id'], r['archivo']),
+                'problema': f"{problema}: {r['error']}" if 'error' in r else problema
             })
     
     return archivos_problema
@@ -390,33 +382,17 @@ def regenerar_hashes_archivos():
     Regenera los hashes de todos los archivos de audio
     Útil después de migración o problemas de integridad
     """
+    from .storage.integridad import ERROR, escanear_archivos
     from .models import ArchivoAudio
     
-    archivos_procesados = 0
-    archivos_error = []
-    
-    for archivo in ArchivoAudio.objects.filter(hash_archivo__isnull=True):
-        try:
-            if archivo.archivo and os.path.isfile(archivo.archivo.path):
-                with archivo.archivo.open('rb') as f:
-                    file_hash = hashlib.sha256()
-                    for chunk in iter(lambda: f.read(4096), b""):
-                        file_hash.update(chunk)
-                    
-                    archivo.hash_archivo = file_hash.hexdigest()
-                    archivo.save(update_fields=['hash_archivo'])
-                    archivos_procesados += 1
-                    
-        except Exception as e:
-            archivos_error.append({
-                'id': archivo.id,
-                'nombre': archivo.nombre_original,
-                'error': str(e)
-            })
+    resultado = escanear_archivos(ArchivoAudio.objects.filter(hash_archivo__isnull=True), corregir=True)
     
     return {
-        'procesados': archivos_procesados,
-        'errores': archivos_error
+        'procesados': resultado['corregidos'],
+        'errores': [
+            {'id': r['id'], 'nombre': r['archivo'], 'error': r.get('error', 'Hash duplicado de otro archivo')}
+            for r in resultado[ERROR] + resultado['duplicados']
+        ]
     }
 
 def limpiar_archivos_huerfanos():
@@ -425,43 +401,27 @@ def limpiar_archivos_huerfanos():
     ¡USAR CON PRECAUCIÓN!
     """
     from django.conf import settings
+    from .storage.integridad import DIRECTORIO_AUDIO, archivos_en_disco, archivos_huerfanos
     
     if not hasattr(settings, 'MEDIA_ROOT'):
         return {'error': 'MEDIA_ROOT no configurado'}
     
-    audio_path = os.path.join(settings.MEDIA_ROOT, 'audio_spots')
-    
-    if not os.path.exists(audio_path):
+    if not os.path.exists(os.path.join(settings.MEDIA_ROOT, DIRECTORIO_AUDIO)):
         return {'error': 'Directorio de audio no existe'}
     
-    archivos_eliminados = []
-    archivos_conservados = []
+    en_disco = archivos_en_disco()
+    huerfanos = archivos_huerfanos(en_disco=en_disco)
     
-    # Obtener lista de archivos en base de datos
-    from .models import ArchivoAudio
-    archivos_db = set()
-    
-    for archivo in ArchivoAudio.objects.all():
-        if archivo.archivo:
-            archivos_db.add(os.path.basename(archivo.archivo.path))
-    
-    # Recorrer archivos físicos
-    for root, dirs, files in os.walk(audio_path):
-        for file in files:
-            file_path = os.path.join(root, file)
-            
-            # Verificar si el archivo está en la base de datos
-            if file not in archivos_db:
-                try:
-                    os.remove(file_path)
-                    archivos_eliminados.append(file)
-                except Exception as e:
-                    print(f"Error eliminando {file}: {e}")
-            else:
-                archivos_conservados.append(file)
+    archivos_eliminados = []
+    for nombre in huerfanos:
+        try:
+            os.remove(os.path.join(settings.MEDIA_ROOT, nombre))
+            archivos_eliminados.append(nombre)
+        except Exception as e:
+            print(f"Error eliminando {nombre}: {e}")
     
     return {
         'eliminados': len(archivos_eliminados),
-        'conservados': len(archivos_conservados),
+        'conservados': len(en_disco) - len(huerfanos),
         'archivos_eliminados': archivos_eliminados
     }
\ No newline at end of file
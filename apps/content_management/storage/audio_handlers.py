@@ -0,0 +1,158 @@
+"""
+Manejadores de subida de archivos de audio
+Sistema PubliTrack - El cuerpo de la petición se escribe al archivo temporal
+en bloques grandes mientras se calculan el SHA-256 y el tamaño, de modo que
+los duplicados se detectan antes de guardar y los metadatos se extraen una
+sola vez del temporal; al guardar, el temporal se mueve al almacenamiento.
+"""
+
+import hashlib
+import os
+
+from django.core.files.uploadedfile import TemporaryUploadedFile
+from django.core.files.uploadhandler import (
+    FileUploadHandler,
+    MemoryFileUploadHandler,
+    TemporaryFileUploadHandler,
+)
+from django.db import IntegrityError, transaction
+
+# Bloque de lectura del cuerpo; el parser usa el menor de todos los manejadores
+TAMAÑO_BUFFER = 1024 * 1024
+
+EXTENSIONES_AUDIO = {'mp3', 'wav', 'aac', 'm4a', 'ogg'}
+
+
+def es_audio(nombre):
+    """
+    Indica si el nombre de archivo tiene una extensión de audio admitida
+    """
+    return os.path.splitext(nombre or '')[1].lower().lstrip('.') in EXTENSIONES_AUDIO
+
+
+# ==================== MANEJADORES ====================
+
+class AudioUploadHandler(FileUploadHandler):
+    """
+    Escribe los archivos de audio directamente a un temporal en disco y
+    calcula su SHA-256 con cada bloque recibido. Los demás archivos pasan a
+    los manejadores siguientes sin cambios.
+    """
+
+    chunk_size = TAMAÑO_BUFFER
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.activo = es_audio(self.file_name)
+        if self.activo:
+            self.file = TemporaryUploadedFile(
+                self.file_name, self.content_type, 0, self.charset, self.content_type_extra
+            )
+            self.sha256 = hashlib.sha256()
+
+    def receive_data_chunk(self, raw_data, start):
+        if not self.activo:
+            return raw_data
+        self.file.write(raw_data)
+        self.sha256.update(raw_data)
+        return None
+
+    def file_complete(self, file_size):
+        if not self.activo:
+            return None
+        self.file.seek(0)
+        self.file.size = file_size
+        self.file.sha256 = self.sha256.hexdigest()
+        return self.file
+
+    def upload_interrupted(self):
+        if getattr(self, 'activo', False) and hasattr(self, 'file'):
+            temp_location = self.file.temporary_file_path()
+            try:
+                self.file.close()
+                os.remove(temp_location)
+            except FileNotFoundError:
+                pass
+
+
+class MemoriaUploadHandler(MemoryFileUploadHandler):
+    """MemoryFileUploadHandler con el mismo bloque de lectura"""
+    chunk_size = TAMAÑO_BUFFER
+
+
+class TemporalUploadHandler(TemporaryFileUploadHandler):
+    """TemporaryFileUploadHandler con el mismo bloque de lectura"""
+    chunk_size = TAMAÑO_BUFFER
+
+
+# ==================== HASH Y DUPLICADOS ====================
+
+def hash_subida(archivo):
+    """
+    SHA-256 de un archivo subido. Usa el calculado durante la subida; si no
+    pasó por AudioUploadHandler (p. ej. SimpleUploadedFile) lo calcula una
+    vez y lo deja guardado en el objeto.
+    """
+    sha256 = getattr(archivo, 'sha256', None)
+    if sha256:
+        return sha256
+
+    digest = hashlib.sha256()
+    for bloque in archivo.chunks(TAMAÑO_BUFFER):
+        digest.update(bloque)
+    archivo.seek(0)
+    archivo.sha256 = digest.hexdigest()
+    return archivo.sha256
+
+
+def buscar_duplicado(archivo, excluir_pk=None):
+    """
+    ArchivoAudio existente con el mismo contenido, o None. `excluir_pk`
+    descarta el propio registro al editarlo.
+    """
+    from ..models import ArchivoAudio
+
+    existentes = ArchivoAudio.objects.filter(hash_archivo=hash_subida(archivo))
+    if excluir_pk:
+        existentes = existentes.exclude(pk=excluir_pk)
+    return existentes.first()
+
+
+def preparar_subida(audio):
+    """
+    Completa hash, tamaño, nombre y metadatos de un ArchivoAudio cuyo archivo
+    aún no se guardó, leyendo el temporal de la subida una sola vez
+    """
+    subido = audio.archivo.file
+    audio.tamaño_bytes = subido.size
+    if not audio.nombre_original:
+        audio.nombre_original = os.path.basename(subido.name)
+    if not audio.hash_archivo:
+        audio.hash_archivo = hash_subida(subido)
+    if not audio.duracion_segundos:
+        if hasattr(subido, 'temporary_file_path'):
+            audio.extraer_metadatos(subido.temporary_file_path())
+        else:
+            audio.extraer_metadatos(subido)
+            subido.seek(0)
+
+
+def obtener_o_crear_audio(archivo, subido_por=None):
+    """
+    Devuelve (audio, creado): el ArchivoAudio existente con el mismo contenido
+    o uno nuevo guardado a partir del archivo subido
+    """
+    from ..models import ArchivoAudio
+
+    existente = buscar_duplicado(archivo)
+    if existente:
+        return existente, False
+    try:
+        with transaction.atomic():
+            return ArchivoAudio.objects.create(archivo=archivo, subido_por=subido_por), True
+    except IntegrityError:
+        # Otra subida del mismo contenido se guardó entre la búsqueda y el alta
+        existente = buscar_duplicado(archivo)
+        if existente is None:
+            raise
+        return existente, False
@@ -0,0 +1,195 @@
+"""
+Verificación de integridad de los archivos de audio
+Sistema PubliTrack - Recalcula hashes en paralelo (hilos; hashlib libera el
+GIL con bloques grandes) leyendo cada archivo mapeado en memoria, omite los
+archivos cuya huella (tamaño, mtime) no cambió desde la última verificación
+y guarda los resultados con bulk_update. Los huérfanos se obtienen con una
+sola pasada de os.scandir contra una sola consulta.
+"""
+
+import hashlib
+import mmap
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.utils import timezone
+
+LOTE_ACTUALIZACION = 500
+DIRECTORIO_AUDIO = 'audio_spots'
+
+# Resultados de la verificación de cada archivo
+SIN_CAMBIOS = 'sin_cambios'
+VERIFICADO = 'verificado'
+SIN_HASH = 'sin_hash'
+MODIFICADO = 'modificado'
+INEXISTENTE = 'inexistente'
+ERROR = 'error'
+
+
+def trabajadores_por_defecto():
+    """
+    Hilos para la verificación: el trabajo es de E/S, así que más que núcleos
+    """
+    return min(32, (os.cpu_count() or 1) + 4)
+
+
+def hash_ruta(ruta):
+    """
+    SHA-256 de un archivo leyéndolo mapeado en memoria en una sola llamada
+    """
+    with open(ruta, 'rb') as archivo:
+        if os.fstat(archivo.fileno()).st_size == 0:
+            return hashlib.sha256().hexdigest()
+        with mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ) as mapa:
+            return hashlib.sha256(mapa).hexdigest()
+
+
+# ==================== VERIFICACIÓN ====================
+
+def _verificar(fila, forzar):
+    """
+    Verifica un archivo (se ejecuta en un hilo, sin acceso a la base de datos)
+    """
+    pk, nombre, hash_guardado, tamaño_guardado, mtime_guardado = fila
+    resultado = {'id': pk, 'archivo': nombre, 'bytes_leidos': 0}
+    if not nombre:
+        return dict(resultado, estado=INEXISTENTE)
+
+    ruta = os.path.join(settings.MEDIA_ROOT, nombre)
+    try:
+        estado = os.stat(ruta)
+    except FileNotFoundError:
+        return dict(resultado, estado=INEXISTENTE)
+    except OSError as e:
+        return dict(resultado, estado=ERROR, error=str(e))
+
+    resultado.update(tamaño=estado.st_size, mtime=estado.st_mtime_ns)
+    if (not forzar and hash_guardado and estado.st_size == tamaño_guardado
+            and estado.st_mtime_ns == mtime_guardado):
+        return dict(resultado, estado=SIN_CAMBIOS)
+
+    try:
+        hash_actual = hash_ruta(ruta)
+    except OSError as e:
+        return dict(resultado, estado=ERROR, error=str(e))
+
+    resultado.update(hash=hash_actual, bytes_leidos=estado.st_size)
+    if not hash_guardado:
+        return dict(resultado, estado=SIN_HASH)
+    if hash_actual != hash_guardado:
+        return dict(resultado, estado=MODIFICADO, hash_guardado=hash_guardado)
+    return dict(resultado, estado=VERIFICADO)
+
+
+def escanear_archivos(queryset=None, trabajadores=None, forzar=False, corregir=False, progreso=None):
+    """
+    Verifica los archivos de audio en paralelo.
+
+    - `forzar` vuelve a calcular el hash aunque la huella no haya cambiado.
+    - `corregir` guarda el hash de los archivos que no lo tenían (si no
+      pertenece ya a otro registro).
+    - `progreso(procesados, total, bytes_leidos, segundos)` se llama a medida
+      que terminan los archivos.
+
+    Devuelve un dict con la lista de resultados por estado, los hashes
+    corregidos y las estadísticas de la pasada.
+    """
+    from ..models import ArchivoAudio
+
+    if queryset is None:
+        queryset = ArchivoAudio.objects.all()
+    filas = list(queryset.order_by('pk').values_list(
+        'pk', 'archivo', 'hash_archivo', 'tamaño_bytes', 'mtime_verificado'
+    ))
+
+    resultados = {estado: [] for estado in (SIN_CAMBIOS, VERIFICADO, SIN_HASH, MODIFICADO, INEXISTENTE, ERROR)}
+    inicio = time.monotonic()
+    bytes_leidos = 0
+
+    with ThreadPoolExecutor(max_workers=trabajadores or trabajadores_por_defecto()) as ejecutor:
+        for procesados, resultado in enumerate(ejecutor.map(lambda fila: _verificar(fila, forzar), filas), 1):
+            resultados[resultado['estado']].append(resultado)
+            bytes_leidos += resultado['bytes_leidos']
+            if progreso:
+                progreso(procesados, len(filas), bytes_leidos, time.monotonic() - inicio)
+
+    # Huella de los archivos verificados y hashes faltantes, en lotes
+    ahora = timezone.now()
+    actualizaciones = [
+        ArchivoAudio(pk=r['id'], tamaño_bytes=r['tamaño'], mtime_verificado=r['mtime'], fecha_verificacion=ahora)
+        for r in resultados[VERIFICADO]
+    ]
+    ArchivoAudio.objects.bulk_update(
+        actualizaciones, ['tamaño_bytes', 'mtime_verificado', 'fecha_verificacion'], batch_size=LOTE_ACTUALIZACION
+    )
+
+    corregidos, duplicados = [], []
+    if corregir and resultados[SIN_HASH]:
+        hashes = [r['hash'] for r in resultados[SIN_HASH]]
+        existentes = set(ArchivoAudio.objects.filter(hash_archivo__in=hashes).values_list('hash_archivo', flat=True))
+        for r in resultados[SIN_HASH]:
+            if r['hash'] in existentes:
+                duplicados.append(r)
+                continue
+            existentes.add(r['hash'])
+            corregidos.append(ArchivoAudio(
+                pk=r['id'], hash_archivo=r['hash'], tamaño_bytes=r['tamaño'],
+                mtime_verificado=r['mtime'], fecha_verificacion=ahora
+            ))
+        ArchivoAudio.objects.bulk_update(
+            corregidos, ['hash_archivo', 'tamaño_bytes', 'mtime_verificado', 'fecha_verificacion'],
+            batch_size=LOTE_ACTUALIZACION
+        )
+
+    segundos = time.monotonic() - inicio
+    return dict(
+        resultados,
+        corregidos=len(corregidos),
+        duplicados=duplicados,
+        total=len(filas),
+        bytes_leidos=bytes_leidos,
+        segundos=segundos,
+        mb_por_segundo=bytes_leidos / 1024 / 1024 / segundos if segundos else 0,
+    )
+
+
+# ==================== HUÉRFANOS ====================
+
+def _recorrer(directorio):
+    pendientes = [directorio]
+    while pendientes:
+        with os.scandir(pendientes.pop()) as entradas:
+            for entrada in entradas:
+                if entrada.is_dir(follow_symlinks=False):
+                    pendientes.append(entrada.path)
+                elif entrada.is_file(follow_symlinks=False):
+                    yield entrada.path
+
+
+def archivos_en_disco(directorio=DIRECTORIO_AUDIO):
+    """
+    Archivos bajo MEDIA_ROOT/directorio, como nombres relativos a MEDIA_ROOT
+    (el mismo formato que guarda el FileField)
+    """
+    raiz = os.path.join(settings.MEDIA_ROOT, directorio)
+    if not os.path.isdir(raiz):
+        return set()
+    return {
+        os.path.relpath(ruta, settings.MEDIA_ROOT).replace(os.sep, '/')
+        for ruta in _recorrer(raiz)
+    }
+
+
+def archivos_huerfanos(directorio=DIRECTORIO_AUDIO, en_disco=None):
+    """
+    Archivos en disco sin ArchivoAudio: diferencia entre un recorrido del
+    disco y una consulta de los nombres registrados
+    """
+    from ..models import ArchivoAudio
+
+    if en_disco is None:
+        en_disco = archivos_en_disco(directorio)
+    registrados = set(ArchivoAudio.objects.exclude(archivo='').values_list('archivo', flat=True))
+    return sorted(en_disco - registrados)
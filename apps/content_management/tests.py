@@ -733,6 +733,539 @@ class IntegrationTest(TransactionTestCase):
             ).exists()
         )
 
+# ==================== TESTS DE PLANES DE CONSULTA ====================
+
+def recorridos_secuenciales(queryset):
+    """
+    Tablas que el plan de la consulta recorre completas (sin índice).
+    Soporta EXPLAIN de PostgreSQL y EXPLAIN QUERY PLAN de SQLite.
+    """
+    from django.db import connections
+
+    plan = queryset.explain()
+    if connections[queryset.db].vendor == 'postgresql':
+        return [
+            linea.split('Seq Scan on ', 1)[1].split()[0]
+            for linea in plan.splitlines() if 'Seq Scan on ' in linea
+        ]
+    # SQLite: "SCAN tabla" sin "USING ... INDEX" es un recorrido completo
+    return [
+        linea.split('SCAN ', 1)[1].split()[0]
+        for linea in plan.splitlines()
+        if 'SCAN ' in linea and 'INDEX' not in linea
+    ]
+
+
+class PlanesConsultaTest(TestCase):
+    """
+    Las consultas frecuentes de listados, tareas y grilla deben usar índices.
+    En PostgreSQL se desactivan los recorridos secuenciales para que el plan
+    solo los elija si ningún índice sirve.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        from apps.parte_mortorios.models import ParteMortorio
+
+        cls.cliente = User.objects.create_user(
+            username='cliente_planes', email='planes@test.com', password='testpass123', rol='cliente'
+        )
+        hoy = date.today()
+        estados = ['activa', 'pausada', 'finalizada', 'pendiente_revision']
+        CuñaPublicitaria.objects.bulk_create([
+            CuñaPublicitaria(
+                codigo=f'CPPLAN{i:04d}',
+                titulo=f'Cuña {i}',
+                cliente=cls.cliente,
+                vendedor_asignado=cls.cliente,
+                duracion_planeada=30,
+                precio_total=Decimal('10.00'),
+                fecha_inicio=hoy - timedelta(days=i % 30),
+                fecha_fin=hoy + timedelta(days=i % 45 - 15),
+                estado=estados[i % len(estados)],
+            )
+            for i in range(200)
+        ])
+        ParteMortorio.objects.bulk_create([
+            ParteMortorio(
+                codigo=f'PMPLAN{i:04d}',
+                cliente=cls.cliente,
+                nombre_fallecido=f'Fallecido {i}',
+                fecha_fallecimiento=hoy - timedelta(days=i % 60),
+                precio_total=Decimal('20.00'),
+                estado=['pendiente', 'al_aire', 'finalizado'][i % 3],
+            )
+            for i in range(100)
+        ])
+
+    def setUp(self):
+        from django.db import connection
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE')
+                cursor.execute('SET LOCAL enable_seqscan = off')
+
+    def consultas_clave(self):
+        from apps.grilla_publicitaria.models import AsignacionCuña
+        from apps.parte_mortorios.models import ParteMortorio
+        from .models import ContratoGenerado
+
+        hoy = date.today()
+        return {
+            'cuñas vencidas': CuñaPublicitaria.objects.filter(estado='activa', fecha_fin__lt=hoy),
+            'cuñas por vencer': CuñaPublicitaria.objects.filter(
+                estado='activa', fecha_fin__lte=hoy + timedelta(days=7)
+            ),
+            'cuñas del vendedor': CuñaPublicitaria.objects.filter(
+                vendedor_asignado=self.cliente, estado='activa'
+            ),
+            'cuñas del cliente': CuñaPublicitaria.objects.filter(cliente=self.cliente),
+            'cuñas vigentes': CuñaPublicitaria.objects.filter(estado='activa', fecha_inicio__lte=hoy),
+            'cuñas del mes': CuñaPublicitaria.objects.filter(
+                created_at__year=hoy.year, created_at__month=hoy.month
+            ),
+            'listado de cuñas': CuñaPublicitaria.objects.order_by('-created_at')[:12],
+            'contratos por estado': ContratoGenerado.objects.filter(estado='activo').order_by('-fecha_generacion')[:20],
+            'contratos del vendedor': ContratoGenerado.objects.filter(
+                vendedor_asignado=self.cliente, estado='activo'
+            ),
+            'partes por estado': ParteMortorio.objects.filter(estado='pendiente'),
+            'listado de partes': ParteMortorio.objects.order_by('-fecha_solicitud')[:20],
+            'partes por fecha': ParteMortorio.objects.filter(fecha_fallecimiento=hoy),
+            'asignaciones del día': AsignacionCuña.objects.filter(
+                fecha_emision=hoy, estado__in=['programada', 'confirmada']
+            ),
+            'asignaciones de la cuña': AsignacionCuña.objects.filter(cuña_id=1).exclude(estado='cancelada'),
+        }
+
+    def test_consultas_frecuentes_usan_indices(self):
+        """Test que ninguna consulta clave recorre su tabla de forma secuencial"""
+        for nombre, queryset in self.consultas_clave().items():
+            with self.subTest(consulta=nombre):
+                self.assertEqual(recorridos_secuenciales(queryset), [], queryset.explain())
+
+class SubidaAudioTest(BaseTestCase):
+    """
+    Subida de audios con hash calculado durante la recepción y detección de
+    duplicados antes de guardar
+    """
+
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directorio.cleanup)
+        ajustes = override_settings(MEDIA_ROOT=self.directorio.name)
+        ajustes.enable()
+        self.addCleanup(ajustes.disable)
+        self.contenido = bytes(range(256)) * 20
+
+    def test_manejador_calcula_hash_durante_la_subida(self):
+        """Test que el manejador escribe el audio al temporal y calcula su SHA-256"""
+        import hashlib
+        from .storage.audio_handlers import AudioUploadHandler
+
+        manejador = AudioUploadHandler()
+        manejador.new_file('archivo', 'spot.mp3', 'audio/mpeg', len(self.contenido))
+        for inicio in range(0, len(self.contenido), 1000):
+            self.assertIsNone(manejador.receive_data_chunk(self.contenido[inicio:inicio + 1000], inicio))
+        subido = manejador.file_complete(len(self.contenido))
+
+        self.assertEqual(subido.sha256, hashlib.sha256(self.contenido).hexdigest())
+        self.assertEqual(subido.size, len(self.contenido))
+        self.assertTrue(os.path.exists(subido.temporary_file_path()))
+        subido.close()
+
+        # Los archivos que no son audio pasan al siguiente manejador
+        manejador.new_file('archivo', 'contrato.pdf', 'application/pdf', 3)
+        self.assertEqual(manejador.receive_data_chunk(b'pdf', 0), b'pdf')
+        self.assertIsNone(manejador.file_complete(3))
+
+    def test_hash_antes_de_guardar_y_sin_segundo_guardado(self):
+        """Test que el hash se guarda en el mismo INSERT, sin actualizar después"""
+        import hashlib
+
+        archivo = SimpleUploadedFile('spot.mp3', self.contenido, content_type='audio/mpeg')
+        with self.assertNumQueries(1):
+            audio = ArchivoAudio.objects.create(archivo=archivo, subido_por=self.admin_user)
+
+        self.assertEqual(audio.hash_archivo, hashlib.sha256(self.contenido).hexdigest())
+        self.assertEqual(audio.tamaño_bytes, len(self.contenido))
+        self.assertEqual(audio.nombre_original, 'spot.mp3')
+        self.assertEqual(audio.formato, 'mp3')
+
+    def test_duplicados(self):
+        """Test que un contenido ya subido se rechaza en el formulario y se reutiliza al crear"""
+        from .storage.audio_handlers import obtener_o_crear_audio
+
+        original, creado = obtener_o_crear_audio(
+            SimpleUploadedFile('spot.mp3', self.contenido, content_type='audio/mpeg'), self.admin_user
+        )
+        self.assertTrue(creado)
+
+        copia, creado = obtener_o_crear_audio(
+            SimpleUploadedFile('copia.mp3', self.contenido, content_type='audio/mpeg'), self.admin_user
+        )
+        self.assertFalse(creado)
+        self.assertEqual(copia, original)
+
+        form = ArchivoAudioForm(files={
+            'archivo': SimpleUploadedFile('otra.mp3', self.contenido, content_type='audio/mpeg')
+        })
+        self.assertFalse(form.is_valid())
+        self.assertIn('ya fue subido', form.errors['archivo'][0])
+        self.assertEqual(ArchivoAudio.objects.count(), 1)
+
+        # Al editar, el propio registro no cuenta como duplicado
+        edicion = ArchivoAudioForm(instance=original, files={
+            'archivo': SimpleUploadedFile('spot.mp3', self.contenido, content_type='audio/mpeg')
+        })
+        self.assertTrue(edicion.is_valid(), edicion.errors)
+
+    def test_vista_de_subida_usa_obtener_o_crear(self):
+        """Test que la vista crea el audio a través de obtener_o_crear_audio"""
+        from unittest import mock
+        from .storage import audio_handlers
+
+        superusuario = User.objects.create_user(
+            username='super_audio', email='super_audio@test.com', password='testpass123',
+            is_staff=True, is_superuser=True
+        )
+        self.client.force_login(superusuario)
+        with mock.patch(
+            'apps.content_management.views.obtener_o_crear_audio', wraps=audio_handlers.obtener_o_crear_audio
+        ) as obtener:
+            respuesta = self.client.post(reverse('content_management:audio_create'), {
+                'archivo': SimpleUploadedFile('spot.mp3', self.contenido, content_type='audio/mpeg')
+            })
+
+        self.assertRedirects(respuesta, reverse('content_management:audio_list'), fetch_redirect_response=False)
+        obtener.assert_called_once()
+        self.assertEqual(ArchivoAudio.objects.get().subido_por, superusuario)
+
+class IntegridadArchivosTest(BaseTestCase):
+    """
+    Verificación paralela de archivos con huella (tamaño, mtime) y detección
+    de huérfanos
+    """
+
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directorio.cleanup)
+        ajustes = override_settings(MEDIA_ROOT=self.directorio.name)
+        ajustes.enable()
+        self.addCleanup(ajustes.disable)
+        self.audios = [
+            ArchivoAudio.objects.create(
+                archivo=SimpleUploadedFile(f'spot{i}.mp3', bytes([i]) * 5000, content_type='audio/mpeg'),
+                duracion_segundos=30,
+                subido_por=self.admin_user
+            )
+            for i in range(4)
+        ]
+
+    def test_huella_evita_releer_y_detecta_cambios(self):
+        """Test que la segunda pasada no lee archivos sin cambios y detecta los modificados"""
+        from .storage.integridad import escanear_archivos
+
+        primera = escanear_archivos(trabajadores=2)
+        self.assertEqual(len(primera['verificado']), 4)
+        self.assertEqual(primera['bytes_leidos'], 4 * 5000)
+
+        segunda = escanear_archivos(trabajadores=2)
+        self.assertEqual(len(segunda['sin_cambios']), 4)
+        self.assertEqual(segunda['bytes_leidos'], 0)
+
+        modificado, eliminado = self.audios[0], self.audios[1]
+        with open(modificado.archivo.path, 'r+b') as archivo:
+            archivo.write(b'X')
+        os.utime(modificado.archivo.path, ns=(0, 10 ** 9))
+        os.remove(eliminado.archivo.path)
+
+        avances = []
+        tercera = escanear_archivos(trabajadores=2, progreso=lambda *datos: avances.append(datos))
+        self.assertEqual([r['id'] for r in tercera['modificado']], [modificado.pk])
+        self.assertEqual([r['id'] for r in tercera['inexistente']], [eliminado.pk])
+        self.assertEqual(len(tercera['sin_cambios']), 2)
+        self.assertEqual([avance[0] for avance in avances], [1, 2, 3, 4])
+
+    def test_corregir_hashes_faltantes(self):
+        """Test que los hashes faltantes se guardan en lote sin duplicar los existentes"""
+        from .storage.integridad import escanear_archivos
+
+        ArchivoAudio.objects.filter(pk=self.audios[2].pk).update(hash_archivo=None)
+        resultado = escanear_archivos(corregir=True)
+
+        self.assertEqual(resultado['corregidos'], 1)
+        self.audios[2].refresh_from_db()
+        self.assertEqual(len(self.audios[2].hash_archivo), 64)
+        self.assertIsNotNone(self.audios[2].mtime_verificado)
+
+    def test_huerfanos(self):
+        """Test que los archivos sin registro se detectan y eliminan"""
+        from .signals import limpiar_archivos_huerfanos
+        from .storage.integridad import archivos_huerfanos
+
+        huerfano = os.path.join(self.directorio.name, 'audio_spots', 'viejo', 'huerfano.mp3')
+        os.makedirs(os.path.dirname(huerfano))
+        with open(huerfano, 'wb') as archivo:
+            archivo.write(b'0')
+
+        with self.assertNumQueries(1):
+            self.assertEqual(archivos_huerfanos(), ['audio_spots/viejo/huerfano.mp3'])
+
+        resultado = limpiar_archivos_huerfanos()
+        self.assertEqual(resultado['eliminados'], 1)
+        self.assertEqual(resultado['conservados'], 4)
+        self.assertFalse(os.path.exists(huerfano))
+
+class AnalisisAudioTest(BaseTestCase):
+    """
+    Análisis del audio decodificado: duración exacta, picos, sonoridad y silencios
+    """
+
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directorio.cleanup)
+        ajustes = override_settings(MEDIA_ROOT=self.directorio.name)
+        ajustes.enable()
+        self.addCleanup(ajustes.disable)
+
+    def wav_de_prueba(self):
+        """0,5 s de silencio, 2 s de tono de 1 kHz a media escala y 0,25 s de silencio"""
+        import io
+        import wave
+        import numpy as np
+
+        frecuencia = 44100
+        tono = 0.5 * np.sin(2 * np.pi * 1000 * np.arange(2 * frecuencia) / frecuencia)
+        señal = np.concatenate([np.zeros(frecuencia // 2), tono, np.zeros(frecuencia // 4)])
+        buffer = io.BytesIO()
+        with wave.open(buffer, 'wb') as archivo:
+            archivo.setnchannels(1)
+            archivo.setsampwidth(2)
+            archivo.setframerate(frecuencia)
+            archivo.writeframes((señal * 32767).astype('<i2').tobytes())
+        return buffer.getvalue()
+
+    def test_analisis_de_wav(self):
+        """Test de duración en ms, silencios, picos y sonoridad de un WAV"""
+        from .analisis_audio import analizar_archivo
+
+        audio = ArchivoAudio.objects.create(
+            archivo=SimpleUploadedFile('tono.wav', self.wav_de_prueba(), content_type='audio/wav'),
+            subido_por=self.admin_user
+        )
+        analisis = analizar_archivo(audio)
+
+        self.assertEqual(analisis.duracion_ms, 2750)
+        self.assertEqual(analisis.silencio_inicio_ms, 500)
+        self.assertEqual(analisis.silencio_fin_ms, 250)
+        self.assertEqual(analisis.duracion_sonora_ms, 2000)
+        self.assertAlmostEqual(analisis.loudness_lufs, -9.72, delta=0.5)
+        self.assertAlmostEqual(analisis.pico_dbfs, -6.02, delta=0.1)
+
+        picos = analisis.lista_picos()
+        self.assertEqual(len(picos), 275)
+        self.assertEqual(max(picos[:50]), 0)
+        self.assertEqual(max(picos[50:250]), 127)
+
+        audio.refresh_from_db()
+        self.assertEqual(audio.duracion_ms, 2750)
+        self.assertEqual(audio.duracion_exacta, timedelta(milliseconds=2750))
+
+        # El mismo contenido no se vuelve a decodificar
+        with patch('apps.content_management.analisis_audio.decodificar') as decodificar:
+            self.assertEqual(analizar_archivo(audio), analisis)
+        decodificar.assert_not_called()
+
+    def test_picos_reducidos_y_silencio_total(self):
+        """Test que los audios largos se reducen a PUNTOS_FORMA_ONDA picos y el silencio no tiene sonoridad"""
+        import numpy as np
+        from .analisis_audio import PUNTOS_FORMA_ONDA, analizar_pcm
+
+        bloques = (np.zeros((8000, 2), dtype=np.float32) for _ in range(30))
+        resultado = analizar_pcm(8000, 2, bloques)
+
+        self.assertEqual(resultado['duracion_ms'], 30000)
+        self.assertEqual(len(resultado['picos']), PUNTOS_FORMA_ONDA)
+        self.assertIsNone(resultado['loudness_lufs'])
+        self.assertIsNone(resultado['pico_dbfs'])
+        self.assertEqual(resultado['silencio_inicio_ms'], 30000)
+
+    def test_api_y_duracion_de_emision(self):
+        """Test que la API entrega el análisis y la cuña usa la duración exacta"""
+        from .analisis_audio import analizar_archivo
+
+        self.client.force_login(User.objects.create_superuser(
+            username='admin_analisis', email='analisis@test.com', password='testpass123'
+        ))
+
+        audio = ArchivoAudio.objects.create(
+            archivo=SimpleUploadedFile('tono.wav', self.wav_de_prueba(), content_type='audio/wav'),
+            subido_por=self.admin_user
+        )
+        url = reverse('content_management:audio_analisis', args=[audio.pk])
+        self.assertFalse(self.client.get(url).json()['analizado'])
+
+        analizar_archivo(audio)
+        respuesta = self.client.get(url)
+        datos = respuesta.json()
+        self.assertEqual(datos['duracion_ms'], 2750)
+        self.assertEqual(len(datos['picos']), 275)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=respuesta['ETag']).status_code, 304)
+
+        cuña = CuñaPublicitaria(archivo_audio=audio, duracion_planeada=3)
+        self.assertEqual(cuña.duracion_emision, timedelta(milliseconds=2750))
+
+    def test_subida_queda_pendiente_para_el_proceso_de_fondo(self):
+        """Test que la subida no decodifica el audio y el comando procesa la cola"""
+        from io import StringIO
+        from django.core.management import call_command
+        from .analisis_audio import audios_pendientes
+
+        with patch('apps.content_management.analisis_audio.decodificar') as decodificar:
+            with self.captureOnCommitCallbacks(execute=True):
+                audio = ArchivoAudio.objects.create(
+                    archivo=SimpleUploadedFile('tono.wav', self.wav_de_prueba(), content_type='audio/wav'),
+                    subido_por=self.admin_user
+                )
+        decodificar.assert_not_called()
+        self.assertIn(audio, audios_pendientes())
+
+        salida = StringIO()
+        call_command('analizar_audios', stdout=salida)
+        self.assertIn('1 analizados', salida.getvalue())
+        self.assertFalse(audios_pendientes().exists())
+
+class EntregaArchivosTest(TestCase):
+    """
+    Entrega de media con rangos, GET condicional y delegación al servidor web
+    """
+
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directorio.cleanup)
+        os.makedirs(os.path.join(self.directorio.name, 'audio_spots'))
+        self.contenido = bytes(range(256)) * 40
+        with open(os.path.join(self.directorio.name, 'audio_spots', 'spot.mp3'), 'wb') as archivo:
+            archivo.write(self.contenido)
+        ajustes = override_settings(MEDIA_ROOT=self.directorio.name, MEDIA_ENTREGA_MODO='python')
+        ajustes.enable()
+        self.addCleanup(ajustes.disable)
+        self.url = '/media/audio_spots/spot.mp3'
+
+    def leer(self, respuesta):
+        contenido = b''.join(respuesta.streaming_content)
+        respuesta.close()
+        return contenido
+
+    def test_archivo_completo(self):
+        """Test que sin Range se envía el archivo completo con sus validadores"""
+        respuesta = self.client.get(self.url)
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertEqual(respuesta['Accept-Ranges'], 'bytes')
+        self.assertEqual(respuesta['Content-Length'], str(len(self.contenido)))
+        self.assertEqual(respuesta['Content-Type'], 'audio/mpeg')
+        self.assertIn('ETag', respuesta)
+        self.assertIn('Last-Modified', respuesta)
+        self.assertEqual(self.leer(respuesta), self.contenido)
+
+    def test_rangos(self):
+        """Test de rangos parciales, abiertos, por sufijo e insatisfacibles"""
+        casos = {
+            'bytes=100-199': (100, 199),
+            'bytes=10200-': (10200, 10239),
+            'bytes=-40': (10200, 10239),
+            'bytes=10000-99999': (10000, 10239),
+        }
+        for rango, (inicio, fin) in casos.items():
+            with self.subTest(rango=rango):
+                respuesta = self.client.get(self.url, HTTP_RANGE=rango)
+                self.assertEqual(respuesta.status_code, 206)
+                self.assertEqual(respuesta['Content-Range'], f'bytes {inicio}-{fin}/{len(self.contenido)}')
+                self.assertEqual(respuesta['Content-Length'], str(fin - inicio + 1))
+                self.assertEqual(self.leer(respuesta), self.contenido[inicio:fin + 1])
+
+        respuesta = self.client.get(self.url, HTTP_RANGE='bytes=20000-')
+        self.assertEqual(respuesta.status_code, 416)
+        self.assertEqual(respuesta['Content-Range'], f'bytes */{len(self.contenido)}')
+
+        # Varios rangos o sintaxis inválida: archivo completo
+        for rango in ('bytes=0-1,5-6', 'bytes=abc', 'items=0-1'):
+            with self.subTest(rango=rango):
+                respuesta = self.client.get(self.url, HTTP_RANGE=rango)
+                self.assertEqual(respuesta.status_code, 200)
+                respuesta.close()
+
+    def test_rango_con_file_wrapper(self):
+        """Test que con wsgi.file_wrapper un 206 envía solo los bytes del rango"""
+        from wsgiref.util import FileWrapper
+        from django.core.handlers.wsgi import WSGIHandler
+        from django.test import RequestFactory
+
+        for rango, longitud in (('bytes=0-9', 10), (None, len(self.contenido))):
+            with self.subTest(rango=rango):
+                extra = {'HTTP_RANGE': rango} if rango else {}
+                entorno = RequestFactory().get(self.url, **extra).environ
+                entorno['wsgi.file_wrapper'] = FileWrapper
+                estado = []
+                cuerpo = WSGIHandler()(entorno, lambda status, headers: estado.append((status, dict(headers))))
+                try:
+                    contenido = b''.join(cuerpo)
+                finally:
+                    cuerpo.close()
+                self.assertEqual(estado[0][1]['Content-Length'], str(longitud))
+                self.assertEqual(contenido, self.contenido[:longitud])
+
+    def test_get_condicional(self):
+        """Test que el ETag y Last-Modified permiten responder 304 y validan If-Range"""
+        respuesta = self.client.get(self.url)
+        respuesta.close()
+        etag, modificado = respuesta['ETag'], respuesta['Last-Modified']
+
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        self.assertEqual(self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=modificado).status_code, 304)
+
+        # If-Range con la fecha vigente respeta el rango; con otra envía todo
+        respuesta = self.client.get(self.url, HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE=modificado)
+        self.assertEqual(respuesta.status_code, 206)
+        respuesta.close()
+        respuesta = self.client.get(
+            self.url, HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE='Mon, 01 Jan 2001 00:00:00 GMT'
+        )
+        self.assertEqual(respuesta.status_code, 200)
+        respuesta.close()
+
+    def test_etag_de_hash_y_descarga(self):
+        """Test que un hash de contenido se usa como ETag fuerte y la descarga es adjunta"""
+        from django.test import RequestFactory
+        from apps.entrega_archivos import servir_archivo
+
+        ruta = os.path.join(self.directorio.name, 'audio_spots', 'spot.mp3')
+        peticion = RequestFactory().get('/', HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE='"abc123"')
+        respuesta = servir_archivo(peticion, ruta, etag='abc123', nombre_descarga='Spot Ñ.mp3', adjunto=True)
+        self.assertEqual(respuesta.status_code, 206)
+        self.assertEqual(respuesta['ETag'], '"abc123"')
+        self.assertTrue(respuesta['Content-Disposition'].startswith('attachment;'))
+        respuesta.close()
+
+    def test_delegacion_al_servidor_web(self):
+        """Test que en modo x-accel/x-sendfile Django solo envía la cabecera"""
+        with override_settings(MEDIA_ENTREGA_MODO='x-accel', MEDIA_ACCEL_PREFIJO='/media-interna/'):
+            respuesta = self.client.get(self.url, HTTP_RANGE='bytes=0-9')
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertEqual(respuesta['X-Accel-Redirect'], '/media-interna/audio_spots/spot.mp3')
+        self.assertEqual(respuesta.content, b'')
+
+        with override_settings(MEDIA_ENTREGA_MODO='x-sendfile'):
+            respuesta = self.client.get(self.url)
+        self.assertTrue(respuesta['X-Sendfile'].endswith(os.path.join('audio_spots', 'spot.mp3')))
+
+    def test_rutas_fuera_de_media(self):
+        """Test que no se sirven archivos inexistentes ni fuera de MEDIA_ROOT"""
+        self.assertEqual(self.client.get('/media/no_existe.mp3').status_code, 404)
+        self.assertEqual(self.client.get('/media/../manage.py').status_code, 404)
+        self.assertEqual(self.client.get('/media/audio_spots/').status_code, 404)
+
 # ==================== COMANDO PARA EJECUTAR TESTS ====================
 
 if __name__ == '__main__':
@@ -30,6 +30,8 @@ urlpatterns = [
     path('audios/', views.ArchivoAudioListView.as_view(), name='audio_list'),
     path('audios/subir/', views.ArchivoAudioCreateView.as_view(), name='audio_create'),
     path('audios/<int:pk>/', views.ArchivoAudioDetailView.as_view(), name='audio_detail'),
+    path('audios/<int:pk>/stream/', views.audio_stream, name='audio_stream'),
+    path('audios/<int:pk>/analisis/', views.audio_analisis_api, name='audio_analisis'),
     path('audios/<int:pk>/eliminar/', views.audio_delete, name='audio_delete'),
     
     # ==================== CUÑAS PUBLICITARIAS ====================
@@ -42,6 +42,8 @@ from .forms import (
     PlantillaContratoForm,
     ContratoGeneradoForm
 )
+from apps.entrega_archivos import servir_archivo
+from .storage.audio_handlers import obtener_o_crear_audio
 
 User = get_user_model()
 
@@ -266,12 +268,20 @@ class ArchivoAudioCreateView(CreateView):
     model = ArchivoAudio
     form_class = ArchivoAudioForm
     template_name = 'content/audio_form.html'
-    success_url = reverse_lazy('content:audio_list')
+    success_url = reverse_lazy('content_management:audio_list')
     
     def form_valid(self, form):
-        form.instance.subido_por = self.request.user
-        messages.success(self.request, 'Archivo de audio subido exitosamente.')
-        return super().form_valid(form)
+        # Una subida concurrente del mismo contenido pudo guardarse después
+        # de validar el formulario: en ese caso se reutiliza ese archivo
+        self.object, creado = obtener_o_crear_audio(form.cleaned_data['archivo'], self.request.user)
+        if creado:
+            messages.success(self.request, 'Archivo de audio subido exitosamente.')
+        else:
+            messages.info(
+                self.request,
+                f'Este audio ya fue subido como "{self.object.nombre_original}"; se usará el existente.'
+            )
+        return redirect(self.get_success_url())
 
 @login_required
 @permission_required('content_management.delete_archivoaudio')
@@ -291,6 +301,57 @@ def audio_delete(request, pk):
     messages.success(request, 'Archivo de audio eliminado exitosamente.')
     return redirect('content:audio_list')
 
+@login_required
+@permission_required('content_management.view_archivoaudio')
+@require_http_methods(["GET", "HEAD"])
+def audio_stream(request, pk):
+    """
+    Reproducción del audio con soporte de rangos (el reproductor salta sin
+    descargar el archivo completo) y ETag basado en el hash del contenido
+    """
+    audio = get_object_or_404(ArchivoAudio, pk=pk)
+
+    if es_cliente(request.user) and not audio.cuñas.filter(cliente=request.user).exists():
+        raise Http404("Audio no encontrado")
+
+    if not audio.archivo:
+        raise Http404("Audio no encontrado")
+
+    return servir_archivo(request, audio.archivo, etag=audio.hash_archivo or None)
+
+@login_required
+@permission_required('content_management.view_archivoaudio')
+@require_http_methods(["GET"])
+def audio_analisis_api(request, pk):
+    """
+    Análisis precalculado del audio (duración exacta, picos de la forma de
+    onda, sonoridad y silencios) para reproductores y programadores
+    """
+    from apps.paginacion import respuesta_json_con_etag
+    from .models import AnalisisAudio
+    
+    audio = get_object_or_404(ArchivoAudio, pk=pk)
+    
+    if es_cliente(request.user) and not audio.cuñas.filter(cliente=request.user).exists():
+        raise Http404("Audio no encontrado")
+    
+    analisis = AnalisisAudio.objects.filter(archivo_audio=audio).first()
+    if analisis is None:
+        return JsonResponse({'analizado': False, 'duracion_ms': audio.duracion_ms})
+    
+    return respuesta_json_con_etag(request, {
+        'analizado': True,
+        'duracion_ms': analisis.duracion_ms,
+        'duracion_sonora_ms': analisis.duracion_sonora_ms,
+        'sample_rate': analisis.sample_rate,
+        'canales': analisis.canales,
+        'loudness_lufs': analisis.loudness_lufs,
+        'pico_dbfs': analisis.pico_dbfs,
+        'silencio_inicio_ms': analisis.silencio_inicio_ms,
+        'silencio_fin_ms': analisis.silencio_fin_ms,
+        'picos': analisis.lista_picos(),
+    })
+
 # ==================== CUÑAS PUBLICITARIAS ====================
 
 @method_decorator([login_required, permission_required('content_management.view_cuñapublicitaria')], name='dispatch')
@@ -734,13 +795,12 @@ def descargar_contrato(request, pk):
         return redirect('content:contrato_detail', pk=pk)
     
     # Servir archivo
-    response = FileResponse(
-        contrato.archivo_contrato.open('rb'),
-        content_type='application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+    return servir_archivo(
+        request, contrato.archivo_contrato,
+        content_type='application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+        nombre_descarga=f'Contrato_{contrato.numero_contrato}.docx',
+        adjunto=True
     )
-    response['Content-Disposition'] = f'attachment; filename="Contrato_{contrato.numero_contrato}.docx"'
-    
-    return response
 
 @login_required
 @user_passes_test(puede_gestionar_contratos)
@@ -3,4 +3,7 @@ from django.apps import AppConfig
 class CustomAdminConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.custom_admin'
-    verbose_name = 'Panel Admin Personalizado'
\ No newline at end of file
+    verbose_name = 'Panel Admin Personalizado'
+
+    def ready(self):
+        import apps.custom_admin.signals
@@ -0,0 +1,88 @@
+"""
+Cache de fragmentos de los listados del panel
+Sistema PubliTrack - Estadísticas de cabecera y opciones de los filtros
+(clientes, vendedores, categorías, tipos de contrato) guardadas en cache y
+etiquetadas por dependencia: al guardar o eliminar un registro de un modelo
+se incrementa la versión de su etiqueta y los fragmentos que dependen de ella
+dejan de usarse.
+"""
+
+import logging
+
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+# Margen de seguridad para cambios que no emiten señales (p. ej. queryset.update())
+FRAGMENTOS_CACHE_TIMEOUT = 60 * 5
+PREFIJO_VERSION = 'fragmentos:version:'
+PREFIJO_FRAGMENTO = 'fragmentos:valor:'
+
+# Etiquetas de dependencia
+CUNAS = 'cunas'
+USUARIOS = 'usuarios'
+CATEGORIAS = 'categorias'
+TIPOS_CONTRATO = 'tipos_contrato'
+ORDENES_TOMA = 'ordenes_toma'
+ORDENES_PRODUCCION = 'ordenes_produccion'
+PARTES = 'partes'
+
+
+# ==================== VERSIONES ====================
+
+def _versiones(etiquetas):
+    """
+    Versión vigente de cada etiqueta, en una sola lectura de cache
+    """
+    claves = [PREFIJO_VERSION + etiqueta for etiqueta in etiquetas]
+    versiones = cache.get_many(claves)
+    for clave in claves:
+        if clave not in versiones:
+            cache.add(clave, 1, timeout=None)
+            versiones[clave] = cache.get(clave, 1)
+    return [versiones[clave] for clave in claves]
+
+
+def invalidar(*etiquetas):
+    """
+    Invalida los fragmentos que dependen de alguna de las etiquetas
+    """
+    for etiqueta in etiquetas:
+        clave = PREFIJO_VERSION + etiqueta
+        try:
+            cache.incr(clave)
+        except ValueError:
+            cache.set(clave, 2, timeout=None)
+
+
+# ==================== FRAGMENTOS ====================
+
+def fragmento(nombre, etiquetas, calcular, timeout=FRAGMENTOS_CACHE_TIMEOUT):
+    """
+    Devuelve el valor cacheado de `nombre` o lo calcula con `calcular()`.
+    La clave incluye la versión de cada etiqueta, así que un cambio en
+    cualquiera de ellas obliga a recalcularlo. Si la cache falla se calcula
+    sin guardarlo.
+    """
+    try:
+        versiones = _versiones(etiquetas)
+    except Exception as e:
+        logger.warning(f"Cache de fragmentos no disponible ({nombre}): {e}")
+        return calcular()
+
+    clave = PREFIJO_FRAGMENTO + nombre + ':' + '.'.join(
+        f'{etiqueta}{version}' for etiqueta, version in zip(etiquetas, versiones)
+    )
+    valor = cache.get(clave)
+    if valor is None:
+        valor = calcular()
+        cache.set(clave, valor, timeout=timeout)
+    return valor
+
+
+def opciones(nombre, etiquetas, queryset, *campos):
+    """
+    Lista cacheada de las filas de un queryset para un desplegable: tuplas
+    con nombre (id y `campos`), no instancias del modelo
+    """
+    return fragmento(nombre, etiquetas, lambda: list(queryset.values_list('id', *campos, named=True)))
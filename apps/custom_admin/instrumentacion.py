@@ -0,0 +1,290 @@
+"""
+Instrumentación de peticiones
+Sistema PubliTrack - Consultas SQL, tiempo de base de datos, SQL repetido y
+tiempo de render de plantillas por petición, con presupuestos de consultas
+por vista y estadísticas recientes para el panel de rendimiento.
+"""
+
+import json
+import logging
+import random
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+INSTRUMENTACION_CACHE_TIMEOUT = 60 * 60 * 24
+VISTAS_KEY = 'instrumentacion:vistas'
+MUESTRAS_POR_DEFECTO = 50
+FRACCION_MUESTREO_POR_DEFECTO = 0.05
+
+_medicion_actual = ContextVar('medicion_actual', default=None)
+
+
+class PresupuestoConsultasExcedido(AssertionError):
+    """Una vista superó su presupuesto de consultas en modo estricto"""
+
+
+# ==================== MEDICIÓN ====================
+
+_PARAMETROS_REPETIDOS = re.compile(r'\((?:%s, )+%s\)')
+
+
+def huella_sql(sql):
+    """
+    Huella de una sentencia: el SQL parametrizado con las listas IN colapsadas,
+    de modo que el mismo patrón con distintos valores cuenta como repetido
+    """
+    return _PARAMETROS_REPETIDOS.sub('(%s...)', sql)
+
+
+class Medicion:
+    """
+    Datos de una petición: consultas, tiempo en base de datos y en plantillas
+    """
+
+    __slots__ = ('inicio', 'consultas', 'tiempo_db', 'tiempo_plantillas', 'huellas')
+
+    def __init__(self):
+        self.inicio = time.perf_counter()
+        self.consultas = 0
+        self.tiempo_db = 0.0
+        self.tiempo_plantillas = 0.0
+        self.huellas = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        """Envoltorio de ejecución de consultas (connection.execute_wrapper)"""
+        inicio = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.tiempo_db += time.perf_counter() - inicio
+            self.consultas += 1
+            self.huellas[huella_sql(sql)] += 1
+
+    @property
+    def tiempo_total(self):
+        return time.perf_counter() - self.inicio
+
+    def repetidas(self, minimo=2):
+        """Huellas ejecutadas al menos `minimo` veces, de más a menos frecuente"""
+        return [(sql, veces) for sql, veces in self.huellas.most_common() if veces >= minimo]
+
+    def server_timing(self):
+        """Valor de la cabecera Server-Timing"""
+        return ', '.join([
+            f'db;dur={self.tiempo_db * 1000:.1f};desc="{self.consultas} consultas"',
+            f'tpl;dur={self.tiempo_plantillas * 1000:.1f};desc="Plantillas"',
+            f'total;dur={self.tiempo_total * 1000:.1f}',
+        ])
+
+
+@contextmanager
+def medir():
+    """
+    Mide las consultas de todas las bases de datos y el render de plantillas
+    ejecutados dentro del bloque
+    """
+    medicion = Medicion()
+    token = _medicion_actual.set(medicion)
+    try:
+        with ExitStack() as pila:
+            for alias in connections:
+                pila.enter_context(connections[alias].execute_wrapper(medicion))
+            yield medicion
+    finally:
+        _medicion_actual.reset(token)
+
+
+def _instalar_medicion_plantillas():
+    """
+    Envuelve el render de plantillas del backend de Django para sumar su tiempo
+    a la medición en curso. Solo mide el render de nivel superior, los include
+    quedan dentro de él.
+    """
+    from django.template.backends.django import Template
+
+    if getattr(Template.render, 'instrumentado', False):
+        return
+
+    render_original = Template.render
+
+    def render(self, *args, **kwargs):
+        medicion = _medicion_actual.get()
+        if medicion is None:
+            return render_original(self, *args, **kwargs)
+        inicio = time.perf_counter()
+        try:
+            return render_original(self, *args, **kwargs)
+        finally:
+            medicion.tiempo_plantillas += time.perf_counter() - inicio
+
+    render.instrumentado = True
+    Template.render = render
+
+
+# ==================== PRESUPUESTOS ====================
+
+def presupuesto_de(vista):
+    """
+    Máximo de consultas permitido para la vista (settings.PRESUPUESTOS_CONSULTAS,
+    por nombre de URL con namespace), o None si no tiene presupuesto
+    """
+    presupuestos = getattr(settings, 'PRESUPUESTOS_CONSULTAS', {})
+    return presupuestos.get(vista, presupuestos.get('*'))
+
+
+def verificar_presupuesto(vista, medicion):
+    """
+    Registra una advertencia si la vista superó su presupuesto; en modo
+    estricto (PRESUPUESTOS_CONSULTAS_ESTRICTOS, p. ej. en tests) lanza
+    PresupuestoConsultasExcedido
+    """
+    presupuesto = presupuesto_de(vista)
+    if presupuesto is None or medicion.consultas <= presupuesto:
+        return
+
+    repetidas = medicion.repetidas()
+    mensaje = f"{vista}: {medicion.consultas} consultas (presupuesto {presupuesto})"
+    if repetidas:
+        sql, veces = repetidas[0]
+        mensaje += f"; la más repetida ({veces} veces): {sql[:200]}"
+
+    if getattr(settings, 'PRESUPUESTOS_CONSULTAS_ESTRICTOS', False):
+        raise PresupuestoConsultasExcedido(mensaje)
+    logger.warning(mensaje)
+
+
+# ==================== ESTADÍSTICAS ====================
+
+def _clave_muestras(vista):
+    return f'instrumentacion:muestras:{vista}'
+
+
+def _cliente_redis():
+    """
+    Cliente de Redis de la cache por defecto, o None si el backend no es Redis
+    (p. ej. LocMemCache en desarrollo y tests)
+    """
+    from django.core.cache.backends.redis import RedisCache
+
+    backend = caches['default']
+    if isinstance(backend, RedisCache):
+        return backend._cache.get_client(write=True)
+    return None
+
+
+def debe_muestrear():
+    """
+    Decide si la petición se guarda en las estadísticas; solo una fracción
+    (INSTRUMENTACION_FRACCION_MUESTREO) para no cargar Redis en cada petición
+    """
+    fraccion = getattr(settings, 'INSTRUMENTACION_FRACCION_MUESTREO', FRACCION_MUESTREO_POR_DEFECTO)
+    return fraccion >= 1 or random.random() < fraccion
+
+
+def registrar_muestra(vista, medicion):
+    """
+    Guarda la medición entre las últimas muestras de la vista (en cache, para
+    que el panel vea las de todos los procesos). En Redis se usan operaciones
+    atómicas de lista y conjunto en un solo viaje, sin leer las muestras.
+    """
+    limite = getattr(settings, 'INSTRUMENTACION_MUESTRAS', MUESTRAS_POR_DEFECTO)
+    repetidas = medicion.repetidas()
+    muestra = {
+        'consultas': medicion.consultas,
+        'db_ms': round(medicion.tiempo_db * 1000, 1),
+        'plantillas_ms': round(medicion.tiempo_plantillas * 1000, 1),
+        'total_ms': round(medicion.tiempo_total * 1000, 1),
+        'repetidas': sum(veces - 1 for _, veces in repetidas),
+        'peor_repetida': repetidas[0] if repetidas else None,
+        'momento': time.time(),
+    }
+
+    redis = _cliente_redis()
+    if redis is not None:
+        clave = cache.make_and_validate_key(_clave_muestras(vista))
+        clave_vistas = cache.make_and_validate_key(VISTAS_KEY)
+        pipeline = redis.pipeline(transaction=False)
+        pipeline.lpush(clave, json.dumps(muestra))
+        pipeline.ltrim(clave, 0, limite - 1)
+        pipeline.expire(clave, INSTRUMENTACION_CACHE_TIMEOUT)
+        pipeline.sadd(clave_vistas, vista)
+        pipeline.expire(clave_vistas, INSTRUMENTACION_CACHE_TIMEOUT)
+        pipeline.execute()
+        return
+
+    clave = _clave_muestras(vista)
+    muestras = cache.get(clave) or []
+    muestras.append(muestra)
+    cache.set(clave, muestras[-limite:], timeout=INSTRUMENTACION_CACHE_TIMEOUT)
+
+    vistas = cache.get(VISTAS_KEY) or set()
+    if vista not in vistas:
+        vistas.add(vista)
+        cache.set(VISTAS_KEY, vistas, timeout=INSTRUMENTACION_CACHE_TIMEOUT)
+
+
+def _muestras_por_vista():
+    """
+    Muestras guardadas de cada vista medida
+    """
+    redis = _cliente_redis()
+    if redis is None:
+        return {vista: cache.get(_clave_muestras(vista)) or [] for vista in cache.get(VISTAS_KEY) or ()}
+
+    vistas = [v.decode() for v in redis.smembers(cache.make_and_validate_key(VISTAS_KEY))]
+    pipeline = redis.pipeline(transaction=False)
+    for vista in vistas:
+        pipeline.lrange(cache.make_and_validate_key(_clave_muestras(vista)), 0, -1)
+    return {
+        vista: [json.loads(muestra) for muestra in muestras]
+        for vista, muestras in zip(vistas, pipeline.execute())
+    }
+
+
+def _percentil(valores, fraccion):
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(len(ordenados) * fraccion))]
+
+
+def resumen_vistas():
+    """
+    Resumen por vista de las muestras recientes, de la más lenta a la más rápida
+    """
+    resumen = []
+    for vista, muestras in _muestras_por_vista().items():
+        if not muestras:
+            continue
+        consultas = [m['consultas'] for m in muestras]
+        totales = [m['total_ms'] for m in muestras]
+        peores = [m['peor_repetida'] for m in muestras if m['peor_repetida']]
+        resumen.append({
+            'vista': vista,
+            'muestras': len(muestras),
+            'consultas_media': round(sum(consultas) / len(consultas), 1),
+            'consultas_max': max(consultas),
+            'db_ms_media': round(sum(m['db_ms'] for m in muestras) / len(muestras), 1),
+            'plantillas_ms_media': round(sum(m['plantillas_ms'] for m in muestras) / len(muestras), 1),
+            'total_ms_p50': _percentil(totales, 0.5),
+            'total_ms_p95': _percentil(totales, 0.95),
+            'repetidas_max': max(m['repetidas'] for m in muestras),
+            'peor_repetida': tuple(max(peores, key=lambda p: p[1])) if peores else None,
+            'presupuesto': presupuesto_de(vista),
+        })
+    return sorted(resumen, key=lambda fila: fila['total_ms_p95'], reverse=True)
+
+
+def limpiar_estadisticas():
+    """
+    Descarta las muestras guardadas de todas las vistas
+    """
+    claves = [_clave_muestras(vista) for vista in _muestras_por_vista()]
+    cache.delete_many(claves + [VISTAS_KEY])
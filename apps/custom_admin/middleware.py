@@ -0,0 +1,63 @@
+"""
+Middleware de instrumentación
+Sistema PubliTrack - Cabecera Server-Timing, presupuestos de consultas por
+vista y muestras para el panel de rendimiento
+"""
+
+import logging
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+from .instrumentacion import (
+    _instalar_medicion_plantillas, debe_muestrear, medir, registrar_muestra, verificar_presupuesto
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _ve_tiempos(request):
+    """
+    Los tiempos internos solo se exponen en desarrollo o a administradores
+    """
+    if settings.DEBUG:
+        return True
+    user = getattr(request, 'user', None)
+    return bool(user and user.is_authenticated and (
+        user.is_superuser or user.is_staff or getattr(user, 'rol', None) == 'admin'
+    ))
+
+
+class InstrumentacionMiddleware:
+    """
+    Mide cada petición resuelta por una vista: consultas, tiempo de base de
+    datos, SQL repetido y render de plantillas
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'INSTRUMENTACION_ACTIVA', True):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        _instalar_medicion_plantillas()
+
+    def __call__(self, request):
+        with medir() as medicion:
+            response = self.get_response(request)
+
+        resolver_match = getattr(request, 'resolver_match', None)
+        if resolver_match is None:
+            return response
+
+        vista = resolver_match.view_name or resolver_match._func_path
+        if _ve_tiempos(request):
+            response['Server-Timing'] = medicion.server_timing()
+        verificar_presupuesto(vista, medicion)
+        if not debe_muestrear():
+            return response
+
+        try:
+            registrar_muestra(vista, medicion)
+        except Exception as e:
+            # Las estadísticas nunca deben romper la petición (p. ej. Redis caído)
+            logger.warning(f"No se pudo registrar la muestra de {vista}: {e}")
+        return response
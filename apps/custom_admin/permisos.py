@@ -0,0 +1,22 @@
+"""
+Comprobaciones de rol del panel
+Sistema PubliTrack - Funciones para user_passes_test compartidas por las
+vistas del panel (views y los módulos de apps.custom_admin.vistas)
+"""
+
+
+def is_admin(user):
+    """Verifica si el usuario es administrador"""
+    return user.is_superuser or user.is_staff or getattr(user, 'rol', None) == 'admin'
+
+
+def is_admin_or_vtr(user):
+    """Verifica si el usuario es administrador o VTR"""
+    return (user.is_superuser or user.is_staff or 
+            getattr(user, 'rol', None) in ['admin', 'vtr'])
+
+
+def is_admin_or_vtr_or_productor(user):
+    """Verifica si el usuario es administrador, VTR, Productor o Vendedor"""
+    return (user.is_superuser or user.is_staff or 
+            getattr(user, 'rol', None) in ['admin', 'vtr', 'productor', 'vendedor'])
@@ -0,0 +1,56 @@
+"""
+Señales del Panel Admin Personalizado
+Sistema PubliTrack - Invalidación de los fragmentos cacheados de los listados
+"""
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from apps.content_management.models import CategoriaPublicitaria, CuñaPublicitaria, TipoContrato
+from apps.orders.models import OrdenProduccion, OrdenToma
+from apps.parte_mortorios.models import ParteMortorio
+from . import fragmentos
+
+CustomUser = get_user_model()
+
+ETIQUETA_POR_MODELO = {
+    CuñaPublicitaria: fragmentos.CUNAS,
+    CustomUser: fragmentos.USUARIOS,
+    CategoriaPublicitaria: fragmentos.CATEGORIAS,
+    TipoContrato: fragmentos.TIPOS_CONTRATO,
+    OrdenToma: fragmentos.ORDENES_TOMA,
+    OrdenProduccion: fragmentos.ORDENES_PRODUCCION,
+    ParteMortorio: fragmentos.PARTES,
+}
+
+# Guardados de usuario que no cambian ningún desplegable (inicio de sesión)
+CAMPOS_USUARIO_IGNORADOS = frozenset({'last_login', 'ultima_conexion'})
+
+
+@receiver(post_save, sender=CuñaPublicitaria)
+@receiver(post_delete, sender=CuñaPublicitaria)
+@receiver(post_save, sender=CustomUser)
+@receiver(post_delete, sender=CustomUser)
+@receiver(post_save, sender=CategoriaPublicitaria)
+@receiver(post_delete, sender=CategoriaPublicitaria)
+@receiver(post_save, sender=TipoContrato)
+@receiver(post_delete, sender=TipoContrato)
+@receiver(post_save, sender=OrdenToma)
+@receiver(post_delete, sender=OrdenToma)
+@receiver(post_save, sender=OrdenProduccion)
+@receiver(post_delete, sender=OrdenProduccion)
+@receiver(post_save, sender=ParteMortorio)
+@receiver(post_delete, sender=ParteMortorio)
+def invalidar_fragmentos(sender, update_fields=None, **kwargs):
+    """
+    Invalida los fragmentos que dependen del modelo guardado o eliminado. La
+    versión se incrementa al confirmar la transacción: antes, una lectura
+    concurrente podría cachear los datos previos bajo la versión nueva.
+    """
+    if sender is CustomUser and update_fields and set(update_fields) <= CAMPOS_USUARIO_IGNORADOS:
+        return
+    etiqueta = ETIQUETA_POR_MODELO[sender]
+    transaction.on_commit(lambda: fragmentos.invalidar(etiqueta))
+
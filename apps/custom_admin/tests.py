@@ -0,0 +1,233 @@
+"""
+Tests para el panel de administración personalizado
+Sistema PubliTrack - Instrumentación de peticiones, presupuestos de consultas
+y cache de fragmentos de los listados, carga diferida de vistas
+"""
+
+from datetime import date
+from decimal import Decimal
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.core.cache import cache
+from django.contrib.auth import get_user_model
+
+from apps.parte_mortorios.models import ParteMortorio
+from .instrumentacion import PresupuestoConsultasExcedido, huella_sql, medir, resumen_vistas
+
+User = get_user_model()
+
+
+@override_settings(INSTRUMENTACION_FRACCION_MUESTREO=1)
+class InstrumentacionTest(TestCase):
+    """Tests del middleware de instrumentación"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(
+            username='admin_rendimiento', email='rendimiento@test.com', password='testpass123', rol='admin'
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.admin)
+        self.url = reverse('custom_admin:rendimiento_panel')
+
+    def test_huellas_de_consultas_repetidas(self):
+        """Test que el mismo patrón con distintos valores cuenta como repetido"""
+        self.assertEqual(
+            huella_sql('SELECT 1 FROM t WHERE id IN (%s, %s, %s)'),
+            huella_sql('SELECT 1 FROM t WHERE id IN (%s, %s)')
+        )
+        with medir() as medicion:
+            for usuario_id in (1, 2, 3):
+                User.objects.filter(pk=usuario_id).exists()
+        self.assertEqual(medicion.consultas, 3)
+        self.assertEqual(medicion.repetidas()[0][1], 3)
+
+    def test_server_timing_y_panel(self):
+        """Test la cabecera Server-Timing y que el panel muestra las vistas medidas"""
+        respuesta = self.client.get(self.url)
+        self.assertIn('db;dur=', respuesta['Server-Timing'])
+        self.assertIn('tpl;dur=', respuesta['Server-Timing'])
+
+        self.client.get(self.url)
+        fila = next(f for f in resumen_vistas() if f['vista'] == 'custom_admin:rendimiento_panel')
+        self.assertEqual(fila['muestras'], 2)
+        self.assertGreater(fila['consultas_max'], 0)
+
+    @override_settings(INSTRUMENTACION_FRACCION_MUESTREO=0)
+    def test_muestreo_parcial(self):
+        """Test que fuera de la fracción muestreada no se guarda la petición pero sí la cabecera"""
+        respuesta = self.client.get(self.url)
+        self.assertIn('Server-Timing', respuesta)
+        self.assertEqual(resumen_vistas(), [])
+
+    @override_settings(
+        PRESUPUESTOS_CONSULTAS={'custom_admin:rendimiento_panel': 1},
+        PRESUPUESTOS_CONSULTAS_ESTRICTOS=True
+    )
+    def test_presupuesto_estricto(self):
+        """Test que superar el presupuesto hace fallar la petición en modo estricto"""
+        with self.assertRaises(PresupuestoConsultasExcedido):
+            self.client.get(self.url)
+
+    @override_settings(PRESUPUESTOS_CONSULTAS={'*': 1})
+    def test_presupuesto_con_advertencia(self):
+        """Test que sin modo estricto solo se registra una advertencia"""
+        with self.assertLogs('apps.custom_admin.instrumentacion', level='WARNING'):
+            self.assertEqual(self.client.get(self.url).status_code, 200)
+
+
+class FragmentosListadosTest(TestCase):
+    """Tests de la cache de estadísticas y desplegables de los listados"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(
+            username='admin_fragmentos', email='fragmentos@test.com', password='testpass123', rol='admin'
+        )
+        cls.cliente = User.objects.create_user(
+            username='cliente_fragmentos', email='cliente_fragmentos@test.com', password='testpass123',
+            rol='cliente', empresa='Funeraria Fragmentos', ruc_dni='1790000000001'
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.admin)
+        self.url = reverse('custom_admin:parte_mortorios_list')
+
+    def crear_parte(self, estado='pendiente'):
+        return ParteMortorio.objects.create(
+            cliente=self.cliente,
+            nombre_fallecido='Ana Torres',
+            fecha_fallecimiento=date.today(),
+            precio_total=Decimal('20.00'),
+            estado=estado
+        )
+
+    def consultas_de_listado(self, **parametros):
+        with medir() as medicion:
+            respuesta = self.client.get(self.url, parametros)
+        self.assertEqual(respuesta.status_code, 200)
+        return respuesta, medicion.consultas
+
+    def test_segunda_carga_usa_cache(self):
+        """Test que estadísticas y clientes salen de cache en la segunda carga"""
+        self.crear_parte()
+        _, primera = self.consultas_de_listado()
+        respuesta, segunda = self.consultas_de_listado()
+        self.assertEqual(primera - segunda, 2)
+        self.assertEqual(respuesta.context['total_partes'], 1)
+        self.assertEqual([c.id for c in respuesta.context['clientes']], [self.cliente.pk])
+        self.assertEqual(respuesta.context['clientes'][0].empresa, 'Funeraria Fragmentos')
+
+    def test_invalidacion_al_guardar_y_eliminar(self):
+        """Test que guardar o eliminar un registro invalida, al confirmar, los fragmentos que dependen de él"""
+        parte = self.crear_parte()
+        self.consultas_de_listado()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.crear_parte(estado='al_aire')
+            respuesta, _ = self.consultas_de_listado()
+            self.assertEqual(respuesta.context['total_partes'], 1)
+        respuesta, _ = self.consultas_de_listado()
+        self.assertEqual(respuesta.context['total_partes'], 2)
+        self.assertEqual(respuesta.context['partes_al_aire'], 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            parte.delete()
+        respuesta, _ = self.consultas_de_listado()
+        self.assertEqual(respuesta.context['partes_pendientes'], 0)
+
+        self.cliente.is_active = False
+        with self.captureOnCommitCallbacks(execute=True):
+            self.cliente.save()
+        respuesta, _ = self.consultas_de_listado()
+        self.assertEqual(list(respuesta.context['clientes']), [])
+
+    def test_filtros_no_usan_estadisticas_globales(self):
+        """Test que con filtros las estadísticas se calculan sobre el resultado filtrado"""
+        self.crear_parte()
+        self.crear_parte(estado='al_aire')
+        self.consultas_de_listado()
+        respuesta, _ = self.consultas_de_listado(estado='al_aire')
+        self.assertEqual(respuesta.context['total_partes'], 1)
+
+    def test_inicio_de_sesion_no_invalida(self):
+        """Test que actualizar la última conexión no invalida los desplegables"""
+        self.consultas_de_listado()
+        _, cacheada = self.consultas_de_listado()
+        self.cliente.marcar_ultima_conexion()
+        self.assertEqual(self.consultas_de_listado()[1], cacheada)
+
+
+class VistasPerezosasTest(TestCase):
+    """Tests de la carga diferida de las vistas desde el URLconf"""
+
+    def test_rutas_resuelven_a_vistas_existentes(self):
+        """Test que cada vista diferida del URLconf existe en su módulo"""
+        from django.urls import get_resolver
+        from .vistas import VistaPerezosa
+
+        def recorrer(patrones):
+            for patron in patrones:
+                if hasattr(patron, 'url_patterns'):
+                    yield from recorrer(patron.url_patterns)
+                else:
+                    yield patron
+
+        perezosas = [p.callback for p in recorrer(get_resolver().url_patterns) if isinstance(p.callback, VistaPerezosa)]
+        self.assertTrue(perezosas)
+        for vista in perezosas:
+            self.assertTrue(callable(vista.vista), vista)
+
+    def test_resolve_y_compatibilidad_de_views(self):
+        """Test que resolve muestra el módulo real y views sigue exponiendo las vistas movidas"""
+        from django.urls import resolve
+        from . import views
+        from .vistas import reportes
+
+        coincidencia = resolve(reverse('custom_admin:reportes_dashboard'))
+        self.assertEqual(coincidencia._func_path, 'apps.custom_admin.vistas.reportes.reports_dashboard_principal')
+        self.assertIs(views.reports_dashboard_principal, reportes.reports_dashboard_principal)
+        with self.assertRaises(AttributeError):
+            views.vista_inexistente
+
+    def test_peticion_a_vista_diferida(self):
+        """Test que la vista diferida atiende la petición y conserva sus decoradores"""
+        admin = User.objects.create_user(
+            username='admin_perezosa', email='perezosa@test.com', password='testpass123', rol='admin'
+        )
+        url = reverse('custom_admin:inventory_categories_ajax_list')
+        self.assertEqual(self.client.get(url).status_code, 302)
+
+        self.client.force_login(admin)
+        respuesta = self.client.get(url)
+        self.assertEqual(respuesta.status_code, 200)
+
+    def test_dependencias_diferidas(self):
+        """Test que los accesores detectan e informan dependencias ausentes"""
+        from apps import dependencias
+
+        self.assertFalse(dependencias.disponible('modulo_inexistente_publitrack'))
+        with self.assertRaises(ImportError):
+            dependencias._importar('modulo_inexistente_publitrack')
+        self.assertTrue(hasattr(dependencias.xlwt(), 'Workbook'))
+
+
+class PermisosGrillaTest(TestCase):
+    """Tests de los permisos de las APIs de la grilla publicitaria"""
+
+    def test_generar_ubicaciones_requiere_admin_o_vtr(self):
+        """Test que un cliente autenticado no puede generar ubicaciones"""
+        cliente = User.objects.create_user(
+            username='cliente_grilla', email='cliente_grilla@test.com', password='testpass123', rol='cliente'
+        )
+        self.client.force_login(cliente)
+        respuesta = self.client.post(
+            reverse('custom_admin:grilla_generar_ubicaciones_api'),
+            data='{"programacion_id": 1}',
+            content_type='application/json'
+        )
+        self.assertIn(respuesta.status_code, (302, 403))
@@ -1,5 +1,11 @@
 from django.urls import path
-from . import views
+
+from .vistas import INVENTARIO, REPORTES, modulo_perezoso
+
+# Los módulos de vistas se importan con la primera petición que los usa
+views = modulo_perezoso('apps.custom_admin.views')
+reportes = modulo_perezoso(REPORTES)
+inventario = modulo_perezoso(INVENTARIO)
 
 app_name = 'custom_admin'
 
@@ -31,6 +37,7 @@ urlpatterns = [
     
     # HISTORIAL
     path('historial/', views.historial_list, name='historial_list'),
+    path('rendimiento/', views.rendimiento_panel, name='rendimiento_panel'),
     
     # ============================
     # URLs DE CUÑAS PUBLICITARIAS
@@ -89,7 +96,7 @@ urlpatterns = [
     path('semaforos/configuracion/', views.configuracion_semaforos, name='configuracion_semaforos'),
     
     # Reportes
-    path('reportes/', views.reports_dashboard_principal, name='reportes_dashboard'),
+    path('reportes/', reportes.reports_dashboard_principal, name='reportes_dashboard'),
     
     # Configuración
     path('configuracion/', views.configuracion, name='configuracion'),
@@ -171,6 +178,7 @@ urlpatterns = [
     path('parte-mortorios/', views.parte_mortorios_list, name='parte_mortorios_list'),
     path('parte-mortorios/<int:parte_id>/detalle/', views.parte_mortorio_detail_api, name='parte_mortorio_detail_api'),
     path('parte-mortorios/crear/', views.parte_mortorio_create_api, name='parte_mortorio_create_api'),
+    path('parte-mortorios/lote/', views.parte_mortorio_lote_api, name='parte_mortorio_lote_api'),
     path('parte-mortorios/<int:parte_id>/editar/', views.parte_mortorio_update_api, name='parte_mortorio_update_api'),
     path('parte-mortorios/<int:parte_id>/eliminar/', views.parte_mortorio_delete_api, name='parte_mortorio_delete_api'),
     path('parte-mortorios/<int:parte_id>/programar/', views.parte_mortorio_programar_api, name='parte_mortorio_programar_api'),
@@ -194,26 +202,26 @@ urlpatterns = [
     path('parte-mortorios/<int:parte_id>/cambiar-estado/', views.parte_mortorio_cambiar_estado_api, name='parte_mortorio_cambiar_estado'),
     
     # ==================== REPORTES DE CONTRATOS ====================
-    path('reports/contratos/dashboard/', views.reports_dashboard_contratos, name='reports_dashboard_contratos'),
-    path('reports/contratos/api/estadisticas/', views.reports_api_estadisticas_contratos, name='reports_api_estadisticas_contratos'),
-    path('reports/contratos/estado/', views.reports_estado_contratos, name='reports_estado_contratos'),
-    path('reports/contratos/vencimiento/', views.reports_vencimiento_contratos, name='reports_vencimiento_contratos'),
-    path('reports/contratos/ingresos/', views.reports_ingresos_contratos, name='reports_ingresos_contratos'),
+    path('reports/contratos/dashboard/', reportes.reports_dashboard_contratos, name='reports_dashboard_contratos'),
+    path('reports/contratos/api/estadisticas/', reportes.reports_api_estadisticas_contratos, name='reports_api_estadisticas_contratos'),
+    path('reports/contratos/estado/', reportes.reports_estado_contratos, name='reports_estado_contratos'),
+    path('reports/contratos/vencimiento/', reportes.reports_vencimiento_contratos, name='reports_vencimiento_contratos'),
+    path('reports/contratos/ingresos/', reportes.reports_ingresos_contratos, name='reports_ingresos_contratos'),
     path('api/categorias-publicitarias/', views.api_categorias_publicitarias, name='api_categorias_publicitarias'),
     # ==================== REPORTES DE VENDEDORES ====================
-    path('reports/vendedores/dashboard/', views.reports_dashboard_vendedores, name='reports_dashboard_vendedores'),
-    path('reports/vendedores/<int:vendedor_id>/detalle/', views.reports_detalle_vendedor, name='reports_detalle_vendedor'),
+    path('reports/vendedores/dashboard/', reportes.reports_dashboard_vendedores, name='reports_dashboard_vendedores'),
+    path('reports/vendedores/<int:vendedor_id>/detalle/', reportes.reports_detalle_vendedor, name='reports_detalle_vendedor'),
     
     # Detalles de contratos por cliente/vendedor
-    path('clientes/<int:cliente_id>/contratos/', views.cliente_contratos_api, name='cliente_contratos_api'),
-    path('vendedores/<int:vendedor_id>/contratos/', views.vendedor_contratos_api, name='vendedor_contratos_api'),
+    path('clientes/<int:cliente_id>/contratos/', reportes.cliente_contratos_api, name='cliente_contratos_api'),
+    path('vendedores/<int:vendedor_id>/contratos/', reportes.vendedor_contratos_api, name='vendedor_contratos_api'),
     
     # ==================== REPORTES DE PARTES MORTUORIOS ====================
-    path('reports/partes-mortuorios/dashboard/', views.reports_dashboard_partes_mortuorios, name='reports_dashboard_partes_mortuorios'),
-    path('reports/partes-mortuorios/api/estado/', views.reports_partes_estado_api, name='reports_partes_estado_api'),
-    path('reports/partes-mortuorios/api/urgencia/', views.reports_partes_urgencia_api, name='reports_partes_urgencia_api'),
-    path('reports/partes-mortuorios/api/ingresos/', views.reports_partes_ingresos_api, name='reports_partes_ingresos_api'),
-    path('reports/partes-mortuorios/api/<int:parte_id>/detalle/', views.reports_partes_detalle_api, name='reports_partes_detalle_api'),
+    path('reports/partes-mortuorios/dashboard/', reportes.reports_dashboard_partes_mortuorios, name='reports_dashboard_partes_mortuorios'),
+    path('reports/partes-mortuorios/api/estado/', reportes.reports_partes_estado_api, name='reports_partes_estado_api'),
+    path('reports/partes-mortuorios/api/urgencia/', reportes.reports_partes_urgencia_api, name='reports_partes_urgencia_api'),
+    path('reports/partes-mortuorios/api/ingresos/', reportes.reports_partes_ingresos_api, name='reports_partes_ingresos_api'),
+    path('reports/partes-mortuorios/api/<int:parte_id>/detalle/', reportes.reports_partes_detalle_api, name='reports_partes_detalle_api'),
     
     # =============================================================================
     # URLs DE PROGRAMACIÓN CANAL - MODALES
@@ -258,6 +266,8 @@ path('api/categorias-programa/<int:categoria_id>/actualizar/', views.api_categor
     path('grilla-publicitaria/api/crear-ubicacion/', views.grilla_crear_ubicacion_api, name='grilla_crear_ubicacion_api'),
     path('grilla-publicitaria/api/generar-ubicaciones/', views.grilla_generar_ubicaciones_api, name='grilla_generar_ubicaciones_api'),
     path('grilla-publicitaria/integrada/', views.grilla_publicitaria_integrada, name='grilla_publicitaria_integrada'),
+    path('grilla-publicitaria/api/matriz/', views.grilla_matriz_api, name='grilla_matriz_api'),
+    path('grilla-publicitaria/api/estado/<int:programacion_id>/', views.grilla_estado_api, name='grilla_estado_api'),
     path('grilla-publicitaria/api/eliminar-ubicacion/<int:ubicacion_id>/', views.grilla_eliminar_ubicacion_api, name='grilla_eliminar_ubicacion_api'),
          
     # Detalles y edición de asignaciones
@@ -268,22 +278,22 @@ path('api/categorias-programa/<int:categoria_id>/actualizar/', views.api_categor
       # ============================================
     # INVENTARIO
     # ============================================
-    path('inventory/', views.inventory_list, name='inventory_list'),
-    path('inventory/export/', views.inventory_export, name='inventory_export'),
+    path('inventory/', inventario.inventory_list, name='inventory_list'),
+    path('inventory/export/', inventario.inventory_export, name='inventory_export'),
     
     # Endpoints AJAX para modales de ítems
-    path('inventory/ajax/detail/<int:item_id>/', views.inventory_ajax_detail, name='inventory_ajax_detail'),
-    path('inventory/ajax/get-form-data/', views.inventory_ajax_get_form_data, name='inventory_ajax_get_form_data'),
-    path('inventory/ajax/get-form-data/<int:item_id>/', views.inventory_ajax_get_form_data, name='inventory_ajax_get_form_data_edit'),
-    path('inventory/ajax/save/', views.inventory_ajax_save, name='inventory_ajax_save'),
-    path('inventory/ajax/delete/<int:item_id>/', views.inventory_ajax_delete, name='inventory_ajax_delete'),
+    path('inventory/ajax/detail/<int:item_id>/', inventario.inventory_ajax_detail, name='inventory_ajax_detail'),
+    path('inventory/ajax/get-form-data/', inventario.inventory_ajax_get_form_data, name='inventory_ajax_get_form_data'),
+    path('inventory/ajax/get-form-data/<int:item_id>/', inventario.inventory_ajax_get_form_data, name='inventory_ajax_get_form_data_edit'),
+    path('inventory/ajax/save/', inventario.inventory_ajax_save, name='inventory_ajax_save'),
+    path('inventory/ajax/delete/<int:item_id>/', inventario.inventory_ajax_delete, name='inventory_ajax_delete'),
     
     # Configuración de inventario
-    path('inventory/categories/ajax/list/', views.inventory_categories_ajax_list, name='inventory_categories_ajax_list'),
-    path('inventory/statuses/ajax/list/', views.inventory_statuses_ajax_list, name='inventory_statuses_ajax_list'),
-    path('inventory/category/ajax/save/', views.inventory_category_ajax_save, name='inventory_category_ajax_save'),
-    path('inventory/status/ajax/save/', views.inventory_status_ajax_save, name='inventory_status_ajax_save'),
-    path('inventory/category/ajax/delete/<int:category_id>/', views.inventory_category_ajax_delete, name='inventory_category_ajax_delete'),
-    path('inventory/status/ajax/delete/<int:status_id>/', views.inventory_status_ajax_delete, name='inventory_status_ajax_delete'),
+    path('inventory/categories/ajax/list/', inventario.inventory_categories_ajax_list, name='inventory_categories_ajax_list'),
+    path('inventory/statuses/ajax/list/', inventario.inventory_statuses_ajax_list, name='inventory_statuses_ajax_list'),
+    path('inventory/category/ajax/save/', inventario.inventory_category_ajax_save, name='inventory_category_ajax_save'),
+    path('inventory/status/ajax/save/', inventario.inventory_status_ajax_save, name='inventory_status_ajax_save'),
+    path('inventory/category/ajax/delete/<int:category_id>/', inventario.inventory_category_ajax_delete, name='inventory_category_ajax_delete'),
+    path('inventory/status/ajax/delete/<int:status_id>/', inventario.inventory_status_ajax_delete, name='inventory_status_ajax_delete'),
     
 ]
\ No newline at end of file
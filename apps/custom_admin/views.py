@@ -3,9 +3,10 @@ from django.contrib.auth.decorators import login_required, user_passes_test
 from django.contrib import messages
 from django.contrib.auth import get_user_model
 from django.core.paginator import Paginator
-from django.db.models import Q, Sum, F
+from django.db.models import Q, Sum, F, Avg, Prefetch, Value
+from django.db.models.functions import Coalesce, Concat, Trim
 from django.utils import timezone
-from django.http import JsonResponse, FileResponse
+from django.http import JsonResponse, FileResponse, Http404
 import json
 from decimal import Decimal
 from datetime import datetime, timedelta
@@ -16,27 +17,23 @@ from django.db.models import Count
 from django.contrib.admin.models import LogEntry, ADDITION, CHANGE, DELETION
 from django.contrib.contenttypes.models import ContentType
 from apps.authentication.models import CustomUser
+from apps.busqueda import buscar
+from . import fragmentos
+from .vistas import VISTAS_MOVIDAS
+from apps.paginacion import (
+    aplicar_busqueda, etag_coincide, paginar_por_cursor, parametros_paginacion, respuesta_json_con_etag
+)
 from apps.content_management.models import PlantillaContrato
 from apps.orders.models import PlantillaOrden, OrdenGenerada
 from apps.orders.models import OrdenToma 
 from apps.parte_mortorios.models import ParteMortorio
-import csv
-import xlwt
 from django.http import HttpResponse
 from datetime import datetime
 from apps.reports_analytics.models import DashboardContratos
 from apps.content_management.models import ContratoGenerado
-import plotly.express as px
-import plotly.offline as pyo
-import plotly.io as pio
 from apps.programacion_canal.models import ProgramacionSemanal, BloqueProgramacion,  CategoriaPrograma
 from apps.grilla_publicitaria.models import TipoUbicacionPublicitaria, UbicacionPublicitaria, AsignacionCuña, GrillaPublicitaria
 from apps.content_management.models import CuñaPublicitaria
-from apps.inventory.models import (
-    Category, Status, 
-    InventoryItem
-)
-INVENTORY_MODELS_AVAILABLE = True
 # Obtener el modelo de usuario correcto
 User = get_user_model()
 
@@ -58,14 +55,6 @@ except ImportError as e:
     TipoContrato = None
     ArchivoAudio = None
     ContratoGenerado = None
-try:
-    import plotly.express as px
-    import plotly.offline as pyo
-    import plotly.io as pio
-    PLOTLY_AVAILABLE = True
-except ImportError:
-    PLOTLY_AVAILABLE = False
-    print("⚠️ Plotly no está disponible. Las gráficas no se mostrarán.")
 try:
     from apps.reports_analytics.models import DashboardContratos, ReporteContratos
     REPORTS_MODELS_AVAILABLE = True
@@ -148,21 +137,7 @@ except ImportError as e:
     REPORTS_MODELS_AVAILABLE = False
     ReporteContratos = None
     DashboardContratos = None
-def is_admin(user):
-    """Verifica si el usuario es administrador"""
-    return user.is_superuser or user.is_staff or getattr(user, 'rol', None) == 'admin'
-
-
-
-def is_admin_or_vtr(user):
-    """Verifica si el usuario es administrador o VTR"""
-    return (user.is_superuser or user.is_staff or 
-            getattr(user, 'rol', None) in ['admin', 'vtr'])
-
-def is_admin_or_vtr_or_productor(user):
-    """Verifica si el usuario es administrador, VTR, Productor o Vendedor"""
-    return (user.is_superuser or user.is_staff or 
-            getattr(user, 'rol', None) in ['admin', 'vtr', 'productor', 'vendedor'])
+from .permisos import is_admin, is_admin_or_vtr, is_admin_or_vtr_or_productor
 
 # IMPORTS CONDICIONALES PARA MODELOS - ACTUALIZAR ESTA SECCIÓN
 try:
@@ -214,24 +189,13 @@ try:
 except ImportError:
     PROGRAMACION_CANAL_AVAILABLE = False
 
-# =============================================================================
-# IMPORTS PARA INVENTARIO
-# =============================================================================
-try:
-    from apps.inventory.models import (
-        Category, Status,
-        InventoryItem
-    )
-    INVENTORY_MODELS_AVAILABLE = True
-except ImportError as e:
-    print(f"⚠️ Error importando modelos de inventory: {e}")
-    INVENTORY_MODELS_AVAILABLE = False
-    Category = None
-    Status = None
-    InventoryItem = None
-
 User = get_user_model()
 
+
+def _con_nombre_completo(usuarios):
+    """Anota 'nombre_completo' (como get_full_name) para las opciones cacheadas de usuarios"""
+    return usuarios.annotate(nombre_completo=Trim(Concat('first_name', Value(' '), 'last_name')))
+
    
 # ==================== GRILLA PUBLICITARIA ====================
 
@@ -424,61 +388,112 @@ def api_panteones(request):
 
 # ==================== APIs PARA CONTRATOS ====================
 
+CAMPOS_BUSQUEDA_CLIENTES = ('empresa', 'first_name', 'last_name', 'username', 'ruc_dni', 'email')
+
+
+def clientes_ordenados_por_empresa(queryset):
+    """Anota la clave de orden estable (empresa, id) usada por la paginación por cursor"""
+    return queryset.annotate(empresa_orden=Coalesce('empresa', Value('')))
+
+
 @login_required
 @user_passes_test(lambda u: u.es_admin or u.es_vendedor)
 def api_plantillas_contrato(request):
-    """API para obtener todas las plantillas de contrato activas"""
+    """API para obtener las plantillas de contrato activas (paginada por cursor, ?q= para buscar)"""
     try:
-        plantillas = PlantillaContrato.objects.filter(is_active=True).order_by('-is_default', 'nombre')
+        cursor, limite, busqueda = parametros_paginacion(request)
         
+        plantillas = aplicar_busqueda(
+            PlantillaContrato.objects.filter(is_active=True),
+            busqueda,
+            ('nombre', 'descripcion')
+        ).values(
+            'id', 'nombre', 'tipo_contrato', 'version', 'incluye_iva', 'porcentaje_iva',
+            'is_default', 'descripcion', 'archivo_plantilla'
+        )
+        filas, siguiente = paginar_por_cursor(plantillas, ('-is_default', 'nombre', 'id'), cursor, limite)
+        
+        tipos = dict(PlantillaContrato._meta.get_field('tipo_contrato').choices)
+        almacenamiento = PlantillaContrato._meta.get_field('archivo_plantilla').storage
         data = []
-        for plantilla in plantillas:
+        for plantilla in filas:
             data.append({
-                'id': plantilla.id,
-                'nombre': plantilla.nombre,
-                'tipo_contrato': plantilla.tipo_contrato,
-                'tipo_contrato_display': plantilla.get_tipo_contrato_display(),
-                'version': plantilla.version,
-                'incluye_iva': plantilla.incluye_iva,
-                'porcentaje_iva': str(plantilla.porcentaje_iva),
-                'is_default': plantilla.is_default,
-                'descripcion': plantilla.descripcion or '',
-                'archivo_url': plantilla.archivo_plantilla.url if plantilla.archivo_plantilla else None
+                'id': plantilla['id'],
+                'nombre': plantilla['nombre'],
+                'tipo_contrato': plantilla['tipo_contrato'],
+                'tipo_contrato_display': tipos.get(plantilla['tipo_contrato'], plantilla['tipo_contrato']),
+                'version': plantilla['version'],
+                'incluye_iva': plantilla['incluye_iva'],
+                'porcentaje_iva': str(plantilla['porcentaje_iva']),
+                'is_default': plantilla['is_default'],
+                'descripcion': plantilla['descripcion'] or '',
+                'archivo_url': almacenamiento.url(plantilla['archivo_plantilla']) if plantilla['archivo_plantilla'] else None
             })
         
-        return JsonResponse({'success': True, 'plantillas': data})
+        return respuesta_json_con_etag(request, {
+            'success': True,
+            'plantillas': data,
+            'siguiente_cursor': siguiente,
+            'hay_mas': siguiente is not None
+        })
     
+    except ValueError as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=400)
     except Exception as e:
         return JsonResponse({'success': False, 'error': str(e)}, status=500)
 
 @login_required
-@user_passes_test(lambda u: u.es_admin or u.es_vendedor)
+@user_passes_test(lambda u: u.es_admin or u.es_doctor or u.es_vendedor)
 def api_clientes_activos(request):
-    """API para obtener todos los clientes activos - Filtrado por vendedor"""
+    """API para obtener los clientes activos - Filtrado por vendedor, paginada por cursor (?q= para buscar)"""
     try:
+        cursor, limite, busqueda = parametros_paginacion(request)
+        
         qs = CustomUser.objects.filter(rol='cliente', is_active=True)
         
         if request.user.es_vendedor:
             qs = qs.filter(vendedor_asignado=request.user)
-            
-        clientes = qs.order_by('empresa', 'first_name', 'last_name')
+        
+        # Cliente puntual (p. ej. el ya ligado a un registro en edición)
+        if request.GET.get('id'):
+            qs = qs.filter(pk=int(request.GET['id']))
+        
+        clientes = clientes_ordenados_por_empresa(
+            aplicar_busqueda(qs, busqueda, CAMPOS_BUSQUEDA_CLIENTES)
+        ).values(
+            'id', 'username', 'first_name', 'last_name', 'empresa', 'empresa_orden', 'ruc_dni',
+            'email', 'telefono', 'ciudad', 'direccion_exacta', 'profesion', 'cargo_empresa',
+            'vendedor_asignado__first_name', 'vendedor_asignado__last_name'
+        )
+        filas, siguiente = paginar_por_cursor(clientes, ('empresa_orden', 'id'), cursor, limite)
         
         data = []
-        for cliente in clientes:
+        for cliente in filas:
+            vendedor = f"{cliente['vendedor_asignado__first_name'] or ''} {cliente['vendedor_asignado__last_name'] or ''}".strip()
             data.append({
-                'id': cliente.id,
-                'nombre_completo': cliente.get_full_name(),
-                'empresa': cliente.empresa or '',
-                'ruc_dni': cliente.ruc_dni or '',
-                'email': cliente.email,
-                'telefono': cliente.telefono or '',
-                'ciudad': cliente.ciudad or '',
-                'direccion': cliente.direccion_exacta or '',
-                'vendedor_asignado': cliente.vendedor_asignado.get_full_name() if cliente.vendedor_asignado else ''
+                'id': cliente['id'],
+                'username': cliente['username'],
+                'nombre_completo': f"{cliente['first_name']} {cliente['last_name']}".strip(),
+                'empresa': cliente['empresa'] or '',
+                'ruc_dni': cliente['ruc_dni'] or '',
+                'email': cliente['email'],
+                'telefono': cliente['telefono'] or '',
+                'ciudad': cliente['ciudad'] or '',
+                'direccion': cliente['direccion_exacta'] or '',
+                'profesion_display': cliente['profesion'] or '',
+                'cargo_empresa': cliente['cargo_empresa'] or '',
+                'vendedor_asignado': vendedor
             })
         
-        return JsonResponse({'success': True, 'clientes': data})
+        return respuesta_json_con_etag(request, {
+            'success': True,
+            'clientes': data,
+            'siguiente_cursor': siguiente,
+            'hay_mas': siguiente is not None
+        })
     
+    except ValueError as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=400)
     except Exception as e:
         return JsonResponse({'success': False, 'error': str(e)}, status=500)
 
@@ -556,20 +571,7 @@ def contratos_generados_list(request):
     # Obtener plantillas activas
     plantillas = PlantillaContrato.objects.filter(is_active=True).order_by('-is_default', 'nombre')
     
-    # Obtener clientes activos (filtrado por vendedor)
-    if request.user.es_vendedor:
-        clientes = CustomUser.objects.filter(
-            rol='cliente',
-            is_active=True,
-            vendedor_asignado=request.user
-        ).order_by('empresa', 'username')
-    else:
-        clientes = CustomUser.objects.filter(
-            rol='cliente',
-            is_active=True
-        ).order_by('empresa', 'username')
-        
-    print(f"👥 Clientes encontrados: {clientes.count()}")
+    # Los clientes se cargan desde api_clientes_activos (paginada, con búsqueda)
     
     # Inicializar variables
     contratos_recientes = []
@@ -636,7 +638,6 @@ def contratos_generados_list(request):
     
     context = {
         'plantillas': plantillas,
-        'clientes': clientes,
         'contratos_recientes': contratos_recientes,
         'total_contratos': total_contratos,
         'contratos_hoy': contratos_hoy,
@@ -648,7 +649,6 @@ def contratos_generados_list(request):
     
     print(f"\n📦 CONTEXT FINAL:")
     print(f"   - plantillas: {type(context['plantillas'])} | Count: {context['plantillas'].count()}")
-    print(f"   - clientes: {type(context['clientes'])} | Count: {context['clientes'].count()}")
     print(f"   - contratos_recientes: {type(context['contratos_recientes'])} | Len: {len(context['contratos_recientes'])}")
     print(f"   - total_contratos: {context['total_contratos']}")
     print(f"   - contratos_hoy: {context['contratos_hoy']}")
@@ -1353,12 +1353,7 @@ def usuarios_list(request):
     usuarios = User.objects.exclude(rol='cliente').prefetch_related('groups')
     
     if query:
-        usuarios = usuarios.filter(
-            Q(username__icontains=query) |
-            Q(email__icontains=query) |
-            Q(first_name__icontains=query) |
-            Q(last_name__icontains=query)
-        )
+        usuarios = buscar(usuarios, query, 'usuario')
     
     # Procesar usuarios para agregar tipo de rol y clase CSS
     usuarios_procesados = []
@@ -1982,6 +1977,30 @@ def historial_list(request):
     
     return render(request, 'custom_admin/historial/list.html', context)
 
+
+# ============= PANEL DE RENDIMIENTO =============
+@login_required
+@user_passes_test(is_admin)
+def rendimiento_panel(request):
+    """Consultas y tiempos recientes por vista (InstrumentacionMiddleware)"""
+    from .instrumentacion import limpiar_estadisticas, resumen_vistas
+
+    if request.method == 'POST':
+        limpiar_estadisticas()
+        messages.success(request, 'Estadísticas de rendimiento reiniciadas.')
+        return redirect('custom_admin:rendimiento_panel')
+
+    vistas = resumen_vistas()
+    context = {
+        'vistas': vistas,
+        'total_vistas': len(vistas),
+        'vistas_sobre_presupuesto': sum(
+            1 for fila in vistas if fila['presupuesto'] is not None and fila['consultas_max'] > fila['presupuesto']
+        ),
+        'vistas_con_repetidas': sum(1 for fila in vistas if fila['repetidas_max']),
+    }
+    return render(request, 'custom_admin/rendimiento/panel.html', context)
+
 # ============= VISTAS DE CUÑAS =============
 @login_required
 @user_passes_test(is_admin)
@@ -2019,10 +2038,7 @@ def cunas_list(request):
     cunas = CuñaPublicitaria.objects.all().select_related('cliente', 'vendedor_asignado', 'categoria', 'tipo_contrato').order_by('-created_at')
     
     if query:
-        cunas = cunas.filter(
-            Q(titulo__icontains=query) |
-            Q(codigo__icontains=query)
-        )
+        cunas = buscar(cunas, query, 'cuña')
     
     if estado:
         cunas = cunas.filter(estado=estado)
@@ -2030,36 +2046,46 @@ def cunas_list(request):
     if cliente_id:
         cunas = cunas.filter(cliente_id=cliente_id)
     
-    # Estadísticas
-    cunas_activas = CuñaPublicitaria.objects.filter(estado='activa').count()
-    cunas_por_vencer = CuñaPublicitaria.objects.filter(
-        fecha_fin__lte=timezone.now().date() + timedelta(days=7),
-        estado='activa'
-    ).count()
+    # Estadísticas globales (cacheadas por día); el valor total depende de los filtros
+    hoy = timezone.now().date()
+    estadisticas = fragmentos.fragmento(
+        f'cunas_list:estadisticas:{hoy.isoformat()}', (fragmentos.CUNAS,),
+        lambda: CuñaPublicitaria.objects.filter(estado='activa').aggregate(
+            activas=Count('id'),
+            por_vencer=Count('id', filter=Q(fecha_fin__lte=hoy + timedelta(days=7))),
+        )
+    )
+    cunas_activas = estadisticas['activas']
+    cunas_por_vencer = estadisticas['por_vencer']
     valor_total = cunas.aggregate(Sum('precio_total'))['precio_total__sum'] or 0
     
     paginator = Paginator(cunas, 12)
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
     
-    # Obtener clientes usando CustomUser con rol='cliente'
-    clientes = CustomUser.objects.filter(
-        rol='cliente',
-        is_active=True
-    ).order_by('empresa', 'username')
+    # Opciones de los filtros y formularios (cacheadas hasta que cambie su modelo)
+    clientes = fragmentos.opciones(
+        'cunas_list:clientes', (fragmentos.USUARIOS,),
+        _con_nombre_completo(CustomUser.objects.filter(rol='cliente', is_active=True).order_by('empresa', 'username')),
+        'nombre_completo', 'empresa'
+    )
     
-    # Obtener vendedores usando CustomUser con rol='vendedor'
-    vendedores = CustomUser.objects.filter(
-        rol='vendedor',
-        is_active=True
-    ).order_by('first_name', 'last_name')
+    vendedores = fragmentos.opciones(
+        'cunas_list:vendedores', (fragmentos.USUARIOS,),
+        _con_nombre_completo(CustomUser.objects.filter(rol='vendedor', is_active=True).order_by('first_name', 'last_name')),
+        'nombre_completo'
+    )
     
     # ✅ CORREGIDO: Usar CategoriaPublicitaria (nombre correcto del modelo)
     categorias = []
     if CONTENT_MODELS_AVAILABLE:
         try:
             from apps.content_management.models import CategoriaPublicitaria
-            categorias = CategoriaPublicitaria.objects.filter(is_active=True)
+            categorias = fragmentos.opciones(
+                'cunas_list:categorias', (fragmentos.CATEGORIAS,),
+                CategoriaPublicitaria.objects.filter(is_active=True),
+                'nombre'
+            )
         except:
             categorias = []
     
@@ -2067,7 +2093,11 @@ def cunas_list(request):
     tipos_contrato = []
     if CONTENT_MODELS_AVAILABLE:
         try:
-            tipos_contrato = TipoContrato.objects.all()
+            tipos_contrato = fragmentos.opciones(
+                'cunas_list:tipos_contrato', (fragmentos.TIPOS_CONTRATO,),
+                TipoContrato.objects.all(),
+                'nombre'
+            )
         except:
             tipos_contrato = []
     
@@ -3027,14 +3057,8 @@ def clientes_list(request):
     vendedor_filter = request.GET.get('vendedor', '')
     
     if search:
-        clientes = clientes.filter(
-            Q(username__icontains=search) |
-            Q(first_name__icontains=search) |
-            Q(last_name__icontains=search) |
-            Q(empresa__icontains=search) |
-            Q(ruc_dni__icontains=search) |
-            Q(email__icontains=search)
-        )
+        # Sin ranking: la página se ordena por (empresa, id) para el cursor
+        clientes = buscar(clientes, search, 'cliente', ordenar=False)
     
     if status_filter:
         clientes = clientes.filter(status=status_filter)
@@ -3042,25 +3066,44 @@ def clientes_list(request):
     if vendedor_filter and request.user.es_admin:
         clientes = clientes.filter(vendedor_asignado_id=vendedor_filter)
     
-    # Ordenar
-    clientes = clientes.order_by('-created_at')
+    # Estadísticas en una sola consulta
+    estadisticas = clientes.aggregate(
+        total=Count('id'),
+        activos=Count('id', filter=Q(status='activo')),
+        inactivos=Count('id', filter=Q(status='inactivo')),
+        con_profesion=Count('id', filter=Q(profesion__gt='')),
+    )
     
-    # Estadísticas
-    total_clientes = clientes.count()
-    clientes_activos = clientes.filter(status='activo').count()
-    clientes_inactivos = clientes.filter(status='inactivo').count()
+    # Página actual ordenada de forma estable por (empresa, id)
+    cursor, limite, _ = parametros_paginacion(request)
+    clientes = clientes_ordenados_por_empresa(clientes)
+    try:
+        clientes, siguiente_cursor = paginar_por_cursor(clientes, ('empresa_orden', 'id'), cursor, limite)
+    except ValueError:
+        messages.warning(request, 'El enlace de paginación no es válido, se muestra la primera página.')
+        cursor = None
+        clientes, siguiente_cursor = paginar_por_cursor(clientes, ('empresa_orden', 'id'), None, limite)
+    
+    # Parámetros de filtro para los enlaces de paginación
+    parametros = request.GET.copy()
+    parametros.pop('cursor', None)
     
     # Vendedores para filtro (solo admins)
-    vendedores = CustomUser.objects.filter(
-        rol='vendedor',
-        status='activo'
-    ).order_by('first_name', 'last_name') if request.user.es_admin else []
+    vendedores = fragmentos.opciones(
+        'clientes_list:vendedores', (fragmentos.USUARIOS,),
+        _con_nombre_completo(CustomUser.objects.filter(rol='vendedor', status='activo').order_by('first_name', 'last_name')),
+        'nombre_completo'
+    ) if request.user.es_admin else []
     
     context = {
         'clientes': clientes,
-        'total_clientes': total_clientes,
-        'clientes_activos': clientes_activos,
-        'clientes_inactivos': clientes_inactivos,
+        'total_clientes': estadisticas['total'],
+        'clientes_activos': estadisticas['activos'],
+        'clientes_inactivos': estadisticas['inactivos'],
+        'clientes_con_profesion': estadisticas['con_profesion'],
+        'siguiente_cursor': siguiente_cursor,
+        'es_primera_pagina': not cursor,
+        'parametros_filtro': parametros.urlencode(),
         'vendedores': vendedores,
         'search': search,
         'status_filter': status_filter,
@@ -3425,12 +3468,7 @@ def orders_list(request):
         ordenes = ordenes.filter(vendedor_asignado=request.user)
     
     if search:
-        ordenes = ordenes.filter(
-            Q(codigo__icontains=search) |
-            Q(nombre_cliente__icontains=search) |
-            Q(ruc_dni_cliente__icontains=search) |
-            Q(empresa_cliente__icontains=search)
-        )
+        ordenes = buscar(ordenes, search, 'orden_toma')
     
     if estado_filter:
         ordenes = ordenes.filter(estado=estado_filter)
@@ -3438,10 +3476,20 @@ def orders_list(request):
     if prioridad_filter:
         ordenes = ordenes.filter(prioridad=prioridad_filter)
 
-    total_ordenes = OrdenToma.objects.count()
-    ordenes_pendientes = OrdenToma.objects.filter(estado='pendiente').count()
-    ordenes_validadas = OrdenToma.objects.filter(estado='validado').count()
-    ordenes_completadas = OrdenToma.objects.filter(estado='completado').count()
+    # Estadísticas globales en una sola consulta, cacheadas hasta que cambie una orden
+    estadisticas = fragmentos.fragmento(
+        'orders_list:estadisticas', (fragmentos.ORDENES_TOMA,),
+        lambda: OrdenToma.objects.aggregate(
+            total=Count('id'),
+            pendientes=Count('id', filter=Q(estado='pendiente')),
+            validadas=Count('id', filter=Q(estado='validado')),
+            completadas=Count('id', filter=Q(estado='completado')),
+        )
+    )
+    total_ordenes = estadisticas['total']
+    ordenes_pendientes = estadisticas['pendientes']
+    ordenes_validadas = estadisticas['validadas']
+    ordenes_completadas = estadisticas['completadas']
 
     # Paginación
     paginator = Paginator(ordenes, 20)
@@ -3452,7 +3500,11 @@ def orders_list(request):
     except:
         ordenes_paginadas = paginator.page(1)
 
-    clientes = CustomUser.objects.filter(rol='cliente', is_active=True).order_by('empresa', 'first_name')
+    clientes = fragmentos.opciones(
+        'orders_list:clientes', (fragmentos.USUARIOS,),
+        _con_nombre_completo(CustomUser.objects.filter(rol='cliente', is_active=True).order_by('empresa', 'first_name')),
+        'nombre_completo', 'empresa', 'ruc_dni', 'ciudad', 'direccion_exacta', 'telefono', 'email'
+    )
 
     context = {
         'ordenes': ordenes_paginadas,
@@ -3781,25 +3833,23 @@ def orden_toma_descargar_validada_api(request, order_id):
         
         orden = get_object_or_404(OrdenToma, pk=order_id)
         
+        from apps.entrega_archivos import servir_archivo
+
         if orden.archivo_orden_firmada:
             file_name = f"Orden_Toma_Validada_{orden.codigo}.pdf"
-            response = FileResponse(
-                orden.archivo_orden_firmada.open('rb'),
-                content_type='application/pdf'
+            return servir_archivo(
+                request, orden.archivo_orden_firmada,
+                content_type='application/pdf', nombre_descarga=file_name, adjunto=True
             )
-            response['Content-Disposition'] = f'attachment; filename="{file_name}"'
-            return response
             
         # Fallback: Revisar si existe en la última orden generada (sistema antiguo/migración)
         ultima_generada = orden.ordenes_generadas.first()
         if ultima_generada and ultima_generada.archivo_orden_validada:
             file_name = f"Orden_Toma_Validada_{orden.codigo}_G.pdf"
-            response = FileResponse(
-                ultima_generada.archivo_orden_validada.open('rb'),
-                content_type='application/pdf'
+            return servir_archivo(
+                request, ultima_generada.archivo_orden_validada,
+                content_type='application/pdf', nombre_descarga=file_name, adjunto=True
             )
-            response['Content-Disposition'] = f'attachment; filename="{file_name}"'
-            return response
             
         else:
              return JsonResponse({
@@ -4555,11 +4605,21 @@ def ordenes_produccion_list(request):
         ordenes_con_abs.append(orden)
 
     # Estadísticas
-    total_ordenes = OrdenProduccion.objects.count()
-    ordenes_pendientes = OrdenProduccion.objects.filter(estado='pendiente').count()
-    ordenes_en_produccion = OrdenProduccion.objects.filter(estado='en_produccion').count()
-    ordenes_completadas = OrdenProduccion.objects.filter(estado='completado').count()
-    ordenes_validadas = OrdenProduccion.objects.filter(estado='validado').count()
+    estadisticas = fragmentos.fragmento(
+        'ordenes_produccion_list:estadisticas', (fragmentos.ORDENES_PRODUCCION,),
+        lambda: OrdenProduccion.objects.aggregate(
+            total=Count('id'),
+            pendientes=Count('id', filter=Q(estado='pendiente')),
+            en_produccion=Count('id', filter=Q(estado='en_produccion')),
+            completadas=Count('id', filter=Q(estado='completado')),
+            validadas=Count('id', filter=Q(estado='validado')),
+        )
+    )
+    total_ordenes = estadisticas['total']
+    ordenes_pendientes = estadisticas['pendientes']
+    ordenes_en_produccion = estadisticas['en_produccion']
+    ordenes_completadas = estadisticas['completadas']
+    ordenes_validadas = estadisticas['validadas']
 
     # Paginación
     paginator = Paginator(ordenes_con_abs, 20)
@@ -4571,7 +4631,11 @@ def ordenes_produccion_list(request):
         ordenes_paginadas = paginator.page(1)
 
     # Obtener productores para filtros
-    productores = CustomUser.objects.filter(rol='productor', is_active=True).order_by('first_name', 'last_name')
+    productores = fragmentos.opciones(
+        'ordenes_produccion_list:productores', (fragmentos.USUARIOS,),
+        _con_nombre_completo(CustomUser.objects.filter(rol='productor', is_active=True).order_by('first_name', 'last_name')),
+        'nombre_completo'
+    )
 
     context = {
         'ordenes': ordenes_paginadas,
@@ -5071,19 +5135,15 @@ def parte_mortorios_list(request):
         cliente_filter = request.GET.get('cliente', '')
         fecha_filter = request.GET.get('fecha', '')
         
+        # Las cuñas asociadas de la página se cargan con una sola consulta
         partes = ParteMortorio.objects.select_related(
             'cliente', 'creado_por'
-        ).all().order_by('-fecha_solicitud')
+        ).prefetch_related(
+            Prefetch('cuñas', to_attr='cunas_asociadas')
+        ).order_by('-fecha_solicitud')
         
         if search:
-            partes = partes.filter(
-                Q(codigo__icontains=search) |
-                Q(nombre_fallecido__icontains=search) |
-                Q(dni_fallecido__icontains=search) |
-                Q(nombre_esposa__icontains=search) |
-                Q(nombres_hijos__icontains=search) |
-                Q(familiares_adicionales__icontains=search)
-            )
+            partes = buscar(partes, search, 'parte_mortorio')
         
         if estado_filter:
             partes = partes.filter(estado=estado_filter)
@@ -5102,17 +5162,32 @@ def parte_mortorios_list(request):
                 # Si la fecha no es válida, ignorar el filtro
                 pass
         
-        # Estadísticas
-        total_partes = partes.count()
-        partes_pendientes = partes.filter(estado='pendiente').count()
-        partes_al_aire = partes.filter(estado='al_aire').count()
-        partes_finalizados = partes.filter(estado='finalizado').count()
+        # Estadísticas en una sola consulta; sin filtros son globales y se cachean
+        def calcular_estadisticas():
+            return partes.order_by().aggregate(
+                total=Count('id'),
+                pendientes=Count('id', filter=Q(estado='pendiente')),
+                al_aire=Count('id', filter=Q(estado='al_aire')),
+                finalizados=Count('id', filter=Q(estado='finalizado')),
+            )
+        
+        if any((search, estado_filter, urgencia_filter, cliente_filter, fecha_filter)):
+            estadisticas = calcular_estadisticas()
+        else:
+            estadisticas = fragmentos.fragmento(
+                'parte_mortorios_list:estadisticas', (fragmentos.PARTES,), calcular_estadisticas
+            )
+        total_partes = estadisticas['total']
+        partes_pendientes = estadisticas['pendientes']
+        partes_al_aire = estadisticas['al_aire']
+        partes_finalizados = estadisticas['finalizados']
         
         # Obtener clientes para filtro
-        clientes = CustomUser.objects.filter(
-            rol='cliente',
-            is_active=True
-        ).order_by('first_name', 'last_name')
+        clientes = fragmentos.opciones(
+            'parte_mortorios_list:clientes', (fragmentos.USUARIOS,),
+            _con_nombre_completo(CustomUser.objects.filter(rol='cliente', is_active=True).order_by('first_name', 'last_name')),
+            'nombre_completo', 'empresa'
+        )
         
         # Paginación
         paginator = Paginator(partes, 20)
@@ -5125,17 +5200,6 @@ def parte_mortorios_list(request):
         except EmptyPage:
             partes_paginadas = paginator.page(paginator.num_pages)
         
-        # ✅ PARA CADA PARTE, OBTENER CUÑAS ASOCIADAS
-        for parte in partes_paginadas:
-            try:
-                from apps.content_management.models import CuñaPublicitaria
-                parte.cunas_asociadas = CuñaPublicitaria.objects.filter(
-                    tags__contains=f"parte_mortorio,{parte.codigo}"
-                )
-            except Exception as e:
-                parte.cunas_asociadas = []
-                print(f"⚠️ Error obteniendo cuñas para parte {parte.codigo}: {str(e)}")
-        
         context = {
             'partes': partes_paginadas,
             'total_partes': total_partes,
@@ -5200,11 +5264,7 @@ def parte_mortorio_detail_api(request, parte_id):
         # Obtener cuñas asociadas
         cunas_asociadas = []
         try:
-            from apps.content_management.models import CuñaPublicitaria
-            cunas = CuñaPublicitaria.objects.filter(
-                tags__contains=f"parte_mortorio,{parte.codigo}"
-            )
-            for cuna in cunas:
+            for cuna in parte.cuñas.all():
                 cunas_asociadas.append({
                     'id': cuna.id,
                     'codigo': cuna.codigo,
@@ -5406,44 +5466,10 @@ def crear_cuña_desde_parte_mortorio(parte_mortorio, usuario):
     """
     Función para crear automáticamente una cuña publicitaria desde un parte mortorio
     """
-    from apps.content_management.models import CuñaPublicitaria
-    from decimal import Decimal
+    from apps.parte_mortorios.lote import construir_cuña
     
-    # Calcular duración en segundos (usar duración de transmisión del parte mortorio)
-    duracion_segundos = parte_mortorio.duracion_transmision or 30
-    
-    # Calcular precio por segundo basado en el precio total del parte mortorio
-    precio_por_segundo = parte_mortorio.precio_total / Decimal(str(duracion_segundos))
-    
-    # Crear título descriptivo para la cuña (Solo nombre del fallecido)
-    titulo_cuña = parte_mortorio.nombre_fallecido
-    
-    # Crear descripción con información del fallecido
-    descripcion = f"Transmisión por fallecimiento de {parte_mortorio.nombre_fallecido}"
-    if parte_mortorio.edad_fallecido:
-        descripcion += f", {parte_mortorio.edad_fallecido} años"
-    if parte_mortorio.nombre_esposa:
-        descripcion += f". Esposa: {parte_mortorio.nombre_esposa}"
-    
-    # Crear la cuña publicitaria
-    cuña = CuñaPublicitaria.objects.create(
-        titulo=titulo_cuña,
-        descripcion=descripcion,
-        cliente=parte_mortorio.cliente,
-        vendedor_asignado=parte_mortorio.creado_por if parte_mortorio.creado_por else None,
-        duracion_planeada=duracion_segundos,
-        repeticiones_dia=parte_mortorio.repeticiones_dia or 1,
-        fecha_inicio=parte_mortorio.fecha_inicio_transmision or timezone.now().date(),
-        fecha_fin=parte_mortorio.fecha_fin_transmision or (timezone.now().date() + timedelta(days=7)),
-        precio_por_segundo=precio_por_segundo,
-        precio_total=parte_mortorio.precio_total,
-        estado='activa',  # La cuña se crea activa por defecto
-        observaciones=f"Cuña generada automáticamente desde parte mortorio {parte_mortorio.codigo}",
-        created_by=usuario
-    )
-    
-    # Agregar tags para identificar que fue creada desde parte mortorio
-    cuña.tags = f"parte_mortorio,transmision_fallecimiento,{parte_mortorio.codigo}"
+    # Título, descripción, fechas y precio por segundo salen del parte mortorio
+    cuña = construir_cuña(parte_mortorio, usuario)
     cuña.save()
     
     # Registrar en historial de la cuña
@@ -5461,6 +5487,48 @@ def crear_cuña_desde_parte_mortorio(parte_mortorio, usuario):
     
     return cuña
 
+@login_required
+@user_passes_test(is_admin)
+@require_http_methods(["POST"])
+def parte_mortorio_lote_api(request):
+    """
+    API para ingresar varios partes mortorios a la vez: {"partes": [...]} con
+    los mismos campos que la creación individual. Si algún parte tiene errores
+    no se crea ninguno.
+    """
+    from apps.parte_mortorios.lote import LoteInvalido, crear_partes_en_lote
+    
+    try:
+        data = json.loads(request.body)
+    except (ValueError, TypeError):
+        return JsonResponse({'success': False, 'error': 'JSON inválido'}, status=400)
+    
+    try:
+        creados = crear_partes_en_lote(data.get('partes') if isinstance(data, dict) else None, request.user)
+    except LoteInvalido as e:
+        return JsonResponse({
+            'success': False,
+            'error': 'El lote tiene partes con errores; no se creó ninguno',
+            'errores': e.errores
+        }, status=400)
+    except Exception as e:
+        import traceback
+        print("❌ ERROR en parte_mortorio_lote_api:")
+        print(traceback.format_exc())
+        return JsonResponse({
+            'success': False,
+            'error': f'Error al crear el lote de partes mortorios: {str(e)}'
+        }, status=500)
+    
+    return JsonResponse({
+        'success': True,
+        'message': f'{len(creados)} partes mortorios creados exitosamente',
+        'partes': [
+            {'parte_id': parte.id, 'codigo': parte.codigo, 'cuña_creada': cuña.codigo}
+            for parte, cuña in creados
+        ]
+    })
+
 @login_required
 @user_passes_test(is_admin)
 @require_http_methods(["PUT", "POST"])
@@ -5615,16 +5683,10 @@ def actualizar_cuña_desde_parte_mortorio(parte_mortorio, usuario):
     """
     Función para actualizar la cuña asociada a un parte mortorio
     """
-    from apps.content_management.models import CuñaPublicitaria
-    
-    # Buscar cuñas asociadas a este parte mortorio (por tags o título)
-    cuñas_asociadas = CuñaPublicitaria.objects.filter(
-        tags__contains=f"parte_mortorio,{parte_mortorio.codigo}"
-    )
+    # Cuña asociada a este parte mortorio
+    cuña = parte_mortorio.cuñas.first()
     
-    if cuñas_asociadas.exists():
-        cuña = cuñas_asociadas.first()
-        
+    if cuña:
         # Actualizar información de la cuña
         cuña.titulo = f"Parte Mortorio - {parte_mortorio.nombre_fallecido}"
         cuña.descripcion = f"Transmisión por fallecimiento de {parte_mortorio.nombre_fallecido}"
@@ -5657,19 +5719,15 @@ def parte_mortorio_delete_api(request, parte_id):
     """API para eliminar un parte mortorio - CON ELIMINACIÓN DE CUÑA ASOCIADA"""
     try:
         from .models import ParteMortorio
-        from apps.content_management.models import CuñaPublicitaria
         
         parte = get_object_or_404(ParteMortorio, pk=parte_id)
         codigo = parte.codigo
         
         # ✅ ELIMINAR CUÑAS ASOCIADAS
         try:
-            cuñas_asociadas = CuñaPublicitaria.objects.filter(
-                tags__contains=f"parte_mortorio,{codigo}"
-            )
-            if cuñas_asociadas.exists():
-                cuñas_count = cuñas_asociadas.count()
-                cuñas_asociadas.delete()
+            cuñas_count = parte.cuñas.count()
+            if cuñas_count:
+                parte.cuñas.all().delete()
                 print(f"✅ Eliminadas {cuñas_count} cuñas asociadas al parte mortorio {codigo}")
         except Exception as e:
             print(f"⚠️ Error eliminando cuñas asociadas: {str(e)}")
@@ -6271,2247 +6329,74 @@ def parte_mortorio_descargar_api(request, parte_generado_id):
     except Exception as e:
         messages.error(request, f'Error al descargar el parte: {str(e)}')
         return redirect('custom_admin:parte_mortorios_list')
-# ==================== VISTAS DE REPORTES DE CONTRATOS ====================
+# =============================================================================
+# VISTAS PRINCIPALES DE PROGRAMACIÓN CANAL - MODALES
+# =============================================================================
 @login_required
-@user_passes_test(lambda u: u.es_admin or u.es_doctor)
-def reports_dashboard_contratos(request):
-    """Dashboard principal de contratos - ACTUALIZADO con gráficas Plotly - Accesible para Admin y Doctor"""
+def programacion_list(request):
+    """
+    Vista ÚNICA de programación con todo integrado - Modales
+    """
+    try:
+        from apps.programacion_canal.models import Programa, ProgramacionSemanal, BloqueProgramacion, CategoriaPrograma
+        from apps.programacion_canal.forms import ProgramaForm, ProgramacionSemanalForm, BloqueProgramacionForm
+        PROGRAMACION_AVAILABLE = True
+    except ImportError:
+        PROGRAMACION_AVAILABLE = False
+        messages.error(request, 'Módulo de Programación no disponible')
+        return redirect('custom_admin:dashboard')
     
-    # Verificar disponibilidad de modelos
-    if not CONTENT_MODELS_AVAILABLE:
-        context = {
-            'error': 'Módulo de Contratos no disponible',
-            'mensaje': 'No se pueden cargar los reportes en este momento.',
-            'models_available': False,
-            'total_contratos': 0,
-            'contratos_activos': 0,
-            'contratos_pendientes': 0,
-            'contratos_por_vencer': 0,
-            'contratos_vencidos': 0,
-            'contratos_cancelados': 0,
-            'ingresos_totales': Decimal('0.00'),
-            'ingresos_activos': Decimal('0.00'),
-            'contratos_recientes': [],
-            'grafica_pastel_html': '',
-            'grafica_barras_html': '',
-        }
-        return render(request, 'custom_admin/reports/contratos/list.html', context)
+    # Obtener datos para la vista
+    programas = Programa.objects.all().order_by('nombre')
+    programaciones = ProgramacionSemanal.objects.all().order_by('-fecha_inicio_semana')
     
-    try:
+    # OBTENER CATEGORÍAS ACTIVAS PARA EL COMBOBOX
+    categorias_activas = CategoriaPrograma.objects.filter(estado='activo').order_by('orden', 'nombre')
+    
+    # Obtener parámetro de semana
+    programacion_id = request.GET.get('programacion_id')
+    programacion_actual = None
+    
+    if programacion_id:
+        # Si se especifica una programación específica
+        programacion_actual = get_object_or_404(ProgramacionSemanal, id=programacion_id)
+    else:
+        # Obtener programación actual para el calendario (semana actual)
+        from django.utils import timezone
+        from datetime import timedelta
         hoy = timezone.now().date()
+        inicio_semana = hoy - timedelta(days=hoy.weekday())
         
-        # Contratos por estado con manejo de errores
-        try:
-            total_contratos = ContratoGenerado.objects.count()
-        except Exception as e:
-            print(f"❌ Error contando contratos: {e}")
-            total_contratos = 0
-        
-        # ✅ CORREGIDO: Contratos "activos" son los que tienen estado 'validado' (con cuñas)
-        try:
-            contratos_activos = ContratoGenerado.objects.filter(estado='validado').count()
-        except Exception as e:
-            print(f"❌ Error contando contratos activos: {e}")
-            contratos_activos = 0
-        
-        # ✅ CORREGIDO: Contratos pendientes son los que tienen estado 'generado'
-        try:
-            contratos_pendientes = ContratoGenerado.objects.filter(estado='generado').count()
-        except Exception as e:
-            print(f"❌ Error contando contratos pendientes: {e}")
-            contratos_pendientes = 0
-        
-        # ✅ CORREGIDO: Contratos por vencer (validados que están cerca de vencer)
-        try:
-            fecha_limite_vencimiento = hoy + timedelta(days=30)
-            contratos_por_vencer = ContratoGenerado.objects.filter(
-                estado='validado',  # Solo los validados pueden vencer
-                cuña__fecha_fin__lte=fecha_limite_vencimiento,
-                cuña__fecha_fin__gte=hoy
-            ).count()
-        except Exception as e:
-            print(f"❌ Error contando contratos por vencer: {e}")
-            contratos_por_vencer = 0
-        
-        # ✅ CORREGIDO: Contratos vencidos (validados cuya fecha fin ya pasó)
-        try:
-            contratos_vencidos = ContratoGenerado.objects.filter(
-                estado='validado',  # Solo los validados pueden estar vencidos
-                cuña__fecha_fin__lt=hoy
-            ).count()
-        except Exception as e:
-            print(f"❌ Error contando contratos vencidos: {e}")
-            contratos_vencidos = 0
-        
-        # ✅ CORREGIDO: Contratos cancelados
-        try:
-            contratos_cancelados = ContratoGenerado.objects.filter(estado='cancelado').count()
-        except Exception as e:
-            print(f"❌ Error contando contratos cancelados: {e}")
-            contratos_cancelados = 0
-        
-        # Ingresos con manejo de errores
-        try:
-            ingresos_totales_result = ContratoGenerado.objects.aggregate(
-                total=Sum('valor_total')
-            )
-            ingresos_totales = ingresos_totales_result['total'] or Decimal('0.00')
-        except Exception as e:
-            print(f"❌ Error calculando ingresos totales: {e}")
-            ingresos_totales = Decimal('0.00')
-        
-        # ✅ CORREGIDO: Ingresos de contratos validados (activos)
-        try:
-            ingresos_activos_result = ContratoGenerado.objects.filter(estado='validado').aggregate(
-                total=Sum('valor_total')
-            )
-            ingresos_activos = ingresos_activos_result['total'] or Decimal('0.00')
-        except Exception as e:
-            print(f"❌ Error calculando ingresos activos: {e}")
-            ingresos_activos = Decimal('0.00')
-        
-        # ✅ CORREGIDO: Ingresos de contratos pendientes
-        try:
-            ingresos_pendientes_result = ContratoGenerado.objects.filter(estado='generado').aggregate(
-                total=Sum('valor_total')
-            )
-            ingresos_pendientes = ingresos_pendientes_result['total'] or Decimal('0.00')
-        except Exception as e:
-            print(f"❌ Error calculando ingresos pendientes: {e}")
-            ingresos_pendientes = Decimal('0.00')
+        programacion_actual = ProgramacionSemanal.objects.filter(
+            fecha_inicio_semana=inicio_semana,
+            estado='publicada'
+        ).first()
         
-        # Contratos recientes
-        try:
-            contratos_recientes = ContratoGenerado.objects.select_related(
-                'cliente', 'cuña', 'plantilla_usada'
-            ).order_by('-fecha_generacion')[:10]
+        # Si no hay programación para la semana actual, usar la más reciente
+        if not programacion_actual and programaciones.exists():
+            programacion_actual = programaciones.first()
+    
+    # Obtener bloques para el calendario
+    bloques_semana = []
+    if programacion_actual:
+        bloques_semana = BloqueProgramacion.objects.filter(
+            programacion_semanal=programacion_actual
+        ).select_related('programa').order_by('dia_semana', 'hora_inicio')
+    
+    # Configuración del calendario
+    dias_semana = ['Lunes', 'Martes', 'Miércoles', 'Jueves', 'Viernes', 'Sábado', 'Domingo']
+    horas_dia = []
+    for hora in range(0, 24):
+        for minuto in [0, 30]:
+            horas_dia.append(f"{hora:02d}:{minuto:02d}")
             
-            # Asegurarnos de que cada contrato tenga el método get_estado_display
-            for contrato in contratos_recientes:
-                if not hasattr(contrato, 'get_estado_display'):
-                    contrato.get_estado_display = lambda: dict(ContratoGenerado.ESTADO_CHOICES).get(contrato.estado, contrato.estado)
-                    
-        except Exception as e:
-            print(f"❌ Error obteniendo contratos recientes: {e}")
-            contratos_recientes = []
-        
-        # ==================== GRÁFICAS CON PLOTLY ====================
-        
-        # 1. Gráfico de pastel - Contratos por Estado
-        datos_estados = {
-            'Estado': ['Validados', 'Pendientes', 'Por Vencer', 'Vencidos', 'Cancelados'],
-            'Cantidad': [contratos_activos, contratos_pendientes, contratos_por_vencer, contratos_vencidos, contratos_cancelados]
-        }
-        
-        fig_pastel = px.pie(
-            datos_estados,
-            values='Cantidad',
-            names='Estado',
-            title='Contratos por Estado',
-            color='Estado',
-            color_discrete_map={
-                'Validados': '#28a745',
-                'Pendientes': '#ffc107',
-                'Por Vencer': '#17a2b8', 
-                'Vencidos': '#dc3545',
-                'Cancelados': '#6c757d'
-            }
-        )
-        
-        fig_pastel.update_traces(
-            textposition='inside',
-            textinfo='percent+label',
-            hovertemplate='<b>%{label}</b><br>Cantidad: %{value}<br>Porcentaje: %{percent}'
-        )
-        
-        fig_pastel.update_layout(
-            height=400,
-            showlegend=True,
-            legend=dict(
-                orientation="h",
-                yanchor="bottom",
-                y=-0.3,
-                xanchor="center",
-                x=0.5
-            )
-        )
-        
-        # 2. Gráfico de barras - Ingresos Mensuales (últimos 6 meses)
-        ingresos_mensuales = []
-        meses_nombres = []
-        
-        try:
-            for i in range(5, -1, -1):
-                mes_fecha = hoy - timedelta(days=30*i)
-                mes_str = mes_fecha.strftime('%Y-%m')
-                mes_nombre = mes_fecha.strftime('%b %Y')
-                
-                # Calcular ingresos del mes
-                ingresos_mes_result = ContratoGenerado.objects.filter(
-                    fecha_generacion__year=mes_fecha.year,
-                    fecha_generacion__month=mes_fecha.month
-                ).aggregate(total=Sum('valor_total'))
-                
-                ingresos_mes = ingresos_mes_result['total'] or Decimal('0.00')
-                
-                ingresos_mensuales.append(float(ingresos_mes))
-                meses_nombres.append(mes_nombre)
-                
-        except Exception as e:
-            print(f"❌ Error calculando ingresos mensuales: {e}")
-            # Datos de ejemplo en caso de error
-            for i in range(6):
-                ingresos_mensuales.append(0)
-                meses_nombres.append(f'Mes {i+1}')
-        
-        datos_ingresos = {
-            'Mes': meses_nombres,
-            'Ingresos': ingresos_mensuales
-        }
-        
-        fig_barras = px.bar(
-            datos_ingresos,
-            x='Mes',
-            y='Ingresos',
-            title='Ingresos Mensuales',
-            color='Ingresos',
-            color_continuous_scale='Blues'
-        )
-        
-        fig_barras.update_traces(
-            hovertemplate='<b>%{x}</b><br>Ingresos: $%{y:,.2f}'
-        )
-        
-        fig_barras.update_layout(
-            height=400,
-            xaxis_title="Mes",
-            yaxis_title="Ingresos ($)",
-            coloraxis_showscale=False
-        )
-        
-        # Formatear ejes
-        fig_barras.update_yaxes(tickprefix="$", tickformat=",.")
-        
-        # Convertir gráficas a HTML
-        grafica_pastel_html = pyo.plot(fig_pastel, output_type='div', include_plotlyjs=False)
-        grafica_barras_html = pyo.plot(fig_barras, output_type='div', include_plotlyjs=False)
-        
-        context = {
-            'total_contratos': total_contratos,
-            'contratos_activos': contratos_activos,
-            'contratos_pendientes': contratos_pendientes,
-            'contratos_por_vencer': contratos_por_vencer,
-            'contratos_vencidos': contratos_vencidos,
-            'contratos_cancelados': contratos_cancelados,
-            'ingresos_totales': ingresos_totales,
-            'ingresos_activos': ingresos_activos,
-            'ingresos_pendientes': ingresos_pendientes,
-            'contratos_recientes': contratos_recientes,
-            'grafica_pastel_html': grafica_pastel_html,
-            'grafica_barras_html': grafica_barras_html,
-            'models_available': True,
-        }
-        
-        print(f"✅ Dashboard de Reportes cargado exitosamente:")
-        print(f"   - Total contratos: {total_contratos}")
-        print(f"   - Activos (validados): {contratos_activos}")
-        print(f"   - Pendientes (generados): {contratos_pendientes}")
-        print(f"   - Por vencer: {contratos_por_vencer}")
-        print(f"   - Vencidos: {contratos_vencidos}")
-        print(f"   - Cancelados: {contratos_cancelados}")
-        print(f"   - Ingresos totales: {ingresos_totales}")
-        print(f"   - Ingresos activos: {ingresos_activos}")
-        print(f"   - Ingresos pendientes: {ingresos_pendientes}")
-        print(f"   - Contratos recientes: {len(contratos_recientes)}")
-        
-        return render(request, 'custom_admin/reports/contratos/list.html', context)
-        
-    except Exception as e:
-        print(f"❌ ERROR CRÍTICO en reports_dashboard_contratos: {e}")
-        import traceback
-        traceback.print_exc()
-        
-        context = {
-            'error': 'Error al cargar el dashboard',
-            'mensaje': str(e),
-            'models_available': False,
-            'total_contratos': 0,
-            'contratos_activos': 0,
-            'contratos_pendientes': 0,
-            'contratos_por_vencer': 0,
-            'contratos_vencidos': 0,
-            'contratos_cancelados': 0,
-            'ingresos_totales': Decimal('0.00'),
-            'ingresos_activos': Decimal('0.00'),
-            'ingresos_pendientes': Decimal('0.00'),
-            'contratos_recientes': [],
-            'grafica_pastel_html': '',
-            'grafica_barras_html': '',
-        }
-        return render(request, 'custom_admin/reports/contratos/list.html', context)
-@login_required
-@user_passes_test(is_admin)
-def reports_api_estadisticas_contratos(request):
-    hoy = timezone.now().date()
-    # Contratos por estado (puedes ajustar la lista de estados si necesitas)
-    contratos_por_estado = list(
-        ContratoGenerado.objects.values('estado').annotate(total=Count('id')).order_by('estado')
-    )
-
-    # Ingresos por mes (últimos 6 meses)
-    ingresos_mensuales = []
-    for i in range(5, -1, -1):
-        mes_fecha = hoy - timezone.timedelta(days=30 * i)
-        mes_nombre = mes_fecha.strftime('%Y-%m')
-        ingreso_mes = (
-            ContratoGenerado.objects
-            .filter(fecha_generacion__year=mes_fecha.year, fecha_generacion__month=mes_fecha.month)
-            .aggregate(total=Sum('valor_total'))['total'] or Decimal('0.00')
-        )
-        ingresos_mensuales.append({'mes': mes_nombre, 'ingresos': float(ingreso_mes)})
-
-    # DEVOLVER claves TAL CUAL espera tu frontend
-    return JsonResponse({
-        'success': True,
-        'contratosporestado': contratos_por_estado,
-        'ingresosmensuales': ingresos_mensuales
-    })
-@login_required
-@user_passes_test(is_admin)
-def reports_vencimiento_contratos(request):
-    """Genera reporte de contratos por vencimiento - CON MANEJO DE ERRORES"""
-    
-    if not CONTENT_MODELS_AVAILABLE:
-        messages.error(request, 'Módulo de Contratos no disponible')
-        return redirect('custom_admin:reports_dashboard_contratos')
-    
-    try:
-        hoy = timezone.now().date()
-        dias_aviso = int(request.GET.get('dias_aviso', 30))
-        formato = request.GET.get('formato', 'html')
-        
-        fecha_limite = hoy + timedelta(days=dias_aviso)
-        
-        # Contratos por vencer
-        try:
-            contratos_por_vencer = ContratoGenerado.objects.filter(
-                estado='activo',
-                cuña__fecha_fin__lte=fecha_limite,
-                cuña__fecha_fin__gte=hoy
-            ).select_related('cliente', 'cuña').order_by('cuña__fecha_fin')
-        except Exception as e:
-            print(f"❌ Error obteniendo contratos por vencer: {e}")
-            contratos_por_vencer = []
-        
-        # Contratos vencidos
-        try:
-            contratos_vencidos = ContratoGenerado.objects.filter(
-                estado='activo',
-                cuña__fecha_fin__lt=hoy
-            ).select_related('cliente', 'cuña').order_by('cuña__fecha_fin')
-        except Exception as e:
-            print(f"❌ Error obteniendo contratos vencidos: {e}")
-            contratos_vencidos = []
-        
-        # Contratos con buena vigencia
-        try:
-            contratos_vigentes = ContratoGenerado.objects.filter(
-                estado='activo',
-                cuña__fecha_fin__gt=fecha_limite
-            ).select_related('cliente', 'cuña').order_by('cuña__fecha_fin')
-        except Exception as e:
-            print(f"❌ Error obteniendo contratos vigentes: {e}")
-            contratos_vigentes = []
-        
-        # Exportar si se solicita
-        if formato == 'csv':
-            return _generar_reporte_csv_vencimiento(contratos_por_vencer, contratos_vencidos, contratos_vigentes)
-        elif formato == 'excel':
-            return _generar_reporte_excel_vencimiento(contratos_por_vencer, contratos_vencidos, contratos_vigentes)
-        
-        context = {
-            'contratos_por_vencer': contratos_por_vencer,
-            'contratos_vencidos': contratos_vencidos,
-            'contratos_vigentes': contratos_vigentes,
-            'dias_aviso': dias_aviso,
-            'fecha_limite': fecha_limite,
-            'fecha_reporte': timezone.now().strftime('%d/%m/%Y %H:%M'),
-        }
-        
-        return render(request, 'custom_admin/reports/vencimiento_contratos.html', context)
-        
-    except Exception as e:
-        print(f"❌ ERROR en reports_vencimiento_contratos: {e}")
-        messages.error(request, f'Error al generar el reporte: {str(e)}')
-        return redirect('custom_admin:reports_dashboard_contratos')
-
-@login_required
-@user_passes_test(is_admin)
-def reports_ingresos_contratos(request):
-    """Genera reporte de ingresos por contratos - CON MANEJO DE ERRORES"""
-    
-    if not CONTENT_MODELS_AVAILABLE:
-        messages.error(request, 'Módulo de Contratos no disponible')
-        return redirect('custom_admin:reports_dashboard_contratos')
-    
-    try:
-        # Parámetros
-        fecha_inicio = request.GET.get('fecha_inicio')
-        fecha_fin = request.GET.get('fecha_fin')
-        agrupar_por = request.GET.get('agrupar_por', 'mes')
-        formato = request.GET.get('formato', 'html')
-        
-        # Base query
-        contratos = ContratoGenerado.objects.select_related('cliente', 'cuña').all()
-        
-        if fecha_inicio:
-            contratos = contratos.filter(fecha_generacion__date__gte=fecha_inicio)
-        if fecha_fin:
-            contratos = contratos.filter(fecha_generacion__date__lte=fecha_fin)
-        
-        # Agrupar datos
-        ingresos_data = []
-        try:
-            if agrupar_por == 'mes':
-                # Para PostgreSQL
-                ingresos_data = contratos.extra(
-                    select={'periodo': "TO_CHAR(fecha_generacion, 'YYYY-MM')"}
-                ).values('periodo').annotate(
-                    total_contratos=Count('id'),
-                    ingresos_totales=Sum('valor_total'),
-                    promedio_contrato=Avg('valor_total')
-                ).order_by('periodo')
-            elif agrupar_por == 'estado':
-                ingresos_data = contratos.values('estado').annotate(
-                    total_contratos=Count('id'),
-                    ingresos_totales=Sum('valor_total'),
-                    promedio_contrato=Avg('valor_total')
-                ).order_by('estado')
-            elif agrupar_por == 'cliente':
-                ingresos_data = contratos.values('cliente__empresa', 'cliente__ruc_dni').annotate(
-                    total_contratos=Count('id'),
-                    ingresos_totales=Sum('valor_total'),
-                    promedio_contrato=Avg('valor_total')
-                ).order_by('-ingresos_totales')
-        except Exception as e:
-            print(f"❌ Error agrupando datos: {e}")
-            # Datos vacíos en caso de error
-            ingresos_data = []
-        
-        # Exportar si se solicita
-        if formato == 'csv':
-            return _generar_reporte_csv_ingresos(ingresos_data, agrupar_por)
-        elif formato == 'excel':
-            return _generar_reporte_excel_ingresos(ingresos_data, agrupar_por)
-        
-        context = {
-            'ingresos_data': ingresos_data,
-            'agrupar_por': agrupar_por,
-            'fecha_inicio': fecha_inicio,
-            'fecha_fin': fecha_fin,
-            'total_ingresos': contratos.aggregate(total=Sum('valor_total'))['total'] or Decimal('0.00'),
-            'fecha_reporte': timezone.now().strftime('%d/%m/%Y %H:%M'),
-        }
-        
-        return render(request, 'custom_admin/reports/ingresos_contratos.html', context)
-        
-    except Exception as e:
-        print(f"❌ ERROR en reports_ingresos_contratos: {e}")
-        messages.error(request, f'Error al generar el reporte: {str(e)}')
-        return redirect('custom_admin:reports_dashboard_contratos')
-
-# ==================== FUNCIONES AUXILIARES PARA EXPORTACIÓN ====================
-
-def _generar_reporte_csv_estado(contratos_por_estado, detalle_estados):
-    """Genera reporte CSV para estado de contratos"""
-    try:
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = 'attachment; filename="reporte_estado_contratos.csv"'
-        
-        writer = csv.writer(response)
-        writer.writerow(['Reporte de Contratos por Estado', datetime.now().strftime('%d/%m/%Y %H:%M')])
-        writer.writerow([])
-        writer.writerow(['Estado', 'Cantidad', 'Valor Total'])
-        
-        for item in contratos_por_estado:
-            writer.writerow([
-                dict(ContratoGenerado.ESTADO_CHOICES).get(item['estado'], item['estado']),
-                item['total'],
-                item['valor_total']
-            ])
-        
-        return response
-    except Exception as e:
-        print(f"❌ Error generando CSV: {e}")
-        return HttpResponse("Error al generar el archivo CSV")
-
-def _generar_reporte_csv_vencimiento(por_vencer, vencidos, vigentes):
-    """Genera reporte CSV para vencimiento de contratos"""
-    try:
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = 'attachment; filename="reporte_vencimiento_contratos.csv"'
-        
-        writer = csv.writer(response)
-        writer.writerow(['Reporte de Contratos por Vencimiento', datetime.now().strftime('%d/%m/%Y %H:%M')])
-        writer.writerow([])
-        
-        # Contratos por vencer
-        writer.writerow(['CONTRATOS POR VENCER'])
-        writer.writerow(['Código', 'Cliente', 'Fecha Fin', 'Días Restantes', 'Valor'])
-        for contrato in por_vencer:
-            dias_restantes = (contrato.cuña.fecha_fin - timezone.now().date()).days
-            writer.writerow([
-                contrato.numero_contrato,
-                contrato.nombre_cliente,
-                contrato.cuña.fecha_fin.strftime('%d/%m/%Y'),
-                dias_restantes,
-                contrato.valor_total
-            ])
-        
-        writer.writerow([])
-        
-        # Contratos vencidos
-        writer.writerow(['CONTRATOS VENCIDOS'])
-        writer.writerow(['Código', 'Cliente', 'Fecha Fin', 'Días Vencidos', 'Valor'])
-        for contrato in vencidos:
-            dias_vencidos = (timezone.now().date() - contrato.cuña.fecha_fin).days
-            writer.writerow([
-                contrato.numero_contrato,
-                contrato.nombre_cliente,
-                contrato.cuña.fecha_fin.strftime('%d/%m/%Y'),
-                dias_vencidos,
-                contrato.valor_total
-            ])
-        
-        return response
-    except Exception as e:
-        print(f"❌ Error generando CSV vencimiento: {e}")
-        return HttpResponse("Error al generar el archivo CSV")
-# ==================== REPORTES DE CONTRATOS - FUNCIONES FALTANTES ====================
-
-@login_required
-@user_passes_test(is_admin)
-def reports_estado_contratos(request):
-    """Genera reporte de contratos por estado - CON MANEJO DE ERRORES"""
-    
-    if not CONTENT_MODELS_AVAILABLE:
-        messages.error(request, 'Módulo de Contratos no disponible')
-        return redirect('custom_admin:reports_dashboard_contratos')
-    
-    try:
-        # Parámetros del reporte
-        fecha_inicio = request.GET.get('fecha_inicio')
-        fecha_fin = request.GET.get('fecha_fin')
-        formato = request.GET.get('formato', 'html')
-        
-        # Filtrar contratos
-        contratos = ContratoGenerado.objects.select_related(
-            'cliente', 'cuña', 'plantilla_usada'
-        ).all()
-        
-        if fecha_inicio:
-            contratos = contratos.filter(fecha_generacion__date__gte=fecha_inicio)
-        if fecha_fin:
-            contratos = contratos.filter(fecha_generacion__date__lte=fecha_fin)
-        
-        # Agrupar por estado
-        try:
-            contratos_por_estado = contratos.values('estado').annotate(
-                total=Count('id'),
-                valor_total=Sum('valor_total')
-            ).order_by('estado')
-        except Exception as e:
-            print(f"❌ Error agrupando por estado: {e}")
-            contratos_por_estado = []
-        
-        # Detalle por estado
-        detalle_estados = {}
-        estados = ['borrador', 'generado', 'enviado', 'firmado', 'validado', 'vencido', 'cancelado']
-        
-        for estado in estados:
-            try:
-                detalle_estados[estado] = list(contratos.filter(estado=estado))
-            except Exception as e:
-                print(f"❌ Error obteniendo detalle para estado {estado}: {e}")
-                detalle_estados[estado] = []
-        
-        # Exportar si se solicita
-        if formato == 'csv':
-            return _generar_reporte_csv_estado(contratos_por_estado, detalle_estados)
-        elif formato == 'excel':
-            return _generar_reporte_excel_estado(contratos_por_estado, detalle_estados)
-        
-        context = {
-            'contratos_por_estado': contratos_por_estado,
-            'detalle_estados': detalle_estados,
-            'fecha_inicio': fecha_inicio,
-            'fecha_fin': fecha_fin,
-            'total_contratos': contratos.count(),
-            'fecha_reporte': timezone.now().strftime('%d/%m/%Y %H:%M'),
-        }
-        
-        return render(request, 'custom_admin/reports/contratos/estado.html', context)
-        
-    except Exception as e:
-        print(f"❌ ERROR en reports_estado_contratos: {e}")
-        messages.error(request, f'Error al generar el reporte: {str(e)}')
-        return redirect('custom_admin:reports_dashboard_contratos')
-
-@login_required
-@user_passes_test(is_admin)
-def reports_vencimiento_contratos(request):
-    """Genera reporte de contratos por vencimiento - CON MANEJO DE ERRORES"""
-    
-    if not CONTENT_MODELS_AVAILABLE:
-        messages.error(request, 'Módulo de Contratos no disponible')
-        return redirect('custom_admin:reports_dashboard_contratos')
-    
-    try:
-        hoy = timezone.now().date()
-        dias_aviso = int(request.GET.get('dias_aviso', 30))
-        formato = request.GET.get('formato', 'html')
-        
-        fecha_limite = hoy + timedelta(days=dias_aviso)
-        
-        # Contratos por vencer (solo los validados pueden vencer)
-        try:
-            contratos_por_vencer = ContratoGenerado.objects.filter(
-                estado='validado',  # Solo contratos validados pueden vencer
-                cuña__fecha_fin__lte=fecha_limite,
-                cuña__fecha_fin__gte=hoy
-            ).select_related('cliente', 'cuña').order_by('cuña__fecha_fin')
-        except Exception as e:
-            print(f"❌ Error obteniendo contratos por vencer: {e}")
-            contratos_por_vencer = []
-        
-        # Contratos vencidos (solo los validados pueden estar vencidos)
-        try:
-            contratos_vencidos = ContratoGenerado.objects.filter(
-                estado='validado',  # Solo contratos validados pueden estar vencidos
-                cuña__fecha_fin__lt=hoy
-            ).select_related('cliente', 'cuña').order_by('cuña__fecha_fin')
-        except Exception as e:
-            print(f"❌ Error obteniendo contratos vencidos: {e}")
-            contratos_vencidos = []
-        
-        # Contratos con buena vigencia
-        try:
-            contratos_vigentes = ContratoGenerado.objects.filter(
-                estado='validado',  # Solo contratos validados están vigentes
-                cuña__fecha_fin__gt=fecha_limite
-            ).select_related('cliente', 'cuña').order_by('cuña__fecha_fin')
-        except Exception as e:
-            print(f"❌ Error obteniendo contratos vigentes: {e}")
-            contratos_vigentes = []
-        
-        # Exportar si se solicita
-        if formato == 'csv':
-            return _generar_reporte_csv_vencimiento(contratos_por_vencer, contratos_vencidos, contratos_vigentes)
-        elif formato == 'excel':
-            return _generar_reporte_excel_vencimiento(contratos_por_vencer, contratos_vencidos, contratos_vigentes)
-        
-        context = {
-            'contratos_por_vencer': contratos_por_vencer,
-            'contratos_vencidos': contratos_vencidos,
-            'contratos_vigentes': contratos_vigentes,
-            'dias_aviso': dias_aviso,
-            'fecha_limite': fecha_limite,
-            'fecha_reporte': timezone.now().strftime('%d/%m/%Y %H:%M'),
-        }
-        
-        return render(request, 'custom_admin/reports/contratos/vencimiento.html', context)
-        
-    except Exception as e:
-        print(f"❌ ERROR en reports_vencimiento_contratos: {e}")
-        messages.error(request, f'Error al generar el reporte: {str(e)}')
-        return redirect('custom_admin:reports_dashboard_contratos')
-
-@login_required
-@user_passes_test(is_admin)
-def reports_ingresos_contratos(request):
-    """Genera reporte de ingresos por contratos - CON MANEJO DE ERRORES"""
-    
-    if not CONTENT_MODELS_AVAILABLE:
-        messages.error(request, 'Módulo de Contratos no disponible')
-        return redirect('custom_admin:reports_dashboard_contratos')
-    
-    try:
-        # Parámetros
-        fecha_inicio = request.GET.get('fecha_inicio')
-        fecha_fin = request.GET.get('fecha_fin')
-        agrupar_por = request.GET.get('agrupar_por', 'mes')
-        formato = request.GET.get('formato', 'html')
-        
-        # Base query
-        contratos = ContratoGenerado.objects.select_related('cliente', 'cuña').all()
-        
-        if fecha_inicio:
-            contratos = contratos.filter(fecha_generacion__date__gte=fecha_inicio)
-        if fecha_fin:
-            contratos = contratos.filter(fecha_generacion__date__lte=fecha_fin)
-        
-        # Agrupar datos
-        ingresos_data = []
-        try:
-            if agrupar_por == 'mes':
-                # Agrupar por mes usando annotate
-                from django.db.models.functions import TruncMonth
-                ingresos_data = contratos.annotate(
-                    mes=TruncMonth('fecha_generacion')
-                ).values('mes').annotate(
-                    total_contratos=Count('id'),
-                    ingresos_totales=Sum('valor_total'),
-                    promedio_contrato=Avg('valor_total')
-                ).order_by('mes')
-                
-                # Formatear meses
-                for item in ingresos_data:
-                    item['periodo'] = item['mes'].strftime('%Y-%m')
-                    
-            elif agrupar_por == 'estado':
-                ingresos_data = contratos.values('estado').annotate(
-                    total_contratos=Count('id'),
-                    ingresos_totales=Sum('valor_total'),
-                    promedio_contrato=Avg('valor_total')
-                ).order_by('estado')
-            elif agrupar_por == 'cliente':
-                ingresos_data = contratos.values('cliente__empresa', 'cliente__ruc_dni').annotate(
-                    total_contratos=Count('id'),
-                    ingresos_totales=Sum('valor_total'),
-                    promedio_contrato=Avg('valor_total')
-                ).order_by('-ingresos_totales')
-        except Exception as e:
-            print(f"❌ Error agrupando datos: {e}")
-            # Datos vacíos en caso de error
-            ingresos_data = []
-        
-        # Exportar si se solicita
-        if formato == 'csv':
-            return _generar_reporte_csv_ingresos(ingresos_data, agrupar_por)
-        elif formato == 'excel':
-            return _generar_reporte_excel_ingresos(ingresos_data, agrupar_por)
-        
-        context = {
-            'ingresos_data': ingresos_data,
-            'agrupar_por': agrupar_por,
-            'fecha_inicio': fecha_inicio,
-            'fecha_fin': fecha_fin,
-            'total_ingresos': contratos.aggregate(total=Sum('valor_total'))['total'] or Decimal('0.00'),
-            'fecha_reporte': timezone.now().strftime('%d/%m/%Y %H:%M'),
-        }
-        
-        return render(request, 'custom_admin/reports/contratos/ingresos.html', context)
-        
-    except Exception as e:
-        print(f"❌ ERROR en reports_ingresos_contratos: {e}")
-        messages.error(request, f'Error al generar el reporte: {str(e)}')
-        return redirect('custom_admin:reports_dashboard_contratos')
-# ==================== REPORTES DE VENDEDORES ====================
-@login_required
-@user_passes_test(lambda u: u.es_admin or u.es_doctor)
-def reports_dashboard_vendedores(request):
-    """Dashboard de reportes de vendedores - VERSIÓN CORREGIDA - Accesible para Admin y Doctor"""
-    
-    # Verificar disponibilidad de modelos
-    if not AUTH_MODELS_AVAILABLE or not CONTENT_MODELS_AVAILABLE:
-        context = {
-            'error': 'Módulos necesarios no disponibles',
-            'estadisticas_vendedores': [],
-            'total_vendedores': 0,
-            'total_contratos_general': 0,
-            'total_ingresos_general': Decimal('0.00'),
-            'vendedor_top': None,
-            'fecha_inicio': '',
-            'fecha_fin': '',
-            'fecha_reporte': timezone.now().strftime('%d/%m/%Y %H:%M'),
-        }
-        return render(request, 'custom_admin/reports/vendedores/dashboard.html', context)
-    
-    try:
-        # Parámetros de filtro
-        fecha_inicio = request.GET.get('fecha_inicio')
-        fecha_fin = request.GET.get('fecha_fin')
-        
-        # Si no hay fechas, usar el último mes
-        if not fecha_inicio:
-            fecha_inicio = (timezone.now() - timedelta(days=30)).strftime('%Y-%m-%d')
-        if not fecha_fin:
-            fecha_fin = timezone.now().strftime('%Y-%m-%d')
-        
-        # Convertir a objetos date para consultas
-        fecha_inicio_obj = datetime.strptime(fecha_inicio, '%Y-%m-%d').date()
-        fecha_fin_obj = datetime.strptime(fecha_fin, '%Y-%m-%d').date()
-        
-        # Obtener todos los vendedores activos
-        vendedores = CustomUser.objects.filter(
-            rol='vendedor',
-            is_active=True
-        ).order_by('first_name', 'last_name')
-        
-        # Estadísticas de vendedores
-        estadisticas_vendedores = []
-        
-        for vendedor in vendedores:
-            try:
-                # ✅ CORREGIDO: Solo contratos donde el vendedor está asignado
-                contratos_vendedor = ContratoGenerado.objects.filter(
-                    Q(cliente__vendedor_asignado=vendedor) | Q(vendedor_asignado=vendedor),
-                    fecha_generacion__date__gte=fecha_inicio_obj,
-                    fecha_generacion__date__lte=fecha_fin_obj
-                ).distinct()
-                
-                # ✅ CORREGIDO: Cuñas del vendedor
-                cuñas_vendedor = CuñaPublicitaria.objects.filter(
-                    vendedor_asignado=vendedor,
-                    created_at__date__gte=fecha_inicio_obj,
-                    created_at__date__lte=fecha_fin_obj
-                )
-                
-                # Calcular estadísticas
-                total_contratos = contratos_vendedor.count()
-                total_cuñas = cuñas_vendedor.count()
-                
-                # Ingresos de contratos
-                ingresos_contratos_result = contratos_vendedor.aggregate(total=Sum('valor_total'))
-                ingresos_contratos = ingresos_contratos_result['total'] or Decimal('0.00')
-                
-                # Ingresos de cuñas
-                ingresos_cuñas_result = cuñas_vendedor.aggregate(total=Sum('precio_total'))
-                ingresos_cuñas = ingresos_cuñas_result['total'] or Decimal('0.00')
-                
-                # Total de ingresos
-                ingresos_totales = ingresos_contratos + ingresos_cuñas
-                
-                # Clientes asignados - CORREGIDO: Contar clientes únicos
-                clientes_asignados = CustomUser.objects.filter(
-                    vendedor_asignado=vendedor,
-                    rol='cliente',
-                    is_active=True
-                ).count()
-                
-                estadisticas_vendedores.append({
-                    'vendedor': vendedor,
-                    'total_contratos': total_contratos,
-                    'total_cuñas': total_cuñas,
-                    'ingresos_contratos': ingresos_contratos,
-                    'ingresos_cuñas': ingresos_cuñas,
-                    'ingresos_totales': ingresos_totales,
-                    'clientes_asignados': clientes_asignados,
-                })
-                
-            except Exception as e:
-                print(f"Error procesando vendedor {vendedor.username}: {e}")
-                continue
-        
-        # Ordenar por ingresos totales (mayor a menor)
-        estadisticas_vendedores.sort(key=lambda x: x['ingresos_totales'], reverse=True)
-        
-        # ✅ CORREGIDO: Calcular totales generales para el template
-        total_vendedores = len(estadisticas_vendedores)
-        total_contratos_general = sum(item['total_contratos'] for item in estadisticas_vendedores)
-        total_cunas_general = sum(item['total_cuñas'] for item in estadisticas_vendedores)
-        total_ing_contratos_general = sum(item['ingresos_contratos'] for item in estadisticas_vendedores)
-        total_ing_cunas_general = sum(item['ingresos_cuñas'] for item in estadisticas_vendedores)
-        total_ingresos_general = sum(item['ingresos_totales'] for item in estadisticas_vendedores)
-        
-        # ✅ CORREGIDO: Calcular total de clientes únicos (sin duplicados)
-        total_clientes_general = CustomUser.objects.filter(
-            vendedor_asignado__in=vendedores,
-            rol='cliente',
-            is_active=True
-        ).distinct().count()
-        
-        # Vendedor top
-        vendedor_top = estadisticas_vendedores[0] if estadisticas_vendedores else None
-        
-        # ==================== GRÁFICAS CON PLOTLY ====================
-        
-        grafica_barras_html = ''
-        grafica_pastel_html = ''
-        
-        # 1. Gráfico de barras - Top 5 Vendedores por Ingresos
-        if estadisticas_vendedores and PLOTLY_AVAILABLE:
-            try:
-                top_vendedores_data = estadisticas_vendedores[:5]
-                vendedores_nombres = [v['vendedor'].get_full_name() for v in top_vendedores_data]
-                vendedores_ingresos = [float(v['ingresos_totales']) for v in top_vendedores_data]
-                
-                fig_barras = px.bar(
-                    x=vendedores_ingresos,
-                    y=vendedores_nombres,
-                    orientation='h',
-                    title='Top 5 Vendedores por Ingresos',
-                    labels={'x': 'Ingresos ($)', 'y': 'Vendedor'},
-                    color=vendedores_ingresos,
-                    color_continuous_scale='Viridis'
-                )
-                
-                fig_barras.update_traces(
-                    hovertemplate='<b>%{y}</b><br>Ingresos: $%{x:,.2f}'
-                )
-                
-                fig_barras.update_layout(
-                    height=400,
-                    showlegend=False,
-                    coloraxis_showscale=False
-                )
-                
-                fig_barras.update_xaxes(tickprefix="$", tickformat=",.")
-                
-                grafica_barras_html = pyo.plot(fig_barras, output_type='div', include_plotlyjs=False)
-            except Exception as e:
-                print(f"❌ Error generando gráfica de barras: {e}")
-        
-        # 2. Gráfico de pastel - Distribución de Ingresos
-        if estadisticas_vendedores and PLOTLY_AVAILABLE:
-            try:
-                ingresos_contratos_total = sum(item['ingresos_contratos'] for item in estadisticas_vendedores)
-                ingresos_cunas_total = sum(item['ingresos_cuñas'] for item in estadisticas_vendedores)
-                
-                if ingresos_contratos_total > 0 or ingresos_cunas_total > 0:
-                    datos_distribucion = {
-                        'Tipo': ['Contratos', 'Cuñas'],
-                        'Ingresos': [float(ingresos_contratos_total), float(ingresos_cunas_total)]
-                    }
-                    
-                    fig_pastel = px.pie(
-                        datos_distribucion,
-                        values='Ingresos',
-                        names='Tipo',
-                        title='Distribución de Ingresos',
-                        color='Tipo',
-                        color_discrete_map={
-                            'Contratos': '#4e73df',
-                            'Cuñas': '#1cc88a'
-                        }
-                    )
-                    
-                    fig_pastel.update_traces(
-                        textposition='inside',
-                        textinfo='percent+label',
-                        hovertemplate='<b>%{label}</b><br>Ingresos: $%{value:,.2f}<br>Porcentaje: %{percent}'
-                    )
-                    
-                    fig_pastel.update_layout(
-                        height=400,
-                        showlegend=True,
-                        legend=dict(
-                            orientation="h",
-                            yanchor="bottom",
-                            y=-0.3,
-                            xanchor="center",
-                            x=0.5
-                        )
-                    )
-                    
-                    grafica_pastel_html = pyo.plot(fig_pastel, output_type='div', include_plotlyjs=False)
-            except Exception as e:
-                print(f"❌ Error generando gráfica de pastel: {e}")
-        
-        context = {
-            'estadisticas_vendedores': estadisticas_vendedores,
-            'total_vendedores': total_vendedores,
-            'total_contratos_general': total_contratos_general,
-            'total_cunas_general': total_cunas_general,  # ✅ NUEVO: Total de cuñas
-            'total_ing_contratos_general': total_ing_contratos_general,  # ✅ NUEVO: Total ingresos contratos
-            'total_ing_cunas_general': total_ing_cunas_general,  # ✅ NUEVO: Total ingresos cuñas
-            'total_ingresos_general': total_ingresos_general,
-            'total_clientes_general': total_clientes_general,
-            'vendedor_top': vendedor_top,
-            'fecha_inicio': fecha_inicio,
-            'fecha_fin': fecha_fin,
-            'fecha_reporte': timezone.now().strftime('%d/%m/%Y %H:%M'),
-            'grafica_barras_html': grafica_barras_html,
-            'grafica_pastel_html': grafica_pastel_html,
-            'PLOTLY_AVAILABLE': PLOTLY_AVAILABLE,
-        }
-        
-        return render(request, 'custom_admin/reports/vendedores/dashboard.html', context)
-        
-    except Exception as e:
-        print(f"❌ ERROR en reports_dashboard_vendedores: {e}")
-        import traceback
-        traceback.print_exc()
-        
-        context = {
-            'error': 'Error al cargar el reporte de vendedores',
-            'estadisticas_vendedores': [],
-            'total_vendedores': 0,
-            'total_contratos_general': 0,
-            'total_cunas_general': 0,
-            'total_ing_contratos_general': Decimal('0.00'),
-            'total_ing_cunas_general': Decimal('0.00'),
-            'total_ingresos_general': Decimal('0.00'),
-            'total_clientes_general': 0,
-            'vendedor_top': None,
-            'fecha_inicio': fecha_inicio if 'fecha_inicio' in locals() else '',
-            'fecha_fin': fecha_fin if 'fecha_fin' in locals() else '',
-            'fecha_reporte': timezone.now().strftime('%d/%m/%Y %H:%M'),
-            'grafica_barras_html': '',
-            'grafica_pastel_html': '',
-            'PLOTLY_AVAILABLE': PLOTLY_AVAILABLE,
-        }
-        return render(request, 'custom_admin/reports/vendedores/dashboard.html', context)
-@login_required
-@user_passes_test(is_admin)
-def cliente_contratos_api(request, cliente_id):
-    """API para obtener contratos de un cliente específico"""
-    try:
-        cliente = get_object_or_404(CustomUser, pk=cliente_id, rol='cliente')
-        
-        # Obtener contratos del cliente
-        contratos = ContratoGenerado.objects.filter(
-            cliente=cliente
-        ).select_related('cuña', 'plantilla_usada').order_by('-fecha_generacion')
-        
-        data = {
-            'success': True,
-            'cliente': {
-                'id': cliente.id,
-                'nombre': cliente.get_full_name(),
-                'empresa': cliente.empresa,
-                'email': cliente.email
-            },
-            'contratos': [
-                {
-                    'id': c.id,
-                    'numero_contrato': c.numero_contrato,
-                    'estado': c.estado,
-                    'estado_display': c.get_estado_display(),
-                    'valor_total': str(c.valor_total),
-                    'fecha_generacion': c.fecha_generacion.strftime('%d/%m/%Y %H:%M'),
-                    'cuña_titulo': c.cuña.titulo if c.cuña else None,
-                    'plantilla_nombre': c.plantilla_usada.nombre if c.plantilla_usada else None
-                } for c in contratos
-            ],
-            'total_contratos': contratos.count()
-        }
-        
-        return JsonResponse(data)
-        
-    except Exception as e:
-        return JsonResponse({'success': False, 'error': str(e)})
-@login_required
-@user_passes_test(is_admin)
-def vendedor_contratos_api(request, vendedor_id):
-    """API para obtener contratos de un vendedor específico"""
-    try:
-        vendedor = get_object_or_404(CustomUser, pk=vendedor_id, rol='vendedor')
-        
-        # Obtener contratos del vendedor (asignados a sus clientes)
-        contratos = ContratoGenerado.objects.filter(
-            cliente__vendedor_asignado=vendedor
-        ).select_related('cliente', 'cuña', 'plantilla_usada').order_by('-fecha_generacion')
-        
-        # Obtener cuñas del vendedor
-        cuñas = CuñaPublicitaria.objects.filter(
-            vendedor_asignado=vendedor
-        ).select_related('cliente', 'categoria').order_by('-created_at')
-        
-        data = {
-            'success': True,
-            'vendedor': {
-                'id': vendedor.id,
-                'nombre': vendedor.get_full_name(),
-                'email': vendedor.email,
-                'telefono': vendedor.telefono or 'No disponible'
-            },
-            'contratos': [
-                {
-                    'id': c.id,
-                    'numero_contrato': c.numero_contrato,
-                    'estado': c.estado,
-                    'estado_display': c.get_estado_display(),
-                    'valor_total': str(c.valor_total),
-                    'fecha_generacion': c.fecha_generacion.strftime('%d/%m/%Y %H:%M'),
-                    'cliente_nombre': c.nombre_cliente,
-                    'cliente_empresa': c.cliente.empresa if c.cliente else None,
-                    'cuña_titulo': c.cuña.titulo if c.cuña else None,
-                    'plantilla_nombre': c.plantilla_usada.nombre if c.plantilla_usada else None
-                } for c in contratos
-            ],
-            'cuñas': [
-                {
-                    'id': c.id,
-                    'codigo': c.codigo,
-                    'titulo': c.titulo,
-                    'estado': c.estado,
-                    'estado_display': c.get_estado_display(),
-                    'precio_total': str(c.precio_total),
-                    'fecha_inicio': c.fecha_inicio.strftime('%d/%m/%Y') if c.fecha_inicio else None,
-                    'fecha_fin': c.fecha_fin.strftime('%d/%m/%Y') if c.fecha_fin else None,
-                    'cliente_nombre': c.cliente.get_full_name() if c.cliente else None,
-                    'cliente_empresa': c.cliente.empresa if c.cliente else None
-                } for c in cuñas
-            ],
-            'total_contratos': contratos.count(),
-            'total_cuñas': cuñas.count(),
-            'ingresos_contratos': str(contratos.aggregate(total=Sum('valor_total'))['total'] or Decimal('0.00')),
-            'ingresos_cuñas': str(cuñas.aggregate(total=Sum('precio_total'))['total'] or Decimal('0.00'))
-        }
-        
-        return JsonResponse(data)
-        
-    except Exception as e:
-        import traceback
-        print(f"❌ ERROR en vendedor_contratos_api: {str(e)}")
-        traceback.print_exc()
-        return JsonResponse({'success': False, 'error': str(e)})
-@login_required
-@user_passes_test(is_admin)
-def reports_detalle_vendedor(request, vendedor_id):
-    """Detalle del desempeño de un vendedor específico - VERSIÓN CORREGIDA"""
-    
-    # Verificar disponibilidad de modelos
-    if not AUTH_MODELS_AVAILABLE or not CONTENT_MODELS_AVAILABLE:
-        messages.error(request, 'Módulos necesarios no disponibles')
-        return redirect('custom_admin:reports_dashboard_vendedores')
-    
-    try:
-        vendedor = CustomUser.objects.get(pk=vendedor_id, rol='vendedor')
-    except CustomUser.DoesNotExist:
-        messages.error(request, 'Vendedor no encontrado')
-        return redirect('custom_admin:reports_dashboard_vendedores')
-    
-    try:
-        # Parámetros de filtro
-        fecha_inicio = request.GET.get('fecha_inicio')
-        fecha_fin = request.GET.get('fecha_fin')
-        
-        # Si no hay fechas, usar el último mes
-        if not fecha_inicio:
-            fecha_inicio = (timezone.now() - timedelta(days=30)).strftime('%Y-%m-%d')
-        if not fecha_fin:
-            fecha_fin = timezone.now().strftime('%Y-%m-%d')
-        
-        # Convertir a objetos date
-        fecha_inicio_obj = datetime.strptime(fecha_inicio, '%Y-%m-%d').date()
-        fecha_fin_obj = datetime.strptime(fecha_fin, '%Y-%m-%d').date()
-        
-        # ✅ CORREGIDO: Contratos donde el vendedor está asignado (a través del cliente)
-        contratos = ContratoGenerado.objects.filter(
-            cliente__vendedor_asignado=vendedor,
-            fecha_generacion__date__gte=fecha_inicio_obj,
-            fecha_generacion__date__lte=fecha_fin_obj
-        ).select_related('cliente', 'cuña').order_by('-fecha_generacion')
-        
-        # ✅ CORREGIDO: Cuñas del vendedor
-        cuñas = CuñaPublicitaria.objects.filter(
-            vendedor_asignado=vendedor,
-            created_at__date__gte=fecha_inicio_obj,
-            created_at__date__lte=fecha_fin_obj
-        ).select_related('cliente', 'categoria').order_by('-created_at')
-        
-        # Clientes asignados
-        clientes = CustomUser.objects.filter(
-            vendedor_asignado=vendedor,
-            rol='cliente',
-            is_active=True
-        ).order_by('empresa', 'first_name')
-        
-        # Estadísticas
-        total_contratos = contratos.count()
-        total_cuñas = cuñas.count()
-        total_clientes = clientes.count()
-        
-        # Ingresos de contratos
-        ingresos_contratos_result = contratos.aggregate(
-            total=Sum('valor_total')
-        )
-        ingresos_contratos = ingresos_contratos_result['total'] or Decimal('0.00')
-        
-        # Ingresos de cuñas
-        ingresos_cuñas_result = cuñas.aggregate(
-            total=Sum('precio_total')
-        )
-        ingresos_cuñas = ingresos_cuñas_result['total'] or Decimal('0.00')
-        
-        # Total de ingresos
-        ingresos_totales = ingresos_contratos + ingresos_cuñas
-        
-        # Promedio por contrato
-        ingresos_por_contrato = ingresos_contratos / total_contratos if total_contratos > 0 else Decimal('0.00')
-        
-        # Contratos por estado
-        contratos_por_estado = contratos.values('estado').annotate(
-            total=Count('id'),
-            valor_total=Sum('valor_total')
-        ).order_by('estado')
-        
-        context = {
-            'vendedor': vendedor,
-            'contratos': contratos,
-            'cuñas': cuñas,
-            'clientes': clientes,
-            'total_contratos': total_contratos,
-            'total_cuñas': total_cuñas,
-            'total_clientes': total_clientes,
-            'ingresos_contratos': ingresos_contratos,
-            'ingresos_cuñas': ingresos_cuñas,
-            'ingresos_totales': ingresos_totales,
-            'ingresos_por_contrato': ingresos_por_contrato,
-            'contratos_por_estado': contratos_por_estado,
-            'fecha_inicio': fecha_inicio,
-            'fecha_fin': fecha_fin,
-            'fecha_reporte': timezone.now().strftime('%d/%m/%Y %H:%M'),
-        }
-        
-        return render(request, 'custom_admin/reports/vendedores/detalle.html', context)
-        
-    except Exception as e:
-        print(f"❌ ERROR en reports_detalle_vendedor: {e}")
-        messages.error(request, f'Error al cargar el detalle del vendedor: {str(e)}')
-        return redirect('custom_admin:reports_dashboard_vendedores')
-@login_required
-@user_passes_test(is_admin)
-def reports_detalle_vendedor(request, vendedor_id):
-    """Detalle del desempeño de un vendedor específico - CORREGIDO"""
-    
-    # Verificar disponibilidad de modelos
-    if not AUTH_MODELS_AVAILABLE or not CONTENT_MODELS_AVAILABLE:
-        messages.error(request, 'Módulos necesarios no disponibles')
-        return redirect('custom_admin:reports_dashboard_vendedores')
-    
-    try:
-        vendedor = CustomUser.objects.get(pk=vendedor_id, rol='vendedor')
-    except CustomUser.DoesNotExist:
-        messages.error(request, 'Vendedor no encontrado')
-        return redirect('custom_admin:reports_dashboard_vendedores')
-    
-    try:
-        # Parámetros de filtro
-        fecha_inicio = request.GET.get('fecha_inicio')
-        fecha_fin = request.GET.get('fecha_fin')
-        
-        # Si no hay fechas, usar el último mes
-        if not fecha_inicio:
-            fecha_inicio = (timezone.now() - timedelta(days=30)).strftime('%Y-%m-%d')
-        if not fecha_fin:
-            fecha_fin = timezone.now().strftime('%Y-%m-%d')
-        
-        # Convertir a objetos date
-        fecha_inicio_obj = datetime.strptime(fecha_inicio, '%Y-%m-%d').date()
-        fecha_fin_obj = datetime.strptime(fecha_fin, '%Y-%m-%d').date()
-        
-        # ✅ CORREGIDO: Contratos donde el vendedor está asignado (a través del cliente)
-        contratos_asignados = ContratoGenerado.objects.filter(
-            cliente__vendedor_asignado=vendedor,
-            fecha_generacion__date__gte=fecha_inicio_obj,
-            fecha_generacion__date__lte=fecha_fin_obj
-        ).select_related('cliente', 'cuña').order_by('-fecha_generacion')
-        
-        # ✅ CORREGIDO: Contratos generados por el vendedor
-        contratos_generados = ContratoGenerado.objects.filter(
-            generado_por=vendedor,
-            fecha_generacion__date__gte=fecha_inicio_obj,
-            fecha_generacion__date__lte=fecha_fin_obj
-        ).select_related('cliente', 'cuña').order_by('-fecha_generacion')
-        
-        # ✅ CORREGIDO: Cuñas del vendedor
-        cuñas = CuñaPublicitaria.objects.filter(
-            vendedor_asignado=vendedor,
-            created_at__date__gte=fecha_inicio_obj,
-            created_at__date__lte=fecha_fin_obj
-        ).select_related('cliente', 'categoria').order_by('-created_at')
-        
-        # Clientes asignados
-        clientes = CustomUser.objects.filter(
-            vendedor_asignado=vendedor,
-            rol='cliente',
-            is_active=True
-        ).order_by('empresa', 'first_name')
-        
-        # Estadísticas
-        total_contratos_asignados = contratos_asignados.count()
-        total_contratos_generados = contratos_generados.count()
-        total_cuñas = cuñas.count()
-        total_clientes = clientes.count()
-        
-        # Ingresos de contratos asignados
-        ingresos_contratos_asignados_result = contratos_asignados.aggregate(
-            total=Sum('valor_total')
-        )
-        ingresos_contratos_asignados = ingresos_contratos_asignados_result['total'] or Decimal('0.00')
-        
-        # Ingresos de contratos generados
-        ingresos_contratos_generados_result = contratos_generados.aggregate(
-            total=Sum('valor_total')
-        )
-        ingresos_contratos_generados = ingresos_contratos_generados_result['total'] or Decimal('0.00')
-        
-        # Ingresos de cuñas
-        ingresos_cuñas_result = cuñas.aggregate(
-            total=Sum('precio_total')
-        )
-        ingresos_cuñas = ingresos_cuñas_result['total'] or Decimal('0.00')
-        
-        # Total de ingresos
-        ingresos_totales = ingresos_contratos_asignados + ingresos_cuñas
-        
-        # Contratos por estado (solo los asignados)
-        contratos_por_estado = contratos_asignados.values('estado').annotate(
-            total=Count('id'),
-            valor_total=Sum('valor_total')
-        ).order_by('estado')
-        
-        context = {
-            'vendedor': vendedor,
-            'contratos_asignados': contratos_asignados,
-            'contratos_generados': contratos_generados,
-            'cuñas': cuñas,
-            'clientes': clientes,
-            'total_contratos_asignados': total_contratos_asignados,
-            'total_contratos_generados': total_contratos_generados,
-            'total_cuñas': total_cuñas,
-            'total_clientes': total_clientes,
-            'ingresos_contratos_asignados': ingresos_contratos_asignados,
-            'ingresos_contratos_generados': ingresos_contratos_generados,
-            'ingresos_cuñas': ingresos_cuñas,
-            'ingresos_totales': ingresos_totales,
-            'contratos_por_estado': contratos_por_estado,
-            'fecha_inicio': fecha_inicio,
-            'fecha_fin': fecha_fin,
-            'fecha_reporte': timezone.now().strftime('%d/%m/%Y %H:%M'),
-        }
-        
-        return render(request, 'custom_admin/reports/vendedores/detalle.html', context)
-        
-    except Exception as e:
-        print(f"❌ ERROR en reports_detalle_vendedor: {e}")
-        messages.error(request, f'Error al cargar el detalle del vendedor: {str(e)}')
-        return redirect('custom_admin:reports_dashboard_vendedores')
-# ==================== DASHBOARD PRINCIPAL DE REPORTES ====================
-@login_required
-@user_passes_test(lambda u: u.es_admin or u.es_doctor)
-def reports_dashboard_principal(request):
-    """Dashboard principal unificado de reportes - Accesible para Admin y Doctor"""
-    
-    # Verificar disponibilidad de modelos
-    modelos_disponibles = CONTENT_MODELS_AVAILABLE and AUTH_MODELS_AVAILABLE
-    
-    context = {
-        'models_available': modelos_disponibles,
-        'fecha_reporte': timezone.now().strftime('%d/%m/%Y %H:%M'),
-    }
-    
-    # Si los modelos están disponibles, cargar datos
-    if modelos_disponibles:
-        try:
-            hoy = timezone.now().date()
-            
-            # ========== DATOS DE CONTRATOS ==========
-            stats_contratos = _calcular_estadisticas_contratos()
-            context.update(stats_contratos)
-            
-            # ========== DATOS DE VENDEDORES ==========
-            fecha_inicio_vendedores = request.GET.get('fecha_inicio_vendedores')
-            fecha_fin_vendedores = request.GET.get('fecha_fin_vendedores')
-            
-            fecha_inicio_obj = None
-            fecha_fin_obj = None
-            
-            if fecha_inicio_vendedores:
-                fecha_inicio_obj = datetime.strptime(fecha_inicio_vendedores, '%Y-%m-%d').date()
-            if fecha_fin_vendedores:
-                fecha_fin_obj = datetime.strptime(fecha_fin_vendedores, '%Y-%m-%d').date()
-            
-            # Calcular estadísticas de vendedores
-            estadisticas_vendedores = _calcular_estadisticas_vendedores(
-                fecha_inicio_obj, fecha_fin_obj
-            )
-            
-            # Estadísticas generales de vendedores
-            vendedores_activos = CustomUser.objects.filter(
-                rol='vendedor', 
-                is_active=True
-            ).count()
-            
-            total_ingresos_vendedores = sum(
-                item['ingresos_totales'] for item in estadisticas_vendedores
-            )
-            
-            vendedor_top = estadisticas_vendedores[0] if estadisticas_vendedores else None
-            
-            # ========== DATOS DE PARTES MORTUORIOS ==========
-            stats_partes = _calcular_estadisticas_partes_mortuorios()
-            context.update(stats_partes)
-            
-            # ✅ SUMAR INGRESOS DE PARTES MORTUORIOS A LOS INGRESOS TOTALES
-            ingresos_totales_con_partes = stats_contratos.get('ingresos_totales', Decimal('0.00')) + stats_partes.get('ingresos_totales_partes', Decimal('0.00'))
-            context['ingresos_totales'] = ingresos_totales_con_partes
-            
-            # Agregar datos al contexto
-            context.update({
-                # Vendedores
-                'vendedores_activos': vendedores_activos,
-                'estadisticas_vendedores': estadisticas_vendedores[:5],  # Top 5
-                'vendedor_top': vendedor_top,
-                'total_ingresos_vendedores': total_ingresos_vendedores,
-                'fecha_inicio_vendedores': fecha_inicio_vendedores,
-                'fecha_fin_vendedores': fecha_fin_vendedores,
-                
-                # Gráficas
-                'PLOTLY_AVAILABLE': PLOTLY_AVAILABLE,
-            })
-            
-            # Generar gráficas si Plotly está disponible
-            if PLOTLY_AVAILABLE:
-                # Gráfica de pastel - Estados de contratos
-                estados_data = [
-                    ('Validados', stats_contratos['contratos_activos']),
-                    ('Pendientes', stats_contratos['contratos_pendientes']),
-                    ('Por Vencer', stats_contratos['contratos_por_vencer']),
-                    ('Vencidos', stats_contratos['contratos_vencidos']),
-                    ('Cancelados', stats_contratos['contratos_cancelados']),
-                ]
-                
-                estados_labels = [item[0] for item in estados_data]
-                estados_values = [item[1] for item in estados_data]
-                
-                fig_pastel = px.pie(
-                    values=estados_values,
-                    names=estados_labels,
-                    title='Contratos por Estado',
-                    color_discrete_sequence=['#28a745', '#ffc107', '#17a2b8', '#dc3545', '#6c757d']
-                )
-                fig_pastel.update_layout(height=400)
-                context['grafica_estados_html'] = pyo.plot(fig_pastel, output_type='div', include_plotlyjs=False)
-                
-                # Gráfica de barras - Ingresos mensuales (últimos 6 meses)
-                ingresos_mensuales = []
-                for i in range(5, -1, -1):
-                    mes_fecha = hoy - timedelta(days=30*i)
-                    mes_nombre = mes_fecha.strftime('%b %Y')
-                    
-                    # Sumar ingresos de contratos y partes mortuorios
-                    ingresos_contratos_mes = ContratoGenerado.objects.filter(
-                        fecha_generacion__year=mes_fecha.year,
-                        fecha_generacion__month=mes_fecha.month
-                    ).aggregate(total=Sum('valor_total'))['total'] or Decimal('0.00')
-                    
-                    ingresos_partes_mes = ParteMortorio.objects.filter(
-                        fecha_solicitud__year=mes_fecha.year,
-                        fecha_solicitud__month=mes_fecha.month
-                    ).aggregate(total=Sum('precio_total'))['total'] or Decimal('0.00')
-                    
-                    ingresos_mes_total = ingresos_contratos_mes + ingresos_partes_mes
-                    
-                    ingresos_mensuales.append({
-                        'mes': mes_nombre,
-                        'ingresos': float(ingresos_mes_total)
-                    })
-                
-                if ingresos_mensuales:
-                    meses = [item['mes'] for item in ingresos_mensuales]
-                    ingresos = [item['ingresos'] for item in ingresos_mensuales]
-                    
-                    fig_barras = px.bar(
-                        x=meses,
-                        y=ingresos,
-                        title='Ingresos Mensuales Totales',
-                        labels={'x': 'Mes', 'y': 'Ingresos ($)'}
-                    )
-                    fig_barras.update_layout(height=400)
-                    fig_barras.update_traces(marker_color='#007bff')
-                    context['grafica_ingresos_html'] = pyo.plot(fig_barras, output_type='div', include_plotlyjs=False)
-                
-                # Gráfica de vendedores
-                if estadisticas_vendedores:
-                    vendedores_nombres = [v['vendedor'].get_full_name() for v in estadisticas_vendedores[:5]]
-                    vendedores_ingresos = [float(v['ingresos_totales']) for v in estadisticas_vendedores[:5]]
-                    
-                    fig_vendedores = px.bar(
-                        x=vendedores_ingresos,
-                        y=vendedores_nombres,
-                        orientation='h',
-                        title='Top 5 Vendedores por Ingresos',
-                        labels={'x': 'Ingresos ($)', 'y': 'Vendedor'}
-                    )
-                    fig_vendedores.update_layout(height=400)
-                    fig_vendedores.update_traces(marker_color='#28a745')
-                    context['grafica_vendedores_html'] = pyo.plot(fig_vendedores, output_type='div', include_plotlyjs=False)
-
-                # ========== GRÁFICA DE PASTEL PARA PARTES MORTORIOS ==========
-                if PARTE_MORTORIO_MODELS_AVAILABLE:
-                    try:
-                        # Datos para el gráfico de pastel de partes mortorios
-                        partes_data = [
-                            ('Pendientes', stats_partes.get('partes_mortuorios_pendientes', 0)),
-                            ('Al Aire', stats_partes.get('partes_mortuorios_al_aire', 0)),
-                            ('Pausados', stats_partes.get('partes_mortuorios_pausados', 0)),
-                            ('Finalizados', stats_partes.get('partes_mortuorios_finalizados', 0)),
-                        ]
-                        
-                        partes_labels = [item[0] for item in partes_data]
-                        partes_values = [item[1] for item in partes_data]
-                        
-                        if any(partes_values):
-                            fig_partes_pastel = px.pie(
-                                values=partes_values,
-                                names=partes_labels,
-                                title='Partes Mortorios por Estado',
-                                color=partes_labels,
-                                color_discrete_map={
-                                    'Pendientes': '#ffc107',      # Amarillo
-                                    'Al Aire': '#28a745',        # Verde
-                                    'Pausados': '#fd7e14',       # Naranja
-                                    'Finalizados': '#20c997'     # Verde azulado
-                                }
-                            )
-                            
-                            fig_partes_pastel.update_traces(
-                                textposition='inside',
-                                textinfo='percent+label',
-                                hovertemplate='<b>%{label}</b><br>Cantidad: %{value}<br>Porcentaje: %{percent}'
-                            )
-                            
-                            fig_partes_pastel.update_layout(
-                                height=300,
-                                showlegend=True,
-                                margin=dict(l=20, r=20, t=40, b=20),
-                                legend=dict(
-                                    orientation="h",
-                                    yanchor="bottom",
-                                    y=-0.2,
-                                    xanchor="center",
-                                    x=0.5
-                                )
-                            )
-                            
-                            context['grafica_pastel_partes_html'] = pyo.plot(fig_partes_pastel, output_type='div', include_plotlyjs=False)
-                        else:
-                            context['grafica_pastel_partes_html'] = ''
-                            
-                    except Exception as e:
-                        print(f"❌ Error generando gráfica de pastel para partes mortorios: {e}")
-                        context['grafica_pastel_partes_html'] = ''
-                    
-        except Exception as e:
-            print(f"❌ ERROR en reports_dashboard_principal: {e}")
-            import traceback
-            traceback.print_exc()
-            context['error'] = f'Error al cargar los datos: {str(e)}'
-    
-    return render(request, 'custom_admin/reports/dashboard_principal.html', context)
-
-def _calcular_estadisticas_partes_mortuorios():
-    """Calcula estadísticas generales de partes mortuorios"""
-    try:
-        if not PARTE_MORTORIO_MODELS_AVAILABLE:
-            return {
-                'total_partes_mortuorios': 0,
-                'partes_mortuorios_pendientes': 0,
-                'partes_mortuorios_al_aire': 0,
-                'partes_mortuorios_pausados': 0,
-                'partes_mortuorios_finalizados': 0,
-                'ingresos_totales_partes': Decimal('0.00'),
-            }
-        
-        # Totales básicos
-        total_partes_mortuorios = ParteMortorio.objects.count()
-        
-        # Partes por estado
-        partes_mortuorios_pendientes = ParteMortorio.objects.filter(estado='pendiente').count()
-        partes_mortuorios_al_aire = ParteMortorio.objects.filter(estado='al_aire').count()
-        partes_mortuorios_pausados = ParteMortorio.objects.filter(estado='pausado').count()
-        partes_mortuorios_finalizados = ParteMortorio.objects.filter(estado='finalizado').count()
-        
-        # Ingresos totales de partes mortuorios
-        ingresos_totales_partes_result = ParteMortorio.objects.aggregate(total=Sum('precio_total'))
-        ingresos_totales_partes = ingresos_totales_partes_result['total'] or Decimal('0.00')
-        
-        return {
-            'total_partes_mortuorios': total_partes_mortuorios,
-            'partes_mortuorios_pendientes': partes_mortuorios_pendientes,
-            'partes_mortuorios_al_aire': partes_mortuorios_al_aire,
-            'partes_mortuorios_pausados': partes_mortuorios_pausados,
-            'partes_mortuorios_finalizados': partes_mortuorios_finalizados,
-            'ingresos_totales_partes': ingresos_totales_partes,
-        }
-        
-    except Exception as e:
-        print(f"❌ ERROR en _calcular_estadisticas_partes_mortuorios: {e}")
-        return {
-            'total_partes_mortuorios': 0,
-            'partes_mortuorios_pendientes': 0,
-            'partes_mortuorios_al_aire': 0,
-            'partes_mortuorios_pausados': 0,
-            'partes_mortuorios_finalizados': 0,
-            'ingresos_totales_partes': Decimal('0.00'),
-        }
-
-def _calcular_estadisticas_vendedores(fecha_inicio=None, fecha_fin=None):
-    """Calcula estadísticas de vendedores para el período especificado"""
-    try:
-        vendedores = CustomUser.objects.filter(rol='vendedor', is_active=True)
-        estadisticas = []
-        
-        for vendedor in vendedores:
-            # Filtrar por fechas si se especifican
-            filtros_contratos = {'vendedor_asignado': vendedor}
-            filtros_cunas = {'vendedor_asignado': vendedor}
-            
-            if fecha_inicio and fecha_fin:
-                filtros_contratos['fecha_generacion__range'] = [fecha_inicio, fecha_fin]
-                filtros_cunas['created_at__range'] = [fecha_inicio, fecha_fin]
-            
-            # Contratos del vendedor
-            contratos_vendedor = ContratoGenerado.objects.filter(**filtros_contratos)
-            total_contratos = contratos_vendedor.count()
-            
-            # Cuñas del vendedor
-            cuñas_vendedor = CuñaPublicitaria.objects.filter(**filtros_cunas)
-            total_cuñas = cuñas_vendedor.count()
-            
-            # Ingresos de contratos
-            ingresos_contratos = contratos_vendedor.aggregate(
-                total=Sum('valor_total')
-            )['total'] or Decimal('0.00')
-            
-            # Ingresos de cuñas
-            ingresos_cuñas = cuñas_vendedor.aggregate(
-                total=Sum('precio_total')
-            )['total'] or Decimal('0.00')
-            
-            # Total de ingresos
-            ingresos_totales = ingresos_contratos + ingresos_cuñas
-            
-            # Clientes asignados
-            clientes_asignados = CustomUser.objects.filter(
-                vendedor_asignado=vendedor,
-                rol='cliente',
-                is_active=True
-            ).count()
-            
-            estadisticas.append({
-                'vendedor': vendedor,
-                'total_contratos': total_contratos,
-                'total_cuñas': total_cuñas,
-                'ingresos_contratos': ingresos_contratos,
-                'ingresos_cuñas': ingresos_cuñas,
-                'ingresos_totales': ingresos_totales,
-                'clientes_asignados': clientes_asignados,
-            })
-        
-        # Ordenar por ingresos totales (mayor a menor)
-        estadisticas.sort(key=lambda x: x['ingresos_totales'], reverse=True)
-        return estadisticas
-        
-    except Exception as e:
-        print(f"❌ ERROR en _calcular_estadisticas_vendedores: {e}")
-        return []
-@login_required
-@user_passes_test(is_admin)
-def reports_contratos_detalle_api(request):
-    """API para obtener detalle de contratos para el modal"""
-    try:
-        contratos_recientes = ContratoGenerado.objects.select_related(
-            'cliente', 'cuña'
-        ).order_by('-fecha_generacion')[:10]
-        
-        data = {
-            'contratos': [
-                {
-                    'numero': c.numero_contrato,
-                    'cliente': c.nombre_cliente,
-                    'estado': c.estado,
-                    'valor': str(c.valor_total),
-                    'fecha': c.fecha_generacion.strftime('%d/%m/%Y')
-                } for c in contratos_recientes
-            ]
-        }
-        return JsonResponse(data)
-    except Exception as e:
-        return JsonResponse({'error': str(e)}, status=500)
-
-@login_required
-@user_passes_test(is_admin)
-def reports_vendedores_detalle_api(request):
-    """API para obtener detalle de vendedores para el modal"""
-    try:
-        vendedores = CustomUser.objects.filter(rol='vendedor', is_active=True)
-        
-        data = {
-            'vendedores': [
-                {
-                    'nombre': v.get_full_name(),
-                    'email': v.email,
-                    'contratos': ContratoGenerado.objects.filter(generado_por=v).count(),
-                    'ingresos': str(ContratoGenerado.objects.filter(
-                        generado_por=v
-                    ).aggregate(total=Sum('valor_total'))['total'] or Decimal('0.00'))
-                } for v in vendedores
-            ]
-        }
-        return JsonResponse(data)
-    except Exception as e:
-        return JsonResponse({'error': str(e)}, status=500)
-# ==================== FUNCIONES AUXILIARES PARA REPORTES ====================
-
-def _calcular_estadisticas_vendedores(fecha_inicio=None, fecha_fin=None):
-    """Calcula estadísticas de vendedores para el período especificado"""
-    try:
-        vendedores = CustomUser.objects.filter(rol='vendedor', is_active=True)
-        estadisticas = []
-        
-        for vendedor in vendedores:
-            # Filtrar por fechas si se especifican
-            filtros_contratos = {'vendedor_asignado': vendedor}
-            filtros_cunas = {'vendedor_asignado': vendedor}
-            
-            if fecha_inicio and fecha_fin:
-                filtros_contratos['fecha_generacion__range'] = [fecha_inicio, fecha_fin]
-                filtros_cunas['created_at__range'] = [fecha_inicio, fecha_fin]
-            
-            # Contratos del vendedor
-            contratos_vendedor = ContratoGenerado.objects.filter(**filtros_contratos)
-            total_contratos = contratos_vendedor.count()
-            
-            # Cuñas del vendedor
-            cuñas_vendedor = CuñaPublicitaria.objects.filter(**filtros_cunas)
-            total_cuñas = cuñas_vendedor.count()
-            
-            # Ingresos de contratos
-            ingresos_contratos = contratos_vendedor.aggregate(
-                total=Sum('valor_total')
-            )['total'] or Decimal('0.00')
-            
-            # Ingresos de cuñas
-            ingresos_cuñas = cuñas_vendedor.aggregate(
-                total=Sum('precio_total')
-            )['total'] or Decimal('0.00')
-            
-            # Total de ingresos
-            ingresos_totales = ingresos_contratos + ingresos_cuñas
-            
-            # Clientes asignados
-            clientes_asignados = CustomUser.objects.filter(
-                vendedor_asignado=vendedor,
-                rol='cliente',
-                is_active=True
-            ).count()
-            
-            estadisticas.append({
-                'vendedor': vendedor,
-                'total_contratos': total_contratos,
-                'total_cuñas': total_cuñas,
-                'ingresos_contratos': ingresos_contratos,
-                'ingresos_cuñas': ingresos_cuñas,
-                'ingresos_totales': ingresos_totales,
-                'clientes_asignados': clientes_asignados,
-            })
-        
-        # Ordenar por ingresos totales (mayor a menor)
-        estadisticas.sort(key=lambda x: x['ingresos_totales'], reverse=True)
-        return estadisticas
-        
-    except Exception as e:
-        print(f"❌ ERROR en _calcular_estadisticas_vendedores: {e}")
-        return []
-
-def _calcular_estadisticas_contratos():
-    """Calcula estadísticas generales de contratos"""
-    try:
-        hoy = timezone.now().date()
-        
-        # Totales básicos
-        total_contratos = ContratoGenerado.objects.count()
-        
-        # Contratos por estado
-        contratos_activos = ContratoGenerado.objects.filter(estado='validado').count()
-        contratos_pendientes = ContratoGenerado.objects.filter(estado='generado').count()
-        
-        # Contratos por vencer (validados que están cerca de vencer)
-        fecha_limite_vencimiento = hoy + timedelta(days=30)
-        contratos_por_vencer = ContratoGenerado.objects.filter(
-            estado='validado',
-            cuña__fecha_fin__lte=fecha_limite_vencimiento,
-            cuña__fecha_fin__gte=hoy
-        ).count()
-        
-        # Contratos vencidos
-        contratos_vencidos = ContratoGenerado.objects.filter(
-            estado='validado',
-            cuña__fecha_fin__lt=hoy
-        ).count()
-        
-        # Contratos cancelados
-        contratos_cancelados = ContratoGenerado.objects.filter(estado='cancelado').count()
-        
-        # Ingresos
-        ingresos_totales_result = ContratoGenerado.objects.aggregate(total=Sum('valor_total'))
-        ingresos_totales = ingresos_totales_result['total'] or Decimal('0.00')
-        
-        ingresos_activos_result = ContratoGenerado.objects.filter(estado='validado').aggregate(
-            total=Sum('valor_total')
-        )
-        ingresos_activos = ingresos_activos_result['total'] or Decimal('0.00')
-        
-        return {
-            'total_contratos': total_contratos,
-            'contratos_activos': contratos_activos,
-            'contratos_pendientes': contratos_pendientes,
-            'contratos_por_vencer': contratos_por_vencer,
-            'contratos_vencidos': contratos_vencidos,
-            'contratos_cancelados': contratos_cancelados,
-            'ingresos_totales': ingresos_totales,
-            'ingresos_activos': ingresos_activos,
-        }
-        
-    except Exception as e:
-        print(f"❌ ERROR en _calcular_estadisticas_contratos: {e}")
-        return {}
-# ==================== REPORTES DE PARTES MORTUORIOS ====================
-@login_required
-@user_passes_test(lambda u: u.es_admin or u.es_doctor)
-def reports_dashboard_partes_mortuorios(request):
-    """Dashboard de reportes de partes mortuorios - Accesible para Admin y Doctor"""
-    
-    # Verificar disponibilidad del módulo
-    if not PARTE_MORTORIO_MODELS_AVAILABLE:
-        context = {
-            'error': 'Módulo de Partes Mortuorios no disponible',
-            'mensaje': 'No se pueden cargar los reportes en este momento.',
-            'models_available': False,
-            'total_partes': 0,
-            'partes_pendientes': 0,
-            'partes_al_aire': 0,
-            'partes_pausados': 0,
-            'partes_finalizados': 0,
-            'ingresos_totales': Decimal('0.00'),
-            'partes_recientes': [],
-            'grafica_pastel_html': '',
-            'grafica_barras_html': '',
-        }
-        return render(request, 'custom_admin/reports/parte_mortorios/list.html', context)
-    
-    try:
-        hoy = timezone.now().date()
-        
-        # Estadísticas básicas - LOS 5 ESTADOS QUE QUIERES
-        try:
-            total_partes = ParteMortorio.objects.count()
-        except Exception as e:
-            print(f"❌ Error contando partes: {e}")
-            total_partes = 0
-        
-        # Partes pendientes
-        try:
-            partes_pendientes = ParteMortorio.objects.filter(estado='pendiente').count()
-        except Exception as e:
-            print(f"❌ Error contando partes pendientes: {e}")
-            partes_pendientes = 0
-        
-        # Partes al aire
-        try:
-            partes_al_aire = ParteMortorio.objects.filter(estado='al_aire').count()
-        except Exception as e:
-            print(f"❌ Error contando partes al aire: {e}")
-            partes_al_aire = 0
-        
-        # Partes pausados
-        try:
-            partes_pausados = ParteMortorio.objects.filter(estado='pausado').count()
-        except Exception as e:
-            print(f"❌ Error contando partes pausados: {e}")
-            partes_pausados = 0
-        
-        # Partes finalizados
-        try:
-            partes_finalizados = ParteMortorio.objects.filter(estado='finalizado').count()
-        except Exception as e:
-            print(f"❌ Error contando partes finalizados: {e}")
-            partes_finalizados = 0
-        
-        # Ingresos totales
-        try:
-            ingresos_totales_result = ParteMortorio.objects.aggregate(
-                total=Sum('precio_total')
-            )
-            ingresos_totales = ingresos_totales_result['total'] or Decimal('0.00')
-        except Exception as e:
-            print(f"❌ Error calculando ingresos totales: {e}")
-            ingresos_totales = Decimal('0.00')
-        
-        # Partes recientes
-        try:
-            partes_recientes = ParteMortorio.objects.select_related(
-                'cliente'
-            ).order_by('-fecha_solicitud')[:10]
-        except Exception as e:
-            print(f"❌ Error obteniendo partes recientes: {e}")
-            partes_recientes = []
-        
-        # ==================== GRÁFICAS CON PLOTLY ====================
-        
-        # 1. Gráfico de pastel - Partes por Estado (LOS 4 ESTADOS PRINCIPALES)
-        try:
-            # Solo los 4 estados principales (sin el total)
-            estados_data = [
-                ('pendiente', partes_pendientes),
-                ('al_aire', partes_al_aire), 
-                ('pausado', partes_pausados),
-                ('finalizado', partes_finalizados)
-            ]
-            
-            # Preparar datos para la gráfica
-            estados_labels = []
-            estados_values = []
-            colores_estados = {
-                'pendiente': '#ffc107',      # Amarillo
-                'al_aire': '#28a745',        # Verde
-                'pausado': '#fd7e14',        # Naranja
-                'finalizado': '#20c997'      # Verde azulado
-            }
-            
-            for estado_codigo, cantidad in estados_data:
-                nombre_estado = dict(ParteMortorio.ESTADO_CHOICES).get(estado_codigo, estado_codigo)
-                estados_labels.append(nombre_estado)
-                estados_values.append(cantidad)
-            
-            if any(estados_values):
-                fig_pastel = px.pie(
-                    values=estados_values,
-                    names=estados_labels,
-                    title='Partes Mortuorios por Estado',
-                    color=estados_labels,
-                    color_discrete_map=colores_estados
-                )
-                
-                fig_pastel.update_traces(
-                    textposition='inside',
-                    textinfo='percent+label',
-                    hovertemplate='<b>%{label}</b><br>Cantidad: %{value}<br>Porcentaje: %{percent}'
-                )
-                
-                fig_pastel.update_layout(
-                    height=400,
-                    showlegend=True,
-                    legend=dict(
-                        orientation="h",
-                        yanchor="bottom",
-                        y=-0.3,
-                        xanchor="center",
-                        x=0.5
-                    )
-                )
-                
-                grafica_pastel_html = pyo.plot(fig_pastel, output_type='div', include_plotlyjs=False)
-            else:
-                grafica_pastel_html = ''
-                
-        except Exception as e:
-            print(f"❌ Error generando gráfica de pastel: {e}")
-            grafica_pastel_html = ''
-        
-        # 2. Gráfico de barras - Ingresos Mensuales
-        try:
-            ingresos_mensuales = []
-            meses_nombres = []
-            
-            for i in range(5, -1, -1):
-                mes_fecha = hoy - timedelta(days=30*i)
-                mes_str = mes_fecha.strftime('%Y-%m')
-                mes_nombre = mes_fecha.strftime('%b %Y')
-                
-                # Calcular ingresos del mes
-                ingresos_mes_result = ParteMortorio.objects.filter(
-                    fecha_solicitud__year=mes_fecha.year,
-                    fecha_solicitud__month=mes_fecha.month
-                ).aggregate(total=Sum('precio_total'))
-                
-                ingresos_mes = ingresos_mes_result['total'] or Decimal('0.00')
-                
-                ingresos_mensuales.append(float(ingresos_mes))
-                meses_nombres.append(mes_nombre)
-            
-            if any(ingresos_mensuales):
-                datos_ingresos = {
-                    'Mes': meses_nombres,
-                    'Ingresos': ingresos_mensuales
-                }
-                
-                fig_barras = px.bar(
-                    datos_ingresos,
-                    x='Mes',
-                    y='Ingresos',
-                    title='Ingresos Mensuales',
-                    color='Ingresos',
-                    color_continuous_scale='Blues'
-                )
-                
-                fig_barras.update_traces(
-                    hovertemplate='<b>%{x}</b><br>Ingresos: $%{y:,.2f}'
-                )
-                
-                fig_barras.update_layout(
-                    height=400,
-                    xaxis_title="Mes",
-                    yaxis_title="Ingresos ($)",
-                    coloraxis_showscale=False
-                )
-                
-                # Formatear ejes
-                fig_barras.update_yaxes(tickprefix="$", tickformat=",.")
-                
-                grafica_barras_html = pyo.plot(fig_barras, output_type='div', include_plotlyjs=False)
-            else:
-                grafica_barras_html = ''
-                
-        except Exception as e:
-            print(f"❌ Error generando gráfica de barras: {e}")
-            grafica_barras_html = ''
-        
-        context = {
-            'total_partes': total_partes,
-            'partes_pendientes': partes_pendientes,
-            'partes_al_aire': partes_al_aire,
-            'partes_pausados': partes_pausados,
-            'partes_finalizados': partes_finalizados,
-            'ingresos_totales': ingresos_totales,
-            'partes_recientes': partes_recientes,
-            'grafica_pastel_html': grafica_pastel_html,
-            'grafica_barras_html': grafica_barras_html,
-            'models_available': True,
-        }
-        
-        print(f"✅ Dashboard de Partes Mortuorios cargado exitosamente:")
-        print(f"   - Total partes: {total_partes}")
-        print(f"   - Pendientes: {partes_pendientes}")
-        print(f"   - Al Aire: {partes_al_aire}")
-        print(f"   - Pausados: {partes_pausados}")
-        print(f"   - Finalizados: {partes_finalizados}")
-        print(f"   - Ingresos totales: {ingresos_totales}")
-        
-        return render(request, 'custom_admin/reports/parte_mortorios/list.html', context)
-        
-    except Exception as e:
-        print(f"❌ ERROR CRÍTICO en reports_dashboard_partes_mortuorios: {e}")
-        import traceback
-        traceback.print_exc()
-        
-        context = {
-            'error': 'Error al cargar el dashboard',
-            'mensaje': str(e),
-            'models_available': False,
-            'total_partes': 0,
-            'partes_pendientes': 0,
-            'partes_al_aire': 0,
-            'partes_pausados': 0,
-            'partes_finalizados': 0,
-            'ingresos_totales': Decimal('0.00'),
-            'partes_recientes': [],
-            'grafica_pastel_html': '',
-            'grafica_barras_html': '',
-        }
-        return render(request, 'custom_admin/reports/parte_mortorios/list.html', context)
-# ==================== APIs PARA MODALES ====================
-
-@login_required
-@user_passes_test(is_admin)
-def reports_partes_estado_api(request):
-    """API para obtener datos de partes por estado (para modal)"""
-    if not PARTE_MORTORIO_MODELS_AVAILABLE:
-        return JsonResponse({'success': False, 'error': 'Módulo no disponible'})
-    
-    try:
-        # Agrupar por estado
-        partes_por_estado = ParteMortorio.objects.values('estado').annotate(
-            total=Count('id'),
-            ingresos_totales=Sum('precio_total')
-        ).order_by('estado')
-        
-        data = []
-        for item in partes_por_estado:
-            data.append({
-                'estado': dict(ParteMortorio.ESTADO_CHOICES).get(item['estado'], item['estado']),
-                'total': item['total'],
-                'ingresos_totales': str(item['ingresos_totales'] or Decimal('0.00'))
-            })
-        
-        return JsonResponse({'success': True, 'data': data})
-        
-    except Exception as e:
-        return JsonResponse({'success': False, 'error': str(e)})
-
-@login_required
-@user_passes_test(is_admin)
-def reports_partes_urgencia_api(request):
-    """API para obtener datos de partes por urgencia (para modal)"""
-    if not PARTE_MORTORIO_MODELS_AVAILABLE:
-        return JsonResponse({'success': False, 'error': 'Módulo no disponible'})
-    
-    try:
-        # Agrupar por urgencia
-        partes_por_urgencia = ParteMortorio.objects.values('urgencia').annotate(
-            total=Count('id'),
-            ingresos_totales=Sum('precio_total')
-        ).order_by('urgencia')
-        
-        data = []
-        for item in partes_por_urgencia:
-            data.append({
-                'urgencia': dict(ParteMortorio.URGENCIA_CHOICES).get(item['urgencia'], item['urgencia']),
-                'total': item['total'],
-                'ingresos_totales': str(item['ingresos_totales'] or Decimal('0.00'))
-            })
-        
-        return JsonResponse({'success': True, 'data': data})
-        
-    except Exception as e:
-        return JsonResponse({'success': False, 'error': str(e)})
-
-@login_required
-@user_passes_test(is_admin)
-def reports_partes_ingresos_api(request):
-    """API para obtener datos de ingresos de partes (para modal)"""
-    if not PARTE_MORTORIO_MODELS_AVAILABLE:
-        return JsonResponse({'success': False, 'error': 'Módulo no disponible'})
-    
-    try:
-        hoy = timezone.now().date()
-        ingresos_mensuales = []
-        
-        for i in range(5, -1, -1):
-            mes_fecha = hoy - timedelta(days=30*i)
-            mes_nombre = mes_fecha.strftime('%b %Y')
-            
-            # Calcular ingresos del mes
-            ingresos_mes_result = ParteMortorio.objects.filter(
-                fecha_solicitud__year=mes_fecha.year,
-                fecha_solicitud__month=mes_fecha.month
-            ).aggregate(total=Sum('precio_total'))
-            
-            ingresos_mes = ingresos_mes_result['total'] or Decimal('0.00')
-            
-            ingresos_mensuales.append({
-                'mes': mes_nombre,
-                'ingresos': float(ingresos_mes)
-            })
-        
-        return JsonResponse({'success': True, 'data': ingresos_mensuales})
-        
-    except Exception as e:
-        return JsonResponse({'success': False, 'error': str(e)})
-
-@login_required
-@user_passes_test(is_admin)
-def reports_partes_detalle_api(request, parte_id):
-    """API para obtener detalle completo de un parte mortuorio"""
-    if not PARTE_MORTORIO_MODELS_AVAILABLE:
-        return JsonResponse({'success': False, 'error': 'Módulo no disponible'})
-    
-    try:
-        parte = get_object_or_404(ParteMortorio, pk=parte_id)
-        
-        data = {
-            'success': True,
-            'parte': {
-                'codigo': parte.codigo,
-                'nombre_fallecido': parte.nombre_fallecido,
-                'edad_fallecido': parte.edad_fallecido,
-                'dni_fallecido': parte.dni_fallecido,
-                'fecha_fallecimiento': parte.fecha_fallecimiento.strftime('%d/%m/%Y') if parte.fecha_fallecimiento else '',
-                'fecha_nacimiento': parte.fecha_nacimiento.strftime('%d/%m/%Y') if parte.fecha_nacimiento else '',
-                'nombre_esposa': parte.nombre_esposa,
-                'cantidad_hijos': parte.cantidad_hijos,
-                'hijos_vivos': parte.hijos_vivos,
-                'hijos_fallecidos': parte.hijos_fallecidos,
-                'nombres_hijos': parte.nombres_hijos,
-                'familiares_adicionales': parte.familiares_adicionales,
-                'tipo_ceremonia': parte.get_tipo_ceremonia_display(),
-                'fecha_misa': parte.fecha_misa.strftime('%d/%m/%Y') if parte.fecha_misa else '',
-                'hora_misa': parte.hora_misa.strftime('%H:%M') if parte.hora_misa else '',
-                'lugar_misa': parte.lugar_misa,
-                'fecha_inicio_transmision': parte.fecha_inicio_transmision.strftime('%d/%m/%Y') if parte.fecha_inicio_transmision else '',
-                'fecha_fin_transmision': parte.fecha_fin_transmision.strftime('%d/%m/%Y') if parte.fecha_fin_transmision else '',
-                'hora_transmision': parte.hora_transmision.strftime('%H:%M') if parte.hora_transmision else '',
-                'duracion_transmision': parte.duracion_transmision,
-                'repeticiones_dia': parte.repeticiones_dia,
-                'precio_total': str(parte.precio_total),
-                'estado': parte.get_estado_display(),
-                'urgencia': parte.get_urgencia_display(),
-                'observaciones': parte.observaciones,
-                'mensaje_personalizado': parte.mensaje_personalizado,
-                'fecha_solicitud': parte.fecha_solicitud.strftime('%d/%m/%Y %H:%M'),
-                'cliente_nombre': parte.cliente.get_full_name() if parte.cliente else '',
-                'cliente_telefono': parte.cliente.telefono if parte.cliente else '',
-                'cliente_email': parte.cliente.email if parte.cliente else '',
-            }
-        }
-        
-        return JsonResponse(data)
-        
-    except Exception as e:
-        return JsonResponse({'success': False, 'error': str(e)})
-# =============================================================================
-# VISTAS PRINCIPALES DE PROGRAMACIÓN CANAL - MODALES
-# =============================================================================
-@login_required
-def programacion_list(request):
-    """
-    Vista ÚNICA de programación con todo integrado - Modales
-    """
-    try:
-        from apps.programacion_canal.models import Programa, ProgramacionSemanal, BloqueProgramacion, CategoriaPrograma
-        from apps.programacion_canal.forms import ProgramaForm, ProgramacionSemanalForm, BloqueProgramacionForm
-        PROGRAMACION_AVAILABLE = True
-    except ImportError:
-        PROGRAMACION_AVAILABLE = False
-        messages.error(request, 'Módulo de Programación no disponible')
-        return redirect('custom_admin:dashboard')
-    
-    # Obtener datos para la vista
-    programas = Programa.objects.all().order_by('nombre')
-    programaciones = ProgramacionSemanal.objects.all().order_by('-fecha_inicio_semana')
-    
-    # OBTENER CATEGORÍAS ACTIVAS PARA EL COMBOBOX
-    categorias_activas = CategoriaPrograma.objects.filter(estado='activo').order_by('orden', 'nombre')
-    
-    # Obtener parámetro de semana
-    programacion_id = request.GET.get('programacion_id')
-    programacion_actual = None
-    
-    if programacion_id:
-        # Si se especifica una programación específica
-        programacion_actual = get_object_or_404(ProgramacionSemanal, id=programacion_id)
-    else:
-        # Obtener programación actual para el calendario (semana actual)
-        from django.utils import timezone
-        from datetime import timedelta
-        hoy = timezone.now().date()
-        inicio_semana = hoy - timedelta(days=hoy.weekday())
-        
-        programacion_actual = ProgramacionSemanal.objects.filter(
-            fecha_inicio_semana=inicio_semana,
-            estado='publicada'
-        ).first()
-        
-        # Si no hay programación para la semana actual, usar la más reciente
-        if not programacion_actual and programaciones.exists():
-            programacion_actual = programaciones.first()
-    
-    # Obtener bloques para el calendario
-    bloques_semana = []
-    if programacion_actual:
-        bloques_semana = BloqueProgramacion.objects.filter(
-            programacion_semanal=programacion_actual
-        ).select_related('programa').order_by('dia_semana', 'hora_inicio')
-    
-    # Configuración del calendario
-    dias_semana = ['Lunes', 'Martes', 'Miércoles', 'Jueves', 'Viernes', 'Sábado', 'Domingo']
-    horas_dia = []
-    for hora in range(0, 24):
-        for minuto in [0, 30]:
-            horas_dia.append(f"{hora:02d}:{minuto:02d}")
-            
-    # PRE-CALCULO DE LA GRILLA para manejar cruces de medianoche y optimizar template
-    calendario_data = []
-    
-    # Cachear bloques por día para evitar iteraciones innecesarias
-    bloques_por_dia = {i: [] for i in range(7)}
-    for b in bloques_semana:
-        bloques_por_dia[b.dia_semana].append(b)
+    # PRE-CALCULO DE LA GRILLA para manejar cruces de medianoche y optimizar template
+    calendario_data = []
+    
+    # Cachear bloques por día para evitar iteraciones innecesarias
+    bloques_por_dia = {i: [] for i in range(7)}
+    for b in bloques_semana:
+        bloques_por_dia[b.dia_semana].append(b)
         
     for hora in horas_dia:
         row = {'hora': hora, 'dias': []}
@@ -8550,14 +6435,15 @@ def programacion_list(request):
     return render(request, 'custom_admin/programacion_canal/programacion_list.html', context)
 @login_required
 def copiar_programacion_semanal(request, programacion_id):
-    """Copiar una programación semanal completa a otra programación existente"""
+    """Copiar una programación semanal completa (bloques, pausas y opcionalmente asignaciones) a otra programación existente"""
     if request.method == 'POST':
         import json
-        from apps.programacion_canal.models import ProgramacionSemanal, BloqueProgramacion
+        from apps.programacion_canal.models import ProgramacionSemanal
+        from apps.programacion_canal.clonacion import clonar_programacion_semanal
         
         programacion_origen = get_object_or_404(ProgramacionSemanal, id=programacion_id)
         
-        # Obtener la programación destino del body JSON
+        # Obtener la programación destino y las opciones del body JSON
         data = json.loads(request.body)
         programacion_destino_id = data.get('programacion_destino_id')
         
@@ -8576,31 +6462,37 @@ def copiar_programacion_semanal(request, programacion_id):
                 'error': 'No puede copiar la programación a sí misma'
             })
         
-        # Eliminar bloques existentes en la programación destino (opcional)
-        # Si quieres que se mantengan los bloques existentes, comenta esta línea
-        programacion_destino.bloques.all().delete()
-        
-        # Copiar todos los bloques
-        bloques_origen = BloqueProgramacion.objects.filter(programacion_semanal=programacion_origen)
-        bloques_copiados = 0
-        
-        for bloque in bloques_origen:
-            nuevo_bloque = BloqueProgramacion(
-                programacion_semanal=programacion_destino,
-                programa=bloque.programa,
-                dia_semana=bloque.dia_semana,
-                hora_inicio=bloque.hora_inicio,
-                duracion_real=bloque.duracion_real,
-                es_repeticion=bloque.es_repeticion,
-                notas=bloque.notas
+        try:
+            resultado = clonar_programacion_semanal(
+                programacion_origen,
+                programacion_destino,
+                incluir_pausas=data.get('incluir_pausas', True),
+                incluir_asignaciones=data.get('incluir_asignaciones', False),
+                reemplazar=data.get('reemplazar', True),
+                usuario=request.user
             )
-            nuevo_bloque.save()
-            bloques_copiados += 1
+        except Exception as e:
+            return JsonResponse({
+                'success': False,
+                'error': f'Error al copiar la programación: {str(e)}'
+            })
+        
+        mensaje = (
+            f'Se copiaron {resultado["bloques"]} bloques, {resultado["pausas"]} pausas y '
+            f'{resultado["asignaciones"]} asignaciones de "{programacion_origen.nombre}" '
+            f'a "{programacion_destino.nombre}"'
+        )
+        if resultado['omitidos']:
+            mensaje += f'. Se omitieron {len(resultado["omitidos"])} elementos'
         
         return JsonResponse({
             'success': True,
-            'message': f'Se copiaron {bloques_copiados} bloques de "{programacion_origen.nombre}" a "{programacion_destino.nombre}"',
-            'programacion_destino_id': programacion_destino.id
+            'message': mensaje,
+            'programacion_destino_id': programacion_destino.id,
+            'omitidos': [
+                {**omitido, 'fecha': omitido['fecha'].isoformat()} if omitido.get('fecha') else omitido
+                for omitido in resultado['omitidos']
+            ]
         })
     
     return JsonResponse({'success': False, 'error': 'Método no permitido'})
@@ -8857,61 +6749,50 @@ def api_bloque_update(request, bloque_id):
 @login_required
 def grilla_publicitaria_list(request):
     """Grilla que combina programación del canal y cuñas publicitarias - VERSIÓN MEJORADA"""
-    GRILLA_AVAILABLE = True
     try:
-        from apps.programacion_canal.models import ProgramacionSemanal, BloqueProgramacion
-        from apps.grilla_publicitaria.models import UbicacionPublicitaria, AsignacionCuña
-        from apps.content_management.models import CuñaPublicitaria
-        
-        
+        context = contexto_grilla_publicitaria(request)
     except ImportError as e:
         print(f"Error importando módulos de grilla: {e}")
-        GRILLA_AVAILABLE = False
         messages.error(request, 'Módulo de Grilla Publicitaria no disponible')
         return render(request, 'custom_admin/en_desarrollo.html', {'error': str(e)})
     
+    return render(request, 'custom_admin/grilla_publicitaria/list.html', context)
+
+def contexto_grilla_publicitaria(request):
+    """
+    Contexto común de la grilla: programación seleccionada, matriz semanal
+    (7 días × 48 franjas) y estadísticas
+    """
+    from apps.programacion_canal.models import ProgramacionSemanal
+    from apps.grilla_publicitaria.matriz import HORAS_FRANJAS, NOMBRES_DIAS, construir_matriz
+    from apps.content_management.models import CuñaPublicitaria
+    
     # Obtener programación actual
     programacion_id = request.GET.get('programacion_id')
     programaciones = ProgramacionSemanal.objects.all().order_by('-fecha_inicio_semana')
     
     programacion_actual = None
     cuñas_disponibles = CuñaPublicitaria.objects.none()
-    ubicaciones = UbicacionPublicitaria.objects.none()
-    asignaciones = AsignacionCuña.objects.none()
-    bloques_semana = BloqueProgramacion.objects.none()
+    bloques_semana, ubicaciones, asignaciones = [], [], []
     
     if programacion_id:
         programacion_actual = get_object_or_404(ProgramacionSemanal, id=programacion_id)
-    elif programaciones.exists():
+    else:
         programacion_actual = programaciones.first()
     
     if programacion_actual:
-        # Obtener bloques de programación
-        bloques_semana = BloqueProgramacion.objects.filter(
-            programacion_semanal=programacion_actual
-        ).select_related('programa').order_by('dia_semana', 'hora_inicio')
-        
-        # Obtener ubicaciones publicitarias para esta programación
-        ubicaciones = UbicacionPublicitaria.objects.filter(
-            bloque_programacion__programacion_semanal=programacion_actual,
-            activo=True
-        ).select_related('bloque_programacion', 'bloque_programacion__programa')
-        
-        # Obtener asignaciones de cuñas
-        asignaciones = AsignacionCuña.objects.filter(
-            ubicacion__bloque_programacion__programacion_semanal=programacion_actual
-        ).select_related('cuña', 'ubicacion')
+        bloques_semana, ubicaciones, asignaciones = datos_grilla_semana(programacion_actual)
         
-        # Obtener cuñas disponibles para programar - CORREGIDO
+        # Obtener cuñas disponibles para programar
         cuñas_disponibles = CuñaPublicitaria.objects.filter(
-            estado='activa',  # Asegúrate que este campo existe en tu modelo
+            estado='activa',
             fecha_inicio__lte=timezone.now().date(),
             fecha_fin__gte=timezone.now().date()
         ).select_related('cliente', 'categoria')
     
-    # Estadísticas - CORREGIDO para evitar errores
+    # Estadísticas
     total_cuñas = CuñaPublicitaria.objects.filter(estado='activa').count()
-    cuñas_programadas = asignaciones.count()
+    cuñas_programadas = len(asignaciones)
     cuñas_pendientes = max(0, total_cuñas - cuñas_programadas)
     
     # Calcular ingresos de forma segura
@@ -8922,13 +6803,7 @@ def grilla_publicitaria_list(request):
         except (AttributeError, TypeError, ValueError):
             continue
     
-    # Horas en intervalos de 30 minutos (de 6:00 AM a 11:30 PM)
-    horas_dia = []
-    for hora in range(0, 24):
-        for minuto in [0, 30]:
-            horas_dia.append(f"{hora:02d}:{minuto:02d}")
-    
-    context = {
+    return {
         'programacion_actual': programacion_actual,
         'programaciones': programaciones,
         'cuñas_disponibles': cuñas_disponibles,
@@ -8936,15 +6811,93 @@ def grilla_publicitaria_list(request):
         'cuñas_programadas': cuñas_programadas,
         'cuñas_pendientes': cuñas_pendientes,
         'ingresos_totales': ingresos_totales,
-        'grilla_available': GRILLA_AVAILABLE,
-        'dias_semana': ['Lunes', 'Martes', 'Miércoles', 'Jueves', 'Viernes', 'Sábado', 'Domingo'],
-        'horas_dia': horas_dia,
+        'grilla_available': True,
+        'dias_semana': NOMBRES_DIAS,
+        'horas_dia': HORAS_FRANJAS,
         'bloques_semana': bloques_semana,
-        'ubicaciones': ubicaciones,
-        'asignaciones': asignaciones,
+        'matriz': construir_matriz(bloques_semana, ubicaciones, asignaciones),
     }
+
+def datos_grilla_semana(programacion):
+    """
+    Bloques, pausas activas y asignaciones de una programación semanal, en
+    tres consultas
+    """
+    from apps.programacion_canal.models import BloqueProgramacion
+    from apps.grilla_publicitaria.models import UbicacionPublicitaria, AsignacionCuña
     
-    return render(request, 'custom_admin/grilla_publicitaria/list.html', context)
+    bloques = list(BloqueProgramacion.objects.filter(
+        programacion_semanal=programacion
+    ).select_related('programa').order_by('dia_semana', 'hora_inicio'))
+    
+    ubicaciones = list(UbicacionPublicitaria.objects.filter(
+        bloque_programacion__programacion_semanal=programacion,
+        activo=True
+    ).order_by('hora_pausa'))
+    
+    asignaciones = list(AsignacionCuña.objects.filter(
+        ubicacion__bloque_programacion__programacion_semanal=programacion
+    ).select_related('cuña'))
+    
+    return bloques, ubicaciones, asignaciones
+
+@login_required
+@require_http_methods(["GET"])
+def grilla_matriz_api(request):
+    """API con la matriz semanal de la grilla (7 días × 48 franjas)"""
+    try:
+        from apps.programacion_canal.models import ProgramacionSemanal
+        from apps.grilla_publicitaria.matriz import NOMBRES_DIAS, construir_matriz, matriz_a_json
+        
+        programacion_id = request.GET.get('programacion_id')
+        if programacion_id:
+            programacion = get_object_or_404(ProgramacionSemanal, id=programacion_id)
+        else:
+            programacion = ProgramacionSemanal.objects.order_by('-fecha_inicio_semana').first()
+        
+        if not programacion:
+            return JsonResponse({'success': False, 'error': 'No hay programaciones disponibles'})
+        
+        bloques, ubicaciones, asignaciones = datos_grilla_semana(programacion)
+        return JsonResponse({
+            'success': True,
+            'programacion_id': programacion.id,
+            'dias': NOMBRES_DIAS,
+            'filas': matriz_a_json(construir_matriz(bloques, ubicaciones, asignaciones)),
+        })
+    
+    except Http404:
+        raise
+    except Exception as e:
+        return JsonResponse({'success': False, 'error': str(e)})
+@login_required
+@require_http_methods(["GET"])
+def grilla_estado_api(request, programacion_id):
+    """
+    Estado versionado de la grilla para el editor: completo, o con ?desde=N
+    solo los bloques cambiados desde la revisión N. Responde 304 si el
+    cliente ya tiene la revisión actual (If-None-Match).
+    """
+    from django.http import HttpResponseNotModified
+    from apps.programacion_canal.models import ProgramacionSemanal
+    from apps.grilla_publicitaria.revisiones import estado_grilla
+    
+    programacion = get_object_or_404(ProgramacionSemanal.objects.only('id', 'revision'), id=programacion_id)
+    
+    try:
+        desde = int(request.GET['desde']) if request.GET.get('desde') else None
+    except ValueError:
+        return JsonResponse({'success': False, 'error': 'Revisión no válida'}, status=400)
+    
+    etag = f'"grilla-{programacion.id}-r{programacion.revision}-{"completo" if desde is None else desde}"'
+    if etag_coincide(request, etag):
+        respuesta = HttpResponseNotModified()
+    else:
+        respuesta = JsonResponse({'success': True, **estado_grilla(programacion, desde)})
+    respuesta['ETag'] = etag
+    respuesta['Cache-Control'] = 'private, no-cache'
+    return respuesta
+
 @login_required
 @user_passes_test(is_admin_or_vtr)
 @require_http_methods(["POST"])
@@ -9310,194 +7263,31 @@ def grilla_editar_asignacion_api(request, asignacion_id):
             
         return JsonResponse({'success': True, 'message': 'Asignación actualizada correctamente'})
         
-    except Exception as e:
-        return JsonResponse({'success': False, 'error': str(e)})
-@login_required
-@user_passes_test(is_admin_or_vtr)
-@require_http_methods(["POST"])
-def grilla_generar_ubicaciones_api(request):
-    """API para generar ubicaciones automáticamente"""
-    try:
-        data = json.loads(request.body)
-        programacion_id = data.get('programacion_id')
-        
-        programacion = get_object_or_404(ProgramacionSemanal, id=programacion_id)
-        bloques = BloqueProgramacion.objects.filter(programacion_semanal=programacion)
-        
-        ubicaciones_creadas = 0
-        
-        for bloque in bloques:
-            # Crear 2-3 pausas publicitarias por bloque dependiendo de la duración
-            duracion_minutos = bloque.duracion_real.total_seconds() / 60
-            
-            if duracion_minutos >= 30:
-                # Para bloques largos, crear 3 pausas
-                pausas = [
-                    ('Pausa Inicial', 'corta', timedelta(minutes=0)),
-                    ('Pausa Intermedia', 'media', timedelta(minutes=duracion_minutos/2)),
-                    ('Pausa Final', 'corta', timedelta(minutes=duracion_minutos-5)),
-                ]
-            elif duracion_minutos >= 15:
-                # Para bloques medianos, crear 2 pausas
-                pausas = [
-                    ('Pausa Inicial', 'corta', timedelta(minutes=0)),
-                    ('Pausa Final', 'corta', timedelta(minutes=duracion_minutos-5)),
-                ]
-            else:
-                # Para bloques cortos, crear 1 pausa
-                pausas = [
-                    ('Pausa Central', 'corta', timedelta(minutes=duracion_minutos/2)),
-                ]
-            
-            for nombre_pausa, tipo_pausa, hora_relativa in pausas:
-                # Verificar si ya existe una ubicación similar
-                existe = UbicacionPublicitaria.objects.filter(
-                    bloque_programacion=bloque,
-                    hora_inicio_relativa=hora_relativa
-                ).exists()
-                
-                if not existe:
-                    UbicacionPublicitaria.objects.create(
-                        bloque_programacion=bloque,
-                        tipo_pausa=tipo_pausa,
-                        nombre=f"{bloque.programa.nombre} - {nombre_pausa}",
-                        hora_inicio_relativa=hora_relativa,
-                        capacidad_cuñas=3,
-                        activo=True
-                    )
-                    ubicaciones_creadas += 1
-        
-        return JsonResponse({
-            'success': True,
-            'message': f'Se crearon {ubicaciones_creadas} ubicaciones publicitarias automáticamente',
-            'ubicaciones_creadas': ubicaciones_creadas
-        })
-        
     except Exception as e:
         return JsonResponse({'success': False, 'error': str(e)})
 # custom_admin/views.py - VISTA CORREGIDA
 @login_required
-def grilla_publicitaria_integrada(request):
-    """Grilla que combina programación del canal y ubicaciones publicitarias como puntos"""
-    try:
-        from apps.programacion_canal.models import ProgramacionSemanal, BloqueProgramacion
-        from apps.grilla_publicitaria.models import UbicacionPublicitaria, AsignacionCuña
-        from apps.content_management.models import CuñaPublicitaria
-        
-        GRILLA_AVAILABLE = True
-    except ImportError as e:
-        GRILLA_AVAILABLE = False
-        messages.error(request, 'Módulo de Grilla Publicitaria no disponible')
-        return render(request, 'custom_admin/en_desarrollo.html', {'error': str(e)})
-    
-    # Obtener programación actual
-    programacion_id = request.GET.get('programacion_id')
-    programaciones = ProgramacionSemanal.objects.all().order_by('-fecha_inicio_semana')
-    
-    programacion_actual = None
-    calendario_data = {}
-    cuñas_disponibles = []
-    ubicaciones = []
-    asignaciones = []
-    bloques_semana = []
-    
-    if programacion_id:
-        programacion_actual = get_object_or_404(ProgramacionSemanal, id=programacion_id)
-    elif programaciones.exists():
-        programacion_actual = programaciones.first()
-    
-    if programacion_actual:
-        # Obtener bloques de programación
-        bloques_semana = BloqueProgramacion.objects.filter(
-            programacion_semanal=programacion_actual
-        ).select_related('programa').order_by('dia_semana', 'hora_inicio')
-        
-        # Obtener ubicaciones publicitarias para esta programación
-        ubicaciones = UbicacionPublicitaria.objects.filter(
-            bloque_programacion__programacion_semanal=programacion_actual,
-            activo=True
-        ).select_related('bloque_programacion', 'bloque_programacion__programa')
-        
-        # Obtener asignaciones de cuñas
-        asignaciones = AsignacionCuña.objects.filter(
-            ubicacion__bloque_programacion__programacion_semanal=programacion_actual
-        ).select_related('cuña', 'ubicacion')
-        
-        # Obtener cuñas disponibles para programar
-        cuñas_disponibles = CuñaPublicitaria.objects.filter(
-            estado='activa',
-            fecha_inicio__lte=timezone.now().date(),
-            fecha_fin__gte=timezone.now().date()
-        ).select_related('cliente', 'categoria')
-        
-        # Preparar datos para el calendario
-        calendario_data = preparar_datos_calendario_mejorado(bloques_semana, ubicaciones, asignaciones)
-    
-    # Estadísticas
-    total_cuñas = CuñaPublicitaria.objects.filter(estado='activa').count()
-    cuñas_programadas = asignaciones.count()
-    cuñas_pendientes = total_cuñas - cuñas_programadas
-    ingresos_totales = sum(float(asignacion.cuña.precio_total) for asignacion in asignaciones)
-    
-    context = {
-        'programacion_actual': programacion_actual,
-        'programaciones': programaciones,
-        'cuñas_disponibles': cuñas_disponibles,
-        'total_cuñas': total_cuñas,
-        'cuñas_programadas': cuñas_programadas,
-        'cuñas_pendientes': cuñas_pendientes,
-        'ingresos_totales': ingresos_totales,
-        'grilla_available': GRILLA_AVAILABLE,
-        'dias_semana': ['Lunes', 'Martes', 'Miércoles', 'Jueves', 'Viernes', 'Sábado', 'Domingo'],
-        'bloques_semana': bloques_semana,
-        'ubicaciones': ubicaciones,
-        'asignaciones': asignaciones,
-        'calendario_data': calendario_data,
-    }
-    
-    return render(request, 'custom_admin/grilla_publicitaria/integrada.html', context)
-
-def preparar_datos_calendario_mejorado(bloques_semana, ubicaciones, asignaciones):
-    """Prepara datos para mostrar ubicaciones como puntos en la programación"""
-    datos = {}
-    
-    for bloque in bloques_semana:
-        dia = bloque.dia_semana
-        hora_inicio = bloque.hora_inicio.strftime('%H:%M')
-        
-        if dia not in datos:
-            datos[dia] = {}
-        
-        if hora_inicio not in datos[dia]:
-            datos[dia][hora_inicio] = {
-                'bloque': bloque,
-                'ubicaciones': [],
-                'asignaciones': []
-            }
-        
-        # Agregar ubicaciones de este bloque
-        ubicaciones_bloque = [u for u in ubicaciones if u.bloque_programacion.id == bloque.id]
-        datos[dia][hora_inicio]['ubicaciones'] = ubicaciones_bloque
-        
-        # Agregar asignaciones de este bloque
-        asignaciones_bloque = []
-        for asignacion in asignaciones:
-            if asignacion.ubicacion.bloque_programacion.id == bloque.id:
-                asignaciones_bloque.append(asignacion)
-        datos[dia][hora_inicio]['asignaciones'] = asignaciones_bloque
+def grilla_publicitaria_integrada(request):
+    """Grilla que combina programación del canal y ubicaciones publicitarias como puntos"""
+    try:
+        context = contexto_grilla_publicitaria(request)
+    except ImportError as e:
+        messages.error(request, 'Módulo de Grilla Publicitaria no disponible')
+        return render(request, 'custom_admin/en_desarrollo.html', {'error': str(e)})
     
-    return datos
+    return render(request, 'custom_admin/grilla_publicitaria/list.html', context)
 @login_required
+@user_passes_test(is_admin_or_vtr)
 @require_http_methods(["POST"])
 def grilla_generar_ubicaciones_api(request):
-    """Generar ubicaciones publicitarias automáticamente"""
+    """Generar ubicaciones publicitarias automáticamente según las plantillas de pausas"""
     try:
-        from apps.programacion_canal.models import ProgramacionSemanal, BloqueProgramacion
-        from apps.grilla_publicitaria.models import UbicacionPublicitaria
-        from datetime import timedelta
+        from apps.programacion_canal.models import ProgramacionSemanal
+        from apps.grilla_publicitaria.generacion import generar_ubicaciones_semana
         
         data = json.loads(request.body)
         programacion_id = data.get('programacion_id')
+        simular = bool(data.get('simular', False))
         
         if programacion_id:
             programacion = ProgramacionSemanal.objects.get(id=programacion_id)
@@ -9508,30 +7298,20 @@ def grilla_generar_ubicaciones_api(request):
         if not programacion:
             return JsonResponse({'success': False, 'error': 'No hay programaciones disponibles'})
         
-        # Obtener todos los bloques de la programación
-        bloques = BloqueProgramacion.objects.filter(programacion_semanal=programacion)
+        resultado = generar_ubicaciones_semana(programacion, simular=simular)
         
-        ubicaciones_creadas = 0
-        
-        for bloque in bloques:
-            # Verificar si ya existe una ubicación para este bloque
-            if not UbicacionPublicitaria.objects.filter(bloque_programacion=bloque).exists():
-                # Crear ubicación publicitaria
-                ubicacion = UbicacionPublicitaria.objects.create(
-                    bloque_programacion=bloque,
-                    tipo_pausa='media',
-                    nombre=f"Pausa - {bloque.programa.nombre}",
-                    hora_inicio_relativa=timedelta(minutes=5),  # 5 minutos después del inicio
-                    duracion_disponible=timedelta(seconds=60),  # 60 segundos
-                    capacidad_cuñas=3,
-                    activo=True
-                )
-                ubicaciones_creadas += 1
+        if simular:
+            mensaje = f'Se crearían {len(resultado["ubicaciones"])} ubicaciones publicitarias'
+        else:
+            mensaje = f'Se crearon {resultado["creadas"]} ubicaciones publicitarias'
         
         return JsonResponse({
             'success': True,
-            'message': f'Se crearon {ubicaciones_creadas} ubicaciones publicitarias',
-            'ubicaciones_creadas': ubicaciones_creadas
+            'message': mensaje,
+            'simulacion': simular,
+            'ubicaciones_creadas': resultado['creadas'],
+            'ubicaciones_existentes': resultado['existentes'],
+            'ubicaciones': resultado['ubicaciones']
         })
         
     except Exception as e:
@@ -9825,701 +7605,6 @@ def grilla_publicitaria_en_vivo(request):
     
     return render(request, 'custom_admin/grilla_publicitaria/en_vivo.html', context)
 
-# ============================================
-# VISTAS DE INVENTARIO - SIMPLIFICADAS
-# ============================================
-
-@login_required
-def inventory_list(request):
-    """Vista principal del inventario - SIMPLIFICADA"""
-    
-    if not INVENTORY_MODELS_AVAILABLE:
-        messages.error(request, 'Módulo de Inventario no disponible')
-        return redirect('custom_admin:dashboard')
-    
-    try:
-        # ========== FILTROS ==========
-        search_query = request.GET.get('search', '')
-        category_id = request.GET.get('category', '')
-        status_id = request.GET.get('status', '')
-        
-        # Items del inventario - SOLO category y status
-        items = InventoryItem.objects.select_related(
-            'category', 'status', 'created_by', 'updated_by'
-        ).all().order_by('code')
-        
-        # Aplicar filtros
-        if search_query:
-            items = items.filter(
-                Q(code__icontains=search_query) |
-                Q(name__icontains=search_query) |
-                Q(description__icontains=search_query) |
-                Q(serial_number__icontains=search_query) |
-                Q(brand__icontains=search_query) |
-                Q(model__icontains=search_query) |
-                Q(location__icontains=search_query)
-            )
-        
-        if category_id:
-            items = items.filter(category_id=category_id)
-        
-        if status_id:
-            items = items.filter(status_id=status_id)
-        
-        # Paginación
-        paginator = Paginator(items, 25)
-        page_number = request.GET.get('page')
-        page_obj = paginator.get_page(page_number)
-        
-        # ========== DATOS PARA FILTROS ==========
-        categories = Category.objects.filter(is_active=True)
-        statuses = Status.objects.all()
-        
-        # ========== ESTADÍSTICAS SIMPLIFICADAS ==========
-        total_items = items.count()
-        total_categories = Category.objects.filter(is_active=True).count()
-        total_statuses = Status.objects.count()
-        
-        # Items con stock bajo
-        low_stock_count = InventoryItem.objects.filter(
-            quantity__lte=F('min_quantity'),
-            is_active=True
-        ).count()
-        
-        context = {
-            'page_obj': page_obj,
-            'search_query': search_query,
-            'selected_category': category_id,
-            'selected_status': status_id,
-            'categories': categories,
-            'statuses': statuses,
-            'total_items': total_items,
-            'total_categories': total_categories,
-            'total_statuses': total_statuses,
-            'low_stock_count': low_stock_count,
-        }
-        
-        return render(request, 'custom_admin/inventory/list.html', context)
-        
-    except Exception as e:
-        print(f"❌ ERROR en inventory_list: {e}")
-        import traceback
-        traceback.print_exc()
-        messages.error(request, f'Error al cargar el inventario: {str(e)}')
-        return redirect('custom_admin:dashboard')
-
-@login_required
-def inventory_ajax_detail(request, item_id):
-    """Obtener detalles de un ítem para modal (AJAX) - SIMPLIFICADA"""
-    
-    if not INVENTORY_MODELS_AVAILABLE:
-        return JsonResponse({'error': 'Módulo no disponible'}, status=400)
-    
-    try:
-        item = get_object_or_404(
-            InventoryItem.objects.select_related(
-                'category', 'status', 'created_by', 'updated_by'
-            ),
-            id=item_id
-        )
-        
-        # Formatear fechas
-        created_at = item.created_at.strftime('%d/%m/%Y %H:%M')
-        updated_at = item.updated_at.strftime('%d/%m/%Y %H:%M')
-        
-        # Estado de stock
-        stock_status = 'Normal'
-        stock_class = 'success'
-        if item.quantity <= item.min_quantity:
-            stock_status = 'Bajo Stock'
-            stock_class = 'danger'
-        elif item.quantity <= item.min_quantity * 1.5:
-            stock_status = 'Próximo a agotar'
-            stock_class = 'warning'
-        
-        data = {
-            'success': True,
-            'item': {
-                'id': item.id,
-                'code': item.code,
-                'name': item.name,
-                'description': item.description,
-                'category': item.category.name if item.category else '',
-                'category_color': item.category.color if item.category else '#3498db',
-                'status': item.status.name if item.status else '',
-                'status_color': item.status.color if item.status else '#95a5a6',
-                'location': item.location,
-                'quantity': item.quantity,
-                'min_quantity': item.min_quantity,
-                'unit_of_measure': item.unit_of_measure,
-                'serial_number': item.serial_number,
-                'brand': item.brand,
-                'model': item.model,
-                'supplier': item.supplier,
-                'stock_status': stock_status,
-                'stock_class': stock_class,
-                'notes': item.notes,
-                'is_active': item.is_active,
-                'created_by': item.created_by.get_full_name() if item.created_by else 'Sistema',
-                'created_at': created_at,
-                'updated_by': item.updated_by.get_full_name() if item.updated_by else 'Sistema',
-                'updated_at': updated_at,
-            }
-        }
-        
-        return JsonResponse(data)
-        
-    except Exception as e:
-        print(f"❌ ERROR en inventory_ajax_detail: {e}")
-        import traceback
-        traceback.print_exc()
-        return JsonResponse({'error': str(e)}, status=500)
-
-@login_required
-def inventory_ajax_get_form_data(request, item_id=None):
-    """Obtener datos para formulario de crear/editar (AJAX) - SIMPLIFICADA"""
-    
-    if not INVENTORY_MODELS_AVAILABLE:
-        return JsonResponse({'error': 'Módulo no disponible'}, status=400)
-    
-    try:
-        categories = Category.objects.filter(is_active=True).values('id', 'name')
-        statuses = Status.objects.all().values('id', 'name')
-        
-        data = {
-            'success': True,
-            'categories': list(categories),
-            'statuses': list(statuses),
-            'item': None,
-        }
-        
-        # Si es edición, obtener datos del item
-        if item_id:
-            item = get_object_or_404(InventoryItem, id=item_id)
-            
-            item_data = {
-                'id': item.id,
-                'code': item.code,
-                'name': item.name,
-                'description': item.description,
-                'category_id': item.category.id if item.category else '',
-                'status_id': item.status.id if item.status else '',
-                'location': item.location,
-                'quantity': item.quantity,
-                'min_quantity': item.min_quantity,
-                'unit_of_measure': item.unit_of_measure,
-                'serial_number': item.serial_number,
-                'brand': item.brand,
-                'model': item.model,
-                'supplier': item.supplier,
-                'notes': item.notes,
-                'is_active': item.is_active,
-            }
-            
-            data['item'] = item_data
-        
-        return JsonResponse(data)
-        
-    except Exception as e:
-        print(f"❌ ERROR en inventory_ajax_get_form_data: {e}")
-        import traceback
-        traceback.print_exc()
-        return JsonResponse({'error': str(e)}, status=500)
-
-@login_required
-@require_POST
-def inventory_ajax_save(request):
-    """Guardar o actualizar ítem (AJAX) - SIMPLIFICADA"""
-    
-    if not INVENTORY_MODELS_AVAILABLE:
-        return JsonResponse({'error': 'Módulo no disponible'}, status=400)
-    
-    try:
-        item_id = request.POST.get('item_id')
-        
-        # Datos básicos
-        name = request.POST.get('name', '').strip()
-        description = request.POST.get('description', '').strip()
-        category_id = request.POST.get('category')
-        status_id = request.POST.get('status')
-        location = request.POST.get('location', '').strip()
-        
-        # Cantidad
-        quantity = int(request.POST.get('quantity', 1))
-        min_quantity = int(request.POST.get('min_quantity', 0))
-        unit_of_measure = request.POST.get('unit_of_measure', 'Unidad').strip()
-        
-        # Información técnica
-        serial_number = request.POST.get('serial_number', '').strip()
-        brand = request.POST.get('brand', '').strip()
-        model = request.POST.get('model', '').strip()
-        supplier = request.POST.get('supplier', '').strip()
-        
-        # Otros
-        notes = request.POST.get('notes', '').strip()
-        is_active = request.POST.get('is_active') == 'true'
-        
-        # Validaciones
-        if not name:
-            return JsonResponse({'error': 'El nombre es obligatorio'}, status=400)
-        
-        if not category_id:
-            return JsonResponse({'error': 'La categoría es obligatoria'}, status=400)
-        
-        if not status_id:
-            return JsonResponse({'error': 'El estado es obligatorio'}, status=400)
-        
-        if quantity < 0:
-            return JsonResponse({'error': 'La cantidad no puede ser negativa'}, status=400)
-        
-        if min_quantity < 0:
-            return JsonResponse({'error': 'La cantidad mínima no puede ser negativa'}, status=400)
-        
-        # Obtener objetos relacionados
-        category = get_object_or_404(Category, id=category_id)
-        status = get_object_or_404(Status, id=status_id)
-        
-        if item_id:
-            # Actualizar ítem existente
-            item = get_object_or_404(InventoryItem, id=item_id)
-            item.name = name
-            item.description = description
-            item.category = category
-            item.status = status
-            item.location = location
-            item.quantity = quantity
-            item.min_quantity = min_quantity
-            item.unit_of_measure = unit_of_measure
-            item.serial_number = serial_number
-            item.brand = brand
-            item.model = model
-            item.supplier = supplier
-            item.notes = notes
-            item.is_active = is_active
-            item.updated_by = request.user
-            
-            item.save()
-            
-            message = f'Ítem "{item.name}" actualizado exitosamente'
-            item_code = item.code
-            
-        else:
-            # Crear nuevo ítem
-            item = InventoryItem(
-                name=name,
-                description=description,
-                category=category,
-                status=status,
-                location=location,
-                quantity=quantity,
-                min_quantity=min_quantity,
-                unit_of_measure=unit_of_measure,
-                serial_number=serial_number,
-                brand=brand,
-                model=model,
-                supplier=supplier,
-                notes=notes,
-                is_active=is_active,
-                created_by=request.user,
-                updated_by=request.user
-            )
-            
-            item.save()
-            
-            message = f'Ítem "{item.name}" creado exitosamente con código {item.code}'
-            item_code = item.code
-        
-        return JsonResponse({
-            'success': True,
-            'message': message,
-            'item_code': item_code,
-            'item_id': item.id
-        })
-        
-    except Exception as e:
-        print(f"❌ ERROR en inventory_ajax_save: {e}")
-        import traceback
-        traceback.print_exc()
-        return JsonResponse({'error': f'Error del servidor: {str(e)}'}, status=500)
-
-@login_required
-@require_POST
-def inventory_ajax_delete(request, item_id):
-    """Eliminar ítem (AJAX)"""
-    
-    if not INVENTORY_MODELS_AVAILABLE:
-        return JsonResponse({'error': 'Módulo no disponible'}, status=400)
-    
-    try:
-        item = get_object_or_404(InventoryItem, id=item_id)
-        item_name = item.name
-        item_code = item.code
-        
-        item.delete()
-        
-        return JsonResponse({
-            'success': True,
-            'message': f'Ítem "{item_name}" ({item_code}) eliminado exitosamente'
-        })
-        
-    except Exception as e:
-        print(f"❌ ERROR en inventory_ajax_delete: {e}")
-        import traceback
-        traceback.print_exc()
-        return JsonResponse({'error': str(e)}, status=500)
-
-@login_required
-def inventory_export(request):
-    """Exportar inventario a CSV o Excel"""
-    
-    if not INVENTORY_MODELS_AVAILABLE:
-        messages.error(request, 'Módulo de Inventario no disponible')
-        return redirect('custom_admin:inventory_list')
-    
-    try:
-        formato = request.GET.get('formato', 'csv')
-        
-        items = InventoryItem.objects.select_related(
-            'category', 'status'
-        ).all().order_by('code')
-        
-        if formato == 'csv':
-            response = HttpResponse(content_type='text/csv')
-            response['Content-Disposition'] = f'attachment; filename="inventario_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv"'
-            
-            writer = csv.writer(response)
-            writer.writerow(['Reporte de Inventario', datetime.now().strftime('%d/%m/%Y %H:%M')])
-            writer.writerow([])
-            writer.writerow([
-                'Código', 'Nombre', 'Categoría', 'Estado', 'Ubicación',
-                'Cantidad', 'Mínimo', 'Unidad', 'Número Serie',
-                'Marca', 'Modelo', 'Proveedor', 'Activo'
-            ])
-            
-            for item in items:
-                writer.writerow([
-                    item.code,
-                    item.name,
-                    item.category.name if item.category else '',
-                    item.status.name if item.status else '',
-                    item.location,
-                    item.quantity,
-                    item.min_quantity,
-                    item.unit_of_measure,
-                    item.serial_number,
-                    item.brand,
-                    item.model,
-                    item.supplier,
-                    'Sí' if item.is_active else 'No'
-                ])
-            
-            return response
-            
-        elif formato == 'excel':
-            response = HttpResponse(content_type='application/ms-excel')
-            response['Content-Disposition'] = f'attachment; filename="inventario_{datetime.now().strftime("%Y%m%d_%H%M%S")}.xls"'
-            
-            wb = xlwt.Workbook(encoding='utf-8')
-            ws = wb.add_sheet('Inventario')
-            
-            # Estilos
-            header_style = xlwt.easyxf('font: bold on; align: vert centre, horiz center')
-            
-            # Encabezados
-            ws.write(0, 0, f'Reporte de Inventario - {datetime.now().strftime("%d/%m/%Y %H:%M")}', header_style)
-            
-            headers = [
-                'Código', 'Nombre', 'Categoría', 'Estado', 'Ubicación',
-                'Cantidad', 'Mínimo', 'Unidad', 'Número Serie',
-                'Marca', 'Modelo', 'Proveedor', 'Activo'
-            ]
-            
-            for col, header in enumerate(headers):
-                ws.write(2, col, header, header_style)
-            
-            # Datos
-            row = 3
-            for item in items:
-                ws.write(row, 0, item.code)
-                ws.write(row, 1, item.name)
-                ws.write(row, 2, item.category.name if item.category else '')
-                ws.write(row, 3, item.status.name if item.status else '')
-                ws.write(row, 4, item.location)
-                ws.write(row, 5, item.quantity)
-                ws.write(row, 6, item.min_quantity)
-                ws.write(row, 7, item.unit_of_measure)
-                ws.write(row, 8, item.serial_number)
-                ws.write(row, 9, item.brand)
-                ws.write(row, 10, item.model)
-                ws.write(row, 11, item.supplier)
-                ws.write(row, 12, 'Sí' if item.is_active else 'No')
-                row += 1
-            
-            wb.save(response)
-            return response
-        
-        else:
-            messages.error(request, 'Formato de exportación no válido')
-            return redirect('custom_admin:inventory_list')
-        
-    except Exception as e:
-        print(f"❌ ERROR en inventory_export: {e}")
-        import traceback
-        traceback.print_exc()
-        messages.error(request, f'Error al exportar el inventario: {str(e)}')
-        return redirect('custom_admin:inventory_list')
-
-# ==================== VISTAS PARA CONFIGURACIÓN DE INVENTARIO ====================
-
-@login_required
-def inventory_categories_ajax_list(request):
-    """Obtener lista de categorías (AJAX) - MOSTRAR TODAS"""
-    if not INVENTORY_MODELS_AVAILABLE:
-        return JsonResponse({'error': 'Módulo no disponible'}, status=400)
-    
-    try:
-        # Obtener TODAS las categorías, no solo las activas
-        categories = Category.objects.all().order_by('order', 'name')
-        
-        # Preparar datos para respuesta
-        categories_data = []
-        for cat in categories:
-            categories_data.append({
-                'id': cat.id,
-                'name': cat.name,
-                'color': cat.color,
-                'order': cat.order,
-                'is_active': cat.is_active,
-                'created_at': cat.created_at.strftime('%Y-%m-%d') if cat.created_at else '',
-            })
-        
-        return JsonResponse({
-            'success': True, 
-            'categories': categories_data,
-            'count': len(categories_data),
-            'message': f'Se encontraron {len(categories_data)} categorías'
-        })
-        
-    except Exception as e:
-        print(f"❌ ERROR en inventory_categories_ajax_list: {e}")
-        import traceback
-        traceback.print_exc()
-        return JsonResponse({'error': str(e)}, status=500)
-
-@login_required
-def inventory_statuses_ajax_list(request):
-    """Obtener lista de estados (AJAX)"""
-    if not INVENTORY_MODELS_AVAILABLE:
-        return JsonResponse({'error': 'Módulo no disponible'}, status=400)
-    
-    try:
-        statuses = Status.objects.all().values('id', 'name', 'color', 'is_default', 'can_use', 'requires_attention')
-        return JsonResponse({'success': True, 'statuses': list(statuses)})
-    except Exception as e:
-        return JsonResponse({'error': str(e)}, status=500)
-
-@login_required
-@require_POST
-def inventory_category_ajax_save(request):
-    """Guardar o actualizar categoría (AJAX) - VERSIÓN SIMPLIFICADA"""
-    if not INVENTORY_MODELS_AVAILABLE:
-        return JsonResponse({'error': 'Módulo no disponible'}, status=400)
-    
-    try:
-        # Obtener datos del POST
-        category_id = request.POST.get('categoria_id') or request.POST.get('id')
-        name = request.POST.get('nombre') or request.POST.get('name', '').strip()
-        color = request.POST.get('color', '#3498db')
-        
-        # Obtener otros campos con valores por defecto
-        order = request.POST.get('orden') or request.POST.get('order', '0')
-        is_active = request.POST.get('activa') or request.POST.get('is_active', 'true')
-        
-        # Convertir tipos
-        try:
-            order = int(order)
-        except:
-            order = 0
-            
-        is_active = is_active.lower() in ['true', '1', 'yes', 'si']
-        
-        # Validación básica
-        if not name:
-            return JsonResponse({'error': 'El nombre es obligatorio'}, status=400)
-        
-        if category_id and category_id != 'undefined' and category_id != '':
-            # Actualizar categoría existente
-            try:
-                category = Category.objects.get(id=category_id)
-                category.name = name
-                category.color = color
-                category.order = order
-                category.is_active = is_active
-                category.save()
-                message = f'Categoría "{name}" actualizada'
-            except Category.DoesNotExist:
-                return JsonResponse({'error': 'Categoría no encontrada'}, status=404)
-        else:
-            # Crear nueva categoría
-            if Category.objects.filter(name=name).exists():
-                return JsonResponse({'error': 'Ya existe una categoría con ese nombre'}, status=400)
-            
-            category = Category.objects.create(
-                name=name,
-                color=color,
-                order=order,
-                is_active=is_active
-            )
-            message = f'Categoría "{name}" creada'
-        
-        return JsonResponse({
-            'success': True, 
-            'message': message, 
-            'id': category.id,
-            'name': category.name,
-            'color': category.color,
-            'order': category.order,
-            'is_active': category.is_active
-        })
-        
-    except Exception as e:
-        print(f"❌ ERROR en inventory_category_ajax_save: {e}")
-        import traceback
-        traceback.print_exc()
-        return JsonResponse({'error': str(e)}, status=500)
-
-@login_required
-@require_POST
-def inventory_status_ajax_save(request):
-    """Guardar o actualizar estado (AJAX)"""
-    if not INVENTORY_MODELS_AVAILABLE:
-        return JsonResponse({'error': 'Módulo no disponible'}, status=400)
-    
-    try:
-        status_id = request.POST.get('status_id') or request.POST.get('estado_id') or request.POST.get('id')
-        name = request.POST.get('nombre') or request.POST.get('name', '').strip()
-        color = request.POST.get('color', '#95a5a6')
-        
-        # Obtener valores de checkboxes (correctamente)
-        is_default = request.POST.get('default') == 'true' or request.POST.get('is_default') == 'true' or request.POST.get('estado_default') == 'true'
-        can_use = request.POST.get('puede_usarse') == 'true' or request.POST.get('can_use') == 'true' or request.POST.get('estado_puede_usarse') == 'true'
-        requires_attention = request.POST.get('requiere_atencion') == 'true' or request.POST.get('requires_attention') == 'true' or request.POST.get('estado_requiere_atencion') == 'true'
-        
-        # Establecer valores por defecto si no vienen
-        if request.POST.get('can_use') is None and request.POST.get('puede_usarse') is None:
-            can_use = True
-        
-        if not name:
-            return JsonResponse({'error': 'El nombre es obligatorio'}, status=400)
-        
-        if status_id and status_id != 'undefined' and status_id != '':
-            # Actualizar estado existente
-            try:
-                status = Status.objects.get(id=status_id)
-                status.name = name
-                status.color = color
-                status.can_use = can_use
-                status.requires_attention = requires_attention
-                
-                # Manejar estado por defecto
-                if is_default:
-                    Status.objects.filter(is_default=True).update(is_default=False)
-                    status.is_default = True
-                else:
-                    status.is_default = False
-                
-                status.save()
-                message = f'Estado "{name}" actualizado'
-            except Status.DoesNotExist:
-                return JsonResponse({'error': 'Estado no encontrado'}, status=404)
-        else:
-            # Crear nuevo estado
-            if Status.objects.filter(name=name).exists():
-                return JsonResponse({'error': 'Ya existe un estado con ese nombre'}, status=400)
-            
-            # Manejar estado por defecto
-            if is_default:
-                Status.objects.filter(is_default=True).update(is_default=False)
-            
-            status = Status.objects.create(
-                name=name,
-                color=color,
-                is_default=is_default,
-                can_use=can_use,
-                requires_attention=requires_attention
-            )
-            message = f'Estado "{name}" creado'
-        
-        return JsonResponse({
-            'success': True, 
-            'message': message, 
-            'id': status.id,
-            'name': status.name,
-            'color': status.color,
-            'is_default': status.is_default,
-            'can_use': status.can_use,
-            'requires_attention': status.requires_attention
-        })
-        
-    except Exception as e:
-        print(f"❌ ERROR en inventory_status_ajax_save: {e}")
-        import traceback
-        traceback.print_exc()
-        return JsonResponse({'error': str(e)}, status=500)
-
-@login_required
-@require_POST
-def inventory_category_ajax_delete(request, category_id):
-    """Eliminar categoría (AJAX)"""
-    if not INVENTORY_MODELS_AVAILABLE:
-        return JsonResponse({'error': 'Módulo no disponible'}, status=400)
-    
-    try:
-        category = get_object_or_404(Category, id=category_id)
-        
-        # Verificar si hay ítems usando esta categoría
-        item_count = InventoryItem.objects.filter(category=category).count()
-        if item_count > 0:
-            return JsonResponse({
-                'error': f'No se puede eliminar. Hay {item_count} ítems usando esta categoría.'
-            }, status=400)
-        
-        category_name = category.name
-        category.delete()
-        return JsonResponse({'success': True, 'message': f'Categoría "{category_name}" eliminada'})
-    except Exception as e:
-        return JsonResponse({'error': str(e)}, status=500)
-
-@login_required
-@require_POST
-def inventory_status_ajax_delete(request, status_id):
-    """Eliminar estado (AJAX)"""
-    if not INVENTORY_MODELS_AVAILABLE:
-        return JsonResponse({'error': 'Módulo no disponible'}, status=400)
-    
-    try:
-        status = get_object_or_404(Status, id=status_id)
-        
-        # Verificar si hay ítems usando este estado
-        item_count = InventoryItem.objects.filter(status=status).count()
-        if item_count > 0:
-            return JsonResponse({
-                'error': f'No se puede eliminar. Hay {item_count} ítems usando este estado.'
-            }, status=400)
-        
-        # Verificar si es el estado por defecto
-        if status.is_default:
-            return JsonResponse({
-                'error': 'No se puede eliminar el estado por defecto.'
-            }, status=400)
-        
-        status_name = status.name
-        status.delete()
-        return JsonResponse({'success': True, 'message': f'Estado "{status_name}" eliminado'})
-    except Exception as e:
-        return JsonResponse({'error': str(e)}, status=500)
-
-
 # ==================== VISTAS DE AUTORIZACIÓN ====================
 
 @login_required
@@ -11251,4 +8336,18 @@ def orden_suspension_descargar_plantilla_api(request, order_id):
             }, status=404)
             
     except Exception as e:
-        return JsonResponse({'success': False, 'error': str(e)}, status=500)
\ No newline at end of file
+        return JsonResponse({'success': False, 'error': str(e)}, status=500)
+
+
+# ==================== VISTAS MOVIDAS A apps.custom_admin.vistas ====================
+
+def __getattr__(nombre):
+    """
+    Compatibilidad para `views.reports_*` e `views.inventory_*`: esas vistas
+    viven en apps.custom_admin.vistas y se importan solo cuando se piden
+    """
+    modulo = VISTAS_MOVIDAS.get(nombre)
+    if modulo is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {nombre!r}")
+    from importlib import import_module
+    return getattr(import_module(modulo), nombre)
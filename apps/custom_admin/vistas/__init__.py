@@ -0,0 +1,107 @@
+"""
+Vistas del panel por funcionalidad, cargadas bajo demanda
+Sistema PubliTrack - El URLconf referencia las vistas con modulo_perezoso():
+cada ruta guarda solo el nombre del módulo y de la función, y el módulo se
+importa la primera vez que se atiende una petición de esa ruta. Así, cargar
+las URLs (arranque de cada worker, management commands, reverse) no importa
+views.py ni las dependencias de reportes o inventario.
+"""
+
+from functools import cached_property
+from importlib import import_module
+
+REPORTES = 'apps.custom_admin.vistas.reportes'
+INVENTARIO = 'apps.custom_admin.vistas.inventario'
+
+# Vistas que antes estaban en views.py (views.__getattr__ las sigue resolviendo)
+VISTAS_MOVIDAS = {
+    **dict.fromkeys([
+        'reports_dashboard_principal',
+        'reports_dashboard_contratos',
+        'reports_api_estadisticas_contratos',
+        'reports_estado_contratos',
+        'reports_vencimiento_contratos',
+        'reports_ingresos_contratos',
+        'reports_contratos_detalle_api',
+        'reports_dashboard_vendedores',
+        'reports_detalle_vendedor',
+        'reports_vendedores_detalle_api',
+        'cliente_contratos_api',
+        'vendedor_contratos_api',
+        'reports_dashboard_partes_mortuorios',
+        'reports_partes_estado_api',
+        'reports_partes_urgencia_api',
+        'reports_partes_ingresos_api',
+        'reports_partes_detalle_api',
+    ], REPORTES),
+    **dict.fromkeys([
+        'inventory_list',
+        'inventory_export',
+        'inventory_ajax_detail',
+        'inventory_ajax_get_form_data',
+        'inventory_ajax_save',
+        'inventory_ajax_delete',
+        'inventory_categories_ajax_list',
+        'inventory_statuses_ajax_list',
+        'inventory_category_ajax_save',
+        'inventory_status_ajax_save',
+        'inventory_category_ajax_delete',
+        'inventory_status_ajax_delete',
+    ], INVENTARIO),
+}
+
+
+class VistaPerezosa:
+    """
+    Vista de función que se importa en la primera llamada. Conserva
+    __module__ y __name__ para que resolve() y los logs muestren la ruta real;
+    los atributos que consulta Django antes de llamar a la vista (p. ej.
+    csrf_exempt en CsrfViewMiddleware) se leen de la vista ya importada.
+    """
+
+    def __init__(self, modulo, nombre):
+        self.modulo = modulo
+        self.__module__ = modulo
+        self.__name__ = self.__qualname__ = nombre
+
+    @cached_property
+    def vista(self):
+        return getattr(import_module(self.modulo), self.__name__)
+
+    def __call__(self, request, *args, **kwargs):
+        return self.vista(request, *args, **kwargs)
+
+    def __getattr__(self, atributo):
+        # Solo vistas de función: consultar view_class al poblar el resolver
+        # no debe importar el módulo
+        if atributo.startswith('__') or atributo in ('view_class', 'view_initkwargs'):
+            raise AttributeError(atributo)
+        return getattr(self.vista, atributo)
+
+    def __repr__(self):
+        return f'<VistaPerezosa {self.modulo}.{self.__name__}>'
+
+
+class ModuloPerezoso:
+    """
+    Sustituto de un módulo de vistas en el URLconf: `views.dashboard`
+    devuelve una VistaPerezosa en lugar de importar el módulo
+    """
+
+    def __init__(self, modulo):
+        self._modulo = modulo
+        self._vistas = {}
+
+    def __getattr__(self, nombre):
+        if nombre.startswith('_'):
+            raise AttributeError(nombre)
+        if nombre not in self._vistas:
+            self._vistas[nombre] = VistaPerezosa(self._modulo, nombre)
+        return self._vistas[nombre]
+
+
+def modulo_perezoso(modulo):
+    """
+    Referencia diferida a un módulo de vistas para usar en urls.py
+    """
+    return ModuloPerezoso(modulo)
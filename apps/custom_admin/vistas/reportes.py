@@ -0,0 +1,1601 @@
+"""
+Vistas de reportes del panel (contratos, vendedores y partes mortuorios)
+Sistema PubliTrack - Se importan bajo demanda desde el URLconf; las gráficas
+se construyen en reports_analytics.generators.graficas, que importa plotly
+solo al renderizar.
+"""
+
+import csv
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from django.contrib import messages
+from django.contrib.auth.decorators import login_required, user_passes_test
+from django.db.models import Avg, Count, Sum
+from django.http import HttpResponse, JsonResponse
+from django.shortcuts import get_object_or_404, redirect, render
+from django.utils import timezone
+
+from apps.dependencias import disponible
+from apps.reports_analytics.generators.dashboard_data import (
+    calcular_desempeño_vendedores,
+    calcular_estadisticas_contratos,
+)
+from apps.reports_analytics.generators.financial_reports import (
+    serie_ingresos,
+    serie_ingresos_mensuales,
+)
+from apps.reports_analytics.generators.graficas import renderizar_grafica
+
+from ..permisos import is_admin
+
+try:
+    from apps.content_management.models import ContratoGenerado, CuñaPublicitaria
+    CONTENT_MODELS_AVAILABLE = True
+except ImportError as e:
+    print(f"⚠️ Error importando modelos de content_management: {e}")
+    CONTENT_MODELS_AVAILABLE = False
+    ContratoGenerado = None
+    CuñaPublicitaria = None
+try:
+    from apps.authentication.models import CustomUser
+    AUTH_MODELS_AVAILABLE = True
+except ImportError as e:
+    print(f"⚠️ Error importando modelos de authentication: {e}")
+    AUTH_MODELS_AVAILABLE = False
+    CustomUser = None
+try:
+    from apps.parte_mortorios.models import ParteMortorio
+    PARTE_MORTORIO_MODELS_AVAILABLE = True
+except ImportError as e:
+    print(f"⚠️ Error importando modelos de parte_mortorios: {e}")
+    PARTE_MORTORIO_MODELS_AVAILABLE = False
+    ParteMortorio = None
+
+PLOTLY_AVAILABLE = disponible('plotly')
+
+
+# ==================== VISTAS DE REPORTES DE CONTRATOS ====================
+def _datos_grafica_ingresos_mensuales(meses_nombres, ingresos_mensuales):
+    """Datos de la gráfica de barras de ingresos mensuales (contratos y partes)"""
+    return {
+        'titulo': 'Ingresos Mensuales',
+        'categorias': meses_nombres,
+        'valores': ingresos_mensuales,
+        'etiquetas': {'x': 'Mes', 'y': 'Ingresos ($)'},
+        'escala_color': 'Blues',
+        'plantilla_hover': '<b>%{x}</b><br>Ingresos: $%{y:,.2f}',
+        'moneda': True,
+    }
+
+@login_required
+@user_passes_test(lambda u: u.es_admin or u.es_doctor)
+def reports_dashboard_contratos(request):
+    """Dashboard principal de contratos - ACTUALIZADO con gráficas Plotly - Accesible para Admin y Doctor"""
+    
+    # Verificar disponibilidad de modelos
+    if not CONTENT_MODELS_AVAILABLE:
+        context = {
+            'error': 'Módulo de Contratos no disponible',
+            'mensaje': 'No se pueden cargar los reportes en este momento.',
+            'models_available': False,
+            'total_contratos': 0,
+            'contratos_activos': 0,
+            'contratos_pendientes': 0,
+            'contratos_por_vencer': 0,
+            'contratos_vencidos': 0,
+            'contratos_cancelados': 0,
+            'ingresos_totales': Decimal('0.00'),
+            'ingresos_activos': Decimal('0.00'),
+            'contratos_recientes': [],
+            'grafica_pastel_html': '',
+            'grafica_barras_html': '',
+        }
+        return render(request, 'custom_admin/reports/contratos/list.html', context)
+    
+    try:
+        hoy = timezone.now().date()
+        
+        # Estadísticas de contratos en una sola consulta agregada (cacheada por fecha)
+        estadisticas = calcular_estadisticas_contratos(hoy)
+        total_contratos = estadisticas['total_contratos']
+        contratos_activos = estadisticas['contratos_activos']
+        contratos_pendientes = estadisticas['contratos_pendientes']
+        contratos_por_vencer = estadisticas['contratos_por_vencer']
+        contratos_vencidos = estadisticas['contratos_vencidos']
+        contratos_cancelados = estadisticas['contratos_cancelados']
+        ingresos_totales = estadisticas['ingresos_totales']
+        ingresos_activos = estadisticas['ingresos_activos']
+        ingresos_pendientes = estadisticas['ingresos_pendientes']
+        
+        # Contratos recientes
+        try:
+            contratos_recientes = ContratoGenerado.objects.select_related(
+                'cliente', 'cuña', 'plantilla_usada'
+            ).order_by('-fecha_generacion')[:10]
+            
+            # Asegurarnos de que cada contrato tenga el método get_estado_display
+            for contrato in contratos_recientes:
+                if not hasattr(contrato, 'get_estado_display'):
+                    contrato.get_estado_display = lambda: dict(ContratoGenerado.ESTADO_CHOICES).get(contrato.estado, contrato.estado)
+                    
+        except Exception as e:
+            print(f"❌ Error obteniendo contratos recientes: {e}")
+            contratos_recientes = []
+        
+        # ==================== GRÁFICAS CON PLOTLY ====================
+        
+        # 1. Gráfico de pastel - Contratos por Estado
+        grafica_pastel_html = renderizar_grafica('pastel', {
+            'titulo': 'Contratos por Estado',
+            'etiquetas': ['Validados', 'Pendientes', 'Por Vencer', 'Vencidos', 'Cancelados'],
+            'valores': [contratos_activos, contratos_pendientes, contratos_por_vencer, contratos_vencidos, contratos_cancelados],
+            'colores': {
+                'Validados': '#28a745',
+                'Pendientes': '#ffc107',
+                'Por Vencer': '#17a2b8',
+                'Vencidos': '#dc3545',
+                'Cancelados': '#6c757d'
+            },
+        })
+        
+        # 2. Gráfico de barras - Ingresos Mensuales (últimos 6 meses)
+        ingresos_mensuales = []
+        meses_nombres = []
+        
+        try:
+            for item in serie_ingresos_mensuales(hoy, 6, fuentes=['contrato']):
+                ingresos_mensuales.append(float(item['total']))
+                meses_nombres.append(item['periodo'].strftime('%b %Y'))
+                
+        except Exception as e:
+            print(f"❌ Error calculando ingresos mensuales: {e}")
+            # Datos de ejemplo en caso de error
+            for i in range(6):
+                ingresos_mensuales.append(0)
+                meses_nombres.append(f'Mes {i+1}')
+        
+        grafica_barras_html = renderizar_grafica('barras', _datos_grafica_ingresos_mensuales(
+            meses_nombres, ingresos_mensuales
+        ))
+        
+        context = {
+            'total_contratos': total_contratos,
+            'contratos_activos': contratos_activos,
+            'contratos_pendientes': contratos_pendientes,
+            'contratos_por_vencer': contratos_por_vencer,
+            'contratos_vencidos': contratos_vencidos,
+            'contratos_cancelados': contratos_cancelados,
+            'ingresos_totales': ingresos_totales,
+            'ingresos_activos': ingresos_activos,
+            'ingresos_pendientes': ingresos_pendientes,
+            'contratos_recientes': contratos_recientes,
+            'grafica_pastel_html': grafica_pastel_html,
+            'grafica_barras_html': grafica_barras_html,
+            'models_available': True,
+        }
+        
+        print(f"✅ Dashboard de Reportes cargado exitosamente:")
+        print(f"   - Total contratos: {total_contratos}")
+        print(f"   - Activos (validados): {contratos_activos}")
+        print(f"   - Pendientes (generados): {contratos_pendientes}")
+        print(f"   - Por vencer: {contratos_por_vencer}")
+        print(f"   - Vencidos: {contratos_vencidos}")
+        print(f"   - Cancelados: {contratos_cancelados}")
+        print(f"   - Ingresos totales: {ingresos_totales}")
+        print(f"   - Ingresos activos: {ingresos_activos}")
+        print(f"   - Ingresos pendientes: {ingresos_pendientes}")
+        print(f"   - Contratos recientes: {len(contratos_recientes)}")
+        
+        return render(request, 'custom_admin/reports/contratos/list.html', context)
+        
+    except Exception as e:
+        print(f"❌ ERROR CRÍTICO en reports_dashboard_contratos: {e}")
+        import traceback
+        traceback.print_exc()
+        
+        context = {
+            'error': 'Error al cargar el dashboard',
+            'mensaje': str(e),
+            'models_available': False,
+            'total_contratos': 0,
+            'contratos_activos': 0,
+            'contratos_pendientes': 0,
+            'contratos_por_vencer': 0,
+            'contratos_vencidos': 0,
+            'contratos_cancelados': 0,
+            'ingresos_totales': Decimal('0.00'),
+            'ingresos_activos': Decimal('0.00'),
+            'ingresos_pendientes': Decimal('0.00'),
+            'contratos_recientes': [],
+            'grafica_pastel_html': '',
+            'grafica_barras_html': '',
+        }
+        return render(request, 'custom_admin/reports/contratos/list.html', context)
+@login_required
+@user_passes_test(is_admin)
+def reports_api_estadisticas_contratos(request):
+    hoy = timezone.now().date()
+    # Contratos por estado (solo los estados con contratos, ordenados por estado)
+    estadisticas = calcular_estadisticas_contratos(hoy)
+    contratos_por_estado = sorted(
+        [
+            {'estado': item['estado'], 'total': item['total']}
+            for item in estadisticas['contratos_por_estado'] if item['total']
+        ],
+        key=lambda item: item['estado']
+    )
+
+    # Ingresos por mes (últimos 6 meses)
+    ingresos_mensuales = [
+        {'mes': item['periodo'].strftime('%Y-%m'), 'ingresos': float(item['total'])}
+        for item in serie_ingresos_mensuales(hoy, 6, fuentes=['contrato'])
+    ]
+
+    # DEVOLVER claves TAL CUAL espera tu frontend
+    return JsonResponse({
+        'success': True,
+        'contratosporestado': contratos_por_estado,
+        'ingresosmensuales': ingresos_mensuales
+    })
+@login_required
+@user_passes_test(is_admin)
+def reports_vencimiento_contratos(request):
+    """Genera reporte de contratos por vencimiento - CON MANEJO DE ERRORES"""
+    
+    if not CONTENT_MODELS_AVAILABLE:
+        messages.error(request, 'Módulo de Contratos no disponible')
+        return redirect('custom_admin:reports_dashboard_contratos')
+    
+    try:
+        hoy = timezone.now().date()
+        dias_aviso = int(request.GET.get('dias_aviso', 30))
+        formato = request.GET.get('formato', 'html')
+        
+        fecha_limite = hoy + timedelta(days=dias_aviso)
+        
+        # Contratos por vencer
+        try:
+            contratos_por_vencer = ContratoGenerado.objects.filter(
+                estado='activo',
+                cuña__fecha_fin__lte=fecha_limite,
+                cuña__fecha_fin__gte=hoy
+            ).select_related('cliente', 'cuña').order_by('cuña__fecha_fin')
+        except Exception as e:
+            print(f"❌ Error obteniendo contratos por vencer: {e}")
+            contratos_por_vencer = []
+        
+        # Contratos vencidos
+        try:
+            contratos_vencidos = ContratoGenerado.objects.filter(
+                estado='activo',
+                cuña__fecha_fin__lt=hoy
+            ).select_related('cliente', 'cuña').order_by('cuña__fecha_fin')
+        except Exception as e:
+            print(f"❌ Error obteniendo contratos vencidos: {e}")
+            contratos_vencidos = []
+        
+        # Contratos con buena vigencia
+        try:
+            contratos_vigentes = ContratoGenerado.objects.filter(
+                estado='activo',
+                cuña__fecha_fin__gt=fecha_limite
+            ).select_related('cliente', 'cuña').order_by('cuña__fecha_fin')
+        except Exception as e:
+            print(f"❌ Error obteniendo contratos vigentes: {e}")
+            contratos_vigentes = []
+        
+        # Exportar si se solicita
+        if formato == 'csv':
+            return _generar_reporte_csv_vencimiento(contratos_por_vencer, contratos_vencidos, contratos_vigentes)
+        elif formato == 'excel':
+            return _generar_reporte_excel_vencimiento(contratos_por_vencer, contratos_vencidos, contratos_vigentes)
+        
+        context = {
+            'contratos_por_vencer': contratos_por_vencer,
+            'contratos_vencidos': contratos_vencidos,
+            'contratos_vigentes': contratos_vigentes,
+            'dias_aviso': dias_aviso,
+            'fecha_limite': fecha_limite,
+            'fecha_reporte': timezone.now().strftime('%d/%m/%Y %H:%M'),
+        }
+        
+        return render(request, 'custom_admin/reports/vencimiento_contratos.html', context)
+        
+    except Exception as e:
+        print(f"❌ ERROR en reports_vencimiento_contratos: {e}")
+        messages.error(request, f'Error al generar el reporte: {str(e)}')
+        return redirect('custom_admin:reports_dashboard_contratos')
+
+@login_required
+@user_passes_test(is_admin)
+def reports_ingresos_contratos(request):
+    """Genera reporte de ingresos por contratos - CON MANEJO DE ERRORES"""
+    
+    if not CONTENT_MODELS_AVAILABLE:
+        messages.error(request, 'Módulo de Contratos no disponible')
+        return redirect('custom_admin:reports_dashboard_contratos')
+    
+    try:
+        # Parámetros
+        fecha_inicio = request.GET.get('fecha_inicio')
+        fecha_fin = request.GET.get('fecha_fin')
+        agrupar_por = request.GET.get('agrupar_por', 'mes')
+        formato = request.GET.get('formato', 'html')
+        
+        # Base query
+        contratos = ContratoGenerado.objects.select_related('cliente', 'cuña').all()
+        
+        if fecha_inicio:
+            contratos = contratos.filter(fecha_generacion__date__gte=fecha_inicio)
+        if fecha_fin:
+            contratos = contratos.filter(fecha_generacion__date__lte=fecha_fin)
+        
+        # Agrupar datos
+        ingresos_data = []
+        try:
+            if agrupar_por == 'mes':
+                # Para PostgreSQL
+                ingresos_data = contratos.extra(
+                    select={'periodo': "TO_CHAR(fecha_generacion, 'YYYY-MM')"}
+                ).values('periodo').annotate(
+                    total_contratos=Count('id'),
+                    ingresos_totales=Sum('valor_total'),
+                    promedio_contrato=Avg('valor_total')
+                ).order_by('periodo')
+            elif agrupar_por == 'estado':
+                ingresos_data = contratos.values('estado').annotate(
+                    total_contratos=Count('id'),
+                    ingresos_totales=Sum('valor_total'),
+                    promedio_contrato=Avg('valor_total')
+                ).order_by('estado')
+            elif agrupar_por == 'cliente':
+                ingresos_data = contratos.values('cliente__empresa', 'cliente__ruc_dni').annotate(
+                    total_contratos=Count('id'),
+                    ingresos_totales=Sum('valor_total'),
+                    promedio_contrato=Avg('valor_total')
+                ).order_by('-ingresos_totales')
+        except Exception as e:
+            print(f"❌ Error agrupando datos: {e}")
+            # Datos vacíos en caso de error
+            ingresos_data = []
+        
+        # Exportar si se solicita
+        if formato == 'csv':
+            return _generar_reporte_csv_ingresos(ingresos_data, agrupar_por)
+        elif formato == 'excel':
+            return _generar_reporte_excel_ingresos(ingresos_data, agrupar_por)
+        
+        context = {
+            'ingresos_data': ingresos_data,
+            'agrupar_por': agrupar_por,
+            'fecha_inicio': fecha_inicio,
+            'fecha_fin': fecha_fin,
+            'total_ingresos': contratos.aggregate(total=Sum('valor_total'))['total'] or Decimal('0.00'),
+            'fecha_reporte': timezone.now().strftime('%d/%m/%Y %H:%M'),
+        }
+        
+        return render(request, 'custom_admin/reports/ingresos_contratos.html', context)
+        
+    except Exception as e:
+        print(f"❌ ERROR en reports_ingresos_contratos: {e}")
+        messages.error(request, f'Error al generar el reporte: {str(e)}')
+        return redirect('custom_admin:reports_dashboard_contratos')
+
+# ==================== FUNCIONES AUXILIARES PARA EXPORTACIÓN ====================
+
+def _generar_reporte_csv_estado(contratos_por_estado, detalle_estados):
+    """Genera reporte CSV para estado de contratos"""
+    try:
+        response = HttpResponse(content_type='text/csv')
+        response['Content-Disposition'] = 'attachment; filename="reporte_estado_contratos.csv"'
+        
+        writer = csv.writer(response)
+        writer.writerow(['Reporte de Contratos por Estado', datetime.now().strftime('%d/%m/%Y %H:%M')])
+        writer.writerow([])
+        writer.writerow(['Estado', 'Cantidad', 'Valor Total'])
+        
+        for item in contratos_por_estado:
+            writer.writerow([
+                dict(ContratoGenerado.ESTADO_CHOICES).get(item['estado'], item['estado']),
+                item['total'],
+                item['valor_total']
+            ])
+        
+        return response
+    except Exception as e:
+        print(f"❌ Error generando CSV: {e}")
+        return HttpResponse("Error al generar el archivo CSV")
+
+def _generar_reporte_csv_vencimiento(por_vencer, vencidos, vigentes):
+    """Genera reporte CSV para vencimiento de contratos"""
+    try:
+        response = HttpResponse(content_type='text/csv')
+        response['Content-Disposition'] = 'attachment; filename="reporte_vencimiento_contratos.csv"'
+        
+        writer = csv.writer(response)
+        writer.writerow(['Reporte de Contratos por Vencimiento', datetime.now().strftime('%d/%m/%Y %H:%M')])
+        writer.writerow([])
+        
+        # Contratos por vencer
+        writer.writerow(['CONTRATOS POR VENCER'])
+        writer.writerow(['Código', 'Cliente', 'Fecha Fin', 'Días Restantes', 'Valor'])
+        for contrato in por_vencer:
+            dias_restantes = (contrato.cuña.fecha_fin - timezone.now().date()).days
+            writer.writerow([
+                contrato.numero_contrato,
+                contrato.nombre_cliente,
+                contrato.cuña.fecha_fin.strftime('%d/%m/%Y'),
+                dias_restantes,
+                contrato.valor_total
+            ])
+        
+        writer.writerow([])
+        
+        # Contratos vencidos
+        writer.writerow(['CONTRATOS VENCIDOS'])
+        writer.writerow(['Código', 'Cliente', 'Fecha Fin', 'Días Vencidos', 'Valor'])
+        for contrato in vencidos:
+            dias_vencidos = (timezone.now().date() - contrato.cuña.fecha_fin).days
+            writer.writerow([
+                contrato.numero_contrato,
+                contrato.nombre_cliente,
+                contrato.cuña.fecha_fin.strftime('%d/%m/%Y'),
+                dias_vencidos,
+                contrato.valor_total
+            ])
+        
+        return response
+    except Exception as e:
+        print(f"❌ Error generando CSV vencimiento: {e}")
+        return HttpResponse("Error al generar el archivo CSV")
+# ==================== REPORTES DE CONTRATOS - FUNCIONES FALTANTES ====================
+
+@login_required
+@user_passes_test(is_admin)
+def reports_estado_contratos(request):
+    """Genera reporte de contratos por estado - CON MANEJO DE ERRORES"""
+    
+    if not CONTENT_MODELS_AVAILABLE:
+        messages.error(request, 'Módulo de Contratos no disponible')
+        return redirect('custom_admin:reports_dashboard_contratos')
+    
+    try:
+        # Parámetros del reporte
+        fecha_inicio = request.GET.get('fecha_inicio')
+        fecha_fin = request.GET.get('fecha_fin')
+        formato = request.GET.get('formato', 'html')
+        
+        # Filtrar contratos
+        contratos = ContratoGenerado.objects.select_related(
+            'cliente', 'cuña', 'plantilla_usada'
+        ).all()
+        
+        if fecha_inicio:
+            contratos = contratos.filter(fecha_generacion__date__gte=fecha_inicio)
+        if fecha_fin:
+            contratos = contratos.filter(fecha_generacion__date__lte=fecha_fin)
+        
+        # Agrupar por estado (servicio compartido con los dashboards)
+        estadisticas = calcular_estadisticas_contratos(
+            fecha_inicio=fecha_inicio,
+            fecha_fin=fecha_fin
+        )
+        contratos_por_estado = [
+            item for item in estadisticas['contratos_por_estado'] if item['total']
+        ]
+        
+        # Detalle por estado: una sola consulta repartida en memoria
+        estados = ['borrador', 'generado', 'enviado', 'firmado', 'validado', 'vencido', 'cancelado']
+        detalle_estados = {estado: [] for estado in estados}
+        for contrato in contratos.filter(estado__in=estados):
+            detalle_estados[contrato.estado].append(contrato)
+        
+        # Exportar si se solicita
+        if formato == 'csv':
+            return _generar_reporte_csv_estado(contratos_por_estado, detalle_estados)
+        elif formato == 'excel':
+            return _generar_reporte_excel_estado(contratos_por_estado, detalle_estados)
+        
+        context = {
+            'contratos_por_estado': contratos_por_estado,
+            'detalle_estados': detalle_estados,
+            'fecha_inicio': fecha_inicio,
+            'fecha_fin': fecha_fin,
+            'total_contratos': estadisticas['total_contratos'],
+            'fecha_reporte': timezone.now().strftime('%d/%m/%Y %H:%M'),
+        }
+        
+        return render(request, 'custom_admin/reports/contratos/estado.html', context)
+        
+    except Exception as e:
+        print(f"❌ ERROR en reports_estado_contratos: {e}")
+        messages.error(request, f'Error al generar el reporte: {str(e)}')
+        return redirect('custom_admin:reports_dashboard_contratos')
+
+@login_required
+@user_passes_test(is_admin)
+def reports_vencimiento_contratos(request):
+    """Genera reporte de contratos por vencimiento - CON MANEJO DE ERRORES"""
+    
+    if not CONTENT_MODELS_AVAILABLE:
+        messages.error(request, 'Módulo de Contratos no disponible')
+        return redirect('custom_admin:reports_dashboard_contratos')
+    
+    try:
+        hoy = timezone.now().date()
+        dias_aviso = int(request.GET.get('dias_aviso', 30))
+        formato = request.GET.get('formato', 'html')
+        
+        fecha_limite = hoy + timedelta(days=dias_aviso)
+        
+        # Contratos por vencer (solo los validados pueden vencer)
+        try:
+            contratos_por_vencer = ContratoGenerado.objects.filter(
+                estado='validado',  # Solo contratos validados pueden vencer
+                cuña__fecha_fin__lte=fecha_limite,
+                cuña__fecha_fin__gte=hoy
+            ).select_related('cliente', 'cuña').order_by('cuña__fecha_fin')
+        except Exception as e:
+            print(f"❌ Error obteniendo contratos por vencer: {e}")
+            contratos_por_vencer = []
+        
+        # Contratos vencidos (solo los validados pueden estar vencidos)
+        try:
+            contratos_vencidos = ContratoGenerado.objects.filter(
+                estado='validado',  # Solo contratos validados pueden estar vencidos
+                cuña__fecha_fin__lt=hoy
+            ).select_related('cliente', 'cuña').order_by('cuña__fecha_fin')
+        except Exception as e:
+            print(f"❌ Error obteniendo contratos vencidos: {e}")
+            contratos_vencidos = []
+        
+        # Contratos con buena vigencia
+        try:
+            contratos_vigentes = ContratoGenerado.objects.filter(
+                estado='validado',  # Solo contratos validados están vigentes
+                cuña__fecha_fin__gt=fecha_limite
+            ).select_related('cliente', 'cuña').order_by('cuña__fecha_fin')
+        except Exception as e:
+            print(f"❌ Error obteniendo contratos vigentes: {e}")
+            contratos_vigentes = []
+        
+        # Exportar si se solicita
+        if formato == 'csv':
+            return _generar_reporte_csv_vencimiento(contratos_por_vencer, contratos_vencidos, contratos_vigentes)
+        elif formato == 'excel':
+            return _generar_reporte_excel_vencimiento(contratos_por_vencer, contratos_vencidos, contratos_vigentes)
+        
+        context = {
+            'contratos_por_vencer': contratos_por_vencer,
+            'contratos_vencidos': contratos_vencidos,
+            'contratos_vigentes': contratos_vigentes,
+            'dias_aviso': dias_aviso,
+            'fecha_limite': fecha_limite,
+            'fecha_reporte': timezone.now().strftime('%d/%m/%Y %H:%M'),
+        }
+        
+        return render(request, 'custom_admin/reports/contratos/vencimiento.html', context)
+        
+    except Exception as e:
+        print(f"❌ ERROR en reports_vencimiento_contratos: {e}")
+        messages.error(request, f'Error al generar el reporte: {str(e)}')
+        return redirect('custom_admin:reports_dashboard_contratos')
+
+@login_required
+@user_passes_test(is_admin)
+def reports_ingresos_contratos(request):
+    """Genera reporte de ingresos por contratos - CON MANEJO DE ERRORES"""
+    
+    if not CONTENT_MODELS_AVAILABLE:
+        messages.error(request, 'Módulo de Contratos no disponible')
+        return redirect('custom_admin:reports_dashboard_contratos')
+    
+    try:
+        # Parámetros
+        fecha_inicio = request.GET.get('fecha_inicio')
+        fecha_fin = request.GET.get('fecha_fin')
+        agrupar_por = request.GET.get('agrupar_por', 'mes')
+        formato = request.GET.get('formato', 'html')
+        
+        # Base query
+        contratos = ContratoGenerado.objects.select_related('cliente', 'cuña').all()
+        
+        if fecha_inicio:
+            contratos = contratos.filter(fecha_generacion__date__gte=fecha_inicio)
+        if fecha_fin:
+            contratos = contratos.filter(fecha_generacion__date__lte=fecha_fin)
+        
+        # Agrupar datos
+        ingresos_data = []
+        try:
+            if agrupar_por == 'mes':
+                # Agrupar por mes desde el acumulado diario de ingresos
+                serie = serie_ingresos(
+                    datetime.strptime(fecha_inicio, '%Y-%m-%d').date() if fecha_inicio else None,
+                    datetime.strptime(fecha_fin, '%Y-%m-%d').date() if fecha_fin else None,
+                    'mes',
+                    fuentes=['contrato']
+                )
+                ingresos_data = [
+                    {
+                        'mes': item['periodo'],
+                        'periodo': item['periodo'].strftime('%Y-%m'),
+                        'total_contratos': item['cantidad'],
+                        'ingresos_totales': item['total'],
+                        'promedio_contrato': item['total'] / item['cantidad'],
+                    }
+                    for item in serie if item['cantidad']
+                ]
+                    
+            elif agrupar_por == 'estado':
+                ingresos_data = contratos.values('estado').annotate(
+                    total_contratos=Count('id'),
+                    ingresos_totales=Sum('valor_total'),
+                    promedio_contrato=Avg('valor_total')
+                ).order_by('estado')
+            elif agrupar_por == 'cliente':
+                ingresos_data = contratos.values('cliente__empresa', 'cliente__ruc_dni').annotate(
+                    total_contratos=Count('id'),
+                    ingresos_totales=Sum('valor_total'),
+                    promedio_contrato=Avg('valor_total')
+                ).order_by('-ingresos_totales')
+        except Exception as e:
+            print(f"❌ Error agrupando datos: {e}")
+            # Datos vacíos en caso de error
+            ingresos_data = []
+        
+        # Exportar si se solicita
+        if formato == 'csv':
+            return _generar_reporte_csv_ingresos(ingresos_data, agrupar_por)
+        elif formato == 'excel':
+            return _generar_reporte_excel_ingresos(ingresos_data, agrupar_por)
+        
+        context = {
+            'ingresos_data': ingresos_data,
+            'agrupar_por': agrupar_por,
+            'fecha_inicio': fecha_inicio,
+            'fecha_fin': fecha_fin,
+            'total_ingresos': contratos.aggregate(total=Sum('valor_total'))['total'] or Decimal('0.00'),
+            'fecha_reporte': timezone.now().strftime('%d/%m/%Y %H:%M'),
+        }
+        
+        return render(request, 'custom_admin/reports/contratos/ingresos.html', context)
+        
+    except Exception as e:
+        print(f"❌ ERROR en reports_ingresos_contratos: {e}")
+        messages.error(request, f'Error al generar el reporte: {str(e)}')
+        return redirect('custom_admin:reports_dashboard_contratos')
+# ==================== REPORTES DE VENDEDORES ====================
+@login_required
+@user_passes_test(lambda u: u.es_admin or u.es_doctor)
+def reports_dashboard_vendedores(request):
+    """Dashboard de reportes de vendedores - VERSIÓN CORREGIDA - Accesible para Admin y Doctor"""
+    
+    # Verificar disponibilidad de modelos
+    if not AUTH_MODELS_AVAILABLE or not CONTENT_MODELS_AVAILABLE:
+        context = {
+            'error': 'Módulos necesarios no disponibles',
+            'estadisticas_vendedores': [],
+            'total_vendedores': 0,
+            'total_contratos_general': 0,
+            'total_ingresos_general': Decimal('0.00'),
+            'vendedor_top': None,
+            'fecha_inicio': '',
+            'fecha_fin': '',
+            'fecha_reporte': timezone.now().strftime('%d/%m/%Y %H:%M'),
+        }
+        return render(request, 'custom_admin/reports/vendedores/dashboard.html', context)
+    
+    try:
+        # Parámetros de filtro
+        fecha_inicio = request.GET.get('fecha_inicio')
+        fecha_fin = request.GET.get('fecha_fin')
+        
+        # Si no hay fechas, usar el último mes
+        if not fecha_inicio:
+            fecha_inicio = (timezone.now() - timedelta(days=30)).strftime('%Y-%m-%d')
+        if not fecha_fin:
+            fecha_fin = timezone.now().strftime('%Y-%m-%d')
+        
+        # Convertir a objetos date para consultas
+        fecha_inicio_obj = datetime.strptime(fecha_inicio, '%Y-%m-%d').date()
+        fecha_fin_obj = datetime.strptime(fecha_fin, '%Y-%m-%d').date()
+        
+        # Métricas de todos los vendedores activos con anotaciones agrupadas (ya ordenadas)
+        estadisticas_vendedores = calcular_desempeño_vendedores(fecha_inicio_obj, fecha_fin_obj)
+        
+        # ✅ CORREGIDO: Calcular totales generales para el template
+        total_vendedores = len(estadisticas_vendedores)
+        total_contratos_general = sum(item['total_contratos'] for item in estadisticas_vendedores)
+        total_cunas_general = sum(item['total_cuñas'] for item in estadisticas_vendedores)
+        total_ing_contratos_general = sum(item['ingresos_contratos'] for item in estadisticas_vendedores)
+        total_ing_cunas_general = sum(item['ingresos_cuñas'] for item in estadisticas_vendedores)
+        total_ingresos_general = sum(item['ingresos_totales'] for item in estadisticas_vendedores)
+        
+        # Cada cliente tiene un único vendedor asignado, así que la suma no duplica clientes
+        total_clientes_general = sum(item['clientes_asignados'] for item in estadisticas_vendedores)
+        
+        # Vendedor top
+        vendedor_top = estadisticas_vendedores[0] if estadisticas_vendedores else None
+        
+        # ==================== GRÁFICAS CON PLOTLY ====================
+        
+        grafica_barras_html = ''
+        grafica_pastel_html = ''
+        
+        # 1. Gráfico de barras - Top 5 Vendedores por Ingresos
+        if estadisticas_vendedores and PLOTLY_AVAILABLE:
+            try:
+                top_vendedores_data = estadisticas_vendedores[:5]
+                
+                grafica_barras_html = renderizar_grafica('barras', {
+                    'titulo': 'Top 5 Vendedores por Ingresos',
+                    'categorias': [v['vendedor'].get_full_name() for v in top_vendedores_data],
+                    'valores': [float(v['ingresos_totales']) for v in top_vendedores_data],
+                    'horizontal': True,
+                    'etiquetas': {'x': 'Ingresos ($)', 'y': 'Vendedor'},
+                    'escala_color': 'Viridis',
+                    'plantilla_hover': '<b>%{y}</b><br>Ingresos: $%{x:,.2f}',
+                    'moneda': True,
+                })
+            except Exception as e:
+                print(f"❌ Error generando gráfica de barras: {e}")
+        
+        # 2. Gráfico de pastel - Distribución de Ingresos
+        if estadisticas_vendedores and PLOTLY_AVAILABLE:
+            try:
+                ingresos_contratos_total = sum(item['ingresos_contratos'] for item in estadisticas_vendedores)
+                ingresos_cunas_total = sum(item['ingresos_cuñas'] for item in estadisticas_vendedores)
+                
+                if ingresos_contratos_total > 0 or ingresos_cunas_total > 0:
+                    grafica_pastel_html = renderizar_grafica('pastel', {
+                        'titulo': 'Distribución de Ingresos',
+                        'etiquetas': ['Contratos', 'Cuñas'],
+                        'valores': [float(ingresos_contratos_total), float(ingresos_cunas_total)],
+                        'colores': {
+                            'Contratos': '#4e73df',
+                            'Cuñas': '#1cc88a'
+                        },
+                        'plantilla_hover': '<b>%{label}</b><br>Ingresos: $%{value:,.2f}<br>Porcentaje: %{percent}',
+                    })
+            except Exception as e:
+                print(f"❌ Error generando gráfica de pastel: {e}")
+        
+        context = {
+            'estadisticas_vendedores': estadisticas_vendedores,
+            'total_vendedores': total_vendedores,
+            'total_contratos_general': total_contratos_general,
+            'total_cunas_general': total_cunas_general,  # ✅ NUEVO: Total de cuñas
+            'total_ing_contratos_general': total_ing_contratos_general,  # ✅ NUEVO: Total ingresos contratos
+            'total_ing_cunas_general': total_ing_cunas_general,  # ✅ NUEVO: Total ingresos cuñas
+            'total_ingresos_general': total_ingresos_general,
+            'total_clientes_general': total_clientes_general,
+            'vendedor_top': vendedor_top,
+            'fecha_inicio': fecha_inicio,
+            'fecha_fin': fecha_fin,
+            'fecha_reporte': timezone.now().strftime('%d/%m/%Y %H:%M'),
+            'grafica_barras_html': grafica_barras_html,
+            'grafica_pastel_html': grafica_pastel_html,
+            'PLOTLY_AVAILABLE': PLOTLY_AVAILABLE,
+        }
+        
+        return render(request, 'custom_admin/reports/vendedores/dashboard.html', context)
+        
+    except Exception as e:
+        print(f"❌ ERROR en reports_dashboard_vendedores: {e}")
+        import traceback
+        traceback.print_exc()
+        
+        context = {
+            'error': 'Error al cargar el reporte de vendedores',
+            'estadisticas_vendedores': [],
+            'total_vendedores': 0,
+            'total_contratos_general': 0,
+            'total_cunas_general': 0,
+            'total_ing_contratos_general': Decimal('0.00'),
+            'total_ing_cunas_general': Decimal('0.00'),
+            'total_ingresos_general': Decimal('0.00'),
+            'total_clientes_general': 0,
+            'vendedor_top': None,
+            'fecha_inicio': fecha_inicio if 'fecha_inicio' in locals() else '',
+            'fecha_fin': fecha_fin if 'fecha_fin' in locals() else '',
+            'fecha_reporte': timezone.now().strftime('%d/%m/%Y %H:%M'),
+            'grafica_barras_html': '',
+            'grafica_pastel_html': '',
+            'PLOTLY_AVAILABLE': PLOTLY_AVAILABLE,
+        }
+        return render(request, 'custom_admin/reports/vendedores/dashboard.html', context)
+@login_required
+@user_passes_test(is_admin)
+def cliente_contratos_api(request, cliente_id):
+    """API para obtener contratos de un cliente específico"""
+    try:
+        cliente = get_object_or_404(CustomUser, pk=cliente_id, rol='cliente')
+        
+        # Obtener contratos del cliente
+        contratos = ContratoGenerado.objects.filter(
+            cliente=cliente
+        ).select_related('cuña', 'plantilla_usada').order_by('-fecha_generacion')
+        
+        data = {
+            'success': True,
+            'cliente': {
+                'id': cliente.id,
+                'nombre': cliente.get_full_name(),
+                'empresa': cliente.empresa,
+                'email': cliente.email
+            },
+            'contratos': [
+                {
+                    'id': c.id,
+                    'numero_contrato': c.numero_contrato,
+                    'estado': c.estado,
+                    'estado_display': c.get_estado_display(),
+                    'valor_total': str(c.valor_total),
+                    'fecha_generacion': c.fecha_generacion.strftime('%d/%m/%Y %H:%M'),
+                    'cuña_titulo': c.cuña.titulo if c.cuña else None,
+                    'plantilla_nombre': c.plantilla_usada.nombre if c.plantilla_usada else None
+                } for c in contratos
+            ],
+            'total_contratos': contratos.count()
+        }
+        
+        return JsonResponse(data)
+        
+    except Exception as e:
+        return JsonResponse({'success': False, 'error': str(e)})
+@login_required
+@user_passes_test(is_admin)
+def vendedor_contratos_api(request, vendedor_id):
+    """API para obtener contratos de un vendedor específico"""
+    try:
+        vendedor = get_object_or_404(CustomUser, pk=vendedor_id, rol='vendedor')
+        
+        # Obtener contratos del vendedor (asignados a sus clientes)
+        contratos = ContratoGenerado.objects.filter(
+            cliente__vendedor_asignado=vendedor
+        ).select_related('cliente', 'cuña', 'plantilla_usada').order_by('-fecha_generacion')
+        
+        # Obtener cuñas del vendedor
+        cuñas = CuñaPublicitaria.objects.filter(
+            vendedor_asignado=vendedor
+        ).select_related('cliente', 'categoria').order_by('-created_at')
+        
+        data = {
+            'success': True,
+            'vendedor': {
+                'id': vendedor.id,
+                'nombre': vendedor.get_full_name(),
+                'email': vendedor.email,
+                'telefono': vendedor.telefono or 'No disponible'
+            },
+            'contratos': [
+                {
+                    'id': c.id,
+                    'numero_contrato': c.numero_contrato,
+                    'estado': c.estado,
+                    'estado_display': c.get_estado_display(),
+                    'valor_total': str(c.valor_total),
+                    'fecha_generacion': c.fecha_generacion.strftime('%d/%m/%Y %H:%M'),
+                    'cliente_nombre': c.nombre_cliente,
+                    'cliente_empresa': c.cliente.empresa if c.cliente else None,
+                    'cuña_titulo': c.cuña.titulo if c.cuña else None,
+                    'plantilla_nombre': c.plantilla_usada.nombre if c.plantilla_usada else None
+                } for c in contratos
+            ],
+            'cuñas': [
+                {
+                    'id': c.id,
+                    'codigo': c.codigo,
+                    'titulo': c.titulo,
+                    'estado': c.estado,
+                    'estado_display': c.get_estado_display(),
+                    'precio_total': str(c.precio_total),
+                    'fecha_inicio': c.fecha_inicio.strftime('%d/%m/%Y') if c.fecha_inicio else None,
+                    'fecha_fin': c.fecha_fin.strftime('%d/%m/%Y') if c.fecha_fin else None,
+                    'cliente_nombre': c.cliente.get_full_name() if c.cliente else None,
+                    'cliente_empresa': c.cliente.empresa if c.cliente else None
+                } for c in cuñas
+            ],
+            'total_contratos': contratos.count(),
+            'total_cuñas': cuñas.count(),
+            'ingresos_contratos': str(contratos.aggregate(total=Sum('valor_total'))['total'] or Decimal('0.00')),
+            'ingresos_cuñas': str(cuñas.aggregate(total=Sum('precio_total'))['total'] or Decimal('0.00'))
+        }
+        
+        return JsonResponse(data)
+        
+    except Exception as e:
+        import traceback
+        print(f"❌ ERROR en vendedor_contratos_api: {str(e)}")
+        traceback.print_exc()
+        return JsonResponse({'success': False, 'error': str(e)})
+@login_required
+@user_passes_test(is_admin)
+def reports_detalle_vendedor(request, vendedor_id):
+    """Detalle del desempeño de un vendedor específico - CORREGIDO"""
+    
+    # Verificar disponibilidad de modelos
+    if not AUTH_MODELS_AVAILABLE or not CONTENT_MODELS_AVAILABLE:
+        messages.error(request, 'Módulos necesarios no disponibles')
+        return redirect('custom_admin:reports_dashboard_vendedores')
+    
+    try:
+        vendedor = CustomUser.objects.get(pk=vendedor_id, rol='vendedor')
+    except CustomUser.DoesNotExist:
+        messages.error(request, 'Vendedor no encontrado')
+        return redirect('custom_admin:reports_dashboard_vendedores')
+    
+    try:
+        # Parámetros de filtro
+        fecha_inicio = request.GET.get('fecha_inicio')
+        fecha_fin = request.GET.get('fecha_fin')
+        
+        # Si no hay fechas, usar el último mes
+        if not fecha_inicio:
+            fecha_inicio = (timezone.now() - timedelta(days=30)).strftime('%Y-%m-%d')
+        if not fecha_fin:
+            fecha_fin = timezone.now().strftime('%Y-%m-%d')
+        
+        # Convertir a objetos date
+        fecha_inicio_obj = datetime.strptime(fecha_inicio, '%Y-%m-%d').date()
+        fecha_fin_obj = datetime.strptime(fecha_fin, '%Y-%m-%d').date()
+        
+        # ✅ CORREGIDO: Contratos donde el vendedor está asignado (a través del cliente)
+        contratos_asignados = ContratoGenerado.objects.filter(
+            cliente__vendedor_asignado=vendedor,
+            fecha_generacion__date__gte=fecha_inicio_obj,
+            fecha_generacion__date__lte=fecha_fin_obj
+        ).select_related('cliente', 'cuña').order_by('-fecha_generacion')
+        
+        # ✅ CORREGIDO: Contratos generados por el vendedor
+        contratos_generados = ContratoGenerado.objects.filter(
+            generado_por=vendedor,
+            fecha_generacion__date__gte=fecha_inicio_obj,
+            fecha_generacion__date__lte=fecha_fin_obj
+        ).select_related('cliente', 'cuña').order_by('-fecha_generacion')
+        
+        # ✅ CORREGIDO: Cuñas del vendedor
+        cuñas = CuñaPublicitaria.objects.filter(
+            vendedor_asignado=vendedor,
+            created_at__date__gte=fecha_inicio_obj,
+            created_at__date__lte=fecha_fin_obj
+        ).select_related('cliente', 'categoria').order_by('-created_at')
+        
+        # Clientes asignados
+        clientes = CustomUser.objects.filter(
+            vendedor_asignado=vendedor,
+            rol='cliente',
+            is_active=True
+        ).order_by('empresa', 'first_name')
+        
+        # Estadísticas
+        total_contratos_asignados = contratos_asignados.count()
+        total_contratos_generados = contratos_generados.count()
+        total_cuñas = cuñas.count()
+        total_clientes = clientes.count()
+        
+        # Ingresos de contratos asignados
+        ingresos_contratos_asignados_result = contratos_asignados.aggregate(
+            total=Sum('valor_total')
+        )
+        ingresos_contratos_asignados = ingresos_contratos_asignados_result['total'] or Decimal('0.00')
+        
+        # Ingresos de contratos generados
+        ingresos_contratos_generados_result = contratos_generados.aggregate(
+            total=Sum('valor_total')
+        )
+        ingresos_contratos_generados = ingresos_contratos_generados_result['total'] or Decimal('0.00')
+        
+        # Ingresos de cuñas
+        ingresos_cuñas_result = cuñas.aggregate(
+            total=Sum('precio_total')
+        )
+        ingresos_cuñas = ingresos_cuñas_result['total'] or Decimal('0.00')
+        
+        # Total de ingresos
+        ingresos_totales = ingresos_contratos_asignados + ingresos_cuñas
+        
+        # Contratos por estado (solo los asignados)
+        contratos_por_estado = contratos_asignados.values('estado').annotate(
+            total=Count('id'),
+            valor_total=Sum('valor_total')
+        ).order_by('estado')
+        
+        context = {
+            'vendedor': vendedor,
+            'contratos_asignados': contratos_asignados,
+            'contratos_generados': contratos_generados,
+            'cuñas': cuñas,
+            'clientes': clientes,
+            'total_contratos_asignados': total_contratos_asignados,
+            'total_contratos_generados': total_contratos_generados,
+            'total_cuñas': total_cuñas,
+            'total_clientes': total_clientes,
+            'ingresos_contratos_asignados': ingresos_contratos_asignados,
+            'ingresos_contratos_generados': ingresos_contratos_generados,
+            'ingresos_cuñas': ingresos_cuñas,
+            'ingresos_totales': ingresos_totales,
+            'contratos_por_estado': contratos_por_estado,
+            'fecha_inicio': fecha_inicio,
+            'fecha_fin': fecha_fin,
+            'fecha_reporte': timezone.now().strftime('%d/%m/%Y %H:%M'),
+        }
+        
+        return render(request, 'custom_admin/reports/vendedores/detalle.html', context)
+        
+    except Exception as e:
+        print(f"❌ ERROR en reports_detalle_vendedor: {e}")
+        messages.error(request, f'Error al cargar el detalle del vendedor: {str(e)}')
+        return redirect('custom_admin:reports_dashboard_vendedores')
+# ==================== DASHBOARD PRINCIPAL DE REPORTES ====================
+@login_required
+@user_passes_test(lambda u: u.es_admin or u.es_doctor)
+def reports_dashboard_principal(request):
+    """Dashboard principal unificado de reportes - Accesible para Admin y Doctor"""
+    
+    # Verificar disponibilidad de modelos
+    modelos_disponibles = CONTENT_MODELS_AVAILABLE and AUTH_MODELS_AVAILABLE
+    
+    context = {
+        'models_available': modelos_disponibles,
+        'fecha_reporte': timezone.now().strftime('%d/%m/%Y %H:%M'),
+    }
+    
+    # Si los modelos están disponibles, cargar datos
+    if modelos_disponibles:
+        try:
+            hoy = timezone.now().date()
+            
+            # ========== DATOS DE CONTRATOS ==========
+            stats_contratos = calcular_estadisticas_contratos(hoy)
+            context.update(stats_contratos)
+            
+            # ========== DATOS DE VENDEDORES ==========
+            fecha_inicio_vendedores = request.GET.get('fecha_inicio_vendedores')
+            fecha_fin_vendedores = request.GET.get('fecha_fin_vendedores')
+            
+            fecha_inicio_obj = None
+            fecha_fin_obj = None
+            
+            if fecha_inicio_vendedores:
+                fecha_inicio_obj = datetime.strptime(fecha_inicio_vendedores, '%Y-%m-%d').date()
+            if fecha_fin_vendedores:
+                fecha_fin_obj = datetime.strptime(fecha_fin_vendedores, '%Y-%m-%d').date()
+            
+            # Calcular estadísticas de vendedores
+            estadisticas_vendedores = calcular_desempeño_vendedores(
+                fecha_inicio_obj, fecha_fin_obj
+            )
+            
+            # Estadísticas generales de vendedores
+            vendedores_activos = len(estadisticas_vendedores)
+            
+            total_ingresos_vendedores = sum(
+                item['ingresos_totales'] for item in estadisticas_vendedores
+            )
+            
+            vendedor_top = estadisticas_vendedores[0] if estadisticas_vendedores else None
+            
+            # ========== DATOS DE PARTES MORTUORIOS ==========
+            stats_partes = _calcular_estadisticas_partes_mortuorios()
+            context.update(stats_partes)
+            
+            # ✅ SUMAR INGRESOS DE PARTES MORTUORIOS A LOS INGRESOS TOTALES
+            ingresos_totales_con_partes = stats_contratos.get('ingresos_totales', Decimal('0.00')) + stats_partes.get('ingresos_totales_partes', Decimal('0.00'))
+            context['ingresos_totales'] = ingresos_totales_con_partes
+            
+            # Agregar datos al contexto
+            context.update({
+                # Vendedores
+                'vendedores_activos': vendedores_activos,
+                'estadisticas_vendedores': estadisticas_vendedores[:5],  # Top 5
+                'vendedor_top': vendedor_top,
+                'total_ingresos_vendedores': total_ingresos_vendedores,
+                'fecha_inicio_vendedores': fecha_inicio_vendedores,
+                'fecha_fin_vendedores': fecha_fin_vendedores,
+                
+                # Gráficas
+                'PLOTLY_AVAILABLE': PLOTLY_AVAILABLE,
+            })
+            
+            # Generar gráficas si Plotly está disponible
+            if PLOTLY_AVAILABLE:
+                # Gráfica de pastel - Estados de contratos
+                context['grafica_estados_html'] = renderizar_grafica('pastel', {
+                    'titulo': 'Contratos por Estado',
+                    'etiquetas': ['Validados', 'Pendientes', 'Por Vencer', 'Vencidos', 'Cancelados'],
+                    'valores': [
+                        stats_contratos['contratos_activos'],
+                        stats_contratos['contratos_pendientes'],
+                        stats_contratos['contratos_por_vencer'],
+                        stats_contratos['contratos_vencidos'],
+                        stats_contratos['contratos_cancelados'],
+                    ],
+                    'colores': ['#28a745', '#ffc107', '#17a2b8', '#dc3545', '#6c757d'],
+                    'detallado': False,
+                })
+                
+                # Gráfica de barras - Ingresos mensuales (últimos 6 meses)
+                # Sumar ingresos de contratos y partes mortuorios
+                ingresos_mensuales = [
+                    {'mes': item['periodo'].strftime('%b %Y'), 'ingresos': float(item['total'])}
+                    for item in serie_ingresos_mensuales(
+                        hoy, 6, fuentes=['contrato', 'parte_mortorio']
+                    )
+                ]
+                
+                if ingresos_mensuales:
+                    context['grafica_ingresos_html'] = renderizar_grafica('barras', {
+                        'titulo': 'Ingresos Mensuales Totales',
+                        'categorias': [item['mes'] for item in ingresos_mensuales],
+                        'valores': [item['ingresos'] for item in ingresos_mensuales],
+                        'etiquetas': {'x': 'Mes', 'y': 'Ingresos ($)'},
+                        'color': '#007bff',
+                    })
+                
+                # Gráfica de vendedores
+                if estadisticas_vendedores:
+                    context['grafica_vendedores_html'] = renderizar_grafica('barras', {
+                        'titulo': 'Top 5 Vendedores por Ingresos',
+                        'categorias': [v['vendedor'].get_full_name() for v in estadisticas_vendedores[:5]],
+                        'valores': [float(v['ingresos_totales']) for v in estadisticas_vendedores[:5]],
+                        'horizontal': True,
+                        'etiquetas': {'x': 'Ingresos ($)', 'y': 'Vendedor'},
+                        'color': '#28a745',
+                    })
+
+                # ========== GRÁFICA DE PASTEL PARA PARTES MORTORIOS ==========
+                if PARTE_MORTORIO_MODELS_AVAILABLE:
+                    try:
+                        # Datos para el gráfico de pastel de partes mortorios
+                        partes_data = [
+                            ('Pendientes', stats_partes.get('partes_mortuorios_pendientes', 0)),
+                            ('Al Aire', stats_partes.get('partes_mortuorios_al_aire', 0)),
+                            ('Pausados', stats_partes.get('partes_mortuorios_pausados', 0)),
+                            ('Finalizados', stats_partes.get('partes_mortuorios_finalizados', 0)),
+                        ]
+                        
+                        partes_labels = [item[0] for item in partes_data]
+                        partes_values = [item[1] for item in partes_data]
+                        
+                        if any(partes_values):
+                            context['grafica_pastel_partes_html'] = renderizar_grafica('pastel', {
+                                'titulo': 'Partes Mortorios por Estado',
+                                'etiquetas': partes_labels,
+                                'valores': partes_values,
+                                'colores': {
+                                    'Pendientes': '#ffc107',      # Amarillo
+                                    'Al Aire': '#28a745',        # Verde
+                                    'Pausados': '#fd7e14',       # Naranja
+                                    'Finalizados': '#20c997'     # Verde azulado
+                                },
+                                'altura': 300,
+                                'leyenda_y': -0.2,
+                                'margen': dict(l=20, r=20, t=40, b=20),
+                            })
+                        else:
+                            context['grafica_pastel_partes_html'] = ''
+                            
+                    except Exception as e:
+                        print(f"❌ Error generando gráfica de pastel para partes mortorios: {e}")
+                        context['grafica_pastel_partes_html'] = ''
+                    
+        except Exception as e:
+            print(f"❌ ERROR en reports_dashboard_principal: {e}")
+            import traceback
+            traceback.print_exc()
+            context['error'] = f'Error al cargar los datos: {str(e)}'
+    
+    return render(request, 'custom_admin/reports/dashboard_principal.html', context)
+
+def _calcular_estadisticas_partes_mortuorios():
+    """Calcula estadísticas generales de partes mortuorios"""
+    try:
+        if not PARTE_MORTORIO_MODELS_AVAILABLE:
+            return {
+                'total_partes_mortuorios': 0,
+                'partes_mortuorios_pendientes': 0,
+                'partes_mortuorios_al_aire': 0,
+                'partes_mortuorios_pausados': 0,
+                'partes_mortuorios_finalizados': 0,
+                'ingresos_totales_partes': Decimal('0.00'),
+            }
+        
+        # Totales básicos
+        total_partes_mortuorios = ParteMortorio.objects.count()
+        
+        # Partes por estado
+        partes_mortuorios_pendientes = ParteMortorio.objects.filter(estado='pendiente').count()
+        partes_mortuorios_al_aire = ParteMortorio.objects.filter(estado='al_aire').count()
+        partes_mortuorios_pausados = ParteMortorio.objects.filter(estado='pausado').count()
+        partes_mortuorios_finalizados = ParteMortorio.objects.filter(estado='finalizado').count()
+        
+        # Ingresos totales de partes mortuorios
+        ingresos_totales_partes_result = ParteMortorio.objects.aggregate(total=Sum('precio_total'))
+        ingresos_totales_partes = ingresos_totales_partes_result['total'] or Decimal('0.00')
+        
+        return {
+            'total_partes_mortuorios': total_partes_mortuorios,
+            'partes_mortuorios_pendientes': partes_mortuorios_pendientes,
+            'partes_mortuorios_al_aire': partes_mortuorios_al_aire,
+            'partes_mortuorios_pausados': partes_mortuorios_pausados,
+            'partes_mortuorios_finalizados': partes_mortuorios_finalizados,
+            'ingresos_totales_partes': ingresos_totales_partes,
+        }
+        
+    except Exception as e:
+        print(f"❌ ERROR en _calcular_estadisticas_partes_mortuorios: {e}")
+        return {
+            'total_partes_mortuorios': 0,
+            'partes_mortuorios_pendientes': 0,
+            'partes_mortuorios_al_aire': 0,
+            'partes_mortuorios_pausados': 0,
+            'partes_mortuorios_finalizados': 0,
+            'ingresos_totales_partes': Decimal('0.00'),
+        }
+
+@login_required
+@user_passes_test(is_admin)
+def reports_contratos_detalle_api(request):
+    """API para obtener detalle de contratos para el modal"""
+    try:
+        contratos_recientes = ContratoGenerado.objects.select_related(
+            'cliente', 'cuña'
+        ).order_by('-fecha_generacion')[:10]
+        
+        data = {
+            'contratos': [
+                {
+                    'numero': c.numero_contrato,
+                    'cliente': c.nombre_cliente,
+                    'estado': c.estado,
+                    'valor': str(c.valor_total),
+                    'fecha': c.fecha_generacion.strftime('%d/%m/%Y')
+                } for c in contratos_recientes
+            ]
+        }
+        return JsonResponse(data)
+    except Exception as e:
+        return JsonResponse({'error': str(e)}, status=500)
+
+@login_required
+@user_passes_test(is_admin)
+def reports_vendedores_detalle_api(request):
+    """API para obtener detalle de vendedores para el modal"""
+    try:
+        vendedores = CustomUser.objects.filter(rol='vendedor', is_active=True).annotate(
+            num_contratos=Count('contratos_generados_por'),
+            ingresos_contratos=Sum('contratos_generados_por__valor_total')
+        )
+        
+        data = {
+            'vendedores': [
+                {
+                    'nombre': v.get_full_name(),
+                    'email': v.email,
+                    'contratos': v.num_contratos,
+                    'ingresos': str(v.ingresos_contratos or Decimal('0.00'))
+                } for v in vendedores
+            ]
+        }
+        return JsonResponse(data)
+    except Exception as e:
+        return JsonResponse({'error': str(e)}, status=500)
+# ==================== REPORTES DE PARTES MORTUORIOS ====================
+@login_required
+@user_passes_test(lambda u: u.es_admin or u.es_doctor)
+def reports_dashboard_partes_mortuorios(request):
+    """Dashboard de reportes de partes mortuorios - Accesible para Admin y Doctor"""
+    
+    # Verificar disponibilidad del módulo
+    if not PARTE_MORTORIO_MODELS_AVAILABLE:
+        context = {
+            'error': 'Módulo de Partes Mortuorios no disponible',
+            'mensaje': 'No se pueden cargar los reportes en este momento.',
+            'models_available': False,
+            'total_partes': 0,
+            'partes_pendientes': 0,
+            'partes_al_aire': 0,
+            'partes_pausados': 0,
+            'partes_finalizados': 0,
+            'ingresos_totales': Decimal('0.00'),
+            'partes_recientes': [],
+            'grafica_pastel_html': '',
+            'grafica_barras_html': '',
+        }
+        return render(request, 'custom_admin/reports/parte_mortorios/list.html', context)
+    
+    try:
+        hoy = timezone.now().date()
+        
+        # Estadísticas básicas - LOS 5 ESTADOS QUE QUIERES
+        try:
+            total_partes = ParteMortorio.objects.count()
+        except Exception as e:
+            print(f"❌ Error contando partes: {e}")
+            total_partes = 0
+        
+        # Partes pendientes
+        try:
+            partes_pendientes = ParteMortorio.objects.filter(estado='pendiente').count()
+        except Exception as e:
+            print(f"❌ Error contando partes pendientes: {e}")
+            partes_pendientes = 0
+        
+        # Partes al aire
+        try:
+            partes_al_aire = ParteMortorio.objects.filter(estado='al_aire').count()
+        except Exception as e:
+            print(f"❌ Error contando partes al aire: {e}")
+            partes_al_aire = 0
+        
+        # Partes pausados
+        try:
+            partes_pausados = ParteMortorio.objects.filter(estado='pausado').count()
+        except Exception as e:
+            print(f"❌ Error contando partes pausados: {e}")
+            partes_pausados = 0
+        
+        # Partes finalizados
+        try:
+            partes_finalizados = ParteMortorio.objects.filter(estado='finalizado').count()
+        except Exception as e:
+            print(f"❌ Error contando partes finalizados: {e}")
+            partes_finalizados = 0
+        
+        # Ingresos totales
+        try:
+            ingresos_totales_result = ParteMortorio.objects.aggregate(
+                total=Sum('precio_total')
+            )
+            ingresos_totales = ingresos_totales_result['total'] or Decimal('0.00')
+        except Exception as e:
+            print(f"❌ Error calculando ingresos totales: {e}")
+            ingresos_totales = Decimal('0.00')
+        
+        # Partes recientes
+        try:
+            partes_recientes = ParteMortorio.objects.select_related(
+                'cliente'
+            ).order_by('-fecha_solicitud')[:10]
+        except Exception as e:
+            print(f"❌ Error obteniendo partes recientes: {e}")
+            partes_recientes = []
+        
+        # ==================== GRÁFICAS CON PLOTLY ====================
+        
+        # 1. Gráfico de pastel - Partes por Estado (LOS 4 ESTADOS PRINCIPALES)
+        try:
+            # Solo los 4 estados principales (sin el total)
+            estados_data = [
+                ('pendiente', partes_pendientes),
+                ('al_aire', partes_al_aire), 
+                ('pausado', partes_pausados),
+                ('finalizado', partes_finalizados)
+            ]
+            
+            # Preparar datos para la gráfica
+            estados_labels = []
+            estados_values = []
+            colores_estados = {
+                'pendiente': '#ffc107',      # Amarillo
+                'al_aire': '#28a745',        # Verde
+                'pausado': '#fd7e14',        # Naranja
+                'finalizado': '#20c997'      # Verde azulado
+            }
+            
+            for estado_codigo, cantidad in estados_data:
+                nombre_estado = dict(ParteMortorio.ESTADO_CHOICES).get(estado_codigo, estado_codigo)
+                estados_labels.append(nombre_estado)
+                estados_values.append(cantidad)
+            
+            # Los colores se asignan por etiqueta visible
+            colores_estados = {
+                dict(ParteMortorio.ESTADO_CHOICES).get(codigo, codigo): color
+                for codigo, color in colores_estados.items()
+            }
+            
+            if any(estados_values):
+                grafica_pastel_html = renderizar_grafica('pastel', {
+                    'titulo': 'Partes Mortuorios por Estado',
+                    'etiquetas': estados_labels,
+                    'valores': estados_values,
+                    'colores': colores_estados,
+                })
+            else:
+                grafica_pastel_html = ''
+                
+        except Exception as e:
+            print(f"❌ Error generando gráfica de pastel: {e}")
+            grafica_pastel_html = ''
+        
+        # 2. Gráfico de barras - Ingresos Mensuales
+        try:
+            ingresos_mensuales = []
+            meses_nombres = []
+            
+            for item in serie_ingresos_mensuales(hoy, 6, fuentes=['parte_mortorio']):
+                ingresos_mensuales.append(float(item['total']))
+                meses_nombres.append(item['periodo'].strftime('%b %Y'))
+            
+            if any(ingresos_mensuales):
+                grafica_barras_html = renderizar_grafica('barras', _datos_grafica_ingresos_mensuales(
+                    meses_nombres, ingresos_mensuales
+                ))
+            else:
+                grafica_barras_html = ''
+                
+        except Exception as e:
+            print(f"❌ Error generando gráfica de barras: {e}")
+            grafica_barras_html = ''
+        
+        context = {
+            'total_partes': total_partes,
+            'partes_pendientes': partes_pendientes,
+            'partes_al_aire': partes_al_aire,
+            'partes_pausados': partes_pausados,
+            'partes_finalizados': partes_finalizados,
+            'ingresos_totales': ingresos_totales,
+            'partes_recientes': partes_recientes,
+            'grafica_pastel_html': grafica_pastel_html,
+            'grafica_barras_html': grafica_barras_html,
+            'models_available': True,
+        }
+        
+        print(f"✅ Dashboard de Partes Mortuorios cargado exitosamente:")
+        print(f"   - Total partes: {total_partes}")
+        print(f"   - Pendientes: {partes_pendientes}")
+        print(f"   - Al Aire: {partes_al_aire}")
+        print(f"   - Pausados: {partes_pausados}")
+        print(f"   - Finalizados: {partes_finalizados}")
+        print(f"   - Ingresos totales: {ingresos_totales}")
+        
+        return render(request, 'custom_admin/reports/parte_mortorios/list.html', context)
+        
+    except Exception as e:
+        print(f"❌ ERROR CRÍTICO en reports_dashboard_partes_mortuorios: {e}")
+        import traceback
+        traceback.print_exc()
+        
+        context = {
+            'error': 'Error al cargar el dashboard',
+            'mensaje': str(e),
+            'models_available': False,
+            'total_partes': 0,
+            'partes_pendientes': 0,
+            'partes_al_aire': 0,
+            'partes_pausados': 0,
+            'partes_finalizados': 0,
+            'ingresos_totales': Decimal('0.00'),
+            'partes_recientes': [],
+            'grafica_pastel_html': '',
+            'grafica_barras_html': '',
+        }
+        return render(request, 'custom_admin/reports/parte_mortorios/list.html', context)
+# ==================== APIs PARA MODALES ====================
+
+@login_required
+@user_passes_test(is_admin)
+def reports_partes_estado_api(request):
+    """API para obtener datos de partes por estado (para modal)"""
+    if not PARTE_MORTORIO_MODELS_AVAILABLE:
+        return JsonResponse({'success': False, 'error': 'Módulo no disponible'})
+    
+    try:
+        # Agrupar por estado
+        partes_por_estado = ParteMortorio.objects.values('estado').annotate(
+            total=Count('id'),
+            ingresos_totales=Sum('precio_total')
+        ).order_by('estado')
+        
+        data = []
+        for item in partes_por_estado:
+            data.append({
+                'estado': dict(ParteMortorio.ESTADO_CHOICES).get(item['estado'], item['estado']),
+                'total': item['total'],
+                'ingresos_totales': str(item['ingresos_totales'] or Decimal('0.00'))
+            })
+        
+        return JsonResponse({'success': True, 'data': data})
+        
+    except Exception as e:
+        return JsonResponse({'success': False, 'error': str(e)})
+
+@login_required
+@user_passes_test(is_admin)
+def reports_partes_urgencia_api(request):
+    """API para obtener datos de partes por urgencia (para modal)"""
+    if not PARTE_MORTORIO_MODELS_AVAILABLE:
+        return JsonResponse({'success': False, 'error': 'Módulo no disponible'})
+    
+    try:
+        # Agrupar por urgencia
+        partes_por_urgencia = ParteMortorio.objects.values('urgencia').annotate(
+            total=Count('id'),
+            ingresos_totales=Sum('precio_total')
+        ).order_by('urgencia')
+        
+        data = []
+        for item in partes_por_urgencia:
+            data.append({
+                'urgencia': dict(ParteMortorio.URGENCIA_CHOICES).get(item['urgencia'], item['urgencia']),
+                'total': item['total'],
+                'ingresos_totales': str(item['ingresos_totales'] or Decimal('0.00'))
+            })
+        
+        return JsonResponse({'success': True, 'data': data})
+        
+    except Exception as e:
+        return JsonResponse({'success': False, 'error': str(e)})
+
+@login_required
+@user_passes_test(is_admin)
+def reports_partes_ingresos_api(request):
+    """API para obtener datos de ingresos de partes (para modal)"""
+    if not PARTE_MORTORIO_MODELS_AVAILABLE:
+        return JsonResponse({'success': False, 'error': 'Módulo no disponible'})
+    
+    try:
+        hoy = timezone.now().date()
+        ingresos_mensuales = [
+            {'mes': item['periodo'].strftime('%b %Y'), 'ingresos': float(item['total'])}
+            for item in serie_ingresos_mensuales(hoy, 6, fuentes=['parte_mortorio'])
+        ]
+        
+        return JsonResponse({'success': True, 'data': ingresos_mensuales})
+        
+    except Exception as e:
+        return JsonResponse({'success': False, 'error': str(e)})
+
+@login_required
+@user_passes_test(is_admin)
+def reports_partes_detalle_api(request, parte_id):
+    """API para obtener detalle completo de un parte mortuorio"""
+    if not PARTE_MORTORIO_MODELS_AVAILABLE:
+        return JsonResponse({'success': False, 'error': 'Módulo no disponible'})
+    
+    try:
+        parte = get_object_or_404(ParteMortorio, pk=parte_id)
+        
+        data = {
+            'success': True,
+            'parte': {
+                'codigo': parte.codigo,
+                'nombre_fallecido': parte.nombre_fallecido,
+                'edad_fallecido': parte.edad_fallecido,
+                'dni_fallecido': parte.dni_fallecido,
+                'fecha_fallecimiento': parte.fecha_fallecimiento.strftime('%d/%m/%Y') if parte.fecha_fallecimiento else '',
+                'fecha_nacimiento': parte.fecha_nacimiento.strftime('%d/%m/%Y') if parte.fecha_nacimiento else '',
+                'nombre_esposa': parte.nombre_esposa,
+                'cantidad_hijos': parte.cantidad_hijos,
+                'hijos_vivos': parte.hijos_vivos,
+                'hijos_fallecidos': parte.hijos_fallecidos,
+                'nombres_hijos': parte.nombres_hijos,
+                'familiares_adicionales': parte.familiares_adicionales,
+                'tipo_ceremonia': parte.get_tipo_ceremonia_display(),
+                'fecha_misa': parte.fecha_misa.strftime('%d/%m/%Y') if parte.fecha_misa else '',
+                'hora_misa': parte.hora_misa.strftime('%H:%M') if parte.hora_misa else '',
+                'lugar_misa': parte.lugar_misa,
+                'fecha_inicio_transmision': parte.fecha_inicio_transmision.strftime('%d/%m/%Y') if parte.fecha_inicio_transmision else '',
+                'fecha_fin_transmision': parte.fecha_fin_transmision.strftime('%d/%m/%Y') if parte.fecha_fin_transmision else '',
+                'hora_transmision': parte.hora_transmision.strftime('%H:%M') if parte.hora_transmision else '',
+                'duracion_transmision': parte.duracion_transmision,
+                'repeticiones_dia': parte.repeticiones_dia,
+                'precio_total': str(parte.precio_total),
+                'estado': parte.get_estado_display(),
+                'urgencia': parte.get_urgencia_display(),
+                'observaciones': parte.observaciones,
+                'mensaje_personalizado': parte.mensaje_personalizado,
+                'fecha_solicitud': parte.fecha_solicitud.strftime('%d/%m/%Y %H:%M'),
+                'cliente_nombre': parte.cliente.get_full_name() if parte.cliente else '',
+                'cliente_telefono': parte.cliente.telefono if parte.cliente else '',
+                'cliente_email': parte.cliente.email if parte.cliente else '',
+            }
+        }
+        
+        return JsonResponse(data)
+        
+    except Exception as e:
+        return JsonResponse({'success': False, 'error': str(e)})
@@ -0,0 +1,63 @@
+# apps/dependencias.py
+"""
+Dependencias pesadas de importación diferida
+Sistema PubliTrack - plotly, pandas, docxtpl y xlwt cuestan cientos de
+milisegundos y varios MB por proceso al importarse. Los módulos que las usan
+las piden con estos accesores en el momento de usarlas, de modo que cargar
+el URLconf o un management command no las importa. Cada accesor importa una
+sola vez por proceso (el resultado queda cacheado).
+"""
+
+import importlib
+import importlib.util
+from functools import cache
+
+
+class DependenciaNoDisponible(ImportError):
+    """La dependencia opcional no está instalada en este entorno"""
+
+
+@cache
+def disponible(nombre):
+    """
+    Indica si un paquete está instalado sin importarlo
+    """
+    try:
+        return importlib.util.find_spec(nombre) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+@cache
+def _importar(nombre):
+    try:
+        return importlib.import_module(nombre)
+    except ImportError as e:
+        raise DependenciaNoDisponible(f"{nombre} no está instalado: {e}") from e
+
+
+# ==================== ACCESORES ====================
+
+def plotly_express():
+    """Módulo plotly.express"""
+    return _importar('plotly.express')
+
+
+def plotly_offline():
+    """Módulo plotly.offline"""
+    return _importar('plotly.offline')
+
+
+def pandas():
+    """Módulo pandas"""
+    return _importar('pandas')
+
+
+def docx_template():
+    """Clase DocxTemplate de docxtpl"""
+    return _importar('docxtpl').DocxTemplate
+
+
+def xlwt():
+    """Módulo xlwt"""
+    return _importar('xlwt')
@@ -0,0 +1,222 @@
+# apps/entrega_archivos.py
+"""
+Entrega de archivos media (audios, documentos firmados, descargas)
+Sistema PubliTrack - Rangos HTTP (206), GET condicional (ETag y Last-Modified)
+y delegación del envío al servidor web (X-Accel-Redirect / X-Sendfile) una vez
+que Django autorizó el acceso. Sin servidor delante, el archivo completo se
+envía con os.sendfile a través del wsgi.file_wrapper (gunicorn), sin copiarlo
+a Python; los rangos se leen por bloques.
+"""
+
+import mimetypes
+import os
+import stat
+from pathlib import Path
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import Http404, HttpResponse, HttpResponseNotModified, StreamingHttpResponse
+from django.utils.http import content_disposition_header, http_date, parse_http_date_safe
+
+TAMAÑO_BLOQUE = 64 * 1024
+
+MODO_PYTHON = 'python'
+MODO_X_ACCEL = 'x-accel'
+MODO_X_SENDFILE = 'x-sendfile'
+
+_INSATISFACIBLE = object()
+
+
+def modo_entrega():
+    """
+    Modo configurado (settings.MEDIA_ENTREGA_MODO): 'python', 'x-accel' (nginx)
+    o 'x-sendfile' (Apache / lighttpd)
+    """
+    return getattr(settings, 'MEDIA_ENTREGA_MODO', MODO_PYTHON)
+
+
+# ==================== CABECERAS CONDICIONALES ====================
+
+def _etiquetas(valor):
+    return [etiqueta.strip() for etiqueta in valor.split(',') if etiqueta.strip()]
+
+
+def _sin_debil(etiqueta):
+    return etiqueta.removeprefix('W/')
+
+
+def no_modificado(request, etag, modificado):
+    """
+    Indica si el cliente ya tiene la versión vigente. If-None-Match (comparación
+    débil) tiene prioridad; If-Modified-Since solo se evalúa si no se envió.
+    """
+    if_none_match = request.headers.get('If-None-Match')
+    if if_none_match is not None:
+        recibidas = _etiquetas(if_none_match)
+        return '*' in recibidas or _sin_debil(etag) in map(_sin_debil, recibidas)
+
+    desde = parse_http_date_safe(request.headers.get('If-Modified-Since', ''))
+    return desde is not None and modificado <= desde
+
+
+def rango_solicitado(request, etag, modificado, tamaño):
+    """
+    Tramo (inicio, fin) inclusivo pedido en la cabecera Range, None si debe
+    enviarse el archivo completo o _INSATISFACIBLE si el rango cae fuera.
+    Solo se atiende un rango; varios rangos o una sintaxis inválida se
+    responden con el archivo completo, como permite el RFC 9110.
+    """
+    cabecera = request.headers.get('Range', '')
+    if not cabecera.startswith('bytes=') or ',' in cabecera:
+        return None
+
+    # If-Range: el rango solo vale si el cliente tiene la misma versión
+    # (comparación fuerte de ETag, o fecha exacta)
+    if_range = request.headers.get('If-Range')
+    if if_range:
+        if if_range.startswith(('"', 'W/')):
+            if etag.startswith('W/') or if_range != etag:
+                return None
+        elif parse_http_date_safe(if_range) != modificado:
+            return None
+
+    inicio, _, fin = cabecera[len('bytes='):].strip().partition('-')
+    try:
+        if not inicio:
+            sufijo = int(fin)
+            if sufijo <= 0 or tamaño == 0:
+                return _INSATISFACIBLE
+            return max(0, tamaño - sufijo), tamaño - 1
+        inicio = int(inicio)
+        fin = int(fin) if fin else None
+    except ValueError:
+        return None
+
+    if inicio < 0 or (fin is not None and fin < inicio):
+        return None
+    if inicio >= tamaño:
+        return _INSATISFACIBLE
+    return inicio, tamaño - 1 if fin is None else min(fin, tamaño - 1)
+
+
+# ==================== RESPUESTAS ====================
+
+class RespuestaArchivo(StreamingHttpResponse):
+    """
+    Respuesta con un tramo de un archivo abierto. Con el archivo completo
+    expone file_to_stream para que el servidor WSGI use su wsgi.file_wrapper
+    (gunicorn lo envía con os.sendfile). Un tramo parcial se lee siempre por
+    bloques sin pasar de su longitud: wsgiref (runserver) y otros
+    file_wrapper envían hasta el final del archivo e ignoran Content-Length.
+    """
+
+    block_size = TAMAÑO_BLOQUE
+
+    def __init__(self, archivo, inicio, longitud, *args, **kwargs):
+        archivo.seek(inicio)
+        super().__init__(self._bloques(archivo, longitud), *args, **kwargs)
+        if inicio == 0 and longitud == os.fstat(archivo.fileno()).st_size:
+            self.file_to_stream = archivo
+        self._resource_closers.append(archivo.close)
+        self['Content-Length'] = str(longitud)
+
+    def _bloques(self, archivo, pendiente):
+        while pendiente > 0:
+            bloque = archivo.read(min(self.block_size, pendiente))
+            if not bloque:
+                break
+            pendiente -= len(bloque)
+            yield bloque
+
+
+def _ruta_de(archivo):
+    if hasattr(archivo, 'path'):
+        return Path(archivo.path)
+    return Path(archivo)
+
+
+def _ruta_interna(ruta):
+    """
+    Ruta de la ubicación interna de nginx para un archivo dentro de MEDIA_ROOT,
+    o None si está fuera
+    """
+    try:
+        relativa = ruta.resolve().relative_to(Path(settings.MEDIA_ROOT).resolve())
+    except ValueError:
+        return None
+    prefijo = getattr(settings, 'MEDIA_ACCEL_PREFIJO', '/media-interna/')
+    return prefijo.rstrip('/') + '/' + quote(relativa.as_posix())
+
+
+def servir_archivo(request, archivo, etag=None, content_type=None, nombre_descarga=None,
+                   adjunto=False, cache_control='private, no-cache'):
+    """
+    Entrega un archivo local (ruta o FieldFile) con soporte de Range, GET
+    condicional y delegación al servidor web. `etag` permite usar un hash de
+    contenido conocido (p. ej. ArchivoAudio.hash_archivo); si no se indica se
+    usa uno débil de fecha y tamaño.
+    """
+    ruta = _ruta_de(archivo)
+    try:
+        estado = os.stat(ruta)
+    except (FileNotFoundError, NotADirectoryError):
+        raise Http404('Archivo no encontrado')
+    if not stat.S_ISREG(estado.st_mode):
+        raise Http404('Archivo no encontrado')
+
+    tamaño = estado.st_size
+    modificado = int(estado.st_mtime)
+    etag = f'"{etag}"' if etag else f'W/"{modificado:x}-{tamaño:x}"'
+    cabeceras = {
+        'ETag': etag,
+        'Last-Modified': http_date(modificado),
+        'Accept-Ranges': 'bytes',
+        'Cache-Control': cache_control,
+    }
+    if adjunto or nombre_descarga:
+        cabeceras['Content-Disposition'] = content_disposition_header(adjunto, nombre_descarga or ruta.name)
+
+    if no_modificado(request, etag, modificado):
+        return HttpResponseNotModified(headers=cabeceras)
+
+    content_type = content_type or mimetypes.guess_type(ruta.name)[0] or 'application/octet-stream'
+
+    # El servidor web envía los bytes (y resuelve los rangos) tras la autorización
+    modo = modo_entrega()
+    if modo == MODO_X_ACCEL:
+        interna = _ruta_interna(ruta)
+        if interna:
+            respuesta = HttpResponse(content_type=content_type, headers=cabeceras)
+            respuesta['X-Accel-Redirect'] = interna
+            return respuesta
+    elif modo == MODO_X_SENDFILE:
+        respuesta = HttpResponse(content_type=content_type, headers=cabeceras)
+        respuesta['X-Sendfile'] = str(ruta.resolve())
+        return respuesta
+
+    rango = rango_solicitado(request, etag, modificado, tamaño)
+    if rango is _INSATISFACIBLE:
+        respuesta = HttpResponse(status=416, headers=cabeceras)
+        respuesta['Content-Range'] = f'bytes */{tamaño}'
+        return respuesta
+
+    inicio, fin = rango or (0, tamaño - 1)
+    respuesta = RespuestaArchivo(
+        open(ruta, 'rb'), inicio, fin - inicio + 1,
+        status=206 if rango else 200, content_type=content_type, headers=cabeceras
+    )
+    if rango:
+        respuesta['Content-Range'] = f'bytes {inicio}-{fin}/{tamaño}'
+    return respuesta
+
+
+def servir_media(request, path):
+    """
+    Vista para /media/: reemplaza a django.views.static.serve con soporte de
+    rangos, GET condicional y delegación al servidor web
+    """
+    raiz = Path(settings.MEDIA_ROOT).resolve()
+    ruta = (raiz / path).resolve()
+    if ruta != raiz and raiz not in ruta.parents:
+        raise Http404('Archivo no encontrado')
+    return servir_archivo(request, ruta, cache_control='public, max-age=0, must-revalidate')
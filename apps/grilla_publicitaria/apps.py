@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class GrillaPublicitariaConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.grilla_publicitaria'
+
+    def ready(self):
+        import apps.grilla_publicitaria.signals
@@ -0,0 +1,184 @@
+"""
+Generación automática de ubicaciones publicitarias
+Sistema PubliTrack - Plantillas de pausas por tipo y duración de programa
+"""
+
+import logging
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db import transaction
+
+from .models import UbicacionPublicitaria
+
+logger = logging.getLogger(__name__)
+
+
+# ==================== PLANTILLAS ====================
+
+# Duración por defecto de cada tipo de pausa
+DURACION_POR_TIPO_PAUSA = {
+    'corta': timedelta(seconds=60),
+    'media': timedelta(minutes=2),
+    'larga': timedelta(minutes=3),
+}
+
+# Reglas evaluadas en orden; se aplica la primera que coincide con el bloque.
+#   - tipos: tipos de programa a los que aplica (None = todos)
+#   - duracion_minima: minutos mínimos del bloque
+#   - pausas: nombre, posición ('minuto' desde el inicio, negativo desde el
+#     final, o 'proporcion' de la duración), tipo_pausa, capacidad y duración
+#     opcional en segundos
+REGLAS_PAUSAS = [
+    {
+        'tipos': ['pelicula', 'serie', 'documental'],
+        'duracion_minima': 60,
+        'pausas': [
+            {'nombre': 'Pausa 1', 'proporcion': 0.25, 'tipo_pausa': 'media', 'capacidad': 4},
+            {'nombre': 'Pausa 2', 'proporcion': 0.5, 'tipo_pausa': 'larga', 'capacidad': 6},
+            {'nombre': 'Pausa 3', 'proporcion': 0.75, 'tipo_pausa': 'media', 'capacidad': 4},
+        ],
+    },
+    {
+        'tipos': None,
+        'duracion_minima': 30,
+        'pausas': [
+            {'nombre': 'Pausa Inicial', 'minuto': 0, 'tipo_pausa': 'corta', 'capacidad': 3},
+            {'nombre': 'Pausa Intermedia', 'proporcion': 0.5, 'tipo_pausa': 'media', 'capacidad': 3},
+            {'nombre': 'Pausa Final', 'minuto': -5, 'tipo_pausa': 'corta', 'capacidad': 3},
+        ],
+    },
+    {
+        'tipos': None,
+        'duracion_minima': 15,
+        'pausas': [
+            {'nombre': 'Pausa Inicial', 'minuto': 0, 'tipo_pausa': 'corta', 'capacidad': 3},
+            {'nombre': 'Pausa Final', 'minuto': -5, 'tipo_pausa': 'corta', 'capacidad': 3},
+        ],
+    },
+    {
+        'tipos': None,
+        'duracion_minima': 0,
+        'pausas': [
+            {'nombre': 'Pausa Central', 'proporcion': 0.5, 'tipo_pausa': 'corta', 'capacidad': 3},
+        ],
+    },
+]
+
+
+def obtener_reglas():
+    """
+    Reglas configuradas en GRILLA_REGLAS_PAUSAS o las reglas por defecto
+    """
+    return getattr(settings, 'GRILLA_REGLAS_PAUSAS', REGLAS_PAUSAS)
+
+
+def regla_para_bloque(bloque, reglas):
+    """
+    Primera regla que coincide con el tipo de programa y la duración del bloque
+    """
+    minutos = bloque.duracion_real.total_seconds() / 60
+    for regla in reglas:
+        tipos = regla.get('tipos')
+        if tipos and bloque.programa.tipo not in tipos:
+            continue
+        if minutos >= regla.get('duracion_minima', 0):
+            return regla
+    return None
+
+
+def hora_pausa(bloque, pausa):
+    """
+    Hora de la pausa dentro del bloque según su posición en la plantilla
+    """
+    if 'proporcion' in pausa:
+        desplazamiento = bloque.duracion_real * pausa['proporcion']
+    else:
+        minuto = timedelta(minutes=pausa.get('minuto', 0))
+        desplazamiento = minuto if minuto >= timedelta(0) else bloque.duracion_real + minuto
+    desplazamiento = max(timedelta(0), min(desplazamiento, bloque.duracion_real))
+
+    inicio = datetime(2000, 1, 1, bloque.hora_inicio.hour, bloque.hora_inicio.minute, bloque.hora_inicio.second)
+    return (inicio + desplazamiento).time().replace(microsecond=0)
+
+
+# ==================== GENERACIÓN ====================
+
+def generar_ubicaciones_semana(programacion, reglas=None, simular=False):
+    """
+    Calcula en memoria las pausas de todos los bloques de la semana y crea las
+    que no existen (mismo bloque y hora) con un único bulk_create dentro de
+    una transacción. Con simular=True solo devuelve la vista previa.
+    """
+    from apps.programacion_canal.models import BloqueProgramacion
+
+    reglas = reglas or obtener_reglas()
+
+    with transaction.atomic():
+        bloques = list(
+            BloqueProgramacion.objects.filter(programacion_semanal=programacion)
+            .select_related('programa')
+            .order_by('dia_semana', 'hora_inicio')
+        )
+        existentes = set(
+            UbicacionPublicitaria.objects.filter(
+                bloque_programacion__programacion_semanal=programacion
+            ).values_list('bloque_programacion_id', 'hora_pausa').order_by()
+        )
+
+        nuevas = []
+        omitidas = 0
+        for bloque in bloques:
+            regla = regla_para_bloque(bloque, reglas)
+            if not regla:
+                continue
+
+            for pausa in regla['pausas']:
+                hora = hora_pausa(bloque, pausa)
+                if (bloque.pk, hora) in existentes:
+                    omitidas += 1
+                    continue
+                existentes.add((bloque.pk, hora))
+
+                tipo_pausa = pausa.get('tipo_pausa', 'media')
+                duracion = pausa.get('duracion')
+                nuevas.append(UbicacionPublicitaria(
+                    bloque_programacion=bloque,
+                    nombre=f"{bloque.programa.nombre} - {pausa['nombre']}",
+                    hora_pausa=hora,
+                    tipo_pausa=tipo_pausa,
+                    duracion_pausa=(
+                        timedelta(seconds=duracion) if duracion
+                        else DURACION_POR_TIPO_PAUSA.get(tipo_pausa, timedelta(minutes=2))
+                    ),
+                    capacidad_cuñas=pausa.get('capacidad', 3),
+                    activo=True
+                ))
+
+        if not simular:
+            UbicacionPublicitaria.objects.bulk_create(nuevas, batch_size=500)
+            if nuevas:
+                # bulk_create no emite señales: el editor debe recargar la grilla completa
+                from .revisiones import registrar_cambio
+                registrar_cambio(programacion.pk)
+            logger.info(
+                f"Generadas {len(nuevas)} ubicaciones para {programacion.codigo} "
+                f"({omitidas} ya existían)"
+            )
+
+    return {
+        'creadas': 0 if simular else len(nuevas),
+        'existentes': omitidas,
+        'ubicaciones': [
+            {
+                'bloque_id': ubicacion.bloque_programacion_id,
+                'dia_semana': ubicacion.bloque_programacion.dia_semana,
+                'nombre': ubicacion.nombre,
+                'hora_pausa': ubicacion.hora_pausa.strftime('%H:%M:%S'),
+                'tipo_pausa': ubicacion.tipo_pausa,
+                'duracion_segundos': int(ubicacion.duracion_pausa.total_seconds()),
+                'capacidad_cuñas': ubicacion.capacidad_cuñas,
+            }
+            for ubicacion in nuevas
+        ],
+    }
@@ -0,0 +1,136 @@
+"""
+Matriz semanal de la grilla integrada
+Sistema PubliTrack - Agrupa bloques de programación, pausas publicitarias y
+asignaciones en una matriz de 7 días × 48 franjas de 30 minutos, en una sola
+pasada por cada lista y con índices enteros, lista para la plantilla y la API.
+"""
+
+from collections import Counter
+
+DIAS_SEMANA = 7
+MINUTOS_FRANJA = 30
+FRANJAS_POR_DIA = 24 * 60 // MINUTOS_FRANJA
+
+NOMBRES_DIAS = ['Lunes', 'Martes', 'Miércoles', 'Jueves', 'Viernes', 'Sábado', 'Domingo']
+HORAS_FRANJAS = [
+    f'{franja * MINUTOS_FRANJA // 60:02d}:{franja * MINUTOS_FRANJA % 60:02d}'
+    for franja in range(FRANJAS_POR_DIA)
+]
+
+
+def indice_franja(hora):
+    """
+    Franja de 30 minutos (0-47) que contiene la hora
+    """
+    return (hora.hour * 60 + hora.minute) // MINUTOS_FRANJA
+
+
+def franjas_bloque(bloque):
+    """
+    Franjas del día que ocupa el bloque: desde la de su inicio hasta la última
+    que empieza antes de su fin. Los bloques que pasan de medianoche se cortan
+    al final del día.
+    """
+    inicio = bloque.hora_inicio.hour * 60 + bloque.hora_inicio.minute
+    fin = min(inicio + int(bloque.duracion_real.total_seconds() // 60), 24 * 60)
+    primera = inicio // MINUTOS_FRANJA
+    ultima = max(primera + 1, -(-fin // MINUTOS_FRANJA))
+    return range(primera, min(ultima, FRANJAS_POR_DIA))
+
+
+def estado_ubicacion(asignadas, capacidad):
+    """
+    Estado visual de una pausa según sus cuñas asignadas
+    """
+    if asignadas >= capacidad:
+        return 'ocupada'
+    if asignadas > 0:
+        return 'con_cunas'
+    return 'sin_cunas'
+
+
+# ==================== CONSTRUCCIÓN ====================
+
+def construir_matriz(bloques, ubicaciones, asignaciones):
+    """
+    Construye la matriz de la semana.
+
+    Devuelve una lista de 48 filas {'indice', 'hora', 'celdas'}; cada fila
+    tiene 7 celdas {'dia', 'bloques'} y cada bloque de la celda es
+    {'bloque', 'total_ubicaciones', 'ubicaciones'}, con las pausas que caen
+    en esa franja como {'ubicacion', 'asignadas', 'estado'}.
+
+    Las asignaciones solo se cuentan por ubicacion_id, sin cargar su
+    ubicación ni su bloque.
+    """
+    celdas = [[[] for _ in range(DIAS_SEMANA)] for _ in range(FRANJAS_POR_DIA)]
+    entradas = {}
+    total_por_bloque = Counter()
+
+    for bloque in bloques:
+        for franja in franjas_bloque(bloque):
+            entrada = {'bloque': bloque, 'total_ubicaciones': 0, 'ubicaciones': []}
+            celdas[franja][bloque.dia_semana].append(entrada)
+            entradas[(bloque.pk, franja)] = entrada
+
+    asignadas = Counter(asignacion.ubicacion_id for asignacion in asignaciones)
+
+    for ubicacion in ubicaciones:
+        total_por_bloque[ubicacion.bloque_programacion_id] += 1
+        if ubicacion.hora_pausa is None:
+            continue
+        entrada = entradas.get((ubicacion.bloque_programacion_id, indice_franja(ubicacion.hora_pausa)))
+        if entrada is None:
+            continue
+        cantidad = asignadas[ubicacion.pk]
+        entrada['ubicaciones'].append({
+            'ubicacion': ubicacion,
+            'asignadas': cantidad,
+            'estado': estado_ubicacion(cantidad, ubicacion.capacidad_cuñas),
+        })
+
+    for (bloque_id, _), entrada in entradas.items():
+        entrada['total_ubicaciones'] = total_por_bloque[bloque_id]
+
+    return [
+        {
+            'indice': franja,
+            'hora': HORAS_FRANJAS[franja],
+            'celdas': [{'dia': dia, 'bloques': celdas[franja][dia]} for dia in range(DIAS_SEMANA)],
+        }
+        for franja in range(FRANJAS_POR_DIA)
+    ]
+
+
+def matriz_a_json(matriz):
+    """
+    Versión serializable de la matriz, con identificadores en lugar de instancias
+    """
+    filas = []
+    for fila in matriz:
+        celdas = []
+        for celda in fila['celdas']:
+            celdas.append([
+                {
+                    'bloque_id': entrada['bloque'].pk,
+                    'programa': entrada['bloque'].programa.nombre,
+                    'color': entrada['bloque'].programa.color,
+                    'hora_inicio': entrada['bloque'].hora_inicio.strftime('%H:%M'),
+                    'hora_fin': entrada['bloque'].hora_fin.strftime('%H:%M'),
+                    'total_ubicaciones': entrada['total_ubicaciones'],
+                    'ubicaciones': [
+                        {
+                            'id': item['ubicacion'].pk,
+                            'nombre': item['ubicacion'].nombre,
+                            'hora_pausa': item['ubicacion'].hora_pausa.strftime('%H:%M'),
+                            'capacidad': item['ubicacion'].capacidad_cuñas,
+                            'asignadas': item['asignadas'],
+                            'estado': item['estado'],
+                        }
+                        for item in entrada['ubicaciones']
+                    ],
+                }
+                for entrada in celda['bloques']
+            ])
+        filas.append({'hora': fila['hora'], 'celdas': celdas})
+    return filas
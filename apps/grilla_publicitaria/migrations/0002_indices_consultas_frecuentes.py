@@ -0,0 +1,24 @@
+# Generated by Django 5.2.5 on 2026-10-19 17:07
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('content_management', '0015_indices_consultas_frecuentes'),
+        ('grilla_publicitaria', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='asignacioncuña',
+            index=models.Index(fields=['fecha_emision', 'estado'], name='grilla_publ_fecha_e_eb98a3_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='asignacioncuña',
+            index=models.Index(fields=['cuña', 'estado'], name='grilla_publ_cuña_id_a6cdba_idx'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.5 on 2026-10-19 17:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('grilla_publicitaria', '0002_indices_consultas_frecuentes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CambioGrilla',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('programacion_id', models.PositiveBigIntegerField(verbose_name='Programación Semanal')),
+                ('revision', models.PositiveIntegerField(verbose_name='Revisión')),
+                ('bloque_id', models.PositiveBigIntegerField(blank=True, null=True, verbose_name='Bloque')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Fecha')),
+            ],
+            options={
+                'verbose_name': 'Cambio de Grilla',
+                'verbose_name_plural': 'Cambios de Grilla',
+                'ordering': ['programacion_id', 'revision'],
+                'indexes': [models.Index(fields=['programacion_id', 'revision'], name='cambio_grilla_prog_rev_idx')],
+            },
+        ),
+    ]
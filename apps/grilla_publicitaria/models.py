@@ -180,6 +180,10 @@ class AsignacionCuña(models.Model):
         verbose_name_plural = _('Asignaciones de Cuñas')
         ordering = ['fecha_emision', 'hora_emision', 'ubicacion', 'orden_en_ubicacion']
         unique_together = ['ubicacion', 'fecha_emision', 'orden_en_ubicacion']
+        indexes = [
+            models.Index(fields=['fecha_emision', 'estado']),
+            models.Index(fields=['cuña', 'estado']),
+        ]
     
     def __str__(self):
         return f"{self.cuña.codigo} - {self.fecha_emision} {self.hora_emision}"
@@ -269,4 +273,28 @@ class GrillaPublicitaria(models.Model):
         
         # Actualizar estadísticas después de guardar
         if not is_new:
-            self.actualizar_estadisticas()
\ No newline at end of file
+            self.actualizar_estadisticas()
+
+class CambioGrilla(models.Model):
+    """
+    Registro de cambios de la grilla por revisión: qué bloque cambió en cada
+    revisión de la programación semanal, para la sincronización incremental.
+    Un bloque nulo indica un cambio masivo que obliga a recargar todo.
+    Se guardan identificadores simples (sin claves foráneas) porque el bloque
+    puede haberse eliminado.
+    """
+    programacion_id = models.PositiveBigIntegerField(_('Programación Semanal'))
+    revision = models.PositiveIntegerField(_('Revisión'))
+    bloque_id = models.PositiveBigIntegerField(_('Bloque'), null=True, blank=True)
+    created_at = models.DateTimeField(_('Fecha'), auto_now_add=True)
+    
+    class Meta:
+        verbose_name = _('Cambio de Grilla')
+        verbose_name_plural = _('Cambios de Grilla')
+        ordering = ['programacion_id', 'revision']
+        indexes = [
+            models.Index(fields=['programacion_id', 'revision'], name='cambio_grilla_prog_rev_idx'),
+        ]
+    
+    def __str__(self):
+        return f"Programación {self.programacion_id} r{self.revision} - bloque {self.bloque_id}"
@@ -0,0 +1,223 @@
+"""
+Revisiones y sincronización incremental de la grilla
+Sistema PubliTrack - Cada cambio en bloques, pausas o asignaciones incrementa
+la revisión de la programación semanal y registra el bloque afectado; el
+editor pide el estado completo una vez y luego solo los bloques cambiados
+desde su revisión.
+"""
+
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db import transaction
+from django.db.models import Count, F, QuerySet
+
+from .matriz import estado_ubicacion, franjas_bloque, indice_franja
+from .models import AsignacionCuña, CambioGrilla, UbicacionPublicitaria
+
+logger = logging.getLogger(__name__)
+
+# Cambios que se conservan por programación; un cliente más atrasado recarga todo
+CAMBIOS_CONSERVADOS = 500
+INTERVALO_PODA = 100
+
+_registro_suspendido = ContextVar('registro_suspendido', default=False)
+
+# Modelos de la grilla: al eliminar uno se registra su propio cambio, así que
+# las filas que arrastra en cascada no registran nada
+MODELOS_GRILLA = ('ProgramacionSemanal', 'BloqueProgramacion', 'UbicacionPublicitaria', 'AsignacionCuña')
+
+
+# ==================== REGISTRO DE CAMBIOS ====================
+
+def registrar_cambio(programacion_id, bloque_id=None):
+    """
+    Incrementa la revisión de la programación y registra el bloque cambiado
+    (None para un cambio masivo). Devuelve la nueva revisión, o None si la
+    programación ya no existe.
+    """
+    from apps.programacion_canal.models import ProgramacionSemanal
+
+    with transaction.atomic():
+        programaciones = ProgramacionSemanal.objects.filter(pk=programacion_id)
+        if not programaciones.update(revision=F('revision') + 1):
+            return None
+        revision = programaciones.values_list('revision', flat=True).get()
+        CambioGrilla.objects.create(programacion_id=programacion_id, revision=revision, bloque_id=bloque_id)
+        if revision % INTERVALO_PODA == 0:
+            CambioGrilla.objects.filter(
+                programacion_id=programacion_id,
+                revision__lte=revision - CAMBIOS_CONSERVADOS
+            ).delete()
+    return revision
+
+
+def registro_suspendido():
+    """
+    Indica si se está dentro de un cambio masivo (las señales no registran nada)
+    """
+    return _registro_suspendido.get()
+
+
+@contextmanager
+def cambio_masivo(*programacion_ids):
+    """
+    Suspende el registro por bloque durante operaciones masivas (clonación,
+    limpieza de datos) y al terminar registra un único cambio masivo por
+    programación, que obliga al editor a recargar la grilla completa
+    """
+    token = _registro_suspendido.set(True)
+    try:
+        yield
+    finally:
+        _registro_suspendido.reset(token)
+    for programacion_id in programacion_ids:
+        registrar_cambio(programacion_id)
+
+
+def programacion_de_bloque(bloque_id):
+    """
+    Programación semanal del bloque, o None si ya no existe
+    """
+    from apps.programacion_canal.models import BloqueProgramacion
+
+    return BloqueProgramacion.objects.filter(pk=bloque_id).values_list(
+        'programacion_semanal_id', flat=True
+    ).first()
+
+
+def bloque_de_ubicacion(ubicacion_id):
+    """
+    (bloque, programación) de la ubicación, o None si ya no existe
+    """
+    return UbicacionPublicitaria.objects.filter(pk=ubicacion_id).values_list(
+        'bloque_programacion_id', 'bloque_programacion__programacion_semanal_id'
+    ).first()
+
+
+def registrar_cambio_de_bloque(bloque_id):
+    """
+    Registra el cambio de un bloque buscando su programación
+    """
+    programacion_id = programacion_de_bloque(bloque_id)
+    if programacion_id:
+        registrar_cambio(programacion_id, bloque_id)
+
+
+def registrar_cambio_de_ubicacion(ubicacion_id):
+    """
+    Registra el cambio del bloque al que pertenece la ubicación
+    """
+    fila = bloque_de_ubicacion(ubicacion_id)
+    if fila:
+        bloque_id, programacion_id = fila
+        registrar_cambio(programacion_id, bloque_id)
+
+
+# ==================== ELIMINACIONES ====================
+
+def origen_eliminacion(instance, origin):
+    """
+    Clasifica una señal según el `origin` de la eliminación: 'propia' si la
+    instancia es lo que se eliminó (o se guardó), 'grilla' si cae en cascada
+    desde otro objeto de la grilla que registra su propio cambio, y 'externa'
+    para QuerySet.delete() o cascadas desde otros modelos (cuñas, programas)
+    """
+    if origin is None or origin is instance:
+        return 'propia'
+    if not isinstance(origin, QuerySet) and type(origin).__name__ in MODELOS_GRILLA:
+        return 'grilla'
+    return 'externa'
+
+
+def registrar_eliminacion_externa(origin, programacion_id):
+    """
+    Registra un único cambio masivo por programación para todas las filas que
+    elimina la misma operación, en lugar de un cambio por fila
+    """
+    registradas = origin.__dict__.setdefault('_programaciones_grilla_registradas', set())
+    if programacion_id and programacion_id not in registradas:
+        registradas.add(programacion_id)
+        registrar_cambio(programacion_id)
+
+
+# ==================== ESTADO ====================
+
+def estado_bloques(programacion, bloque_ids=None):
+    """
+    Bloques de la programación (o solo los indicados) con sus franjas y
+    pausas activas, en formato JSON. Tres consultas sin importar el tamaño.
+    """
+    from apps.programacion_canal.models import BloqueProgramacion
+
+    bloques = BloqueProgramacion.objects.filter(programacion_semanal=programacion).select_related('programa')
+    ubicaciones = UbicacionPublicitaria.objects.filter(
+        bloque_programacion__programacion_semanal=programacion, activo=True
+    )
+    asignaciones = AsignacionCuña.objects.filter(ubicacion__bloque_programacion__programacion_semanal=programacion)
+    if bloque_ids is not None:
+        bloques = bloques.filter(pk__in=bloque_ids)
+        ubicaciones = ubicaciones.filter(bloque_programacion_id__in=bloque_ids)
+        asignaciones = asignaciones.filter(ubicacion__bloque_programacion_id__in=bloque_ids)
+
+    asignadas = dict(
+        asignaciones.order_by().values_list('ubicacion_id').annotate(total=Count('id'))
+    )
+    pausas_por_bloque = {}
+    for ubicacion in ubicaciones.order_by('hora_pausa'):
+        cantidad = asignadas.get(ubicacion.pk, 0)
+        pausas_por_bloque.setdefault(ubicacion.bloque_programacion_id, []).append({
+            'id': ubicacion.pk,
+            'nombre': ubicacion.nombre,
+            'hora_pausa': ubicacion.hora_pausa.strftime('%H:%M') if ubicacion.hora_pausa else None,
+            'franja': indice_franja(ubicacion.hora_pausa) if ubicacion.hora_pausa else None,
+            'capacidad': ubicacion.capacidad_cuñas,
+            'asignadas': cantidad,
+            'estado': estado_ubicacion(cantidad, ubicacion.capacidad_cuñas),
+        })
+
+    return [
+        {
+            'id': bloque.pk,
+            'dia': bloque.dia_semana,
+            'franjas': list(franjas_bloque(bloque)),
+            'programa': bloque.programa.nombre,
+            'color': bloque.programa.color,
+            'hora_inicio': bloque.hora_inicio.strftime('%H:%M'),
+            'hora_fin': bloque.hora_fin.strftime('%H:%M'),
+            'ubicaciones': pausas_por_bloque.get(bloque.pk, []),
+        }
+        for bloque in bloques.order_by('dia_semana', 'hora_inicio')
+    ]
+
+
+def estado_grilla(programacion, desde=None):
+    """
+    Estado de la grilla para el editor. Con `desde` devuelve solo los bloques
+    cambiados después de esa revisión (y los eliminados); si esos cambios ya
+    no están registrados o hubo un cambio masivo, devuelve el estado completo.
+    """
+    revision = programacion.revision
+    if desde is not None and 0 <= desde <= revision:
+        cambios = list(
+            CambioGrilla.objects.filter(
+                programacion_id=programacion.pk, revision__gt=desde, revision__lte=revision
+            ).values_list('bloque_id', flat=True)
+        )
+        if len(cambios) == revision - desde and None not in cambios:
+            ids = set(cambios)
+            bloques = estado_bloques(programacion, ids)
+            return {
+                'revision': revision,
+                'completo': False,
+                'bloques': bloques,
+                'eliminados': sorted(ids - {bloque['id'] for bloque in bloques}),
+            }
+
+    return {
+        'revision': revision,
+        'completo': True,
+        'bloques': estado_bloques(programacion),
+        'eliminados': [],
+    }
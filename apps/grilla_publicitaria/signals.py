@@ -0,0 +1,74 @@
+"""
+Señales del módulo de Grilla Publicitaria
+Sistema PubliTrack - Revisiones de la grilla para la sincronización incremental
+"""
+
+import logging
+
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from apps.programacion_canal.models import BloqueProgramacion, ProgramacionSemanal
+from .models import AsignacionCuña, CambioGrilla, UbicacionPublicitaria
+from .revisiones import (
+    bloque_de_ubicacion, origen_eliminacion, programacion_de_bloque, registrar_cambio,
+    registrar_cambio_de_bloque, registrar_cambio_de_ubicacion, registrar_eliminacion_externa,
+    registro_suspendido
+)
+
+logger = logging.getLogger(__name__)
+
+
+@receiver(post_save, sender=BloqueProgramacion)
+@receiver(post_delete, sender=BloqueProgramacion)
+def revision_por_bloque(sender, instance, **kwargs):
+    """Registra el cambio de un bloque de programación"""
+    if registro_suspendido():
+        return
+    try:
+        origen = origen_eliminacion(instance, kwargs.get('origin'))
+        if origen == 'propia':
+            registrar_cambio(instance.programacion_semanal_id, instance.pk)
+        elif origen == 'externa':
+            registrar_eliminacion_externa(kwargs['origin'], instance.programacion_semanal_id)
+    except Exception as e:
+        logger.error(f"Error registrando cambio del bloque {instance.pk}: {e}")
+
+
+@receiver(post_save, sender=UbicacionPublicitaria)
+@receiver(post_delete, sender=UbicacionPublicitaria)
+def revision_por_ubicacion(sender, instance, **kwargs):
+    """Registra el cambio del bloque de una pausa publicitaria"""
+    if registro_suspendido():
+        return
+    try:
+        origen = origen_eliminacion(instance, kwargs.get('origin'))
+        if origen == 'propia':
+            registrar_cambio_de_bloque(instance.bloque_programacion_id)
+        elif origen == 'externa':
+            registrar_eliminacion_externa(kwargs['origin'], programacion_de_bloque(instance.bloque_programacion_id))
+    except Exception as e:
+        logger.error(f"Error registrando cambio de la ubicación {instance.pk}: {e}")
+
+
+@receiver(post_save, sender=AsignacionCuña)
+@receiver(post_delete, sender=AsignacionCuña)
+def revision_por_asignacion(sender, instance, **kwargs):
+    """Registra el cambio del bloque de una asignación de cuña"""
+    if registro_suspendido():
+        return
+    try:
+        origen = origen_eliminacion(instance, kwargs.get('origin'))
+        if origen == 'propia':
+            registrar_cambio_de_ubicacion(instance.ubicacion_id)
+        elif origen == 'externa':
+            fila = bloque_de_ubicacion(instance.ubicacion_id)
+            registrar_eliminacion_externa(kwargs['origin'], fila and fila[1])
+    except Exception as e:
+        logger.error(f"Error registrando cambio de la asignación {instance.pk}: {e}")
+
+
+@receiver(post_delete, sender=ProgramacionSemanal)
+def limpiar_cambios_programacion(sender, instance, **kwargs):
+    """Elimina el registro de cambios de una programación eliminada"""
+    CambioGrilla.objects.filter(programacion_id=instance.pk).delete()
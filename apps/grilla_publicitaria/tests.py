@@ -1,3 +1,297 @@
+"""
+Tests para el módulo de Grilla Publicitaria
+Sistema PubliTrack - Generación de ubicaciones por plantillas de pausas,
+matriz semanal de la grilla integrada y sincronización por revisiones
+"""
+
+from datetime import date, time, timedelta
+from decimal import Decimal
+from types import SimpleNamespace
 from django.test import TestCase
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+
+from apps.content_management.models import CuñaPublicitaria
+from apps.programacion_canal.models import Programa, ProgramacionSemanal, BloqueProgramacion
+from .generacion import generar_ubicaciones_semana
+from .matriz import FRANJAS_POR_DIA, construir_matriz, franjas_bloque
+from .models import AsignacionCuña, CambioGrilla, UbicacionPublicitaria
+from .revisiones import estado_grilla
+
+
+class GeneracionUbicacionesTest(TestCase):
+    """Tests del motor de plantillas de pausas"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.programacion = ProgramacionSemanal.objects.create(
+            nombre='Semana de prueba',
+            codigo='PRG260302',
+            fecha_inicio_semana=date(2026, 3, 2),
+            fecha_fin_semana=date(2026, 3, 8)
+        )
+        cls.noticiero = Programa.objects.create(
+            nombre='Noticiero', tipo='noticiero', duracion_estandar=timedelta(hours=1)
+        )
+        cls.pelicula = Programa.objects.create(
+            nombre='Cine', tipo='pelicula', duracion_estandar=timedelta(hours=2)
+        )
+
+    def crear_bloque(self, programa, dia, hora, minutos):
+        return BloqueProgramacion.objects.create(
+            programacion_semanal=self.programacion,
+            programa=programa,
+            dia_semana=dia,
+            hora_inicio=hora,
+            duracion_real=timedelta(minutes=minutos)
+        )
+
+    def test_reglas_por_tipo_y_duracion(self):
+        """Test que cada bloque recibe las pausas de la regla que le corresponde"""
+        noticiero = self.crear_bloque(self.noticiero, 0, time(7, 0), 60)
+        pelicula = self.crear_bloque(self.pelicula, 0, time(20, 0), 120)
+        corto = self.crear_bloque(self.noticiero, 1, time(7, 0), 10)
+
+        resultado = generar_ubicaciones_semana(self.programacion)
+
+        self.assertEqual(resultado['creadas'], 7)
+        horas = lambda bloque: list(
+            UbicacionPublicitaria.objects.filter(bloque_programacion=bloque)
+            .order_by('hora_pausa').values_list('hora_pausa', 'tipo_pausa')
+        )
+        self.assertEqual(horas(noticiero), [(time(7, 0), 'corta'), (time(7, 30), 'media'), (time(7, 55), 'corta')])
+        self.assertEqual(horas(pelicula), [(time(20, 30), 'media'), (time(21, 0), 'larga'), (time(21, 30), 'media')])
+        self.assertEqual(horas(corto), [(time(7, 5), 'corta')])
+
+    def test_simulacion_e_idempotencia(self):
+        """Test que la vista previa no escribe y que regenerar no duplica pausas"""
+        for dia in range(7):
+            for hora in range(0, 24, 4):
+                self.crear_bloque(self.noticiero, dia, time(hora, 0), 60)
+
+        with self.assertNumQueries(4):
+            vista_previa = generar_ubicaciones_semana(self.programacion, simular=True)
+        self.assertEqual(len(vista_previa['ubicaciones']), 7 * 6 * 3)
+        self.assertFalse(UbicacionPublicitaria.objects.exists())
+
+        # Savepoint, bloques, existentes, inserción, registro de la revisión y liberación
+        with self.assertNumQueries(10):
+            generar_ubicaciones_semana(self.programacion)
+        self.assertEqual(UbicacionPublicitaria.objects.count(), 7 * 6 * 3)
+
+        resultado = generar_ubicaciones_semana(self.programacion)
+        self.assertEqual(resultado['creadas'], 0)
+        self.assertEqual(resultado['existentes'], 7 * 6 * 3)
+
+
+class MatrizSemanaTest(TestCase):
+    """Tests de la matriz semanal de la grilla integrada"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.programacion = ProgramacionSemanal.objects.create(
+            nombre='Semana matriz',
+            codigo='PRG260309',
+            fecha_inicio_semana=date(2026, 3, 9),
+            fecha_fin_semana=date(2026, 3, 15)
+        )
+        cls.programa = Programa.objects.create(
+            nombre='Matinal', tipo='noticiero', duracion_estandar=timedelta(hours=1)
+        )
+        cls.bloque = BloqueProgramacion.objects.create(
+            programacion_semanal=cls.programacion, programa=cls.programa,
+            dia_semana=2, hora_inicio=time(7, 0), duracion_real=timedelta(minutes=60)
+        )
+        cls.nocturno = BloqueProgramacion.objects.create(
+            programacion_semanal=cls.programacion, programa=cls.programa,
+            dia_semana=6, hora_inicio=time(23, 0), duracion_real=timedelta(minutes=90)
+        )
+        generar_ubicaciones_semana(cls.programacion)
+
+    def test_bloques_y_pausas_por_franja(self):
+        """Test que cada bloque ocupa sus franjas y cada pausa cae en la suya"""
+        self.assertEqual(list(franjas_bloque(self.bloque)), [14, 15])
+        self.assertEqual(list(franjas_bloque(self.nocturno)), [46, 47])
+
+        ubicaciones = list(UbicacionPublicitaria.objects.filter(bloque_programacion=self.bloque))
+        pausa_0730 = next(u for u in ubicaciones if u.hora_pausa == time(7, 30))
+        asignaciones = [SimpleNamespace(ubicacion_id=pausa_0730.pk)] * pausa_0730.capacidad_cuñas
+
+        matriz = construir_matriz([self.bloque, self.nocturno], ubicaciones, asignaciones)
+        self.assertEqual(len(matriz), FRANJAS_POR_DIA)
+        self.assertEqual(matriz[14]['hora'], '07:00')
+
+        entrada_07 = matriz[14]['celdas'][2]['bloques'][0]
+        entrada_0730 = matriz[15]['celdas'][2]['bloques'][0]
+        self.assertEqual(entrada_07['total_ubicaciones'], len(ubicaciones))
+        self.assertEqual([i['ubicacion'].hora_pausa for i in entrada_07['ubicaciones']], [time(7, 0)])
+        self.assertEqual(
+            sorted(i['ubicacion'].hora_pausa for i in entrada_0730['ubicaciones']), [time(7, 30), time(7, 55)]
+        )
+        ocupada = next(i for i in entrada_0730['ubicaciones'] if i['ubicacion'] == pausa_0730)
+        self.assertEqual(ocupada['estado'], 'ocupada')
+        self.assertEqual(matriz[16]['celdas'][2]['bloques'], [])
+        self.assertEqual(len(matriz[47]['celdas'][6]['bloques']), 1)
+
+    def test_vista_y_api(self):
+        """Test que la grilla, la vista integrada y la API comparten la matriz"""
+        admin = get_user_model().objects.create_user(
+            username='admin_matriz', email='admin_matriz@test.com', password='testpass123',
+            rol='admin', is_staff=True
+        )
+        self.client.force_login(admin)
+
+        respuesta = self.client.get(reverse('custom_admin:grilla_matriz_api'), {'programacion_id': self.programacion.pk})
+        filas = respuesta.json()['filas']
+        self.assertEqual(len(filas), FRANJAS_POR_DIA)
+        self.assertEqual(filas[14]['celdas'][2][0]['programa'], 'Matinal')
+        self.assertEqual(filas[14]['celdas'][2][0]['ubicaciones'][0]['hora_pausa'], '07:00')
+
+        for vista in ('custom_admin:grilla_publicitaria_list', 'custom_admin:grilla_publicitaria_integrada'):
+            respuesta = self.client.get(reverse(vista), {'programacion_id': self.programacion.pk})
+            self.assertEqual(respuesta.status_code, 200)
+            self.assertEqual(len(respuesta.context['matriz']), FRANJAS_POR_DIA)
+
+
+class RevisionesGrillaTest(TestCase):
+    """Tests de la revisión de la grilla y la sincronización incremental"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.programa = Programa.objects.create(
+            nombre='Vespertino', tipo='noticiero', duracion_estandar=timedelta(hours=1)
+        )
+        cls.admin = get_user_model().objects.create_user(
+            username='admin_revisiones', email='admin_revisiones@test.com', password='testpass123',
+            rol='admin', is_staff=True
+        )
+
+    def setUp(self):
+        self.programacion = ProgramacionSemanal.objects.create(
+            nombre='Semana revisiones',
+            codigo='PRG260316',
+            fecha_inicio_semana=date(2026, 3, 16),
+            fecha_fin_semana=date(2026, 3, 22)
+        )
+        self.bloques = [
+            BloqueProgramacion.objects.create(
+                programacion_semanal=self.programacion, programa=self.programa,
+                dia_semana=dia, hora_inicio=time(18, 0), duracion_real=timedelta(minutes=60)
+            )
+            for dia in range(3)
+        ]
+
+    def revision(self):
+        self.programacion.refresh_from_db()
+        return self.programacion.revision
+
+    def crear_pausa(self, bloque, hora):
+        return UbicacionPublicitaria.objects.create(
+            bloque_programacion=bloque, nombre=f'Pausa {hora}', hora_pausa=hora,
+            duracion_pausa=timedelta(minutes=2), capacidad_cuñas=2
+        )
+
+    def test_delta_solo_con_bloques_cambiados(self):
+        """Test que el delta trae solo los bloques tocados y los eliminados"""
+        inicial = self.revision()
+        self.assertEqual(inicial, 3)
+
+        pausa = self.crear_pausa(self.bloques[1], time(18, 40))
+        eliminado = self.bloques[2].pk
+        self.bloques[2].delete()
+
+        estado = estado_grilla(ProgramacionSemanal.objects.get(pk=self.programacion.pk), desde=inicial)
+        self.assertFalse(estado['completo'])
+        self.assertEqual(estado['revision'], inicial + 2)
+        self.assertEqual([bloque['id'] for bloque in estado['bloques']], [self.bloques[1].pk])
+        self.assertEqual(estado['bloques'][0]['franjas'], [36, 37])
+        self.assertEqual(estado['bloques'][0]['ubicaciones'][0]['id'], pausa.pk)
+        self.assertEqual(estado['bloques'][0]['ubicaciones'][0]['franja'], 37)
+        self.assertEqual(estado['eliminados'], [eliminado])
+
+    def test_revision_no_retrocede_ni_pierde_cambios(self):
+        """Test que guardar una instancia anterior no reduce la revisión y que los huecos recargan todo"""
+        anterior = ProgramacionSemanal.objects.get(pk=self.programacion.pk)
+        self.crear_pausa(self.bloques[0], time(18, 10))
+        anterior.estado = 'aprobada'
+        anterior.save()
+        self.assertEqual(self.revision(), 4)
+
+        CambioGrilla.objects.filter(programacion_id=self.programacion.pk, revision=2).delete()
+        self.assertTrue(estado_grilla(self.programacion, desde=1)['completo'])
+        self.assertFalse(estado_grilla(self.programacion, desde=2)['completo'])
+
+        generar_ubicaciones_semana(self.programacion)
+        self.assertTrue(estado_grilla(ProgramacionSemanal.objects.get(pk=self.programacion.pk), desde=4)['completo'])
+
+    def test_api_con_etag(self):
+        """Test el estado completo, la respuesta 304 y el delta tras un cambio"""
+        self.client.force_login(self.admin)
+        url = reverse('custom_admin:grilla_estado_api', args=[self.programacion.pk])
+
+        completo = self.client.get(url)
+        self.assertTrue(completo.json()['completo'])
+        self.assertEqual(len(completo.json()['bloques']), 3)
+        revision = completo.json()['revision']
+
+        sin_cambios = self.client.get(url, {'desde': revision})
+        self.assertEqual(sin_cambios.json()['bloques'], [])
+        repetida = self.client.get(url, {'desde': revision}, HTTP_IF_NONE_MATCH=sin_cambios['ETag'])
+        self.assertEqual(repetida.status_code, 304)
+
+        self.crear_pausa(self.bloques[0], time(18, 20))
+        delta = self.client.get(url, {'desde': revision}, HTTP_IF_NONE_MATCH=sin_cambios['ETag'])
+        self.assertEqual(delta.status_code, 200)
+        self.assertEqual([bloque['id'] for bloque in delta.json()['bloques']], [self.bloques[0].pk])
+
+        self.assertEqual(self.client.get(url, {'desde': 'x'}).status_code, 400)
+
+    def poblar(self):
+        cliente = get_user_model().objects.create_user(
+            username='cliente_revisiones', email='cliente_revisiones@test.com', password='testpass123', rol='cliente'
+        )
+        cuña = CuñaPublicitaria.objects.create(
+            titulo='Cuña revisiones', cliente=cliente, duracion_planeada=30, precio_total=Decimal('10.00'),
+            fecha_inicio=date(2026, 3, 16), fecha_fin=date(2026, 3, 22)
+        )
+        for bloque in self.bloques:
+            pausa = self.crear_pausa(bloque, time(18, 30))
+            for orden in range(3):
+                AsignacionCuña.objects.create(
+                    ubicacion=pausa, cuña=cuña, fecha_emision=date(2026, 3, 16),
+                    hora_emision=time(18, 30), orden_en_ubicacion=orden
+                )
+
+    def test_eliminar_bloque_registra_un_cambio(self):
+        """Test que las pausas y asignaciones eliminadas en cascada no registran un cambio por fila"""
+        self.poblar()
+        inicial = self.revision()
+        bloque = self.bloques[0]
+        eliminado = bloque.pk
+
+        with self.assertNumQueries(10):
+            bloque.delete()
+
+        self.assertEqual(self.revision(), inicial + 1)
+        estado = estado_grilla(ProgramacionSemanal.objects.get(pk=self.programacion.pk), desde=inicial)
+        self.assertEqual(estado['eliminados'], [eliminado])
+
+    def test_eliminar_semana_poblada(self):
+        """Test que eliminar una semana con bloques, pausas y asignaciones no registra cambios por fila"""
+        self.poblar()
+        programacion_id = self.programacion.pk
+
+        with self.assertNumQueries(9):
+            self.programacion.delete()
+
+        self.assertFalse(CambioGrilla.objects.filter(programacion_id=programacion_id).exists())
+
+    def test_eliminacion_por_queryset_es_un_cambio_masivo(self):
+        """Test que QuerySet.delete() registra un único cambio masivo por programación"""
+        self.poblar()
+        inicial = self.revision()
+
+        BloqueProgramacion.objects.filter(programacion_semanal=self.programacion).delete()
 
-# Create your tests here.
+        self.assertEqual(self.revision(), inicial + 1)
+        self.assertTrue(estado_grilla(ProgramacionSemanal.objects.get(pk=self.programacion.pk), desde=inicial)['completo'])
@@ -0,0 +1,42 @@
+# Índices de trigramas (pg_trgm) para la búsqueda de listados; solo PostgreSQL
+
+from django.db import migrations
+
+TABLA = 'orders_ordentoma'
+
+# (índice, columna) sobre UPPER(columna::text), la expresión de icontains
+INDICES = [
+    ('orders_ordentoma_codigo_trgm', 'codigo'),
+    ('orders_ordentoma_nombre_cliente_trgm', 'nombre_cliente'),
+    ('orders_ordentoma_ruc_dni_cliente_trgm', 'ruc_dni_cliente'),
+    ('orders_ordentoma_empresa_cliente_trgm', 'empresa_cliente'),
+]
+
+
+def crear_indices(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for indice, columna in INDICES:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS "{indice}" ON "{TABLA}" '
+            f'USING gin ((UPPER("{columna}"::text)) gin_trgm_ops)'
+        )
+
+
+def eliminar_indices(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for indice, _ in INDICES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS "{indice}"')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0013_ordenproduccion_vendedor_asignado_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(crear_indices, eliminar_indices),
+    ]
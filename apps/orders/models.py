@@ -2,6 +2,7 @@
 Modelos para el módulo de Órdenes de Toma
 Sistema PubliTrack - Gestión de órdenes ligadas a clientes
 """
+import logging
 import os 
 import uuid
 from decimal import Decimal
@@ -15,6 +16,8 @@ from django.core.exceptions import ValidationError
 from apps.authentication.models import CustomUser
 from django.core.validators import FileExtensionValidator 
 
+logger = logging.getLogger(__name__)
+
 class OrdenToma(models.Model):
     """
     Orden de toma generada automáticamente al crear un cliente
@@ -338,20 +341,9 @@ class OrdenToma(models.Model):
         super().save(*args, **kwargs)
     
     def generar_codigo(self):
-        """Genera código único basado en el próximo ID"""
-        try:
-            # Obtener el último ID para generar el siguiente
-            ultima_orden = OrdenToma.objects.order_by('-id').first()
-            if ultima_orden:
-                siguiente_numero = ultima_orden.id + 1
-            else:
-                siguiente_numero = 1
-            
-            return f"OT{siguiente_numero:06d}"
-        except Exception:
-            # Fallback si hay algún error
-            import time
-            return f"OT{int(time.time())}"
+        """Genera código único de la orden de toma (OT + contador)"""
+        from apps.system_configuration.secuencias import generar_codigo
+        return generar_codigo(OrdenToma, 'codigo', 'OT', 6)
     
     def copiar_datos_cliente(self):
         """Copia los datos del cliente a la orden - VERSIÓN CORREGIDA"""
@@ -863,27 +855,19 @@ class OrdenGenerada(models.Model):
         super().save(*args, **kwargs)
 
     def generar_numero_orden(self):
-        año = timezone.now().year
-        mes = timezone.now().month
-        for intento in range(1, 100):
-            count = OrdenGenerada.objects.filter(
-                fecha_generacion__year=año,
-                fecha_generacion__month=mes
-            ).count() + intento
-            numero = f"ORD{año}{mes:02d}{count:04d}"
-            if not OrdenGenerada.objects.filter(numero_orden=numero).exists():
-                return numero
-        raise Exception("No se pudo generar un número de orden único")
+        """Genera el número de la orden generada (ORD + AAAAMM + contador)"""
+        from apps.system_configuration.secuencias import generar_codigo, periodo_mensual
+        return generar_codigo(OrdenGenerada, 'numero_orden', 'ORD', 4, periodo_mensual())
 
     def generar_orden_pdf(self):
         """Genera el PDF de la orden - VERSIÓN CORREGIDA"""
         try:
-            from docxtpl import DocxTemplate
-            from io import BytesIO
             import os
-            import subprocess
-            from django.core.files.base import ContentFile
-            import tempfile
+            from apps.system_configuration.documentos import generar_documento
+
+            # Una orden ya emitida (validada, firmada...) conserva su PDF
+            if self.archivo_orden_pdf and not self.puede_regenerar:
+                return True
 
             if not self.plantilla_usada or not self.plantilla_usada.archivo_plantilla:
                 raise ValueError("No hay plantilla asignada o la plantilla no tiene archivo")
@@ -894,8 +878,6 @@ class OrdenGenerada(models.Model):
 
             print(f"📄 Usando plantilla: {self.plantilla_usada.archivo_plantilla.path}")
 
-            # Cargar plantilla
-            doc = DocxTemplate(self.plantilla_usada.archivo_plantilla.path)
             orden_toma = self.orden_toma
 
             # Preparar contexto con valores por defecto
@@ -937,56 +919,14 @@ class OrdenGenerada(models.Model):
             self.datos_generacion = context
             self.save()
 
-            # Renderizar documento
-            doc.render(context)
-            
-            # Guardar temporalmente el documento Word
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.docx') as tmp_docx:
-                doc.save(tmp_docx.name)
-                temp_docx_path = tmp_docx.name
-
-            print(f"💾 DOCX guardado en: {temp_docx_path}")
-
-            # Convertir a PDF usando LibreOffice
-            temp_pdf_path = temp_docx_path.replace('.docx', '.pdf')
-            
-            try:
-                # Intentar conversión con LibreOffice
-                cmd = [
-                    'libreoffice', '--headless', '--convert-to', 'pdf',
-                    '--outdir', os.path.dirname(temp_docx_path),
-                    temp_docx_path
-                ]
-                
-                print(f"🔄 Ejecutando: {' '.join(cmd)}")
-                result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-                
-                if result.returncode != 0:
-                    print(f"❌ Error en LibreOffice: {result.stderr}")
-                    raise Exception(f"Error en conversión PDF: {result.stderr}")
-                    
-                print(f"✅ PDF generado en: {temp_pdf_path}")
-
-            except Exception as e:
-                print(f"❌ Error en conversión: {e}")
-                # Fallback: si no hay LibreOffice, guardar el DOCX directamente
-                temp_pdf_path = temp_docx_path
-                print("⚠️ Usando DOCX como fallback")
-
-            # Leer el archivo generado y guardarlo en el modelo
-            with open(temp_pdf_path, 'rb') as pdf_file:
-                pdf_content = pdf_file.read()
-                pdf_filename = f"orden_{self.numero_orden}.pdf"
-                self.archivo_orden_pdf.save(pdf_filename, ContentFile(pdf_content), save=False)
-
-            # Limpiar archivos temporales
-            try:
-                if os.path.exists(temp_docx_path):
-                    os.remove(temp_docx_path)
-                if temp_pdf_path != temp_docx_path and os.path.exists(temp_pdf_path):
-                    os.remove(temp_pdf_path)
-            except Exception as e:
-                print(f"⚠️ Error limpiando temporales: {e}")
+            # Renderizar y convertir a PDF (o reutilizar el PDF de la misma plantilla y contexto)
+            ruta, reutilizado = generar_documento(
+                'orden', self.plantilla_usada.archivo_plantilla, context, f"orden_{self.numero_orden}",
+                permitir_docx=True
+            )
+            self.archivo_orden_pdf.name = ruta
+            if reutilizado:
+                logger.debug(f"PDF reutilizado: {ruta}")
 
             self.estado = 'generada'
             self.save()
@@ -1002,7 +942,8 @@ class OrdenGenerada(models.Model):
     def generar_orden_produccion_pdf(self):
         """Genera el PDF de la orden de producción - VERSIÓN PARA PRODUCCIÓN"""
         try:
-            from docxtpl import DocxTemplate
+            from apps.dependencias import docx_template
+            DocxTemplate = docx_template()
             from io import BytesIO
             import os
             import subprocess
@@ -1128,7 +1069,8 @@ class OrdenGenerada(models.Model):
     def generar_orden_autorizacion_pdf(self):
         """Genera el PDF de la orden de autorización"""
         try:
-            from docxtpl import DocxTemplate
+            from apps.dependencias import docx_template
+            DocxTemplate = docx_template()
             from django.core.files.base import ContentFile
             import tempfile
             import os
@@ -1194,7 +1136,8 @@ class OrdenGenerada(models.Model):
     def generar_orden_suspension_pdf(self):
         """Genera el PDF de la orden de suspensión"""
         try:
-            from docxtpl import DocxTemplate
+            from apps.dependencias import docx_template
+            DocxTemplate = docx_template()
             from django.core.files.base import ContentFile
             import tempfile
             import os
@@ -1557,18 +1500,9 @@ class OrdenProduccion(models.Model):
         super().save(*args, **kwargs)
     
     def generar_codigo(self):
-        """Genera código único para orden de producción"""
-        try:
-            ultima_orden = OrdenProduccion.objects.order_by('-id').first()
-            if ultima_orden:
-                siguiente_numero = ultima_orden.id + 1
-            else:
-                siguiente_numero = 1
-            
-            return f"OP{siguiente_numero:06d}"
-        except Exception:
-            import time
-            return f"OP{int(time.time())}"
+        """Genera código único para orden de producción (OP + contador)"""
+        from apps.system_configuration.secuencias import generar_codigo
+        return generar_codigo(OrdenProduccion, 'codigo', 'OP', 6)
     
     def copiar_datos_orden_toma(self):
         """Copia datos de la orden de toma relacionada"""
@@ -1891,8 +1825,9 @@ class OrdenAutorizacion(models.Model):
         super().save(*args, **kwargs)
         
     def generar_codigo(self):
-        import time
-        return f"AUT{int(time.time())}"
+        """Genera código único de la autorización (AUT + AAAAMM + contador)"""
+        from apps.system_configuration.secuencias import generar_codigo, periodo_mensual
+        return generar_codigo(OrdenAutorizacion, 'codigo', 'AUT', 4, periodo_mensual())
         
     def get_absolute_url(self):
         # Placeholder, se debe implementar vista
@@ -4,7 +4,9 @@ NOTA: Actualmente no se usa porque las URLs están en custom_admin
 """
 
 from django.urls import path
-from apps.custom_admin import views
+from apps.custom_admin.vistas import modulo_perezoso
+
+views = modulo_perezoso('apps.custom_admin.views')
 
 app_name = 'orders'
 
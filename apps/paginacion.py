@@ -0,0 +1,132 @@
+# apps/paginacion.py
+"""
+Paginación por cursor (keyset) y búsqueda incremental para listados y selectores
+Sistema PubliTrack - El costo de cada página no depende del total de registros
+"""
+
+import base64
+import hashlib
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from django.http import HttpResponse, HttpResponseNotModified
+
+LIMITE_POR_DEFECTO = 50
+LIMITE_MAXIMO = 200
+
+
+# ==================== CURSORES ====================
+
+def codificar_cursor(valores):
+    """
+    Codifica los valores de orden de la última fila en un cursor opaco
+    """
+    contenido = json.dumps(valores, cls=DjangoJSONEncoder, separators=(',', ':'))
+    return base64.urlsafe_b64encode(contenido.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decodificar_cursor(cursor, orden):
+    """
+    Decodifica un cursor; lanza ValueError si no corresponde al orden dado
+    """
+    try:
+        relleno = '=' * (-len(cursor) % 4)
+        valores = json.loads(base64.urlsafe_b64decode(cursor + relleno).decode('utf-8'))
+    except (ValueError, TypeError) as e:
+        raise ValueError('Cursor inválido') from e
+
+    if not isinstance(valores, list) or len(valores) != len(orden):
+        raise ValueError('Cursor inválido')
+    return valores
+
+
+def _filtro_posterior(orden, valores):
+    """
+    Condición keyset "fila posterior al cursor" para un orden compuesto, p. ej.
+    (a > va) OR (a = va AND b > vb) para ('a', 'b')
+    """
+    condicion = Q()
+    for i, campo in enumerate(orden):
+        nombre = campo.lstrip('-')
+        operador = 'lt' if campo.startswith('-') else 'gt'
+        paso = Q(**{f'{nombre}__{operador}': valores[i]})
+        for previo, valor in zip(orden[:i], valores[:i]):
+            paso &= Q(**{previo.lstrip('-'): valor})
+        condicion |= paso
+    return condicion
+
+
+def _valor(fila, campo):
+    nombre = campo.lstrip('-')
+    return fila[nombre] if isinstance(fila, dict) else getattr(fila, nombre)
+
+
+# ==================== API PÚBLICA ====================
+
+def parametros_paginacion(request, limite_defecto=LIMITE_POR_DEFECTO, limite_maximo=LIMITE_MAXIMO):
+    """
+    Lee cursor, límite y texto de búsqueda (q) de la petición
+    """
+    try:
+        limite = int(request.GET.get('limite', limite_defecto))
+    except (TypeError, ValueError):
+        limite = limite_defecto
+    limite = max(1, min(limite, limite_maximo))
+    return request.GET.get('cursor') or None, limite, (request.GET.get('q') or '').strip()
+
+
+def aplicar_busqueda(queryset, texto, campos):
+    """
+    Búsqueda incremental: cada palabra debe aparecer en alguno de los campos
+    """
+    for palabra in texto.split():
+        condicion = Q()
+        for campo in campos:
+            condicion |= Q(**{f'{campo}__icontains': palabra})
+        queryset = queryset.filter(condicion)
+    return queryset
+
+
+def paginar_por_cursor(queryset, orden, cursor=None, limite=LIMITE_POR_DEFECTO):
+    """
+    Devuelve (filas, siguiente_cursor) de una página ordenada por `orden`, que
+    debe terminar en un campo único (normalmente 'id') para ser estable. Los
+    campos de orden deben existir en las filas (incluirlos en values()).
+    """
+    orden = list(orden)
+    queryset = queryset.order_by(*orden)
+    if cursor:
+        queryset = queryset.filter(_filtro_posterior(orden, decodificar_cursor(cursor, orden)))
+
+    filas = list(queryset[:limite + 1])
+    siguiente = None
+    if len(filas) > limite:
+        filas = filas[:limite]
+        siguiente = codificar_cursor([_valor(filas[-1], campo) for campo in orden])
+    return filas, siguiente
+
+
+def etag_coincide(request, etag):
+    """
+    Indica si el cliente ya tiene la versión `etag` (cabecera If-None-Match)
+    """
+    recibidos = [valor.strip().removeprefix('W/') for valor in request.headers.get('If-None-Match', '').split(',')]
+    return etag in recibidos
+
+
+def respuesta_json_con_etag(request, datos):
+    """
+    Respuesta JSON con ETag calculado sobre el contenido; responde 304 si el
+    cliente ya tiene esa versión (If-None-Match)
+    """
+    contenido = json.dumps(datos, cls=DjangoJSONEncoder)
+    etag = '"{}"'.format(hashlib.sha1(contenido.encode('utf-8')).hexdigest())
+
+    if etag_coincide(request, etag):
+        respuesta = HttpResponseNotModified()
+    else:
+        respuesta = HttpResponse(contenido, content_type='application/json')
+    respuesta['ETag'] = etag
+    respuesta['Cache-Control'] = 'private, no-cache'
+    return respuesta
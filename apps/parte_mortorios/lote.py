@@ -0,0 +1,369 @@
+"""
+Ingreso de partes mortorios en lote
+Sistema PubliTrack - Valida juntos todos los partes recibidos y, si ninguno
+tiene errores, crea en una sola transacción los partes y sus cuñas con
+inserciones en bloque y códigos reservados de una vez. Los estados se fijan
+ya sincronizados (cuña activa, parte al aire), sin la ida y vuelta de señales
+de la creación individual; el semáforo, los fragmentos, las estadísticas y la
+programación de transmisiones se actualizan una sola vez al confirmar el lote.
+"""
+
+import logging
+from datetime import datetime, timedelta
+from decimal import Decimal, InvalidOperation
+
+from django.db import transaction
+from django.utils import timezone
+
+from apps.content_management.models import CuñaPublicitaria, HistorialCuña
+from .models import ParteMortorio
+from .signals import ESTADO_PARTE_POR_CUÑA, sincronizacion_suspendida
+
+logger = logging.getLogger(__name__)
+
+MAXIMO_PARTES_LOTE = 200
+
+# Estado con el que nace la cuña (el parte toma el equivalente sincronizado)
+ESTADO_CUÑA_INICIAL = 'activa'
+
+CAMPOS_OBLIGATORIOS = ('nombre_fallecido', 'fecha_fallecimiento', 'precio_total')
+
+CAMPOS_TEXTO = (
+    'nombre_contacto', 'telefono_contacto', 'nombre_fallecido', 'dni_fallecido',
+    'nombre_esposa', 'nombres_hijos', 'familiares_adicionales', 'lugar_misa',
+    'observaciones', 'mensaje_personalizado',
+)
+
+# Campo entero -> valor por defecto
+CAMPOS_ENTEROS = {
+    'edad_fallecido': None,
+    'cantidad_hijos': 0,
+    'hijos_vivos': 0,
+    'hijos_fallecidos': 0,
+    'duracion_transmision': 1,
+    'repeticiones_dia': 1,
+}
+
+CAMPOS_FECHA = (
+    'fecha_fallecimiento', 'fecha_nacimiento', 'fecha_misa',
+    'fecha_inicio_transmision', 'fecha_fin_transmision',
+)
+
+CAMPOS_HORA = ('hora_misa', 'hora_transmision')
+
+# Campo con opciones -> valor por defecto
+CAMPOS_OPCIONES = {
+    'tipo_ceremonia': 'misa',
+    'urgencia': 'normal',
+}
+
+
+class LoteInvalido(Exception):
+    """Algún parte del lote no pasó la validación; no se creó ninguno"""
+
+    def __init__(self, errores):
+        super().__init__(f"{len(errores)} parte(s) con errores")
+        self.errores = errores
+
+
+# ==================== VALIDACIÓN ====================
+
+def _validar_parte(datos):
+    """
+    Convierte los datos de un parte (mismo formato que la creación individual)
+    en valores de campos. Devuelve (valores, errores por campo).
+    """
+    valores, errores = {}, {}
+    if not isinstance(datos, dict):
+        return valores, {'parte': 'Se esperaba un objeto'}
+
+    for campo in CAMPOS_OBLIGATORIOS:
+        if not datos.get(campo):
+            errores[campo] = f'El campo {campo} es obligatorio'
+
+    for campo in CAMPOS_TEXTO:
+        if datos.get(campo):
+            valores[campo] = str(datos[campo]).strip()
+
+    for campo, defecto in CAMPOS_ENTEROS.items():
+        valor = datos.get(campo)
+        if valor in (None, ''):
+            valores[campo] = defecto
+            continue
+        try:
+            valores[campo] = int(valor)
+            if valores[campo] < 0:
+                raise ValueError
+        except (TypeError, ValueError):
+            errores[campo] = 'Debe ser un número entero positivo'
+
+    for campo in CAMPOS_FECHA:
+        if datos.get(campo):
+            try:
+                valores[campo] = datetime.strptime(str(datos[campo]), '%Y-%m-%d').date()
+            except ValueError:
+                errores[campo] = 'Fecha inválida (formato AAAA-MM-DD)'
+
+    for campo in CAMPOS_HORA:
+        if datos.get(campo):
+            try:
+                valores[campo] = datetime.strptime(str(datos[campo]), '%H:%M').time()
+            except ValueError:
+                errores[campo] = 'Hora inválida (formato HH:MM)'
+
+    for campo, defecto in CAMPOS_OPCIONES.items():
+        valor = datos.get(campo) or defecto
+        opciones = dict(ParteMortorio._meta.get_field(campo).choices)
+        if valor in opciones:
+            valores[campo] = valor
+        else:
+            errores[campo] = f'Valor no permitido: {valor}'
+
+    if datos.get('precio_total'):
+        try:
+            valores['precio_total'] = Decimal(str(datos['precio_total']))
+            if valores['precio_total'] < 0:
+                raise InvalidOperation
+        except InvalidOperation:
+            errores['precio_total'] = 'Precio inválido'
+
+    # Fechas de transmisión por defecto, igual que la creación individual
+    if 'fecha_inicio_transmision' not in errores:
+        valores.setdefault('fecha_inicio_transmision', timezone.now().date())
+        if 'fecha_fin_transmision' not in errores:
+            valores.setdefault('fecha_fin_transmision', valores['fecha_inicio_transmision'] + timedelta(days=7))
+            # Mismo criterio que CuñaPublicitaria.clean para la cuña que se crea
+            if valores['fecha_fin_transmision'] <= valores['fecha_inicio_transmision']:
+                errores['fecha_fin_transmision'] = 'La fecha de fin debe ser posterior a la fecha de inicio'
+
+    if not errores.keys() & {'cantidad_hijos', 'hijos_vivos', 'hijos_fallecidos'}:
+        if valores['hijos_vivos'] + valores['hijos_fallecidos'] > valores['cantidad_hijos']:
+            errores['cantidad_hijos'] = (
+                'La suma de hijos vivos y fallecidos no puede ser mayor a la cantidad total de hijos'
+            )
+
+    return valores, errores
+
+
+def validar_partes(lista):
+    """
+    Valida todos los partes del lote y devuelve sus valores de campos (con el
+    cliente ya resuelto). Si alguno falla lanza LoteInvalido con los errores
+    de cada índice; los clientes se buscan en una sola consulta.
+    """
+    from apps.authentication.models import CustomUser
+
+    if not isinstance(lista, list) or not lista:
+        raise LoteInvalido([{'indice': None, 'errores': {'partes': 'Se esperaba una lista de partes'}}])
+    if len(lista) > MAXIMO_PARTES_LOTE:
+        raise LoteInvalido([{
+            'indice': None,
+            'errores': {'partes': f'El lote admite como máximo {MAXIMO_PARTES_LOTE} partes'}
+        }])
+
+    resultados = [_validar_parte(datos) for datos in lista]
+
+    ids_clientes = {
+        str(datos['cliente_id']) for datos in lista
+        if isinstance(datos, dict) and datos.get('cliente_id')
+    }
+    clientes = {
+        str(cliente.pk): cliente
+        for cliente in CustomUser.objects.filter(pk__in=[i for i in ids_clientes if i.isdigit()], rol='cliente')
+    }
+
+    vistos = {}
+    errores_lote = []
+    for indice, (datos, (valores, errores)) in enumerate(zip(lista, resultados)):
+        if isinstance(datos, dict) and datos.get('cliente_id'):
+            valores['cliente'] = clientes.get(str(datos['cliente_id']))
+            if valores['cliente'] is None:
+                errores['cliente_id'] = 'Cliente no encontrado'
+
+        # El mismo fallecido dos veces en el lote suele ser un envío duplicado
+        if valores.get('nombre_fallecido') and valores.get('fecha_fallecimiento'):
+            clave = (' '.join(valores['nombre_fallecido'].lower().split()), valores['fecha_fallecimiento'])
+            if clave in vistos:
+                errores['nombre_fallecido'] = f'Duplicado del parte {vistos[clave]} del lote'
+            else:
+                vistos[clave] = indice
+
+        if errores:
+            errores_lote.append({'indice': indice, 'errores': errores})
+
+    if errores_lote:
+        raise LoteInvalido(errores_lote)
+    return [valores for valores, _ in resultados]
+
+
+# ==================== CREACIÓN ====================
+
+def construir_cuña(parte, usuario):
+    """
+    Cuña (sin guardar) que transmite un parte mortorio
+    """
+    duracion_segundos = parte.duracion_transmision or 30
+
+    descripcion = f"Transmisión por fallecimiento de {parte.nombre_fallecido}"
+    if parte.edad_fallecido:
+        descripcion += f", {parte.edad_fallecido} años"
+    if parte.nombre_esposa:
+        descripcion += f". Esposa: {parte.nombre_esposa}"
+
+    return CuñaPublicitaria(
+        titulo=parte.nombre_fallecido,
+        descripcion=descripcion,
+        cliente=parte.cliente,
+        vendedor_asignado=parte.creado_por,
+        duracion_planeada=duracion_segundos,
+        repeticiones_dia=parte.repeticiones_dia or 1,
+        fecha_inicio=parte.fecha_inicio_transmision or timezone.now().date(),
+        fecha_fin=parte.fecha_fin_transmision or (timezone.now().date() + timedelta(days=7)),
+        precio_por_segundo=parte.precio_total / Decimal(str(duracion_segundos)),
+        precio_total=parte.precio_total,
+        estado=ESTADO_CUÑA_INICIAL,
+        observaciones=f"Cuña generada automáticamente desde parte mortorio {parte.codigo}",
+        # Tags informativos; la relación se guarda en parte_mortorio
+        tags=f"parte_mortorio,transmision_fallecimiento,{parte.codigo}",
+        parte_mortorio=parte,
+        created_by=usuario
+    )
+
+
+def _historial_creacion(cuña):
+    """Entrada 'creada' del historial, igual a la que deja la señal post_save"""
+    return HistorialCuña(
+        cuña=cuña,
+        accion='creada',
+        usuario=cuña.created_by,
+        descripcion=f'Cuña publicitaria "{cuña.titulo}" creada',
+        datos_nuevos={
+            'titulo': cuña.titulo,
+            'estado': cuña.estado,
+            'precio_total': str(cuña.precio_total),
+            'fecha_inicio': cuña.fecha_inicio.isoformat() if cuña.fecha_inicio else None,
+            'fecha_fin': cuña.fecha_fin.isoformat() if cuña.fecha_fin else None,
+        }
+    )
+
+
+def _registrar_historial(usuario, partes, cuñas):
+    """
+    Entradas de LogEntry de partes y cuñas en una sola inserción
+    """
+    from django.contrib.admin.models import LogEntry, ADDITION
+    from django.contrib.contenttypes.models import ContentType
+
+    tipo_parte = ContentType.objects.get_for_model(ParteMortorio).pk
+    tipo_cuña = ContentType.objects.get_for_model(CuñaPublicitaria).pk
+    entradas = []
+    for parte, cuña in zip(partes, cuñas):
+        entradas.append(LogEntry(
+            user_id=usuario.pk,
+            content_type_id=tipo_parte,
+            object_id=str(parte.pk),
+            object_repr=f"Parte mortorio creado: {parte.codigo}",
+            action_flag=ADDITION,
+            change_message=(
+                f'Parte mortorio creado en lote: {parte.codigo} - '
+                f'Fallecido: {parte.nombre_fallecido} - Precio: ${parte.precio_total}'
+            )
+        ))
+        entradas.append(LogEntry(
+            user_id=usuario.pk,
+            content_type_id=tipo_cuña,
+            object_id=str(cuña.pk),
+            object_repr=f"Cuña creada desde parte mortorio: {cuña.titulo}",
+            action_flag=ADDITION,
+            change_message=f'Cuña creada automáticamente desde parte mortorio {parte.codigo}'
+        ))
+    LogEntry.objects.bulk_create(entradas)
+
+
+def _actualizar_ingresos(partes, cuñas):
+    """
+    Recalcula una vez cada bucket del acumulado diario afectado por el lote
+    """
+    from apps.reports_analytics.generators.financial_reports import (
+        actualizar_ingreso_diario, claves_ingreso
+    )
+
+    for fuente, registros in (('parte_mortorio', partes), ('cuña', cuñas)):
+        for clave in claves_ingreso(fuente, [registro.pk for registro in registros]):
+            actualizar_ingreso_diario(fuente, *clave)
+
+
+def crear_partes_en_lote(lista, usuario):
+    """
+    Valida y crea los partes del lote con sus cuñas. Devuelve la lista de
+    pares (parte, cuña); si algún parte es inválido lanza LoteInvalido sin
+    crear nada.
+    """
+    from apps.system_configuration.secuencias import generar_codigos, periodo_mensual
+
+    valores = validar_partes(lista)
+    estado_parte = ESTADO_PARTE_POR_CUÑA[ESTADO_CUÑA_INICIAL]
+
+    with transaction.atomic(), sincronizacion_suspendida():
+        codigos_partes = generar_codigos(ParteMortorio, 'codigo', 'PM', 6, cantidad=len(valores))
+        partes = ParteMortorio.objects.bulk_create([
+            ParteMortorio(codigo=codigo, estado=estado_parte, creado_por=usuario, **campos)
+            for codigo, campos in zip(codigos_partes, valores)
+        ])
+
+        codigos_cuñas = generar_codigos(
+            CuñaPublicitaria, 'codigo', 'CP', 4, periodo_mensual(), cantidad=len(partes)
+        )
+        cuñas = []
+        for parte, codigo in zip(partes, codigos_cuñas):
+            cuña = construir_cuña(parte, usuario)
+            cuña.codigo = codigo
+            cuñas.append(cuña)
+        cuñas = CuñaPublicitaria.objects.bulk_create(cuñas)
+
+        HistorialCuña.objects.bulk_create([_historial_creacion(cuña) for cuña in cuñas])
+        _registrar_historial(usuario, partes, cuñas)
+        _actualizar_ingresos(partes, cuñas)
+
+        ids_cuñas = [cuña.pk for cuña in cuñas]
+        transaction.on_commit(lambda: aplicar_efectos_lote(ids_cuñas))
+
+    logger.info(f"Lote de {len(partes)} partes mortorios creado")
+    return list(zip(partes, cuñas))
+
+
+# ==================== EFECTOS DEL LOTE ====================
+
+def aplicar_efectos_lote(ids_cuñas):
+    """
+    Efectos que la creación individual dispara por cada registro, aplicados
+    una vez para todo el lote: cache de listados y estadísticas, semáforo de
+    las cuñas nuevas, avisos de vencimiento y programación de transmisiones
+    """
+    from django.db.models import Q
+    from apps.content_management.signals import programar_notificacion_vencimiento
+    from apps.custom_admin import fragmentos
+    from apps.reports_analytics.generators.dashboard_data import invalidar_estadisticas_contratos
+    from apps.traffic_light_system.utils.status_calculator import StatusCalculator
+
+    fragmentos.invalidar(fragmentos.PARTES, fragmentos.CUNAS)
+    invalidar_estadisticas_contratos()
+
+    try:
+        # Las alertas las crea la señal de EstadoSemaforo al guardar cada estado
+        StatusCalculator().actualizar_todas_las_cuñas(filtros=Q(pk__in=ids_cuñas))
+    except Exception as e:
+        logger.error(f"Error actualizando el semáforo del lote de partes: {e}")
+
+    # bulk_create no emite post_save: se programa aquí lo que haría crear_notificacion_vencimiento
+    for cuña in CuñaPublicitaria.objects.filter(pk__in=ids_cuñas).select_related('cliente', 'vendedor_asignado'):
+        programar_notificacion_vencimiento(cuña)
+
+    try:
+        from apps.transmission_control.tasks import actualizar_proximas_reproducciones
+        actualizar_proximas_reproducciones.delay()
+    except ImportError:
+        # Sin Celery, el ciclo periódico de transmisiones tomará las cuñas nuevas
+        logger.info("Celery no disponible: próximas reproducciones se actualizan en el siguiente ciclo")
+    except Exception as e:
+        logger.error(f"Error programando la actualización de transmisiones del lote: {e}")
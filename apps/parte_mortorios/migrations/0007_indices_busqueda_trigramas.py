@@ -0,0 +1,44 @@
+# Índices de trigramas (pg_trgm) para la búsqueda de listados; solo PostgreSQL
+
+from django.db import migrations
+
+TABLA = 'parte_mortorios_partemortorio'
+
+# (índice, columna) sobre UPPER(columna::text), la expresión de icontains
+INDICES = [
+    ('parte_mortorios_partemortorio_codigo_trgm', 'codigo'),
+    ('parte_mortorios_partemortorio_nombre_fallecido_trgm', 'nombre_fallecido'),
+    ('parte_mortorios_partemortorio_dni_fallecido_trgm', 'dni_fallecido'),
+    ('parte_mortorios_partemortorio_nombre_esposa_trgm', 'nombre_esposa'),
+    ('parte_mortorios_partemortorio_nombres_hijos_trgm', 'nombres_hijos'),
+    ('parte_mortorios_partemortorio_familiares_adicionales_trgm', 'familiares_adicionales'),
+]
+
+
+def crear_indices(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for indice, columna in INDICES:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS "{indice}" ON "{TABLA}" '
+            f'USING gin ((UPPER("{columna}"::text)) gin_trgm_ops)'
+        )
+
+
+def eliminar_indices(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for indice, _ in INDICES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS "{indice}"')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('parte_mortorios', '0006_partemortorio_nombre_contacto_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(crear_indices, eliminar_indices),
+    ]
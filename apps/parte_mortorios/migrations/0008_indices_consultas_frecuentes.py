@@ -0,0 +1,23 @@
+# Generated by Django 5.2.5 on 2026-10-19 17:07
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('parte_mortorios', '0007_indices_busqueda_trigramas'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='partemortorio',
+            index=models.Index(fields=['fecha_solicitud'], name='parte_morto_fecha_s_b3b953_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='partemortorio',
+            index=models.Index(fields=['fecha_fallecimiento'], name='parte_morto_fecha_f_34a17c_idx'),
+        ),
+    ]
@@ -1,3 +1,5 @@
+import logging
+
 from django.db import models
 from django.conf import settings
 from django.utils import timezone
@@ -6,6 +8,10 @@ from django.urls import reverse
 from decimal import Decimal
 from django.core.validators import FileExtensionValidator
 import uuid
+
+logger = logging.getLogger(__name__)
+
+
 class ParteMortorio(models.Model):
     """
     Modelo para gestionar partes mortuorios (transmisiones por fallecimiento)
@@ -270,6 +276,8 @@ class ParteMortorio(models.Model):
             models.Index(fields=['estado', 'fecha_solicitud']),
             models.Index(fields=['cliente', 'estado']),
             models.Index(fields=['codigo']),
+            models.Index(fields=['fecha_solicitud']),
+            models.Index(fields=['fecha_fallecimiento']),
         ]
     
     def __str__(self):
@@ -286,18 +294,9 @@ class ParteMortorio(models.Model):
         super().save(*args, **kwargs)
     
     def generar_codigo(self):
-        """Genera código único para el parte mortorio"""
-        try:
-            ultimo_parte = ParteMortorio.objects.order_by('-id').first()
-            if ultimo_parte:
-                siguiente_numero = ultimo_parte.id + 1
-            else:
-                siguiente_numero = 1
-            
-            return f"PM{siguiente_numero:06d}"
-        except Exception:
-            import time
-            return f"PM{int(time.time())}"
+        """Genera código único para el parte mortorio (PM + contador)"""
+        from apps.system_configuration.secuencias import generar_codigo
+        return generar_codigo(ParteMortorio, 'codigo', 'PM', 6)
     
     def get_absolute_url(self):
         return reverse('parte_mortorios:detalle', kwargs={'pk': self.pk})
@@ -696,28 +695,19 @@ class ParteMortorioGenerado(models.Model):
         super().save(*args, **kwargs)
 
     def generar_numero_parte(self):
-        """Genera número único para el parte generado"""
-        año = timezone.now().year
-        mes = timezone.now().month
-        for intento in range(1, 100):
-            count = ParteMortorioGenerado.objects.filter(
-                fecha_generacion__year=año,
-                fecha_generacion__month=mes
-            ).count() + intento
-            numero = f"PMG{año}{mes:02d}{count:04d}"
-            if not ParteMortorioGenerado.objects.filter(numero_parte=numero).exists():
-                return numero
-        raise Exception("No se pudo generar un número de parte único")
+        """Genera número único para el parte generado (PMG + AAAAMM + contador)"""
+        from apps.system_configuration.secuencias import generar_codigo, periodo_mensual
+        return generar_codigo(ParteMortorioGenerado, 'numero_parte', 'PMG', 4, periodo_mensual())
 
     def generar_parte_pdf(self):
         """Genera el PDF del parte mortorio"""
         try:
-            from docxtpl import DocxTemplate
-            from io import BytesIO
             import os
-            import subprocess
-            from django.core.files.base import ContentFile
-            import tempfile
+            from apps.system_configuration.documentos import generar_documento
+
+            # Un parte ya emitido (impreso, validado...) conserva su PDF
+            if self.archivo_parte_pdf and not self.puede_regenerar:
+                return True
 
             if not self.plantilla_usada or not self.plantilla_usada.archivo_plantilla:
                 raise ValueError("No hay plantilla asignada o la plantilla no tiene archivo")
@@ -728,8 +718,6 @@ class ParteMortorioGenerado(models.Model):
 
             print(f"📄 Usando plantilla: {self.plantilla_usada.archivo_plantilla.path}")
 
-            # Cargar plantilla
-            doc = DocxTemplate(self.plantilla_usada.archivo_plantilla.path)
             parte_mortorio = self.parte_mortorio
 
             # Función helper para formatear fechas en español
@@ -789,56 +777,14 @@ class ParteMortorioGenerado(models.Model):
             self.datos_generacion = context
             self.save()
 
-            # Renderizar documento
-            doc.render(context)
-            
-            # Guardar temporalmente el documento Word
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.docx') as tmp_docx:
-                doc.save(tmp_docx.name)
-                temp_docx_path = tmp_docx.name
-
-            print(f"💾 DOCX guardado en: {temp_docx_path}")
-
-            # Convertir a PDF usando LibreOffice
-            temp_pdf_path = temp_docx_path.replace('.docx', '.pdf')
-            
-            try:
-                # Intentar conversión con LibreOffice
-                cmd = [
-                    'libreoffice', '--headless', '--convert-to', 'pdf',
-                    '--outdir', os.path.dirname(temp_docx_path),
-                    temp_docx_path
-                ]
-                
-                print(f"🔄 Ejecutando: {' '.join(cmd)}")
-                result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-                
-                if result.returncode != 0:
-                    print(f"❌ Error en LibreOffice: {result.stderr}")
-                    raise Exception(f"Error en conversión PDF: {result.stderr}")
-                    
-                print(f"✅ PDF generado en: {temp_pdf_path}")
-
-            except Exception as e:
-                print(f"❌ Error en conversión: {e}")
-                # Fallback: si no hay LibreOffice, guardar el DOCX directamente
-                temp_pdf_path = temp_docx_path
-                print("⚠️ Usando DOCX como fallback")
-
-            # Leer el archivo generado y guardarlo en el modelo
-            with open(temp_pdf_path, 'rb') as pdf_file:
-                pdf_content = pdf_file.read()
-                pdf_filename = f"parte_mortorio_{self.numero_parte}.pdf"
-                self.archivo_parte_pdf.save(pdf_filename, ContentFile(pdf_content), save=False)
-
-            # Limpiar archivos temporales
-            try:
-                if os.path.exists(temp_docx_path):
-                    os.remove(temp_docx_path)
-                if temp_pdf_path != temp_docx_path and os.path.exists(temp_pdf_path):
-                    os.remove(temp_pdf_path)
-            except Exception as e:
-                print(f"⚠️ Error limpiando temporales: {e}")
+            # Renderizar y convertir a PDF (o reutilizar el PDF de la misma plantilla y contexto)
+            ruta, reutilizado = generar_documento(
+                'parte_mortorio', self.plantilla_usada.archivo_plantilla, context, f"parte_mortorio_{self.numero_parte}",
+                permitir_docx=True
+            )
+            self.archivo_parte_pdf.name = ruta
+            if reutilizado:
+                logger.debug(f"PDF reutilizado: {ruta}")
 
             self.estado = 'generado'
             self.save()
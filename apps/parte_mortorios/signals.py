@@ -1,8 +1,45 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 from .models import ParteMortorio
 from apps.content_management.models import CuñaPublicitaria
 
+# Mapeo de estados Parte -> Cuña (pendiente pausa la cuña para que no salga al aire)
+ESTADO_CUÑA_POR_PARTE = {
+    'al_aire': 'activa',
+    'pausado': 'pausada',
+    'finalizado': 'finalizada',
+    'pendiente': 'pausada',
+}
+
+# Mapeo de estados Cuña -> Parte
+ESTADO_PARTE_POR_CUÑA = {
+    'activa': 'al_aire',
+    'pausada': 'pausado',
+    'finalizada': 'finalizado',
+    'borrador': 'pendiente',
+    'pendiente_revision': 'pendiente',
+}
+
+# Mientras está activa, ningún guardado sincroniza el estado de su contraparte
+_sincronizacion_suspendida = ContextVar('sincronizacion_partes_suspendida', default=False)
+
+
+@contextmanager
+def sincronizacion_suspendida():
+    """
+    Suspende la sincronización parte <-> cuña en el bloque (p. ej. un ingreso
+    en lote que ya crea ambos registros con estados coherentes)
+    """
+    token = _sincronizacion_suspendida.set(True)
+    try:
+        yield
+    finally:
+        _sincronizacion_suspendida.reset(token)
+
+
 @receiver(post_save, sender=ParteMortorio)
 def sincronizar_estado_cuña_desde_parte(sender, instance, created, **kwargs):
     """
@@ -13,28 +50,20 @@ def sincronizar_estado_cuña_desde_parte(sender, instance, created, **kwargs):
     - finalizado -> finalizada
     - pendiente -> pendiente_revision (o borrador/pausada?) -> Dejamos 'pausada' para que no salga al aire.
     """
-    # Mapeo de estados Parte -> Cuña
-    mapa_estados = {
-        'al_aire': 'activa',
-        'pausado': 'pausada',
-        'finalizado': 'finalizada',
-        'pendiente': 'pausada', # Si se marca pendiente, pausamos la cuña
-    }
-    
-    nuevo_estado_cuna = mapa_estados.get(instance.estado)
+    if _sincronizacion_suspendida.get():
+        return
+
+    nuevo_estado_cuna = ESTADO_CUÑA_POR_PARTE.get(instance.estado)
     if not nuevo_estado_cuna:
         return
 
-    # Buscar cuña asociada por tag
-    # El tag es: "parte_mortorio,transmision_fallecimiento,{codigo}"
+    # Cuñas asociadas por la relación parte_mortorio
     try:
-        # Usamos filter por si acaso hubiera duplicados (no debería)
-        cuñas = CuñaPublicitaria.objects.filter(tags__contains=instance.codigo)
-        for cuña in cuñas:
-            if cuña.estado != nuevo_estado_cuna:
-                print(f"🔄 Sincronizando Cuña {cuña.codigo} a estado {nuevo_estado_cuna} (por Parte {instance.codigo})")
-                cuña.estado = nuevo_estado_cuna
-                cuña.save()
+        # Solo las que todavía no están en el estado destino
+        for cuña in instance.cuñas.exclude(estado=nuevo_estado_cuna):
+            print(f"🔄 Sincronizando Cuña {cuña.codigo} a estado {nuevo_estado_cuna} (por Parte {instance.codigo})")
+            cuña.estado = nuevo_estado_cuna
+            cuña.save()
     except Exception as e:
         print(f"❌ Error sincronizando cuña desde parte: {e}")
 
@@ -48,39 +77,18 @@ def sincronizar_estado_parte_desde_cuña(sender, instance, created, **kwargs):
     - finalizada -> finalizado
     """
     # Verificar si es una cuña de parte mortorio
-    if not instance.tags or 'parte_mortorio' not in instance.tags:
+    if not instance.parte_mortorio_id or _sincronizacion_suspendida.get():
         return
 
-    # Mapeo de estados Cuña -> Parte
-    mapa_estados = {
-        'activa': 'al_aire',
-        'pausada': 'pausado',
-        'finalizada': 'finalizado',
-        # Si la cuña vuelve a borrador?
-        'borrador': 'pendiente',
-        'pendiente_revision': 'pendiente'
-    }
-
-    nuevo_estado_parte = mapa_estados.get(instance.estado)
+    nuevo_estado_parte = ESTADO_PARTE_POR_CUÑA.get(instance.estado)
     if not nuevo_estado_parte:
         return
 
-    # Extraer código del parte desde los tags
-    # Tags format: "parte_mortorio,transmision_fallecimiento,PM000001"
-    program_cod = None
     try:
-        tags = instance.tags.split(',')
-        for tag in tags:
-            tag = tag.strip()
-            if tag.startswith('PM') and len(tag) > 2: # Asumiendo código PM...
-                program_cod = tag
-                break
-        
-        if program_cod:
-            parte = ParteMortorio.objects.filter(codigo=program_cod).first()
-            if parte and parte.estado != nuevo_estado_parte:
-                print(f"🔄 Sincronizando Parte {parte.codigo} a estado {nuevo_estado_parte} (por Cuña {instance.codigo})")
-                parte.estado = nuevo_estado_parte
-                parte.save()
+        parte = ParteMortorio.objects.filter(pk=instance.parte_mortorio_id).first()
+        if parte and parte.estado != nuevo_estado_parte:
+            print(f"🔄 Sincronizando Parte {parte.codigo} a estado {nuevo_estado_parte} (por Cuña {instance.codigo})")
+            parte.estado = nuevo_estado_parte
+            parte.save()
     except Exception as e:
         print(f"❌ Error sincronizando parte desde cuña: {e}")
@@ -1,3 +1,190 @@
+"""
+Tests para el módulo de Partes Mortorios
+Sistema PubliTrack - Relación entre partes mortorios y sus cuñas, búsqueda de listados
+e ingreso en lote
+"""
+
+import json
+from datetime import date, timedelta
+from decimal import Decimal
+from unittest import mock
 from django.test import TestCase
+from django.db.models import Prefetch
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+
+from apps.busqueda import buscar
+from apps.content_management.models import CuñaPublicitaria
+from .models import ParteMortorio
+
+User = get_user_model()
+
+
+class ParteMortorioCuñasTest(TestCase):
+    """Tests de la relación parte mortorio -> cuñas"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.cliente = User.objects.create_user(
+            username='familia_test',
+            email='familia@test.com',
+            password='testpass123',
+            rol='cliente'
+        )
+
+    def crear_parte(self, estado='pendiente'):
+        return ParteMortorio.objects.create(
+            cliente=self.cliente,
+            nombre_fallecido='Juan Pérez',
+            fecha_fallecimiento=date.today(),
+            precio_total=Decimal('20.00'),
+            estado=estado
+        )
+
+    def crear_cuña(self, parte, estado='pausada'):
+        return CuñaPublicitaria.objects.create(
+            titulo=parte.nombre_fallecido,
+            cliente=self.cliente,
+            duracion_planeada=30,
+            precio_total=parte.precio_total,
+            fecha_inicio=date.today(),
+            fecha_fin=date.today() + timedelta(days=7),
+            estado=estado,
+            parte_mortorio=parte
+        )
+
+    def test_estado_del_parte_se_propaga_a_sus_cuñas(self):
+        """Test que solo las cuñas del parte cambian de estado"""
+        parte = self.crear_parte()
+        otro_parte = self.crear_parte()
+        cuña = self.crear_cuña(parte)
+        cuña_ajena = self.crear_cuña(otro_parte)
+
+        parte.estado = 'al_aire'
+        parte.save()
+
+        cuña.refresh_from_db()
+        cuña_ajena.refresh_from_db()
+        self.assertEqual(cuña.estado, 'activa')
+        self.assertEqual(cuña_ajena.estado, 'pausada')
+
+    def test_cuñas_de_la_pagina_en_una_consulta(self):
+        """Test que el prefetch carga las cuñas de todos los partes en una consulta"""
+        for _ in range(3):
+            parte = self.crear_parte()
+            self.crear_cuña(parte)
+
+        with self.assertNumQueries(2):
+            partes = list(ParteMortorio.objects.prefetch_related(
+                Prefetch('cuñas', to_attr='cunas_asociadas')
+            ))
+            self.assertTrue(all(len(p.cunas_asociadas) == 1 for p in partes))
+
+
+class BusquedaPartesTest(TestCase):
+    """Tests de la búsqueda compartida de listados"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cliente = User.objects.create_user(
+            username='familia_busqueda', email='busqueda@test.com', password='testpass123', rol='cliente'
+        )
+        datos = [
+            ('María López Vega', 'Pedro Ruiz'),
+            ('María Andrade', 'Lucía López'),
+            ('José Vega', ''),
+        ]
+        for nombre, esposa in datos:
+            ParteMortorio.objects.create(
+                cliente=cliente,
+                nombre_fallecido=nombre,
+                nombre_esposa=esposa,
+                fecha_fallecimiento=date.today(),
+                precio_total=Decimal('20.00')
+            )
+
+    def nombres(self, texto):
+        partes = buscar(ParteMortorio.objects.order_by('nombre_fallecido'), texto, 'parte_mortorio')
+        return list(partes.values_list('nombre_fallecido', flat=True))
+
+    def test_cada_palabra_en_algun_campo(self):
+        """Test que todas las palabras deben aparecer, aunque sea en campos distintos"""
+        self.assertEqual(self.nombres('maría lópez'), ['María Andrade', 'María López Vega'])
+        self.assertEqual(self.nombres('vega'), ['José Vega', 'María López Vega'])
+        self.assertEqual(self.nombres('  '), ['José Vega', 'María Andrade', 'María López Vega'])
+        self.assertEqual(self.nombres('andrade ruiz'), [])
+
+
+class IngresoLoteTest(TestCase):
+    """Tests del ingreso de partes mortorios en lote"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(
+            username='admin_lote', email='lote@test.com', password='testpass123', rol='admin'
+        )
+        cls.cliente = User.objects.create_user(
+            username='familia_lote', email='familia_lote@test.com', password='testpass123', rol='cliente'
+        )
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def enviar(self, partes):
+        return self.client.post(
+            reverse('custom_admin:parte_mortorio_lote_api'),
+            data=json.dumps({'partes': partes}),
+            content_type='application/json'
+        )
+
+    def datos(self, nombre, **extra):
+        return {
+            'nombre_fallecido': nombre,
+            'fecha_fallecimiento': date.today().isoformat(),
+            'precio_total': '30.00',
+            'cliente_id': self.cliente.pk,
+            **extra
+        }
+
+    def test_crea_partes_y_cuñas_sincronizados(self):
+        """Test que el lote crea cada parte con su cuña y estados ya coherentes"""
+        from apps.reports_analytics.models import IngresoDiario
+        from apps.traffic_light_system.models import EstadoSemaforo
+
+        with mock.patch('apps.content_management.signals.programar_notificacion_vencimiento') as notificar:
+            with self.captureOnCommitCallbacks(execute=True):
+                respuesta = self.enviar([self.datos(f'Fallecido {i}', urgencia='urgente') for i in range(3)])
+
+        self.assertEqual(respuesta.status_code, 200)
+        partes = ParteMortorio.objects.order_by('codigo')
+        self.assertEqual(partes.count(), 3)
+        self.assertEqual(len({parte.codigo for parte in partes}), 3)
+        for parte in partes:
+            cuña = parte.cuñas.get()
+            self.assertEqual((parte.estado, cuña.estado), ('al_aire', 'activa'))
+            self.assertEqual(cuña.historial.filter(accion='creada').count(), 1)
+        self.assertEqual(EstadoSemaforo.objects.filter(cuña__parte_mortorio__in=partes).count(), 3)
+        self.assertEqual(
+            IngresoDiario.objects.get(fuente='parte_mortorio').total, Decimal('90.00')
+        )
+        self.assertEqual(notificar.call_count, 3)
+
+    def test_un_parte_invalido_rechaza_el_lote(self):
+        """Test que los errores se informan por índice y no se crea nada"""
+        respuesta = self.enviar([
+            self.datos('Válido'),
+            self.datos('Sin precio', precio_total=''),
+            self.datos('Válido'),
+        ])
+
+        self.assertEqual(respuesta.status_code, 400)
+        errores = respuesta.json()['errores']
+        self.assertEqual([error['indice'] for error in errores], [1, 2])
+        self.assertIn('precio_total', errores[0]['errores'])
+        self.assertIn('nombre_fallecido', errores[1]['errores'])
 
-# Create your tests here.
+        hoy = date.today().isoformat()
+        respuesta = self.enviar([self.datos('Un día', fecha_inicio_transmision=hoy, fecha_fin_transmision=hoy)])
+        self.assertIn('fecha_fin_transmision', respuesta.json()['errores'][0]['errores'])
+        self.assertFalse(ParteMortorio.objects.exists())
+        self.assertFalse(CuñaPublicitaria.objects.exists())
@@ -0,0 +1,206 @@
+"""
+Clonación de programaciones semanales
+Sistema PubliTrack - Copia de bloques, pausas publicitarias y asignaciones de cuñas
+"""
+
+import logging
+
+from django.db import transaction
+
+from .models import BloqueProgramacion
+
+logger = logging.getLogger(__name__)
+
+
+# Estados de cuña que no se vuelven a programar en la semana destino
+ESTADOS_CUÑA_NO_CLONABLES = ('finalizada', 'cancelada')
+
+
+# ==================== UTILIDADES ====================
+
+def _se_solapa(bloque, bloques_dia):
+    """
+    Devuelve el primer bloque del mismo día que se solapa con `bloque`
+    """
+    for existente in bloques_dia:
+        if bloque.hay_solapamiento(existente):
+            return existente
+    return None
+
+
+def _copiar_bloques(origen, destino, reemplazar, omitidos):
+    """
+    Crea en memoria las copias de los bloques del origen y las inserta con un
+    único bulk_create. Devuelve el mapeo {id bloque origen: bloque nuevo}.
+    """
+    bloques_origen = list(
+        BloqueProgramacion.objects.filter(programacion_semanal=origen)
+        .select_related('programa')
+        .order_by('dia_semana', 'hora_inicio')
+    )
+
+    # Bloques que se conservan en el destino, agrupados por día
+    ocupados = {}
+    if not reemplazar:
+        for bloque in BloqueProgramacion.objects.filter(programacion_semanal=destino).select_related('programa'):
+            ocupados.setdefault(bloque.dia_semana, []).append(bloque)
+
+    nuevos = []
+    for bloque in bloques_origen:
+        conflicto = _se_solapa(bloque, ocupados.get(bloque.dia_semana, []))
+        if conflicto:
+            omitidos.append({
+                'tipo': 'bloque',
+                'referencia': str(bloque),
+                'motivo': f'Se solapa con {conflicto.programa.nombre} ({conflicto.hora_inicio} - {conflicto.hora_fin})',
+            })
+            continue
+
+        copia = BloqueProgramacion(
+            programacion_semanal=destino,
+            programa_id=bloque.programa_id,
+            dia_semana=bloque.dia_semana,
+            hora_inicio=bloque.hora_inicio,
+            duracion_real=bloque.duracion_real,
+            es_repeticion=bloque.es_repeticion,
+            notas=bloque.notas
+        )
+        copia.origen_id = bloque.pk
+        nuevos.append(copia)
+        ocupados.setdefault(bloque.dia_semana, []).append(bloque)
+
+    # PostgreSQL y SQLite devuelven los ids generados, que se usan para remapear
+    BloqueProgramacion.objects.bulk_create(nuevos, batch_size=500)
+    return {copia.origen_id: copia for copia in nuevos}
+
+
+def _copiar_pausas(mapa_bloques):
+    """
+    Copia las pausas publicitarias de los bloques clonados con un único
+    bulk_create. Devuelve el mapeo {id pausa origen: pausa nueva}.
+    """
+    from apps.grilla_publicitaria.models import UbicacionPublicitaria
+
+    nuevas = []
+    for pausa in UbicacionPublicitaria.objects.filter(bloque_programacion_id__in=mapa_bloques).order_by():
+        copia = UbicacionPublicitaria(
+            bloque_programacion=mapa_bloques[pausa.bloque_programacion_id],
+            nombre=pausa.nombre,
+            hora_pausa=pausa.hora_pausa,
+            tipo_pausa=pausa.tipo_pausa,
+            duracion_pausa=pausa.duracion_pausa,
+            capacidad_cuñas=pausa.capacidad_cuñas,
+            activo=pausa.activo
+        )
+        copia.origen_id = pausa.pk
+        nuevas.append(copia)
+
+    UbicacionPublicitaria.objects.bulk_create(nuevas, batch_size=500)
+    return {copia.origen_id: copia for copia in nuevas}
+
+
+def _copiar_asignaciones(mapa_pausas, desplazamiento, usuario, omitidos):
+    """
+    Copia las asignaciones de cuñas desplazando la fecha de emisión. Se omiten
+    las que quedan fuera de la vigencia de la cuña o cuya cuña ya no se emite.
+    """
+    from apps.grilla_publicitaria.models import AsignacionCuña
+
+    asignaciones = AsignacionCuña.objects.filter(
+        ubicacion_id__in=mapa_pausas
+    ).exclude(
+        estado='cancelada'
+    ).values(
+        'ubicacion_id', 'cuña_id', 'cuña__codigo', 'cuña__estado',
+        'cuña__fecha_inicio', 'cuña__fecha_fin',
+        'fecha_emision', 'hora_emision', 'orden_en_ubicacion'
+    ).order_by()
+
+    nuevas = []
+    for asignacion in asignaciones:
+        fecha = asignacion['fecha_emision'] + desplazamiento
+        motivo = None
+        if asignacion['cuña__estado'] in ESTADOS_CUÑA_NO_CLONABLES:
+            motivo = f"La cuña está {asignacion['cuña__estado']}"
+        elif not (asignacion['cuña__fecha_inicio'] <= fecha <= asignacion['cuña__fecha_fin']):
+            motivo = (
+                f"Fuera de la vigencia de la cuña "
+                f"({asignacion['cuña__fecha_inicio']} al {asignacion['cuña__fecha_fin']})"
+            )
+
+        if motivo:
+            omitidos.append({
+                'tipo': 'asignacion',
+                'referencia': asignacion['cuña__codigo'],
+                'fecha': fecha,
+                'motivo': motivo,
+            })
+            continue
+
+        nuevas.append(AsignacionCuña(
+            ubicacion=mapa_pausas[asignacion['ubicacion_id']],
+            cuña_id=asignacion['cuña_id'],
+            fecha_emision=fecha,
+            hora_emision=asignacion['hora_emision'],
+            orden_en_ubicacion=asignacion['orden_en_ubicacion'],
+            estado='programada',
+            creado_por=usuario
+        ))
+
+    AsignacionCuña.objects.bulk_create(nuevas, batch_size=500)
+    return nuevas
+
+
+# ==================== CLONACIÓN ====================
+
+def clonar_programacion_semanal(origen, destino, incluir_pausas=True,
+                                incluir_asignaciones=False, reemplazar=True, usuario=None):
+    """
+    Clona una programación semanal sobre otra en una sola transacción.
+
+    - reemplazar: elimina antes los bloques del destino (y en cascada sus pausas
+      y asignaciones); si es False se conservan y se omiten los bloques del
+      origen que se solapan con ellos.
+    - incluir_pausas: copia las ubicaciones publicitarias de cada bloque.
+    - incluir_asignaciones: copia las asignaciones de cuñas, desplazadas a la
+      semana destino y filtradas por la vigencia de cada cuña (requiere pausas).
+
+    Cada nivel se inserta con un único bulk_create y las relaciones se remapean
+    en memoria, por lo que el número de consultas no depende del tamaño de la
+    semana. Devuelve los totales copiados y la lista de elementos omitidos.
+    """
+    if origen.pk == destino.pk:
+        raise ValueError('No puede copiar la programación a sí misma')
+
+    omitidos = []
+    desplazamiento = destino.fecha_inicio_semana - origen.fecha_inicio_semana
+
+    # La grilla del destino cambia por completo: un solo registro de revisión
+    from apps.grilla_publicitaria.revisiones import cambio_masivo
+
+    with transaction.atomic(), cambio_masivo(destino.pk):
+        if reemplazar:
+            BloqueProgramacion.objects.filter(programacion_semanal=destino).delete()
+
+        mapa_bloques = _copiar_bloques(origen, destino, reemplazar, omitidos)
+
+        mapa_pausas = {}
+        if incluir_pausas and mapa_bloques:
+            mapa_pausas = _copiar_pausas(mapa_bloques)
+
+        asignaciones = []
+        if incluir_asignaciones and mapa_pausas:
+            asignaciones = _copiar_asignaciones(mapa_pausas, desplazamiento, usuario, omitidos)
+
+    logger.info(
+        f"Programación {origen.codigo} clonada en {destino.codigo}: "
+        f"{len(mapa_bloques)} bloques, {len(mapa_pausas)} pausas, "
+        f"{len(asignaciones)} asignaciones, {len(omitidos)} omitidos"
+    )
+
+    return {
+        'bloques': len(mapa_bloques),
+        'pausas': len(mapa_pausas),
+        'asignaciones': len(asignaciones),
+        'omitidos': omitidos,
+    }
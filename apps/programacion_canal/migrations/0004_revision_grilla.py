@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-19 17:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('programacion_canal', '0003_alter_categoriaprograma_color_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='programacionsemanal',
+            name='revision',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Revisión de la Grilla'),
+        ),
+    ]
@@ -136,6 +136,9 @@ class ProgramacionSemanal(models.Model):
     # Estado
     estado = models.CharField(_('Estado'), max_length=15, choices=ESTADO_CHOICES, default='borrador')
     
+    # Revisión de la grilla: aumenta con cada cambio de bloques, pausas o asignaciones
+    revision = models.PositiveIntegerField(_('Revisión de la Grilla'), default=0, editable=False)
+    
     # Metadatos
     created_by = models.ForeignKey(
         User,
@@ -158,6 +161,13 @@ class ProgramacionSemanal(models.Model):
     def save(self, *args, **kwargs):
         if not self.codigo:
             self.codigo = self.generar_codigo()
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            # La revisión solo se incrementa en la base de datos; un guardado
+            # completo con una instancia anterior no debe hacerla retroceder
+            kwargs['update_fields'] = [
+                campo.name for campo in self._meta.concrete_fields
+                if not campo.primary_key and campo.name != 'revision'
+            ]
         super().save(*args, **kwargs)
     
     def generar_codigo(self):
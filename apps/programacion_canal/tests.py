@@ -1,3 +1,135 @@
+"""
+Tests para el módulo de Programación de Canal
+Sistema PubliTrack - Clonación de programaciones semanales
+"""
+
+from datetime import date, time, timedelta
+from decimal import Decimal
 from django.test import TestCase
+from django.contrib.auth import get_user_model
+
+from apps.content_management.models import CuñaPublicitaria
+from apps.grilla_publicitaria.models import UbicacionPublicitaria, AsignacionCuña
+from .clonacion import clonar_programacion_semanal
+from .models import Programa, ProgramacionSemanal, BloqueProgramacion
+
+User = get_user_model()
+
+
+class ClonacionProgramacionTest(TestCase):
+    """Tests del motor de clonación de semanas"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.lunes = date(2026, 3, 2)
+        cls.usuario = User.objects.create_user(
+            username='operador_grilla',
+            email='operador@test.com',
+            password='testpass123',
+            rol='cliente'
+        )
+        cls.programa = Programa.objects.create(
+            nombre='Noticiero',
+            duracion_estandar=timedelta(hours=1)
+        )
+        cls.cuña = CuñaPublicitaria.objects.create(
+            titulo='Cuña vigente',
+            cliente=cls.usuario,
+            duracion_planeada=30,
+            precio_total=Decimal('30.00'),
+            fecha_inicio=cls.lunes,
+            fecha_fin=cls.lunes + timedelta(days=9)
+        )
+
+    def crear_semana(self, lunes, nombre):
+        return ProgramacionSemanal.objects.create(
+            nombre=nombre,
+            codigo=f'PRG{lunes:%y%m%d}',
+            fecha_inicio_semana=lunes,
+            fecha_fin_semana=lunes + timedelta(days=6)
+        )
+
+    def poblar(self, semana, dias=7):
+        """Un bloque por día con una pausa y una asignación"""
+        for dia in range(dias):
+            bloque = BloqueProgramacion.objects.create(
+                programacion_semanal=semana,
+                programa=self.programa,
+                dia_semana=dia,
+                hora_inicio=time(8, 0),
+                duracion_real=timedelta(hours=1)
+            )
+            pausa = UbicacionPublicitaria.objects.create(
+                bloque_programacion=bloque,
+                nombre='Corte 1',
+                hora_pausa=time(8, 30)
+            )
+            AsignacionCuña.objects.create(
+                ubicacion=pausa,
+                cuña=self.cuña,
+                fecha_emision=semana.fecha_inicio_semana + timedelta(days=dia),
+                hora_emision=time(8, 30),
+                estado='transmitida'
+            )
+
+    def test_clona_bloques_pausas_y_asignaciones_vigentes(self):
+        """Test que las asignaciones se desplazan y se omiten las fuera de vigencia"""
+        origen = self.crear_semana(self.lunes, 'Semana 1')
+        destino = self.crear_semana(self.lunes + timedelta(days=7), 'Semana 2')
+        self.poblar(origen)
+
+        resultado = clonar_programacion_semanal(
+            origen, destino, incluir_asignaciones=True, usuario=self.usuario
+        )
+
+        self.assertEqual((resultado['bloques'], resultado['pausas'], resultado['asignaciones']), (7, 7, 3))
+        self.assertEqual(len(resultado['omitidos']), 4)
+        self.assertTrue(all(o['tipo'] == 'asignacion' for o in resultado['omitidos']))
+
+        asignaciones = AsignacionCuña.objects.filter(
+            ubicacion__bloque_programacion__programacion_semanal=destino
+        ).order_by('fecha_emision')
+        self.assertEqual(
+            [a.fecha_emision for a in asignaciones],
+            [destino.fecha_inicio_semana + timedelta(days=dia) for dia in range(3)]
+        )
+        self.assertTrue(all(a.estado == 'programada' and a.creado_por == self.usuario for a in asignaciones))
+        # El origen no se modifica
+        self.assertEqual(AsignacionCuña.objects.filter(
+            ubicacion__bloque_programacion__programacion_semanal=origen
+        ).count(), 7)
+
+    def test_sin_reemplazar_omite_bloques_solapados(self):
+        """Test que sin reemplazar se conservan los bloques del destino"""
+        origen = self.crear_semana(self.lunes, 'Semana 1')
+        destino = self.crear_semana(self.lunes + timedelta(days=7), 'Semana 2')
+        self.poblar(origen, dias=2)
+        BloqueProgramacion.objects.create(
+            programacion_semanal=destino,
+            programa=self.programa,
+            dia_semana=0,
+            hora_inicio=time(8, 30),
+            duracion_real=timedelta(hours=1)
+        )
+
+        resultado = clonar_programacion_semanal(origen, destino, reemplazar=False)
+
+        self.assertEqual(resultado['bloques'], 1)
+        self.assertEqual(resultado['omitidos'][0]['tipo'], 'bloque')
+        self.assertEqual(destino.bloques.count(), 2)
+
+    def test_consultas_constantes(self):
+        """Test que el número de consultas no depende del tamaño de la semana"""
+        pequeña = self.crear_semana(self.lunes - timedelta(days=14), 'Semana A')
+        grande = self.crear_semana(self.lunes - timedelta(days=7), 'Semana B')
+        self.poblar(pequeña, dias=1)
+        self.poblar(grande, dias=7)
+        destino_pequeña = self.crear_semana(self.lunes + timedelta(days=7), 'Semana 2')
+        destino_grande = self.crear_semana(self.lunes, 'Semana 1')
 
-# Create your tests here.
+        # Borrado, lectura e inserción de bloques, pausas y asignaciones, el savepoint
+        # y el registro de la revisión de la grilla destino
+        with self.assertNumQueries(14):
+            clonar_programacion_semanal(pequeña, destino_pequeña, incluir_asignaciones=True)
+        with self.assertNumQueries(14):
+            clonar_programacion_semanal(grande, destino_grande, incluir_asignaciones=True)
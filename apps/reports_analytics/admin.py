@@ -1,6 +1,6 @@
 # apps/reports_analytics/admin.py
 from django.contrib import admin
-from .models import ReporteContratos, DashboardContratos, ReporteVendedores, ReportePartesMortuorios, DashboardPartesMortuorios
+from .models import ReporteContratos, DashboardContratos, ReporteVendedores, ReportePartesMortuorios, DashboardPartesMortuorios, IngresoDiario
 
 @admin.register(ReporteContratos)
 class ReporteContratosAdmin(admin.ModelAdmin):
@@ -30,4 +30,11 @@ class ReportePartesMortuoriosAdmin(admin.ModelAdmin):
 @admin.register(DashboardPartesMortuorios)
 class DashboardPartesMortuoriosAdmin(admin.ModelAdmin):
     list_display = ['fecha_actualizacion', 'total_partes', 'partes_programados', 'ingresos_totales']
-    readonly_fields = ['fecha_actualizacion']
\ No newline at end of file
+    readonly_fields = ['fecha_actualizacion']
+
+@admin.register(IngresoDiario)
+class IngresoDiarioAdmin(admin.ModelAdmin):
+    list_display = ['fecha', 'fuente', 'vendedor', 'categoria', 'cantidad', 'total']
+    list_filter = ['fuente', 'fecha']
+    readonly_fields = ['fecha_actualizacion']
+    date_hierarchy = 'fecha'
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class ReportsAnalyticsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.reports_analytics'
+
+    def ready(self):
+        import apps.reports_analytics.signals
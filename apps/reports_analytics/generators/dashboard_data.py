@@ -0,0 +1,254 @@
+"""
+Generadores de datos para los dashboards de reportes
+Sistema PubliTrack - Estadísticas agregadas compartidas por dashboards, APIs y exportaciones
+"""
+
+import logging
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db.models import Count, F, Q, Sum
+from django.utils import timezone
+
+from apps.content_management.models import ContratoGenerado, CuñaPublicitaria
+
+logger = logging.getLogger(__name__)
+
+
+# ==================== CONFIGURACIÓN DE CACHE ====================
+
+ESTADISTICAS_CONTRATOS_TIMEOUT = 300  # 5 minutos
+ESTADISTICAS_CONTRATOS_VERSION_KEY = 'reports:contratos:version'
+
+
+def _version_estadisticas_contratos():
+    """
+    Obtiene la versión vigente de las estadísticas de contratos en cache
+    """
+    cache.add(ESTADISTICAS_CONTRATOS_VERSION_KEY, 1, timeout=None)
+    return cache.get(ESTADISTICAS_CONTRATOS_VERSION_KEY, 1)
+
+
+def invalidar_estadisticas_contratos():
+    """
+    Invalida todas las estadísticas de contratos cacheadas incrementando su versión
+    """
+    try:
+        cache.incr(ESTADISTICAS_CONTRATOS_VERSION_KEY)
+    except ValueError:
+        cache.set(ESTADISTICAS_CONTRATOS_VERSION_KEY, 2, timeout=None)
+
+
+def _clave_estadisticas_contratos(fecha_referencia, dias_aviso, fecha_inicio, fecha_fin):
+    """
+    Construye la clave de cache para una combinación de fecha de referencia y filtros
+    """
+    return 'reports:contratos:stats:v{}:{}:{}:{}:{}'.format(
+        _version_estadisticas_contratos(),
+        fecha_referencia.isoformat(),
+        dias_aviso,
+        fecha_inicio or '-',
+        fecha_fin or '-',
+    )
+
+
+# ==================== ESTADÍSTICAS DE CONTRATOS ====================
+
+def _expresiones_estadisticas_contratos(fecha_referencia, dias_aviso):
+    """
+    Expresiones de agregación condicional para calcular todo el desglose en una sola consulta
+    """
+    fecha_limite = fecha_referencia + timedelta(days=dias_aviso)
+    validado = Q(estado='validado')
+
+    expresiones = {
+        'total_contratos': Count('id'),
+        'ingresos_totales': Sum('valor_total'),
+        # Solo los validados pueden vencer; la fecha fin se toma de la cuña asociada
+        'contratos_por_vencer': Count('id', filter=validado & Q(
+            cuña__fecha_fin__gte=fecha_referencia,
+            cuña__fecha_fin__lte=fecha_limite,
+        )),
+        'contratos_vencidos': Count('id', filter=validado & Q(cuña__fecha_fin__lt=fecha_referencia)),
+    }
+
+    for estado, _ in ContratoGenerado.ESTADO_CHOICES:
+        expresiones[f'total_{estado}'] = Count('id', filter=Q(estado=estado))
+        expresiones[f'valor_{estado}'] = Sum('valor_total', filter=Q(estado=estado))
+
+    return expresiones
+
+
+def calcular_estadisticas_contratos(fecha_referencia=None, dias_aviso=30,
+                                    fecha_inicio=None, fecha_fin=None, usar_cache=True):
+    """
+    Calcula el desglose completo de contratos (conteos, ingresos y ventanas de
+    vencimiento) en un único aggregate() con Count/Sum filtrados.
+
+    Los resultados se cachean por fecha de referencia y filtros; cualquier cambio
+    en contratos o cuñas invalida el cache (ver reports_analytics.signals).
+    """
+    fecha_referencia = fecha_referencia or timezone.now().date()
+
+    clave = None
+    if usar_cache:
+        clave = _clave_estadisticas_contratos(fecha_referencia, dias_aviso, fecha_inicio, fecha_fin)
+        estadisticas = cache.get(clave)
+        if estadisticas is not None:
+            return estadisticas
+
+    contratos = ContratoGenerado.objects.all()
+    if fecha_inicio:
+        contratos = contratos.filter(fecha_generacion__date__gte=fecha_inicio)
+    if fecha_fin:
+        contratos = contratos.filter(fecha_generacion__date__lte=fecha_fin)
+
+    resultado = contratos.aggregate(
+        **_expresiones_estadisticas_contratos(fecha_referencia, dias_aviso)
+    )
+
+    contratos_por_estado = [
+        {
+            'estado': estado,
+            'estado_display': nombre,
+            'total': resultado[f'total_{estado}'],
+            'valor_total': resultado[f'valor_{estado}'] or Decimal('0.00'),
+        }
+        for estado, nombre in ContratoGenerado.ESTADO_CHOICES
+    ]
+
+    estadisticas = {
+        'fecha_referencia': fecha_referencia,
+        'total_contratos': resultado['total_contratos'],
+        'contratos_activos': resultado['total_validado'],
+        'contratos_pendientes': resultado['total_generado'],
+        'contratos_por_vencer': resultado['contratos_por_vencer'],
+        'contratos_vencidos': resultado['contratos_vencidos'],
+        'contratos_cancelados': resultado['total_cancelado'],
+        'ingresos_totales': resultado['ingresos_totales'] or Decimal('0.00'),
+        'ingresos_activos': resultado['valor_validado'] or Decimal('0.00'),
+        'ingresos_pendientes': resultado['valor_generado'] or Decimal('0.00'),
+        'contratos_por_estado': contratos_por_estado,
+    }
+
+    if clave:
+        cache.set(clave, estadisticas, timeout=ESTADISTICAS_CONTRATOS_TIMEOUT)
+
+    return estadisticas
+
+
+# ==================== DESEMPEÑO DE VENDEDORES ====================
+
+def _inicio_dia(fecha):
+    """
+    Convierte una fecha en el datetime aware de su inicio en la zona horaria local
+    """
+    return timezone.make_aware(datetime.combine(fecha, time.min))
+
+
+def _filtros_rango(campo, fecha_inicio=None, fecha_fin=None):
+    """
+    Filtros inclusivos por fecha sobre un DateTimeField expresados como rango de
+    datetimes (a diferencia de __date, permite usar el índice de la columna)
+    """
+    filtros = {}
+    if fecha_inicio:
+        filtros[f'{campo}__gte'] = _inicio_dia(fecha_inicio)
+    if fecha_fin:
+        filtros[f'{campo}__lt'] = _inicio_dia(fecha_fin + timedelta(days=1))
+    return filtros
+
+
+def calcular_desempeño_vendedores(fecha_inicio=None, fecha_fin=None, vendedores=None):
+    """
+    Calcula las métricas de todos los vendedores con anotaciones agrupadas y
+    devuelve la lista ordenada por ingresos totales (mayor a menor).
+
+    El costo es fijo: vendedores, contratos (dos agrupaciones), cuñas y clientes,
+    sin importar cuántos vendedores existan. Un contrato cuenta para el vendedor
+    asignado al contrato y, si es distinto, también para el vendedor del cliente.
+    """
+    User = get_user_model()
+    if vendedores is None:
+        vendedores = User.objects.filter(rol='vendedor', is_active=True)
+    vendedores = list(vendedores.order_by('first_name', 'last_name'))
+    if not vendedores:
+        return []
+
+    ids = [vendedor.pk for vendedor in vendedores]
+    metricas = {
+        pk: {
+            'total_contratos': 0,
+            'total_cuñas': 0,
+            'ingresos_contratos': Decimal('0.00'),
+            'ingresos_cuñas': Decimal('0.00'),
+            'clientes_asignados': 0,
+        }
+        for pk in ids
+    }
+
+    contratos = ContratoGenerado.objects.filter(
+        **_filtros_rango('fecha_generacion', fecha_inicio, fecha_fin)
+    )
+
+    por_vendedor_contrato = contratos.filter(
+        vendedor_asignado__in=ids
+    ).values('vendedor_asignado').annotate(
+        total=Count('id'), ingresos=Sum('valor_total')
+    ).order_by()
+
+    por_vendedor_cliente = contratos.filter(
+        Q(vendedor_asignado__isnull=True) | ~Q(vendedor_asignado=F('cliente__vendedor_asignado')),
+        cliente__vendedor_asignado__in=ids
+    ).values('cliente__vendedor_asignado').annotate(
+        total=Count('id'), ingresos=Sum('valor_total')
+    ).order_by()
+
+    for fila in por_vendedor_contrato:
+        item = metricas[fila['vendedor_asignado']]
+        item['total_contratos'] += fila['total']
+        item['ingresos_contratos'] += fila['ingresos'] or Decimal('0.00')
+
+    for fila in por_vendedor_cliente:
+        item = metricas[fila['cliente__vendedor_asignado']]
+        item['total_contratos'] += fila['total']
+        item['ingresos_contratos'] += fila['ingresos'] or Decimal('0.00')
+
+    cuñas = CuñaPublicitaria.objects.filter(
+        vendedor_asignado__in=ids,
+        **_filtros_rango('created_at', fecha_inicio, fecha_fin)
+    ).values('vendedor_asignado').annotate(
+        total=Count('id'), ingresos=Sum('precio_total')
+    ).order_by()
+
+    for fila in cuñas:
+        item = metricas[fila['vendedor_asignado']]
+        item['total_cuñas'] = fila['total']
+        item['ingresos_cuñas'] = fila['ingresos'] or Decimal('0.00')
+
+    clientes = User.objects.filter(
+        rol='cliente',
+        is_active=True,
+        vendedor_asignado__in=ids
+    ).values('vendedor_asignado').annotate(total=Count('id')).order_by()
+
+    for fila in clientes:
+        metricas[fila['vendedor_asignado']]['clientes_asignados'] = fila['total']
+
+    estadisticas = []
+    for vendedor in vendedores:
+        item = metricas[vendedor.pk]
+        estadisticas.append({
+            'vendedor': vendedor,
+            **item,
+            'ingresos_totales': item['ingresos_contratos'] + item['ingresos_cuñas'],
+        })
+
+    # sort() es estable: a igualdad de ingresos se mantiene el orden alfabético
+    estadisticas.sort(key=lambda x: x['ingresos_totales'], reverse=True)
+    for posicion, item in enumerate(estadisticas, start=1):
+        item['posicion'] = posicion
+
+    return estadisticas
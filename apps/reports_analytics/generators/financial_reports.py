@@ -0,0 +1,271 @@
+"""
+Generadores de reportes financieros
+Sistema PubliTrack - Acumulado diario de ingresos y series temporales
+"""
+
+import logging
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncDate, TruncDay, TruncMonth, TruncWeek
+
+from apps.content_management.models import ContratoGenerado, CuñaPublicitaria
+from apps.parte_mortorios.models import ParteMortorio
+from ..models import IngresoDiario
+from .dashboard_data import _filtros_rango
+
+logger = logging.getLogger(__name__)
+
+
+# ==================== FUENTES DE INGRESOS ====================
+
+# Cada fuente define de dónde sale la fecha, el valor, el vendedor y la categoría
+FUENTES_INGRESOS = {
+    'contrato': {
+        'modelo': ContratoGenerado,
+        'fecha': 'fecha_generacion',
+        'valor': 'valor_total',
+        'vendedor': 'vendedor_asignado',
+        'categoria': 'cuña__categoria',
+    },
+    'cuña': {
+        'modelo': CuñaPublicitaria,
+        'fecha': 'created_at',
+        'valor': 'precio_total',
+        'vendedor': 'vendedor_asignado',
+        'categoria': 'categoria',
+    },
+    'parte_mortorio': {
+        'modelo': ParteMortorio,
+        'fecha': 'fecha_solicitud',
+        'valor': 'precio_total',
+        'vendedor': 'cliente__vendedor_asignado',
+        'categoria': None,
+    },
+}
+
+GRANULARIDADES = {
+    'dia': TruncDay,
+    'semana': TruncWeek,
+    'mes': TruncMonth,
+}
+
+
+def _claves_fuente(fuente, queryset):
+    """
+    Anota el día local y las referencias de vendedor y categoría de una fuente
+    """
+    config = FUENTES_INGRESOS[fuente]
+    anotaciones = {
+        'dia': TruncDate(config['fecha']),
+        'vendedor_ref': F(config['vendedor']),
+    }
+    if config['categoria']:
+        anotaciones['categoria_ref'] = F(config['categoria'])
+    return queryset.annotate(**anotaciones).values(*anotaciones.keys())
+
+
+def _filas_agrupadas(fuente, **filtros):
+    """
+    Agrupa una fuente por (día, vendedor, categoría) con cantidad y total
+    """
+    config = FUENTES_INGRESOS[fuente]
+    queryset = config['modelo'].objects.filter(**filtros)
+    return _claves_fuente(fuente, queryset).annotate(
+        cantidad=Count('id'),
+        total=Sum(config['valor'])
+    ).order_by()
+
+
+def clave_ingreso(fuente, pk):
+    """
+    Obtiene la clave (fecha, vendedor_id, categoria_id) de un registro fuente,
+    o None si el registro no existe
+    """
+    config = FUENTES_INGRESOS[fuente]
+    fila = _claves_fuente(fuente, config['modelo'].objects.filter(pk=pk)).first()
+    if not fila or not fila['dia']:
+        return None
+    return (fila['dia'], fila['vendedor_ref'], fila.get('categoria_ref'))
+
+
+def claves_ingreso(fuente, pks):
+    """
+    Claves distintas (fecha, vendedor_id, categoria_id) de varios registros
+    fuente en una sola consulta
+    """
+    config = FUENTES_INGRESOS[fuente]
+    filas = _claves_fuente(fuente, config['modelo'].objects.filter(pk__in=pks)).order_by().distinct()
+    return {
+        (fila['dia'], fila['vendedor_ref'], fila.get('categoria_ref'))
+        for fila in filas if fila['dia']
+    }
+
+
+# ==================== MANTENIMIENTO DEL ACUMULADO ====================
+
+def actualizar_ingreso_diario(fuente, fecha, vendedor_id=None, categoria_id=None):
+    """
+    Recalcula un único bucket del acumulado a partir de la fuente. Se consulta
+    solo el rango del día, por lo que el costo no depende del tamaño de la tabla.
+    """
+    config = FUENTES_INGRESOS[fuente]
+    filtros = _filtros_rango(config['fecha'], fecha, fecha)
+    filtros[config['vendedor']] = vendedor_id
+    if config['categoria']:
+        filtros[config['categoria']] = categoria_id
+
+    resultado = config['modelo'].objects.filter(**filtros).aggregate(
+        cantidad=Count('id'),
+        total=Sum(config['valor'])
+    )
+
+    buckets = IngresoDiario.objects.filter(
+        fecha=fecha,
+        fuente=fuente,
+        vendedor_id=vendedor_id,
+        categoria_id=categoria_id
+    )
+
+    if not resultado['cantidad']:
+        buckets.delete()
+        return None
+
+    bucket, _ = buckets.update_or_create(
+        fecha=fecha,
+        fuente=fuente,
+        vendedor_id=vendedor_id,
+        categoria_id=categoria_id,
+        defaults={
+            'cantidad': resultado['cantidad'],
+            'total': resultado['total'] or Decimal('0.00'),
+        }
+    )
+    return bucket
+
+
+def recalcular_ingresos_diarios(fecha_inicio=None, fecha_fin=None, fuentes=None):
+    """
+    Reconstruye el acumulado para un rango de fechas (o completo) en una transacción.
+    Devuelve la cantidad de buckets creados por fuente.
+    """
+    fuentes = fuentes or list(FUENTES_INGRESOS)
+    creados = {}
+
+    with transaction.atomic():
+        for fuente in fuentes:
+            existentes = IngresoDiario.objects.filter(fuente=fuente)
+            if fecha_inicio:
+                existentes = existentes.filter(fecha__gte=fecha_inicio)
+            if fecha_fin:
+                existentes = existentes.filter(fecha__lte=fecha_fin)
+            existentes.delete()
+
+            filas = _filas_agrupadas(
+                fuente,
+                **_filtros_rango(FUENTES_INGRESOS[fuente]['fecha'], fecha_inicio, fecha_fin)
+            )
+            nuevos = IngresoDiario.objects.bulk_create([
+                IngresoDiario(
+                    fecha=fila['dia'],
+                    fuente=fuente,
+                    vendedor_id=fila['vendedor_ref'],
+                    categoria_id=fila.get('categoria_ref'),
+                    cantidad=fila['cantidad'],
+                    total=fila['total'] or Decimal('0.00'),
+                )
+                for fila in filas if fila['dia']
+            ], batch_size=500)
+            creados[fuente] = len(nuevos)
+
+    return creados
+
+
+# ==================== SERIES TEMPORALES ====================
+
+def primer_dia_meses_atras(fecha, meses):
+    """
+    Primer día del mes que abre una ventana de `meses` meses calendario terminando
+    en el mes de `fecha` (evita los saltos de timedelta(days=30 * i))
+    """
+    indice = fecha.year * 12 + fecha.month - 1 - (meses - 1)
+    return date(indice // 12, indice % 12 + 1, 1)
+
+
+def _periodos(fecha_inicio, fecha_fin, granularidad):
+    """
+    Genera el inicio de cada período entre dos fechas según la granularidad
+    """
+    if granularidad == 'mes':
+        actual = fecha_inicio.replace(day=1)
+    elif granularidad == 'semana':
+        actual = fecha_inicio - timedelta(days=fecha_inicio.weekday())
+    else:
+        actual = fecha_inicio
+
+    while actual <= fecha_fin:
+        yield actual
+        if granularidad == 'mes':
+            actual = date(actual.year + actual.month // 12, actual.month % 12 + 1, 1)
+        elif granularidad == 'semana':
+            actual += timedelta(days=7)
+        else:
+            actual += timedelta(days=1)
+
+
+def serie_ingresos(fecha_inicio=None, fecha_fin=None, granularidad='mes',
+                   fuentes=None, vendedor=None, categoria=None):
+    """
+    Serie de ingresos por día, semana o mes leída del acumulado diario con un
+    único escaneo por rango de fechas. Si se indican ambas fechas, los períodos
+    sin ingresos se devuelven con cantidad y total en cero.
+    """
+    if granularidad not in GRANULARIDADES:
+        raise ValueError(f'Granularidad no soportada: {granularidad}')
+
+    ingresos = IngresoDiario.objects.all()
+    if fecha_inicio:
+        ingresos = ingresos.filter(fecha__gte=fecha_inicio)
+    if fecha_fin:
+        ingresos = ingresos.filter(fecha__lte=fecha_fin)
+    if fuentes:
+        ingresos = ingresos.filter(fuente__in=fuentes)
+    if vendedor:
+        ingresos = ingresos.filter(vendedor=vendedor)
+    if categoria:
+        ingresos = ingresos.filter(categoria=categoria)
+
+    filas = ingresos.annotate(
+        periodo=GRANULARIDADES[granularidad]('fecha')
+    ).values('periodo').annotate(
+        cantidad=Sum('cantidad'),
+        total=Sum('total')
+    ).order_by('periodo')
+
+    por_periodo = {
+        fila['periodo']: {
+            'periodo': fila['periodo'],
+            'cantidad': fila['cantidad'] or 0,
+            'total': fila['total'] or Decimal('0.00'),
+        }
+        for fila in filas
+    }
+
+    if not (fecha_inicio and fecha_fin):
+        return list(por_periodo.values())
+
+    return [
+        por_periodo.get(periodo, {'periodo': periodo, 'cantidad': 0, 'total': Decimal('0.00')})
+        for periodo in _periodos(fecha_inicio, fecha_fin, granularidad)
+    ]
+
+
+def serie_ingresos_mensuales(hoy, meses=6, fuentes=None):
+    """
+    Ingresos de los últimos `meses` meses calendario, incluyendo el mes en curso
+    """
+    return serie_ingresos(
+        primer_dia_meses_atras(hoy, meses), hoy, 'mes', fuentes=fuentes
+    )
@@ -0,0 +1,189 @@
+"""
+Generadores de gráficas para los dashboards de reportes
+Sistema PubliTrack - Renderizado de figuras Plotly cacheado por huella de datos
+"""
+
+import hashlib
+import json
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+
+from apps.dependencias import plotly_express, plotly_offline
+
+logger = logging.getLogger(__name__)
+
+
+# ==================== CONFIGURACIÓN ====================
+
+GRAFICAS_TIMEOUT = 60 * 60 * 6  # 6 horas; la clave cambia con los datos
+GRAFICAS_VERSION = 1  # Incrementar al cambiar el estilo de los constructores
+
+CONSTRUCTORES_GRAFICAS = {}
+
+
+def grafica(nombre):
+    """
+    Registra un constructor de figura. El constructor recibe solo datos
+    serializables a JSON, que son los que definen la huella en cache.
+    """
+    def decorador(funcion):
+        CONSTRUCTORES_GRAFICAS[nombre] = funcion
+        return funcion
+    return decorador
+
+
+def huella_grafica(nombre, datos):
+    """
+    Huella SHA-256 del constructor y de sus datos de entrada
+    """
+    contenido = json.dumps(
+        [GRAFICAS_VERSION, nombre, datos],
+        sort_keys=True,
+        default=str,
+        separators=(',', ':')
+    )
+    return hashlib.sha256(contenido.encode('utf-8')).hexdigest()
+
+
+# ==================== CONSTRUCTORES ====================
+
+@grafica('pastel')
+def _figura_pastel(datos):
+    """
+    Gráfico de pastel. Opciones: titulo, etiquetas, valores, colores (dict por
+    etiqueta o lista), altura, detallado, plantilla_hover, leyenda_y, margen
+    """
+    px = plotly_express()
+
+    colores = datos.get('colores')
+    opciones = {}
+    if isinstance(colores, dict):
+        opciones = {'color': datos['etiquetas'], 'color_discrete_map': colores}
+    elif colores:
+        opciones = {'color_discrete_sequence': colores}
+
+    fig = px.pie(
+        values=datos['valores'],
+        names=datos['etiquetas'],
+        title=datos.get('titulo'),
+        **opciones
+    )
+
+    layout = {'height': datos.get('altura', 400)}
+    if datos.get('detallado', True):
+        fig.update_traces(
+            textposition='inside',
+            textinfo='percent+label',
+            hovertemplate=datos.get(
+                'plantilla_hover',
+                '<b>%{label}</b><br>Cantidad: %{value}<br>Porcentaje: %{percent}'
+            )
+        )
+        layout.update(
+            showlegend=True,
+            legend=dict(
+                orientation="h",
+                yanchor="bottom",
+                y=datos.get('leyenda_y', -0.3),
+                xanchor="center",
+                x=0.5
+            )
+        )
+    if datos.get('margen'):
+        layout['margin'] = datos['margen']
+
+    fig.update_layout(**layout)
+    return fig
+
+
+@grafica('barras')
+def _figura_barras(datos):
+    """
+    Gráfico de barras. Opciones: titulo, categorias, valores, horizontal,
+    etiquetas (ejes), escala_color o color, plantilla_hover, moneda
+    """
+    px = plotly_express()
+
+    horizontal = datos.get('horizontal', False)
+    categorias, valores = datos['categorias'], datos['valores']
+    opciones = {}
+    if datos.get('escala_color'):
+        opciones = {'color': valores, 'color_continuous_scale': datos['escala_color']}
+
+    fig = px.bar(
+        x=valores if horizontal else categorias,
+        y=categorias if horizontal else valores,
+        orientation='h' if horizontal else 'v',
+        title=datos.get('titulo'),
+        labels=datos.get('etiquetas'),
+        **opciones
+    )
+
+    if datos.get('plantilla_hover'):
+        fig.update_traces(hovertemplate=datos['plantilla_hover'])
+    if datos.get('color'):
+        fig.update_traces(marker_color=datos['color'])
+
+    fig.update_layout(height=datos.get('altura', 400), showlegend=False, coloraxis_showscale=False)
+
+    if datos.get('moneda'):
+        eje = fig.update_xaxes if horizontal else fig.update_yaxes
+        eje(tickprefix="$", tickformat=",.")
+
+    return fig
+
+
+# ==================== RENDERIZADO ====================
+
+def _html_cliente(nombre, huella, especificacion, altura):
+    """
+    Contenedor que dibuja la figura en el navegador a partir de su especificación
+    JSON, sin generar el div de Plotly en el servidor
+    """
+    div_id = f'grafica-{nombre}-{huella[:12]}'
+    especificacion = especificacion.replace('</', '<\\/')
+    return (
+        f'<div id="{div_id}" class="plotly-graph-div" style="height:{altura}px; width:100%;"></div>'
+        f'<script type="text/javascript">(function(){{'
+        f'var spec = {especificacion};'
+        f'Plotly.newPlot("{div_id}", spec.data, spec.layout, {{responsive: true}});'
+        f'}})();</script>'
+    )
+
+
+def especificacion_grafica(nombre, datos):
+    """
+    Especificación JSON de Plotly (data + layout) cacheada por huella,
+    para endpoints que entregan la figura al navegador
+    """
+    clave = f'reports:grafica:json:{huella_grafica(nombre, datos)}'
+    especificacion = cache.get(clave)
+    if especificacion is None:
+        especificacion = CONSTRUCTORES_GRAFICAS[nombre](datos).to_json()
+        cache.set(clave, especificacion, timeout=GRAFICAS_TIMEOUT)
+    return especificacion
+
+
+def renderizar_grafica(nombre, datos, formato=None):
+    """
+    Devuelve el HTML de una gráfica registrada. Si la huella de los datos ya está
+    en cache no se construye la figura. Formatos:
+      - 'div': div generado por plotly.offline en el servidor (por defecto)
+      - 'cliente': solo la especificación JSON, dibujada con Plotly.newPlot
+    El formato por defecto se configura con REPORTES_GRAFICAS_FORMATO.
+    """
+    formato = formato or getattr(settings, 'REPORTES_GRAFICAS_FORMATO', 'div')
+    huella = huella_grafica(nombre, datos)
+
+    if formato == 'cliente':
+        return _html_cliente(nombre, huella, especificacion_grafica(nombre, datos), datos.get('altura', 400))
+
+    clave = f'reports:grafica:div:{huella}'
+    html = cache.get(clave)
+    if html is None:
+        fig = CONSTRUCTORES_GRAFICAS[nombre](datos)
+        html = plotly_offline().plot(fig, output_type='div', include_plotlyjs=False)
+        cache.set(clave, html, timeout=GRAFICAS_TIMEOUT)
+    return html
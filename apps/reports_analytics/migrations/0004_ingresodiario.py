@@ -0,0 +1,36 @@
+# Generated by Django 5.2.5 on 2026-10-19 16:41
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('content_management', '0012_alter_cuñapublicitaria_cliente'),
+        ('reports_analytics', '0003_dashboardpartesmortuorios_reportepartesmortuorios'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IngresoDiario',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fecha', models.DateField(verbose_name='Fecha')),
+                ('fuente', models.CharField(choices=[('contrato', 'Contrato'), ('cuña', 'Cuña Publicitaria'), ('parte_mortorio', 'Parte Mortorio')], max_length=20, verbose_name='Fuente')),
+                ('cantidad', models.PositiveIntegerField(default=0, verbose_name='Cantidad')),
+                ('total', models.DecimalField(decimal_places=2, default=0, max_digits=15, verbose_name='Total')),
+                ('fecha_actualizacion', models.DateTimeField(auto_now=True, verbose_name='Fecha de Actualización')),
+                ('categoria', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='ingresos_diarios', to='content_management.categoriapublicitaria', verbose_name='Categoría')),
+                ('vendedor', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='ingresos_diarios', to=settings.AUTH_USER_MODEL, verbose_name='Vendedor')),
+            ],
+            options={
+                'verbose_name': 'Ingreso Diario',
+                'verbose_name_plural': 'Ingresos Diarios',
+                'ordering': ['fecha', 'fuente'],
+                'indexes': [models.Index(fields=['fecha', 'fuente'], name='reports_ana_fecha_2d770f_idx'), models.Index(fields=['vendedor', 'fecha'], name='reports_ana_vendedo_e642a4_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,66 @@
+# Generated by Django 5.2.5 on 2026-10-19 18:12
+
+from django.db import migrations, models
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncDate
+
+
+# Copia congelada de FUENTES_INGRESOS (generators/financial_reports.py) al
+# momento de esta migración: (app, modelo, fecha, valor, vendedor, categoría)
+FUENTES = {
+    'contrato': ('content_management', 'ContratoGenerado', 'fecha_generacion', 'valor_total',
+                 'vendedor_asignado', 'cuña__categoria'),
+    'cuña': ('content_management', 'CuñaPublicitaria', 'created_at', 'precio_total',
+             'vendedor_asignado', 'categoria'),
+    'parte_mortorio': ('parte_mortorios', 'ParteMortorio', 'fecha_solicitud', 'precio_total',
+                       'cliente__vendedor_asignado', None),
+}
+
+
+def reconstruir_ingresos(apps, schema_editor):
+    """
+    Reconstruye el acumulado diario desde las fuentes. Elimina los buckets
+    duplicados previos a la restricción y evita que los dashboards queden en
+    cero hasta ejecutar recalcular_ingresos.
+    """
+    IngresoDiario = apps.get_model('reports_analytics', 'IngresoDiario')
+    IngresoDiario.objects.all().delete()
+
+    for fuente, (app, modelo, fecha, valor, vendedor, categoria) in FUENTES.items():
+        anotaciones = {'dia': TruncDate(fecha), 'vendedor_ref': F(vendedor)}
+        if categoria:
+            anotaciones['categoria_ref'] = F(categoria)
+
+        filas = apps.get_model(app, modelo).objects.annotate(**anotaciones).values(
+            *anotaciones.keys()
+        ).annotate(cantidad=Count('id'), total=Sum(valor)).order_by()
+
+        IngresoDiario.objects.bulk_create([
+            IngresoDiario(
+                fecha=fila['dia'],
+                fuente=fuente,
+                vendedor_id=fila['vendedor_ref'],
+                categoria_id=fila.get('categoria_ref'),
+                cantidad=fila['cantidad'],
+                total=fila['total'] or 0,
+            )
+            for fila in filas if fila['dia']
+        ], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports_analytics', '0004_ingresodiario'),
+        ('content_management', '0017_huella_verificacion'),
+        ('parte_mortorios', '0008_indices_consultas_frecuentes'),
+        ('authentication', '0009_indices_busqueda_trigramas'),
+    ]
+
+    operations = [
+        migrations.RunPython(reconstruir_ingresos, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='ingresodiario',
+            constraint=models.UniqueConstraint(fields=('fecha', 'fuente', 'vendedor', 'categoria'), name='ingreso_diario_bucket_unico', nulls_distinct=False),
+        ),
+    ]
@@ -2,7 +2,7 @@
 from django.db import models
 from django.utils import timezone
 from django.contrib.auth import get_user_model
-from apps.content_management.models import ContratoGenerado, CuñaPublicitaria
+from apps.content_management.models import ContratoGenerado, CuñaPublicitaria, CategoriaPublicitaria
 from apps.authentication.models import CustomUser
 
 User = get_user_model()
@@ -115,4 +115,58 @@ class DashboardPartesMortuorios(models.Model):
         verbose_name_plural = 'Dashboards Partes Mortuorios'
     
     def __str__(self):
-        return f"Dashboard Partes Mortuorios - {self.fecha_actualizacion.strftime('%d/%m/%Y %H:%M')}"
\ No newline at end of file
+        return f"Dashboard Partes Mortuorios - {self.fecha_actualizacion.strftime('%d/%m/%Y %H:%M')}"
+
+class IngresoDiario(models.Model):
+    """
+    Acumulado diario de ingresos por (fecha, fuente, vendedor, categoría).
+    Se mantiene incrementalmente desde las señales de contratos, cuñas y partes
+    mortuorios; ver generators/financial_reports.py y el comando recalcular_ingresos.
+    """
+
+    FUENTE_CHOICES = [
+        ('contrato', 'Contrato'),
+        ('cuña', 'Cuña Publicitaria'),
+        ('parte_mortorio', 'Parte Mortorio'),
+    ]
+
+    fecha = models.DateField('Fecha')
+    fuente = models.CharField('Fuente', max_length=20, choices=FUENTE_CHOICES)
+    vendedor = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='ingresos_diarios',
+        verbose_name='Vendedor'
+    )
+    categoria = models.ForeignKey(
+        CategoriaPublicitaria,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='ingresos_diarios',
+        verbose_name='Categoría'
+    )
+    cantidad = models.PositiveIntegerField('Cantidad', default=0)
+    total = models.DecimalField('Total', max_digits=15, decimal_places=2, default=0)
+    fecha_actualizacion = models.DateTimeField('Fecha de Actualización', auto_now=True)
+
+    class Meta:
+        verbose_name = 'Ingreso Diario'
+        verbose_name_plural = 'Ingresos Diarios'
+        ordering = ['fecha', 'fuente']
+        indexes = [
+            models.Index(fields=['fecha', 'fuente']),
+            models.Index(fields=['vendedor', 'fecha']),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['fecha', 'fuente', 'vendedor', 'categoria'],
+                nulls_distinct=False,
+                name='ingreso_diario_bucket_unico'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.fecha} - {self.get_fuente_display()}: {self.total}"
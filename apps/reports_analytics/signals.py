@@ -0,0 +1,81 @@
+"""
+Señales del módulo de Reportes y Analítica
+Sistema PubliTrack - Invalidación de estadísticas cacheadas y acumulado de ingresos
+"""
+
+import logging
+
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete, pre_save, pre_delete
+from django.dispatch import receiver
+
+from apps.content_management.models import ContratoGenerado, CuñaPublicitaria
+from apps.parte_mortorios.models import ParteMortorio
+from .generators.dashboard_data import invalidar_estadisticas_contratos
+from .generators.financial_reports import actualizar_ingreso_diario, clave_ingreso
+
+logger = logging.getLogger(__name__)
+
+FUENTE_POR_MODELO = {
+    ContratoGenerado: 'contrato',
+    CuñaPublicitaria: 'cuña',
+    ParteMortorio: 'parte_mortorio',
+}
+
+
+@receiver(post_save, sender=ContratoGenerado)
+@receiver(post_delete, sender=ContratoGenerado)
+@receiver(post_save, sender=CuñaPublicitaria)
+@receiver(post_delete, sender=CuñaPublicitaria)
+def invalidar_estadisticas_por_cambio(sender, **kwargs):
+    """
+    Invalida las estadísticas de contratos cuando cambia un contrato o su cuña
+    (la fecha fin de la cuña define las ventanas de vencimiento)
+    """
+    invalidar_estadisticas_contratos()
+
+
+# ==================== ACUMULADO DIARIO DE INGRESOS ====================
+
+@receiver(pre_save, sender=ContratoGenerado)
+@receiver(pre_save, sender=CuñaPublicitaria)
+@receiver(pre_save, sender=ParteMortorio)
+@receiver(pre_delete, sender=ContratoGenerado)
+@receiver(pre_delete, sender=CuñaPublicitaria)
+@receiver(pre_delete, sender=ParteMortorio)
+def guardar_clave_ingreso_anterior(sender, instance, **kwargs):
+    """
+    Guarda el bucket al que pertenecía el registro antes del cambio, para poder
+    recalcularlo si cambia la fecha, el vendedor o la categoría
+    """
+    instance._clave_ingreso_anterior = None
+    if instance.pk:
+        try:
+            instance._clave_ingreso_anterior = clave_ingreso(FUENTE_POR_MODELO[sender], instance.pk)
+        except Exception as e:
+            logger.error(f"Error obteniendo clave de ingreso de {sender.__name__} {instance.pk}: {e}")
+
+
+@receiver(post_save, sender=ContratoGenerado)
+@receiver(post_save, sender=CuñaPublicitaria)
+@receiver(post_save, sender=ParteMortorio)
+@receiver(post_delete, sender=ContratoGenerado)
+@receiver(post_delete, sender=CuñaPublicitaria)
+@receiver(post_delete, sender=ParteMortorio)
+def actualizar_ingresos_por_cambio(sender, instance, **kwargs):
+    """
+    Recalcula los buckets afectados del acumulado diario. Los cambios hechos con
+    queryset.update() no emiten señales; el comando recalcular_ingresos los reconcilia.
+    """
+    fuente = FUENTE_POR_MODELO[sender]
+    try:
+        with transaction.atomic():
+            claves = {getattr(instance, '_clave_ingreso_anterior', None)}
+            if kwargs.get('signal') is post_save:
+                claves.add(clave_ingreso(fuente, instance.pk))
+            claves.discard(None)
+
+            for clave in claves:
+                actualizar_ingreso_diario(fuente, *clave)
+    except Exception as e:
+        logger.error(f"Error actualizando ingresos diarios de {sender.__name__} {instance.pk}: {e}")
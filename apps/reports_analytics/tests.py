@@ -1,3 +1,269 @@
+"""
+Tests para el módulo de Reportes y Analítica
+Sistema PubliTrack - Pruebas de los generadores de estadísticas
+"""
+
+from decimal import Decimal
+from importlib import import_module
+from io import StringIO
+from datetime import date, datetime, time, timedelta
+from unittest import mock
+from django.apps import apps
 from django.test import TestCase
+from django.core.cache import cache
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.utils import timezone
+
+from apps.content_management.models import CuñaPublicitaria, ContratoGenerado
+from .generators.dashboard_data import calcular_estadisticas_contratos, calcular_desempeño_vendedores
+from .generators.financial_reports import primer_dia_meses_atras, serie_ingresos
+from .generators import graficas
+from .models import IngresoDiario
+
+User = get_user_model()
+
+
+class BaseReportesTestCase(TestCase):
+    """Clase base con un cliente, un vendedor y cuñas de distintas vigencias"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.hoy = date.today()
+        cls.vendedor = User.objects.create_user(
+            username='vendedor_reportes',
+            email='vendedor_reportes@test.com',
+            password='testpass123',
+            rol='vendedor'
+        )
+        cls.cliente = User.objects.create_user(
+            username='cliente_reportes',
+            email='cliente_reportes@test.com',
+            password='testpass123',
+            rol='cliente',
+            empresa='Empresa Reportes',
+            vendedor_asignado=cls.vendedor
+        )
+
+    def crear_cuña(self, fecha_fin, precio=Decimal('100.00')):
+        return CuñaPublicitaria.objects.create(
+            titulo='Cuña reporte',
+            cliente=self.cliente,
+            vendedor_asignado=self.vendedor,
+            duracion_planeada=30,
+            precio_total=precio,
+            fecha_inicio=fecha_fin - timedelta(days=60),
+            fecha_fin=fecha_fin
+        )
+
+    def crear_contrato(self, estado, valor, cuña=None):
+        return ContratoGenerado.objects.create(
+            cliente=self.cliente,
+            cuña=cuña,
+            nombre_cliente='Empresa Reportes',
+            ruc_dni_cliente='0999999999001',
+            valor_sin_iva=valor,
+            valor_total=valor,
+            estado=estado
+        )
+
+
+class EstadisticasContratosTest(BaseReportesTestCase):
+    """Tests del servicio de estadísticas de contratos"""
+
+    def setUp(self):
+        cache.clear()
+        self.crear_contrato('validado', Decimal('100.00'), self.crear_cuña(self.hoy + timedelta(days=10)))
+        self.crear_contrato('validado', Decimal('200.00'), self.crear_cuña(self.hoy - timedelta(days=5)))
+        self.crear_contrato('validado', Decimal('300.00'), self.crear_cuña(self.hoy + timedelta(days=90)))
+        self.crear_contrato('generado', Decimal('50.00'))
+        self.crear_contrato('cancelado', Decimal('25.00'))
+
+    def test_desglose_completo(self):
+        """Test conteos, ingresos y ventanas de vencimiento"""
+        stats = calcular_estadisticas_contratos(self.hoy, usar_cache=False)
+
+        self.assertEqual(stats['total_contratos'], 5)
+        self.assertEqual(stats['contratos_activos'], 3)
+        self.assertEqual(stats['contratos_pendientes'], 1)
+        self.assertEqual(stats['contratos_cancelados'], 1)
+        self.assertEqual(stats['contratos_por_vencer'], 1)
+        self.assertEqual(stats['contratos_vencidos'], 1)
+        self.assertEqual(stats['ingresos_totales'], Decimal('675.00'))
+        self.assertEqual(stats['ingresos_activos'], Decimal('600.00'))
+        self.assertEqual(stats['ingresos_pendientes'], Decimal('50.00'))
+
+        por_estado = {item['estado']: item for item in stats['contratos_por_estado']}
+        self.assertEqual(por_estado['validado']['total'], 3)
+        self.assertEqual(por_estado['borrador']['valor_total'], Decimal('0.00'))
+
+    def test_una_sola_consulta(self):
+        """Test que todo el desglose se obtiene con un único aggregate"""
+        with self.assertNumQueries(1):
+            calcular_estadisticas_contratos(self.hoy, usar_cache=False)
+
+    def test_cache_por_fecha_e_invalidacion(self):
+        """Test que el resultado se cachea por fecha y se invalida al guardar un contrato"""
+        calcular_estadisticas_contratos(self.hoy)
+        with self.assertNumQueries(0):
+            stats = calcular_estadisticas_contratos(self.hoy)
+        self.assertEqual(stats['total_contratos'], 5)
+
+        self.crear_contrato('generado', Decimal('10.00'))
+        stats = calcular_estadisticas_contratos(self.hoy)
+        self.assertEqual(stats['total_contratos'], 6)
+
+
+class DesempeñoVendedoresTest(BaseReportesTestCase):
+    """Tests del motor de desempeño de vendedores"""
+
+    def setUp(self):
+        self.otro_vendedor = User.objects.create_user(
+            username='otro_vendedor',
+            email='otro_vendedor@test.com',
+            password='testpass123',
+            rol='vendedor',
+            first_name='Zoila'
+        )
+        self.crear_contrato('validado', Decimal('100.00'))
+        self.crear_cuña(self.hoy + timedelta(days=30), precio=Decimal('40.00'))
+
+        # Contrato asignado a otro vendedor: cuenta para ambos (vendedor del contrato y del cliente)
+        contrato = self.crear_contrato('generado', Decimal('60.00'))
+        ContratoGenerado.objects.filter(pk=contrato.pk).update(vendedor_asignado=self.otro_vendedor)
+
+    def test_metricas_y_ranking(self):
+        """Test métricas por vendedor y orden por ingresos totales"""
+        ranking = calcular_desempeño_vendedores(self.hoy - timedelta(days=1), self.hoy)
+
+        self.assertEqual([item['vendedor'] for item in ranking], [self.vendedor, self.otro_vendedor])
+        primero, segundo = ranking
+        self.assertEqual(primero['posicion'], 1)
+        self.assertEqual(primero['total_contratos'], 2)
+        self.assertEqual(primero['ingresos_contratos'], Decimal('160.00'))
+        self.assertEqual(primero['total_cuñas'], 1)
+        self.assertEqual(primero['ingresos_totales'], Decimal('200.00'))
+        self.assertEqual(primero['clientes_asignados'], 1)
+        self.assertEqual(segundo['total_contratos'], 1)
+        self.assertEqual(segundo['ingresos_totales'], Decimal('60.00'))
+
+    def test_rango_de_fechas(self):
+        """Test que el rango de fechas excluye registros fuera del período"""
+        ranking = calcular_desempeño_vendedores(self.hoy + timedelta(days=1), self.hoy + timedelta(days=2))
+        self.assertTrue(all(item['ingresos_totales'] == 0 for item in ranking))
+
+    def test_consultas_constantes(self):
+        """Test que el número de consultas no depende de la cantidad de vendedores"""
+        for i in range(5):
+            User.objects.create_user(
+                username=f'vendedor_extra_{i}',
+                email=f'vendedor_extra_{i}@test.com',
+                password='testpass123',
+                rol='vendedor'
+            )
+        with self.assertNumQueries(5):
+            calcular_desempeño_vendedores()
+
+
+class IngresosDiariosTest(BaseReportesTestCase):
+    """Tests del acumulado diario de ingresos y sus series"""
+
+    def mover_a(self, contrato, fecha):
+        contrato.fecha_generacion = timezone.make_aware(datetime.combine(fecha, time(12, 0)))
+        contrato.save()
+
+    def test_mantenimiento_incremental(self):
+        """Test que crear, mover y eliminar contratos mantiene los buckets"""
+        contrato = self.crear_contrato('validado', Decimal('100.00'))
+        self.crear_contrato('generado', Decimal('50.00'))
+
+        bucket = IngresoDiario.objects.get(fuente='contrato', fecha=timezone.localdate())
+        self.assertEqual(bucket.cantidad, 2)
+        self.assertEqual(bucket.total, Decimal('150.00'))
+
+        ayer = timezone.localdate() - timedelta(days=1)
+        self.mover_a(contrato, ayer)
+        self.assertEqual(IngresoDiario.objects.get(fuente='contrato', fecha=ayer).total, Decimal('100.00'))
+        self.assertEqual(
+            IngresoDiario.objects.get(fuente='contrato', fecha=timezone.localdate()).total,
+            Decimal('50.00')
+        )
+
+        contrato.delete()
+        self.assertFalse(IngresoDiario.objects.filter(fuente='contrato', fecha=ayer).exists())
+
+    def test_recalculo_coincide_con_incremental(self):
+        """Test que el comando de backfill reconstruye los mismos buckets"""
+        self.crear_contrato('validado', Decimal('100.00'))
+        self.crear_cuña(self.hoy + timedelta(days=30), precio=Decimal('40.00'))
+        incremental = list(IngresoDiario.objects.values_list('fecha', 'fuente', 'vendedor', 'cantidad', 'total'))
+
+        IngresoDiario.objects.all().delete()
+        call_command('recalcular_ingresos', stdout=StringIO())
+
+        recalculado = list(IngresoDiario.objects.values_list('fecha', 'fuente', 'vendedor', 'cantidad', 'total'))
+        self.assertCountEqual(incremental, recalculado)
+
+    def test_migracion_reconstruye_acumulado(self):
+        """Test que la migración de la restricción única deja el acumulado poblado"""
+        self.crear_contrato('validado', Decimal('100.00'))
+        self.crear_cuña(self.hoy + timedelta(days=30), precio=Decimal('40.00'))
+        incremental = list(IngresoDiario.objects.values_list('fecha', 'fuente', 'vendedor', 'cantidad', 'total'))
+
+        IngresoDiario.objects.all().delete()
+        migracion = import_module('apps.reports_analytics.migrations.0005_ingresodiario_bucket_unico')
+        migracion.reconstruir_ingresos(apps, None)
+
+        recalculado = list(IngresoDiario.objects.values_list('fecha', 'fuente', 'vendedor', 'cantidad', 'total'))
+        self.assertCountEqual(incremental, recalculado)
+
+    def test_serie_mensual_por_mes_calendario(self):
+        """Test que la serie usa meses calendario, rellena vacíos y usa una consulta"""
+        hoy = date(2026, 3, 31)
+        self.mover_a(self.crear_contrato('validado', Decimal('10.00')), date(2026, 1, 31))
+        self.mover_a(self.crear_contrato('validado', Decimal('20.00')), date(2026, 3, 1))
+
+        self.assertEqual(primer_dia_meses_atras(hoy, 6), date(2025, 10, 1))
+        with self.assertNumQueries(1):
+            serie = serie_ingresos(primer_dia_meses_atras(hoy, 3), hoy, 'mes', fuentes=['contrato'])
+
+        self.assertEqual([item['periodo'] for item in serie], [date(2026, 1, 1), date(2026, 2, 1), date(2026, 3, 1)])
+        self.assertEqual([item['total'] for item in serie], [Decimal('10.00'), Decimal('0.00'), Decimal('20.00')])
+
+        semanal = serie_ingresos(date(2026, 2, 23), date(2026, 3, 8), 'semana', fuentes=['contrato'])
+        self.assertEqual([item['periodo'] for item in semanal], [date(2026, 2, 23), date(2026, 3, 2)])
+
+
+class GraficasCacheadasTest(TestCase):
+    """Tests del renderizado de gráficas cacheado por huella de datos"""
+
+    datos = {
+        'titulo': 'Ingresos Mensuales',
+        'categorias': ['Ene 2026', 'Feb 2026'],
+        'valores': [10.0, 20.0],
+    }
+
+    def setUp(self):
+        cache.clear()
+
+    def test_no_reconstruye_con_los_mismos_datos(self):
+        """Test que la figura se construye una sola vez por huella"""
+        constructor = mock.Mock(wraps=graficas.CONSTRUCTORES_GRAFICAS['barras'])
+        with mock.patch.dict(graficas.CONSTRUCTORES_GRAFICAS, {'barras': constructor}):
+            primera = graficas.renderizar_grafica('barras', self.datos, formato='div')
+            segunda = graficas.renderizar_grafica('barras', dict(self.datos), formato='div')
+            graficas.renderizar_grafica('barras', {**self.datos, 'valores': [10.0, 25.0]}, formato='div')
+
+        self.assertEqual(primera, segunda)
+        self.assertIn('plotly-graph-div', primera)
+        self.assertEqual(constructor.call_count, 2)
 
-# Create your tests here.
+    def test_formato_cliente_entrega_especificacion(self):
+        """Test que el formato cliente incluye la especificación JSON y no el div de Plotly"""
+        html = graficas.renderizar_grafica('barras', self.datos, formato='cliente')
+        self.assertIn('Plotly.newPlot', html)
+        self.assertIn('Feb 2026', html)
+        self.assertEqual(
+            graficas.huella_grafica('barras', self.datos),
+            graficas.huella_grafica('barras', dict(reversed(list(self.datos.items()))))
+        )
@@ -1,3 +1,19 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import DocumentoRenderizado, SecuenciaDocumento
+
+
+@admin.register(SecuenciaDocumento)
+class SecuenciaDocumentoAdmin(admin.ModelAdmin):
+    list_display = ['prefijo', 'periodo', 'ultimo_valor', 'actualizado']
+    list_filter = ['prefijo']
+    search_fields = ['prefijo', 'periodo']
+    readonly_fields = ['actualizado']
+
+
+@admin.register(DocumentoRenderizado)
+class DocumentoRenderizadoAdmin(admin.ModelAdmin):
+    list_display = ['tipo', 'huella', 'archivo', 'tamaño_bytes', 'usos', 'ultimo_uso']
+    list_filter = ['tipo']
+    search_fields = ['huella', 'hash_contenido', 'archivo']
+    readonly_fields = ['fecha_creacion', 'ultimo_uso']
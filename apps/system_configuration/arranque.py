@@ -0,0 +1,123 @@
+"""
+Benchmark de arranque
+Sistema PubliTrack - Mide en procesos nuevos (como un worker de gunicorn o un
+management command) el tiempo de importación con `python -X importtime`, la
+memoria residual máxima (RSS) y qué dependencias pesadas quedan cargadas
+tras django.setup() y cada escenario (cargar el URLconf, importar las vistas
+del panel, usar las dependencias diferidas).
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from django.conf import settings
+
+DEPENDENCIAS_PESADAS = ('plotly', 'pandas', 'docxtpl', 'xlwt', 'numpy')
+
+# Código que ejecuta cada escenario después de django.setup()
+ESCENARIOS_ARRANQUE = {
+    'setup': '',
+    'urlconf': (
+        "from django.urls import get_resolver, reverse\n"
+        "get_resolver().url_patterns\n"
+        "reverse('custom_admin:dashboard')\n"
+    ),
+    'custom_admin_views': 'import apps.custom_admin.views\n',
+    'vistas_reportes': 'import apps.custom_admin.vistas.reportes\n',
+    'vistas_inventario': 'import apps.custom_admin.vistas.inventario\n',
+    'graficas': 'from apps.dependencias import plotly_express\nplotly_express()\n',
+}
+
+_PROGRAMA = """
+import json, resource, sys, time
+inicio = time.perf_counter()
+import django
+django.setup()
+setup = time.perf_counter()
+{codigo}
+fin = time.perf_counter()
+print(json.dumps({{
+    'segundos_setup': setup - inicio,
+    'segundos_escenario': fin - setup,
+    'rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    'modulos': len(sys.modules),
+    'cargadas': [nombre for nombre in {pesadas!r} if nombre in sys.modules],
+}}))
+"""
+
+
+def _entorno():
+    entorno = dict(os.environ)
+    entorno.setdefault('DJANGO_SETTINGS_MODULE', 'publictrack.settings')
+    rutas = [str(settings.BASE_DIR)] + [ruta for ruta in entorno.get('PYTHONPATH', '').split(os.pathsep) if ruta]
+    entorno['PYTHONPATH'] = os.pathsep.join(rutas)
+    return entorno
+
+
+def parsear_importtime(texto):
+    """
+    Líneas de `-X importtime` como dicts (modulo, propio_us, acumulado_us)
+    """
+    modulos = []
+    for linea in texto.splitlines():
+        if not linea.startswith('import time:') or 'self [us]' in linea:
+            continue
+        try:
+            propio, acumulado, modulo = linea[len('import time:'):].split('|')
+            modulos.append({
+                'modulo': modulo.strip(),
+                'propio_us': int(propio),
+                'acumulado_us': int(acumulado),
+            })
+        except ValueError:
+            continue
+    return modulos
+
+
+def ejecutar_arranque(nombre):
+    """
+    Ejecuta un escenario en un intérprete nuevo. Devuelve las mediciones del
+    proceso hijo más el desglose de importtime.
+    """
+    programa = _PROGRAMA.format(codigo=ESCENARIOS_ARRANQUE[nombre], pesadas=DEPENDENCIAS_PESADAS)
+    proceso = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', programa],
+        capture_output=True, text=True, env=_entorno(), cwd=str(settings.BASE_DIR), timeout=300
+    )
+    lineas = [linea for linea in proceso.stdout.splitlines() if linea.startswith('{')]
+    if proceso.returncode != 0 or not lineas:
+        error = proceso.stderr.strip().splitlines()[-1:] or ['sin salida']
+        raise RuntimeError(f"Escenario {nombre} falló: {error[0]}")
+
+    resultado = json.loads(lineas[-1])
+    importaciones = parsear_importtime(proceso.stderr)
+    resultado['importacion_total_us'] = sum(modulo['propio_us'] for modulo in importaciones)
+    resultado['importaciones'] = importaciones
+    return resultado
+
+
+def medir_arranque(escenarios=None, repeticiones=3, top=10):
+    """
+    Mide cada escenario `repeticiones` veces y devuelve la mediana de tiempos
+    y RSS, las dependencias pesadas cargadas y los módulos más costosos
+    """
+    informe = {}
+    for nombre in escenarios or ESCENARIOS_ARRANQUE:
+        corridas = [ejecutar_arranque(nombre) for _ in range(repeticiones)]
+        ultima = corridas[-1]
+        informe[nombre] = {
+            'segundos_setup': round(statistics.median(c['segundos_setup'] for c in corridas), 4),
+            'segundos_escenario': round(statistics.median(c['segundos_escenario'] for c in corridas), 4),
+            'importacion_ms': round(statistics.median(c['importacion_total_us'] for c in corridas) / 1000, 1),
+            'rss_mb': round(statistics.median(c['rss_kb'] for c in corridas) / 1024, 1),
+            'modulos': ultima['modulos'],
+            'cargadas': ultima['cargadas'],
+            'mas_costosos': [
+                {'modulo': m['modulo'], 'acumulado_ms': round(m['acumulado_us'] / 1000, 1)}
+                for m in sorted(ultima['importaciones'], key=lambda m: m['acumulado_us'], reverse=True)[:top]
+            ],
+        }
+    return informe
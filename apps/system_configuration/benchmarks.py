@@ -0,0 +1,271 @@
+"""
+Benchmarks de rutas críticas
+Sistema PubliTrack - Ejecuta escenarios repetibles (listados, reportes,
+grilla, semáforos, transmisiones y PDF), mide latencia y consultas por
+iteración y guarda percentiles en JSON para comparar entre commits.
+"""
+
+import json
+import subprocess
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.custom_admin.instrumentacion import medir
+
+ESCENARIOS = {}
+
+
+class EscenarioNoDisponible(Exception):
+    """El escenario no puede ejecutarse en este entorno (datos o dependencias)"""
+
+
+def escenario(nombre, mutante=False):
+    """
+    Registra un escenario. La función recibe el contexto y devuelve la
+    operación a medir (sin argumentos). Las iteraciones de los escenarios
+    mutantes se revierten para que todas partan del mismo estado.
+    """
+    def registrar(preparar):
+        ESCENARIOS[nombre] = {'preparar': preparar, 'mutante': mutante}
+        return preparar
+    return registrar
+
+
+class Contexto:
+    """Cliente autenticado como administrador y datos de la estación"""
+
+    def __init__(self):
+        from django.contrib.auth import get_user_model
+
+        User = get_user_model()
+        self.admin, _ = User.objects.get_or_create(
+            username='bench_admin',
+            defaults={'email': 'bench_admin@bench.local', 'rol': 'admin', 'is_staff': True}
+        )
+        hosts = [host for host in settings.ALLOWED_HOSTS if host != '*' and not host.startswith('.')]
+        self.cliente = Client(raise_request_exception=False, HTTP_HOST=hosts[0] if hosts else 'testserver')
+        self.cliente.force_login(self.admin)
+
+    def get(self, nombre_url, **parametros):
+        url = reverse(nombre_url)
+
+        def operacion():
+            respuesta = self.cliente.get(url, parametros)
+            if respuesta.status_code >= 400:
+                raise RuntimeError(f"{nombre_url} respondió {respuesta.status_code}")
+        return operacion
+
+
+# ==================== ESCENARIOS ====================
+
+@escenario('cunas_list')
+def _cunas_list(contexto):
+    return contexto.get('custom_admin:cunas_list')
+
+
+@escenario('cunas_list_busqueda')
+def _cunas_list_busqueda(contexto):
+    return contexto.get('custom_admin:cunas_list', q='CPB0001')
+
+
+@escenario('reportes_dashboard')
+def _reportes_dashboard(contexto):
+    return contexto.get('custom_admin:reportes_dashboard')
+
+
+@escenario('reportes_contratos')
+def _reportes_contratos(contexto):
+    return contexto.get('custom_admin:reports_dashboard_contratos')
+
+
+@escenario('reportes_vendedores')
+def _reportes_vendedores(contexto):
+    return contexto.get('custom_admin:reports_dashboard_vendedores')
+
+
+@escenario('reportes_partes')
+def _reportes_partes(contexto):
+    return contexto.get('custom_admin:reports_dashboard_partes_mortuorios')
+
+
+@escenario('grilla_publicitaria_list')
+def _grilla_publicitaria_list(contexto):
+    from apps.programacion_canal.models import ProgramacionSemanal
+
+    programacion = ProgramacionSemanal.objects.order_by('-fecha_inicio_semana').first()
+    if programacion is None:
+        raise EscenarioNoDisponible('No hay programaciones semanales')
+    return contexto.get('custom_admin:grilla_publicitaria_list', programacion_id=programacion.pk)
+
+
+@escenario('grilla_en_vivo')
+def _grilla_en_vivo(contexto):
+    return contexto.get('custom_admin:grilla_publicitaria_en_vivo')
+
+
+@escenario('semaforos_recalculo', mutante=True)
+def _semaforos_recalculo(contexto):
+    from apps.traffic_light_system.utils.status_calculator import recalcular_estados_masivo
+    return recalcular_estados_masivo
+
+
+@escenario('transmisiones_programadas', mutante=True)
+def _transmisiones_programadas(contexto):
+    try:
+        from apps.transmission_control.tasks import procesar_transmisiones_programadas
+    except ImportError as e:
+        raise EscenarioNoDisponible(f'Tareas no disponibles: {e}')
+    return procesar_transmisiones_programadas.run
+
+
+@escenario('contrato_pdf', mutante=True)
+def _contrato_pdf(contexto):
+    from apps.content_management.models import ContratoGenerado
+
+    contrato = ContratoGenerado.objects.filter(
+        plantilla_usada__archivo_plantilla__gt=''
+    ).select_related('plantilla_usada', 'cliente').first()
+    if contrato is None:
+        raise EscenarioNoDisponible('No hay contratos con plantilla para generar el PDF')
+    return contrato.generar_contrato
+
+
+# ==================== EJECUCIÓN ====================
+
+def _percentil(valores, fraccion):
+    ordenados = sorted(valores)
+    posicion = (len(ordenados) - 1) * fraccion
+    inferior = int(posicion)
+    superior = min(inferior + 1, len(ordenados) - 1)
+    return ordenados[inferior] + (ordenados[superior] - ordenados[inferior]) * (posicion - inferior)
+
+
+def _medir_iteracion(operacion, mutante):
+    inicio = time.perf_counter()
+    with medir() as medicion:
+        if mutante:
+            with transaction.atomic():
+                operacion()
+                transaction.set_rollback(True)
+        else:
+            operacion()
+    return (time.perf_counter() - inicio) * 1000, medicion.consultas
+
+
+def ejecutar_escenario(nombre, contexto, iteraciones=10, calentamiento=1):
+    """
+    Ejecuta un escenario y devuelve sus percentiles de latencia (ms) y consultas
+    """
+    definicion = ESCENARIOS[nombre]
+    try:
+        operacion = definicion['preparar'](contexto)
+    except EscenarioNoDisponible as e:
+        return {'omitido': str(e)}
+
+    tiempos, consultas, errores = [], [], []
+    for i in range(calentamiento + iteraciones):
+        try:
+            duracion, cantidad = _medir_iteracion(operacion, definicion['mutante'])
+        except Exception as e:
+            errores.append(str(e)[:200])
+            continue
+        if i >= calentamiento:
+            tiempos.append(duracion)
+            consultas.append(cantidad)
+
+    if not tiempos:
+        return {'errores': errores[:3], 'omitido': 'Todas las iteraciones fallaron'}
+
+    resultado = {
+        'iteraciones': len(tiempos),
+        'p50_ms': round(_percentil(tiempos, 0.50), 2),
+        'p90_ms': round(_percentil(tiempos, 0.90), 2),
+        'p95_ms': round(_percentil(tiempos, 0.95), 2),
+        'p99_ms': round(_percentil(tiempos, 0.99), 2),
+        'min_ms': round(min(tiempos), 2),
+        'max_ms': round(max(tiempos), 2),
+        'consultas_media': round(sum(consultas) / len(consultas), 1),
+        'consultas_max': max(consultas),
+    }
+    if errores:
+        resultado['errores'] = errores[:3]
+    return resultado
+
+
+def _commit_actual():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=settings.BASE_DIR, capture_output=True, text=True, timeout=5
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def _volumen():
+    from django.contrib.auth import get_user_model
+    from apps.content_management.models import ContratoGenerado, CuñaPublicitaria
+    from apps.grilla_publicitaria.models import AsignacionCuña
+    from apps.transmission_control.models import LogTransmision
+
+    return {
+        'usuarios': get_user_model().objects.count(),
+        'cunas': CuñaPublicitaria.objects.count(),
+        'contratos': ContratoGenerado.objects.count(),
+        'asignaciones': AsignacionCuña.objects.count(),
+        'logs_transmision': LogTransmision.objects.count(),
+    }
+
+
+def ejecutar_benchmarks(nombres=None, iteraciones=10, calentamiento=1, salida=None):
+    """
+    Ejecuta los escenarios indicados (por defecto todos) y devuelve el informe
+    """
+    contexto = Contexto()
+    informe = {
+        'fecha': timezone.now().isoformat(),
+        'commit': _commit_actual(),
+        'base_datos': connection.vendor,
+        'volumen': _volumen(),
+        'escenarios': {},
+    }
+    for nombre in nombres or ESCENARIOS:
+        resultado = ejecutar_escenario(nombre, contexto, iteraciones, calentamiento)
+        informe['escenarios'][nombre] = resultado
+        if salida:
+            if 'p50_ms' in resultado:
+                salida(f"  {nombre}: p50 {resultado['p50_ms']} ms, p95 {resultado['p95_ms']} ms, "
+                       f"{resultado['consultas_max']} consultas")
+            else:
+                salida(f"  {nombre}: omitido ({resultado['omitido']})")
+    return informe
+
+
+def guardar_informe(informe, ruta):
+    ruta = Path(ruta)
+    ruta.parent.mkdir(parents=True, exist_ok=True)
+    ruta.write_text(json.dumps(informe, indent=2, ensure_ascii=False), encoding='utf-8')
+    return ruta
+
+
+def comparar_informes(anterior, actual, umbral=0.2):
+    """
+    Regresiones entre dos informes: p95 peor en más del `umbral` (fracción) o
+    más consultas que antes. Devuelve una lista de (escenario, descripción).
+    """
+    regresiones = []
+    for nombre, resultado in actual['escenarios'].items():
+        previo = anterior.get('escenarios', {}).get(nombre)
+        if not previo or 'p95_ms' not in previo or 'p95_ms' not in resultado:
+            continue
+        if resultado['p95_ms'] > previo['p95_ms'] * (1 + umbral):
+            regresiones.append((nombre, f"p95 {previo['p95_ms']} → {resultado['p95_ms']} ms"))
+        if resultado['consultas_max'] > previo['consultas_max']:
+            regresiones.append((nombre, f"consultas {previo['consultas_max']} → {resultado['consultas_max']}"))
+    return regresiones
@@ -0,0 +1,156 @@
+"""
+Cache de documentos generados
+Sistema PubliTrack - Contratos, órdenes y partes se generan desde una
+plantilla DOCX y un contexto. La huella SHA-256 de (hash de la plantilla,
+contexto canónico) identifica la salida: si ya se generó, se devuelve el PDF
+existente sin renderizar ni convertir con LibreOffice. Los PDF se guardan
+por hash de contenido (documentos/<aa>/<hash>.pdf), de modo que salidas
+idénticas comparten el mismo archivo.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import subprocess
+import tempfile
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import DocumentoRenderizado
+
+logger = logging.getLogger(__name__)
+
+DIRECTORIO_DOCUMENTOS = 'documentos'
+VERSION_RENDER = 1  # Incrementar al cambiar el renderizado o la conversión
+TIMEOUT_CONVERSION = 60
+TAMAÑO_BLOQUE = 1024 * 1024
+
+# Hash de cada plantilla por (ruta, tamaño, mtime): se lee una vez por proceso
+_hashes_plantillas = {}
+
+
+class ConversionPDFError(Exception):
+    """LibreOffice no pudo convertir el documento a PDF"""
+
+
+# ==================== HUELLAS ====================
+
+def hash_plantilla(ruta):
+    """
+    SHA-256 del archivo de plantilla; se recalcula solo si cambia en disco
+    """
+    estado = os.stat(ruta)
+    clave = (str(ruta), estado.st_size, estado.st_mtime_ns)
+    if clave not in _hashes_plantillas:
+        digest = hashlib.sha256()
+        with open(ruta, 'rb') as archivo:
+            for bloque in iter(lambda: archivo.read(TAMAÑO_BLOQUE), b''):
+                digest.update(bloque)
+        _hashes_plantillas[clave] = digest.hexdigest()
+    return _hashes_plantillas[clave]
+
+
+def huella_documento(tipo, ruta_plantilla, contexto):
+    """
+    Huella de la salida: tipo, hash de la plantilla y contexto serializado de
+    forma canónica (claves ordenadas; fechas y Decimal como texto)
+    """
+    contenido = json.dumps(
+        [VERSION_RENDER, tipo, hash_plantilla(ruta_plantilla), contexto],
+        sort_keys=True,
+        default=str,
+        ensure_ascii=False,
+        separators=(',', ':')
+    )
+    return hashlib.sha256(contenido.encode('utf-8')).hexdigest()
+
+
+# ==================== ALMACENAMIENTO POR CONTENIDO ====================
+
+def ruta_por_contenido(hash_contenido, extension='pdf'):
+    return f"{DIRECTORIO_DOCUMENTOS}/{hash_contenido[:2]}/{hash_contenido}.{extension}"
+
+
+def guardar_por_contenido(contenido, extension='pdf'):
+    """
+    Guarda los bytes bajo su SHA-256 (si ya existen no se vuelven a escribir).
+    Devuelve (ruta, hash_contenido).
+    """
+    hash_contenido = hashlib.sha256(contenido).hexdigest()
+    ruta = ruta_por_contenido(hash_contenido, extension)
+    if not default_storage.exists(ruta):
+        guardada = default_storage.save(ruta, ContentFile(contenido))
+        if guardada != ruta:
+            # Otro proceso guardó el mismo contenido a la vez: sobra la copia
+            default_storage.delete(guardada)
+    return ruta, hash_contenido
+
+
+# ==================== RENDERIZADO ====================
+
+def convertir_a_pdf(doc, nombre, permitir_docx=False):
+    """
+    Guarda el DocxTemplate ya renderizado y lo convierte con LibreOffice.
+    Devuelve (bytes, es_pdf); con `permitir_docx`, si la conversión falla se
+    devuelve el DOCX en lugar de lanzar ConversionPDFError.
+    """
+    with tempfile.TemporaryDirectory(prefix='publitrack_doc_') as carpeta:
+        ruta_docx = os.path.join(carpeta, f'{nombre}.docx')
+        doc.save(ruta_docx)
+        try:
+            resultado = subprocess.run(
+                ['libreoffice', '--headless', '--convert-to', 'pdf', '--outdir', carpeta, ruta_docx],
+                capture_output=True, text=True, timeout=TIMEOUT_CONVERSION
+            )
+            if resultado.returncode != 0:
+                raise ConversionPDFError(resultado.stderr)
+            with open(os.path.join(carpeta, f'{nombre}.pdf'), 'rb') as pdf:
+                return pdf.read(), True
+        except (OSError, subprocess.SubprocessError, ConversionPDFError) as e:
+            if not permitir_docx:
+                raise ConversionPDFError(f"Error en conversión PDF: {e}") from e
+            logger.warning(f"Error en conversión ({e}). Usando DOCX como fallback")
+            with open(ruta_docx, 'rb') as docx:
+                return docx.read(), False
+
+
+def generar_documento(tipo, plantilla, contexto, nombre, permitir_docx=False):
+    """
+    Devuelve (ruta, reutilizado) del documento para la plantilla (FieldFile)
+    y el contexto dados. Si la huella ya está registrada y el archivo existe
+    se devuelve sin renderizar. El DOCX de respaldo no se registra, para que
+    la próxima solicitud vuelva a intentar la conversión.
+    """
+    huella = huella_documento(tipo, plantilla.path, contexto)
+    existente = DocumentoRenderizado.objects.filter(huella=huella).first()
+    if existente and default_storage.exists(existente.archivo):
+        DocumentoRenderizado.objects.filter(pk=existente.pk).update(
+            usos=F('usos') + 1, ultimo_uso=timezone.now()
+        )
+        return existente.archivo, True
+
+    from apps.dependencias import docx_template
+
+    doc = docx_template()(plantilla.path)
+    doc.render(contexto)
+    contenido, es_pdf = convertir_a_pdf(doc, nombre, permitir_docx)
+    ruta, hash_contenido = guardar_por_contenido(contenido, 'pdf' if es_pdf else 'docx')
+
+    if es_pdf:
+        try:
+            with transaction.atomic():
+                DocumentoRenderizado.objects.update_or_create(huella=huella, defaults={
+                    'tipo': tipo,
+                    'hash_contenido': hash_contenido,
+                    'archivo': ruta,
+                    'tamaño_bytes': len(contenido),
+                })
+        except IntegrityError:
+            # Otra solicitud idéntica registró la misma huella
+            pass
+    return ruta, False
@@ -0,0 +1,296 @@
+"""
+Estación sintética para benchmarks
+Sistema PubliTrack - Genera con inserciones masivas un volumen realista de
+clientes, cuñas, contratos, partes mortorios, una semana de programación con
+pausas y asignaciones, y meses de logs de transmisión.
+"""
+
+import random
+from datetime import time, timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils import timezone
+
+from .secuencias import generar_codigos
+
+# Prefijos de los datos sintéticos (permiten limpiarlos sin tocar datos reales)
+PREFIJO_USUARIO = 'bench_'
+PREFIJO_CUÑA = 'CPB'
+PREFIJO_CONTRATO = 'CTRB'
+PREFIJO_PARTE = 'PMB'
+PREFIJO_PROGRAMACION = 'PRGBENCH'
+
+ESCALAS = {
+    'pequeña': {'vendedores': 5, 'clientes': 200, 'cunas': 2000, 'contratos': 1000, 'partes': 200, 'dias_logs': 30, 'logs_por_dia': 200},
+    'mediana': {'vendedores': 15, 'clientes': 2000, 'cunas': 20000, 'contratos': 10000, 'partes': 2000, 'dias_logs': 90, 'logs_por_dia': 1000},
+    'grande': {'vendedores': 40, 'clientes': 5000, 'cunas': 50000, 'contratos': 25000, 'partes': 5000, 'dias_logs': 180, 'logs_por_dia': 2000},
+}
+
+TAMAÑO_LOTE = 1000
+
+
+def _log(salida, mensaje):
+    if salida:
+        salida(mensaje)
+
+
+# ==================== USUARIOS ====================
+
+def _crear_usuarios(rol, cantidad, vendedores=None):
+    User = get_user_model()
+    inicio = User.objects.filter(username__startswith=f'{PREFIJO_USUARIO}{rol}_').count()
+    usuarios = []
+    for i in range(inicio, inicio + cantidad):
+        usuario = User(
+            username=f'{PREFIJO_USUARIO}{rol}_{i:05d}',
+            email=f'{PREFIJO_USUARIO}{rol}_{i:05d}@bench.local',
+            first_name=f'{rol.title()} {i}',
+            last_name='Sintético',
+            rol=rol,
+            empresa=f'Empresa {i % 700}' if rol == 'cliente' else None,
+            ruc_dni=f'{1790000000000 + i}' if rol == 'cliente' else None,
+            vendedor_asignado=random.choice(vendedores) if vendedores else None,
+        )
+        usuario.set_unusable_password()
+        usuarios.append(usuario)
+    return User.objects.bulk_create(usuarios, batch_size=TAMAÑO_LOTE)
+
+
+# ==================== CONTENIDO ====================
+
+def _crear_cunas(cantidad, clientes, vendedores):
+    from apps.content_management.models import CuñaPublicitaria
+
+    hoy = timezone.now().date()
+    estados = ['activa'] * 5 + ['aprobada', 'pausada', 'finalizada', 'pendiente_revision', 'borrador']
+    codigos = generar_codigos(CuñaPublicitaria, 'codigo', PREFIJO_CUÑA, 6, cantidad=cantidad)
+    cunas = []
+    for codigo in codigos:
+        inicio = hoy - timedelta(days=random.randint(0, 180))
+        cunas.append(CuñaPublicitaria(
+            codigo=codigo,
+            titulo=f'Cuña {codigo}',
+            cliente=random.choice(clientes),
+            vendedor_asignado=random.choice(vendedores),
+            duracion_planeada=random.choice([10, 20, 30, 45, 60]),
+            repeticiones_dia=random.randint(1, 12),
+            precio_total=Decimal(random.randint(50, 5000)),
+            fecha_inicio=inicio,
+            fecha_fin=inicio + timedelta(days=random.choice([7, 15, 30, 60, 90, 180])),
+            estado=random.choice(estados),
+        ))
+    return CuñaPublicitaria.objects.bulk_create(cunas, batch_size=TAMAÑO_LOTE)
+
+
+def _crear_contratos(cantidad, cunas):
+    from apps.content_management.models import ContratoGenerado
+
+    estados = ['validado'] * 4 + ['generado', 'enviado', 'firmado', 'vencido', 'cancelado']
+    codigos = generar_codigos(ContratoGenerado, 'numero_contrato', PREFIJO_CONTRATO, 6, cantidad=cantidad)
+    contratos = []
+    for numero, cuña in zip(codigos, random.sample(cunas, min(cantidad, len(cunas)))):
+        valor = cuña.precio_total
+        contratos.append(ContratoGenerado(
+            numero_contrato=numero,
+            cuña=cuña,
+            cliente=cuña.cliente,
+            vendedor_asignado=cuña.vendedor_asignado,
+            nombre_cliente=cuña.cliente.empresa or cuña.cliente.username,
+            ruc_dni_cliente=cuña.cliente.ruc_dni,
+            valor_sin_iva=valor,
+            valor_iva=(valor * Decimal('0.15')).quantize(Decimal('0.01')),
+            valor_total=(valor * Decimal('1.15')).quantize(Decimal('0.01')),
+            estado=random.choice(estados),
+        ))
+    return ContratoGenerado.objects.bulk_create(contratos, batch_size=TAMAÑO_LOTE)
+
+
+def _crear_partes(cantidad, clientes):
+    from apps.parte_mortorios.models import ParteMortorio
+
+    hoy = timezone.now().date()
+    codigos = generar_codigos(ParteMortorio, 'codigo', PREFIJO_PARTE, 6, cantidad=cantidad)
+    partes = [
+        ParteMortorio(
+            codigo=codigo,
+            cliente=random.choice(clientes),
+            nombre_fallecido=f'Fallecido {codigo}',
+            fecha_fallecimiento=hoy - timedelta(days=random.randint(0, 120)),
+            precio_total=Decimal(random.randint(15, 120)),
+            estado=random.choice(['pendiente', 'al_aire', 'finalizado', 'pausado']),
+            urgencia=random.choice(['normal', 'normal', 'urgente']),
+        )
+        for codigo in codigos
+    ]
+    return ParteMortorio.objects.bulk_create(partes, batch_size=TAMAÑO_LOTE)
+
+
+# ==================== PROGRAMACIÓN ====================
+
+def _crear_semana(cunas):
+    """
+    Semana actual completa (bloques de 6:00 a 24:00), con pausas generadas por
+    plantillas y todas sus posiciones ocupadas por cuñas activas
+    """
+    from apps.grilla_publicitaria.generacion import generar_ubicaciones_semana
+    from apps.grilla_publicitaria.models import AsignacionCuña, UbicacionPublicitaria
+    from apps.programacion_canal.models import BloqueProgramacion, Programa, ProgramacionSemanal
+
+    hoy = timezone.now().date()
+    lunes = hoy - timedelta(days=hoy.weekday())
+    programacion, _ = ProgramacionSemanal.objects.get_or_create(
+        codigo=f'{PREFIJO_PROGRAMACION}{lunes:%y%m%d}'[:20],
+        defaults={
+            'nombre': f'Semana sintética {lunes:%d/%m/%Y}',
+            'fecha_inicio_semana': lunes,
+            'fecha_fin_semana': lunes + timedelta(days=6),
+        }
+    )
+    programacion.bloques.all().delete()
+
+    tipos = ['noticiero', 'entretenimiento', 'deportivo', 'musical', 'pelicula', 'variedades']
+    programas = [
+        Programa.objects.get_or_create(
+            nombre=f'Programa sintético {tipo}',
+            defaults={
+                'tipo': tipo,
+                'codigo': f'BENCH{tipo[:10].upper()}',
+                'duracion_estandar': timedelta(hours=1),
+            }
+        )[0]
+        for tipo in tipos
+    ]
+    BloqueProgramacion.objects.bulk_create([
+        BloqueProgramacion(
+            programacion_semanal=programacion,
+            programa=programas[(dia + hora) % len(programas)],
+            dia_semana=dia,
+            hora_inicio=time(hora, 0),
+            duracion_real=timedelta(hours=1),
+        )
+        for dia in range(7)
+        for hora in range(6, 24)
+    ])
+    generar_ubicaciones_semana(programacion)
+
+    activas = [cuña for cuña in cunas if cuña.estado == 'activa'] or cunas
+    ubicaciones = UbicacionPublicitaria.objects.filter(
+        bloque_programacion__programacion_semanal=programacion
+    ).select_related('bloque_programacion')
+    asignaciones = []
+    for ubicacion in ubicaciones:
+        fecha = lunes + timedelta(days=ubicacion.bloque_programacion.dia_semana)
+        for orden in range(1, ubicacion.capacidad_cuñas + 1):
+            asignaciones.append(AsignacionCuña(
+                ubicacion=ubicacion,
+                cuña=random.choice(activas),
+                fecha_emision=fecha,
+                hora_emision=ubicacion.hora_pausa,
+                orden_en_ubicacion=orden,
+                estado='transmitida' if fecha < hoy else 'programada',
+            ))
+    AsignacionCuña.objects.bulk_create(asignaciones, batch_size=TAMAÑO_LOTE)
+    return programacion, len(asignaciones)
+
+
+def _crear_logs(dias, por_dia, cunas):
+    """
+    Logs de transmisión de los últimos `dias` días. timestamp es auto_now_add,
+    así que cada día se inserta y luego se fecha con un UPDATE por franja.
+    """
+    from apps.transmission_control.models import LogTransmision
+
+    acciones = ['iniciada', 'finalizada', 'finalizada', 'programada', 'pausada', 'error']
+    ahora = timezone.now()
+    total = 0
+    for dia in range(dias, 0, -1):
+        base = (ahora - timedelta(days=dia)).replace(hour=0, minute=0, second=0, microsecond=0)
+        logs = LogTransmision.objects.bulk_create([
+            LogTransmision(
+                cuña=random.choice(cunas),
+                accion=random.choice(acciones),
+                nivel='info',
+                descripcion='Evento sintético',
+            )
+            for _ in range(por_dia)
+        ], batch_size=TAMAÑO_LOTE)
+        ids = [log.pk for log in logs if log.pk]
+        if ids:
+            franjas = 6
+            tamaño = -(-len(ids) // franjas)
+            for franja in range(franjas):
+                LogTransmision.objects.filter(pk__in=ids[franja * tamaño:(franja + 1) * tamaño]).update(
+                    timestamp=base + timedelta(hours=6 + franja * 3)
+                )
+        total += por_dia
+    return total
+
+
+def _invalidar_fragmentos():
+    from apps.custom_admin import fragmentos
+    fragmentos.invalidar(fragmentos.USUARIOS, fragmentos.CUNAS, fragmentos.PARTES)
+
+
+# ==================== API PÚBLICA ====================
+
+def sembrar_estacion(escala='pequeña', semilla=42, salida=None, **cantidades):
+    """
+    Crea la estación sintética. `cantidades` permite sobrescribir los valores
+    de la escala (clientes, cunas, contratos, partes, dias_logs, logs_por_dia).
+    Devuelve el número de registros creados por tipo.
+    """
+    parametros = dict(ESCALAS[escala])
+    parametros.update({clave: valor for clave, valor in cantidades.items() if valor is not None})
+    random.seed(semilla)
+    resumen = {}
+
+    with transaction.atomic():
+        vendedores = _crear_usuarios('vendedor', parametros['vendedores'])
+        clientes = _crear_usuarios('cliente', parametros['clientes'], vendedores)
+        resumen['usuarios'] = len(vendedores) + len(clientes)
+        _log(salida, f"  Usuarios: {resumen['usuarios']}")
+
+        cunas = _crear_cunas(parametros['cunas'], clientes, vendedores)
+        resumen['cunas'] = len(cunas)
+        _log(salida, f"  Cuñas: {resumen['cunas']}")
+
+        resumen['contratos'] = len(_crear_contratos(parametros['contratos'], cunas))
+        _log(salida, f"  Contratos: {resumen['contratos']}")
+
+        resumen['partes'] = len(_crear_partes(parametros['partes'], clientes))
+        _log(salida, f"  Partes mortorios: {resumen['partes']}")
+
+        programacion, resumen['asignaciones'] = _crear_semana(cunas)
+        _log(salida, f"  Semana {programacion.codigo}: {resumen['asignaciones']} asignaciones")
+
+    resumen['logs'] = _crear_logs(parametros['dias_logs'], parametros['logs_por_dia'], cunas)
+    _log(salida, f"  Logs de transmisión: {resumen['logs']}")
+
+    # Las inserciones masivas no disparan señales: reconstruir el acumulado de ingresos
+    from apps.reports_analytics.generators.financial_reports import recalcular_ingresos_diarios
+    recalcular_ingresos_diarios()
+    _invalidar_fragmentos()
+    return resumen
+
+
+def limpiar_estacion():
+    """
+    Elimina los datos sintéticos (identificados por sus prefijos)
+    """
+    from apps.content_management.models import ContratoGenerado, CuñaPublicitaria
+    from apps.grilla_publicitaria.revisiones import cambio_masivo
+    from apps.parte_mortorios.models import ParteMortorio
+    from apps.programacion_canal.models import ProgramacionSemanal
+    from apps.transmission_control.models import LogTransmision
+
+    # Las semanas sintéticas desaparecen: no registrar revisiones por cada asignación
+    with transaction.atomic(), cambio_masivo():
+        LogTransmision.objects.filter(cuña__codigo__startswith=PREFIJO_CUÑA).delete()
+        ProgramacionSemanal.objects.filter(codigo__startswith=PREFIJO_PROGRAMACION).delete()
+        ContratoGenerado.objects.filter(numero_contrato__startswith=PREFIJO_CONTRATO).delete()
+        CuñaPublicitaria.objects.filter(codigo__startswith=PREFIJO_CUÑA).delete()
+        ParteMortorio.objects.filter(codigo__startswith=PREFIJO_PARTE).delete()
+        get_user_model().objects.filter(username__startswith=PREFIJO_USUARIO).delete()
+    _invalidar_fragmentos()
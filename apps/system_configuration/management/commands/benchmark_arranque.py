@@ -0,0 +1,71 @@
+"""
+Management command para medir el costo de arranque
+Sistema PubliTrack - Tiempo de importación (-X importtime), RSS y dependencias
+pesadas cargadas al iniciar Django, cargar el URLconf e importar las vistas
+"""
+
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.system_configuration.arranque import ESCENARIOS_ARRANQUE, medir_arranque
+
+
+class Command(BaseCommand):
+    help = 'Mide tiempo de importación, RSS y dependencias cargadas en procesos nuevos'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--escenario',
+            action='append',
+            choices=list(ESCENARIOS_ARRANQUE),
+            help='Escenario a ejecutar (se puede repetir; por defecto todos)'
+        )
+
+        parser.add_argument(
+            '--repeticiones',
+            type=int,
+            default=3,
+            help='Procesos por escenario (se informa la mediana)'
+        )
+
+        parser.add_argument(
+            '--top',
+            type=int,
+            default=10,
+            help='Módulos más costosos a mostrar por escenario'
+        )
+
+        parser.add_argument(
+            '--salida',
+            type=str,
+            help='Archivo JSON donde guardar el informe'
+        )
+
+    def handle(self, *args, **options):
+        if options['repeticiones'] < 1:
+            raise CommandError("--repeticiones debe ser al menos 1")
+
+        try:
+            informe = medir_arranque(options['escenario'], options['repeticiones'], options['top'])
+        except RuntimeError as e:
+            raise CommandError(str(e))
+
+        for nombre, datos in informe.items():
+            self.stdout.write(self.style.SUCCESS(
+                f"{nombre}: setup {datos['segundos_setup'] * 1000:.0f} ms, "
+                f"escenario {datos['segundos_escenario'] * 1000:.0f} ms, "
+                f"importación {datos['importacion_ms']:.0f} ms, RSS {datos['rss_mb']:.1f} MB, "
+                f"{datos['modulos']} módulos"
+            ))
+            self.stdout.write(f"  Dependencias pesadas cargadas: {', '.join(datos['cargadas']) or 'ninguna'}")
+            if options['verbosity'] > 1:
+                for modulo in datos['mas_costosos']:
+                    self.stdout.write(f"    {modulo['acumulado_ms']:>8.1f} ms  {modulo['modulo']}")
+
+        if options['salida']:
+            ruta = Path(options['salida'])
+            ruta.parent.mkdir(parents=True, exist_ok=True)
+            ruta.write_text(json.dumps(informe, indent=2, ensure_ascii=False), encoding='utf-8')
+            self.stdout.write(f"Resultados guardados en {ruta}")
@@ -0,0 +1,96 @@
+"""
+Management command para ejecutar los benchmarks de rutas críticas
+Sistema PubliTrack - Percentiles de latencia y consultas en JSON, comparables entre commits
+"""
+
+import json
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from apps.system_configuration.benchmarks import (
+    ESCENARIOS,
+    comparar_informes,
+    ejecutar_benchmarks,
+    guardar_informe,
+)
+
+
+class Command(BaseCommand):
+    help = 'Mide latencia (p50/p90/p95/p99) y consultas de las rutas críticas'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--escenario',
+            action='append',
+            choices=list(ESCENARIOS),
+            help='Escenario a ejecutar (se puede repetir; por defecto todos)'
+        )
+
+        parser.add_argument(
+            '--iteraciones',
+            type=int,
+            default=10,
+            help='Iteraciones medidas por escenario'
+        )
+
+        parser.add_argument(
+            '--salida',
+            type=str,
+            help='Archivo JSON de resultados (por defecto benchmarks/<fecha>_<commit>.json)'
+        )
+
+        parser.add_argument(
+            '--comparar',
+            type=str,
+            help='Informe JSON anterior con el que comparar'
+        )
+
+        parser.add_argument(
+            '--umbral',
+            type=float,
+            default=0.2,
+            help='Aumento de p95 tolerado al comparar (fracción, 0.2 = 20%%)'
+        )
+
+        parser.add_argument(
+            '--fallar-si-regresion',
+            action='store_true',
+            help='Terminar con error si hay regresiones respecto a --comparar'
+        )
+
+    def handle(self, *args, **options):
+        if options['iteraciones'] < 1:
+            raise CommandError("--iteraciones debe ser al menos 1")
+
+        anterior = None
+        if options['comparar']:
+            try:
+                anterior = json.loads(Path(options['comparar']).read_text(encoding='utf-8'))
+            except (OSError, ValueError) as e:
+                raise CommandError(f"No se pudo leer {options['comparar']}: {e}")
+
+        self.stdout.write("Ejecutando benchmarks...")
+        informe = ejecutar_benchmarks(
+            options['escenario'], options['iteraciones'], salida=self.stdout.write
+        )
+
+        ruta = options['salida'] or Path(settings.BASE_DIR) / 'benchmarks' / (
+            f"{timezone.now():%Y%m%d_%H%M%S}_{informe['commit'] or 'sin_commit'}.json"
+        )
+        self.stdout.write(f"Resultados guardados en {guardar_informe(informe, ruta)}")
+
+        if anterior is None:
+            return
+
+        regresiones = comparar_informes(anterior, informe, options['umbral'])
+        if not regresiones:
+            self.stdout.write(self.style.SUCCESS("Sin regresiones respecto al informe anterior"))
+            return
+
+        for nombre, descripcion in regresiones:
+            self.stdout.write(self.style.WARNING(f"  Regresión en {nombre}: {descripcion}"))
+        if options['fallar_si_regresion']:
+            raise CommandError(f"{len(regresiones)} regresiones de rendimiento")
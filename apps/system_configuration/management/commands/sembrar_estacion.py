@@ -0,0 +1,78 @@
+"""
+Management command para crear una estación sintética de benchmarks
+Sistema PubliTrack - Clientes, cuñas, contratos, programación y logs masivos
+"""
+
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.system_configuration.estacion_sintetica import ESCALAS, limpiar_estacion, sembrar_estacion
+
+
+class Command(BaseCommand):
+    help = 'Crea (o elimina) una estación sintética para benchmarks de rendimiento'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--escala',
+            choices=list(ESCALAS),
+            default='pequeña',
+            help='Volumen de datos a generar'
+        )
+
+        for opcion in ('clientes', 'cunas', 'contratos', 'partes', 'dias-logs', 'logs-por-dia'):
+            parser.add_argument(
+                f'--{opcion}',
+                type=int,
+                help=f'Sobrescribe la cantidad de {opcion.replace("-", " ")} de la escala'
+            )
+
+        parser.add_argument(
+            '--semilla',
+            type=int,
+            default=42,
+            help='Semilla aleatoria (misma semilla, mismos datos)'
+        )
+
+        parser.add_argument(
+            '--limpiar',
+            action='store_true',
+            help='Eliminar los datos sintéticos en lugar de crearlos'
+        )
+
+        parser.add_argument(
+            '--forzar',
+            action='store_true',
+            help='Permitir la ejecución con DEBUG desactivado'
+        )
+
+    def handle(self, *args, **options):
+        if not settings.DEBUG and not options['forzar']:
+            raise CommandError(
+                "DEBUG está desactivado. Use --forzar solo sobre una base de datos de pruebas."
+            )
+
+        start_time = time.time()
+        if options['limpiar']:
+            self.stdout.write("Eliminando estación sintética...")
+            limpiar_estacion()
+            self.stdout.write(self.style.SUCCESS(f"Datos sintéticos eliminados en {time.time() - start_time:.2f}s"))
+            return
+
+        self.stdout.write(f"Creando estación sintética ({options['escala']})...")
+        resumen = sembrar_estacion(
+            options['escala'],
+            semilla=options['semilla'],
+            salida=self.stdout.write,
+            clientes=options['clientes'],
+            cunas=options['cunas'],
+            contratos=options['contratos'],
+            partes=options['partes'],
+            dias_logs=options['dias_logs'],
+            logs_por_dia=options['logs_por_dia'],
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Estación creada en {time.time() - start_time:.2f}s: {sum(resumen.values())} registros"
+        ))
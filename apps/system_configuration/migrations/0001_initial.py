@@ -0,0 +1,30 @@
+# Generated by Django 5.2.5 on 2026-10-19 17:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SecuenciaDocumento',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('prefijo', models.CharField(max_length=10, verbose_name='Prefijo')),
+                ('periodo', models.CharField(blank=True, default='', help_text='Periodo de la numeración (AAAAMM) o vacío si es continua', max_length=10, verbose_name='Periodo')),
+                ('ultimo_valor', models.PositiveBigIntegerField(default=0, verbose_name='Último valor asignado')),
+                ('actualizado', models.DateTimeField(auto_now=True, verbose_name='Actualizado')),
+            ],
+            options={
+                'verbose_name': 'Secuencia de Documento',
+                'verbose_name_plural': 'Secuencias de Documentos',
+                'ordering': ['prefijo', '-periodo'],
+                'constraints': [models.UniqueConstraint(fields=('prefijo', 'periodo'), name='secuencia_prefijo_periodo_unica')],
+            },
+        ),
+    ]
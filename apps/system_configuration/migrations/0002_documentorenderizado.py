@@ -0,0 +1,32 @@
+# Generated by Django 5.2.5 on 2026-10-19 17:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('system_configuration', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DocumentoRenderizado',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('huella', models.CharField(max_length=64, unique=True, verbose_name='Huella de plantilla y contexto')),
+                ('tipo', models.CharField(max_length=30, verbose_name='Tipo de documento')),
+                ('hash_contenido', models.CharField(db_index=True, max_length=64, verbose_name='SHA-256 del PDF')),
+                ('archivo', models.CharField(max_length=255, verbose_name='Ruta en el almacenamiento')),
+                ('tamaño_bytes', models.PositiveBigIntegerField(default=0, verbose_name='Tamaño')),
+                ('usos', models.PositiveIntegerField(default=0, verbose_name='Reutilizaciones')),
+                ('fecha_creacion', models.DateTimeField(auto_now_add=True, verbose_name='Creado')),
+                ('ultimo_uso', models.DateTimeField(auto_now=True, verbose_name='Último uso')),
+            ],
+            options={
+                'verbose_name': 'Documento Renderizado',
+                'verbose_name_plural': 'Documentos Renderizados',
+                'ordering': ['-ultimo_uso'],
+            },
+        ),
+    ]
@@ -1,3 +1,62 @@
+"""
+Modelos de Configuración del Sistema
+Sistema PubliTrack - Secuencias para la numeración de documentos y cache de
+documentos generados
+"""
+
 from django.db import models
 
-# Create your models here.
+
+class SecuenciaDocumento(models.Model):
+    """
+    Contador de códigos de documentos por prefijo y periodo (p. ej. CP/202610).
+    Se asigna con bloqueo de fila para que dos altas simultáneas nunca reciban
+    el mismo número.
+    """
+
+    prefijo = models.CharField('Prefijo', max_length=10)
+    periodo = models.CharField(
+        'Periodo',
+        max_length=10,
+        blank=True,
+        default='',
+        help_text='Periodo de la numeración (AAAAMM) o vacío si es continua'
+    )
+    ultimo_valor = models.PositiveBigIntegerField('Último valor asignado', default=0)
+    actualizado = models.DateTimeField('Actualizado', auto_now=True)
+
+    class Meta:
+        verbose_name = 'Secuencia de Documento'
+        verbose_name_plural = 'Secuencias de Documentos'
+        ordering = ['prefijo', '-periodo']
+        constraints = [
+            models.UniqueConstraint(fields=['prefijo', 'periodo'], name='secuencia_prefijo_periodo_unica'),
+        ]
+
+    def __str__(self):
+        return f"{self.prefijo}{self.periodo} → {self.ultimo_valor}"
+
+
+class DocumentoRenderizado(models.Model):
+    """
+    PDF generado desde una plantilla, indexado por la huella de (plantilla,
+    contexto). El archivo se guarda por su hash de contenido, así que varios
+    documentos con la misma salida comparten el mismo archivo.
+    """
+
+    huella = models.CharField('Huella de plantilla y contexto', max_length=64, unique=True)
+    tipo = models.CharField('Tipo de documento', max_length=30)
+    hash_contenido = models.CharField('SHA-256 del PDF', max_length=64, db_index=True)
+    archivo = models.CharField('Ruta en el almacenamiento', max_length=255)
+    tamaño_bytes = models.PositiveBigIntegerField('Tamaño', default=0)
+    usos = models.PositiveIntegerField('Reutilizaciones', default=0)
+    fecha_creacion = models.DateTimeField('Creado', auto_now_add=True)
+    ultimo_uso = models.DateTimeField('Último uso', auto_now=True)
+
+    class Meta:
+        verbose_name = 'Documento Renderizado'
+        verbose_name_plural = 'Documentos Renderizados'
+        ordering = ['-ultimo_uso']
+
+    def __str__(self):
+        return f"{self.tipo} {self.huella[:12]} → {self.archivo}"
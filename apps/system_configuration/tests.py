@@ -1,3 +1,232 @@
+"""
+Tests para el módulo de Configuración del Sistema
+Sistema PubliTrack - Secuencias de códigos de documentos y cache de
+documentos generados
+"""
+
+from datetime import date
+from decimal import Decimal
 from django.test import TestCase
+from django.contrib.auth import get_user_model
+
+from apps.parte_mortorios.models import ParteMortorio
+from .models import SecuenciaDocumento
+from .secuencias import generar_codigos, periodo_mensual, reservar
+
+User = get_user_model()
+
+
+class SecuenciaDocumentoTest(TestCase):
+    """Tests de la asignación de códigos por (prefijo, periodo)"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.cliente = User.objects.create_user(
+            username='familia_secuencia', email='secuencia@test.com', password='testpass123', rol='cliente'
+        )
+
+    def crear_parte(self, **extra):
+        return ParteMortorio.objects.create(
+            cliente=self.cliente,
+            nombre_fallecido='Juan Pérez',
+            fecha_fallecimiento=date.today(),
+            precio_total=Decimal('20.00'),
+            **extra
+        )
+
+    def test_continua_la_numeracion_existente(self):
+        """Test que la secuencia nueva parte del mayor código ya usado"""
+        self.crear_parte(codigo='PM000041')
+        self.crear_parte(codigo='PM1700000000')  # Código antiguo con marca de tiempo
+
+        self.assertEqual(self.crear_parte().codigo, 'PM000042')
+        self.assertEqual(self.crear_parte().codigo, 'PM000043')
+
+        # Asignar no vuelve a consultar los partes existentes: bloqueo y actualización
+        with self.assertNumQueries(4):
+            self.assertEqual(ParteMortorio().generar_codigo(), 'PM000044')
+
+    def test_reserva_de_bloques_y_periodos(self):
+        """Test que los bloques son consecutivos y cada periodo tiene su contador"""
+        self.assertEqual(list(reservar('TST', '202601', cantidad=3)), [1, 2, 3])
+        self.assertEqual(list(reservar('TST', '202601', cantidad=2)), [4, 5])
+        self.assertEqual(list(reservar('TST', '202602')), [1])
+
+        codigos = generar_codigos(ParteMortorio, 'codigo', 'PMT', 4, periodo_mensual(date(2026, 3, 1)), cantidad=2)
+        self.assertEqual(codigos, ['PMT2026030001', 'PMT2026030002'])
+        self.assertEqual(SecuenciaDocumento.objects.get(prefijo='TST', periodo='202601').ultimo_valor, 5)
+
+        with self.assertRaises(ValueError):
+            reservar('TST', cantidad=0)
+
+
+class BenchmarksTest(TestCase):
+    """Tests de la estación sintética y los benchmarks"""
+
+    def test_estacion_y_benchmark(self):
+        """Test que la estación se siembra y los benchmarks producen percentiles"""
+        import json
+        import tempfile
+        from io import StringIO
+        from pathlib import Path
+        from django.core.management import call_command
+
+        from apps.content_management.models import CuñaPublicitaria
+        from apps.grilla_publicitaria.models import AsignacionCuña
+        from .benchmarks import comparar_informes
+
+        salida = StringIO()
+        call_command(
+            'sembrar_estacion', '--forzar', '--clientes', '5', '--cunas', '30', '--contratos', '10',
+            '--partes', '5', '--dias-logs', '2', '--logs-por-dia', '5', verbosity=0, stdout=salida
+        )
+        self.assertIn('Estación creada en', salida.getvalue())
+        self.assertEqual(CuñaPublicitaria.objects.filter(codigo__startswith='CPB').count(), 30)
+        self.assertTrue(AsignacionCuña.objects.exists())
+
+        with tempfile.TemporaryDirectory() as carpeta:
+            ruta = Path(carpeta) / 'informe.json'
+            salida = StringIO()
+            call_command(
+                'benchmark_rendimiento', '--escenario', 'cunas_list', '--escenario', 'contrato_pdf',
+                '--iteraciones', '2', '--salida', str(ruta), stdout=salida
+            )
+            self.assertIn(f'Resultados guardados en {ruta}', salida.getvalue())
+            informe = json.loads(ruta.read_text(encoding='utf-8'))
+
+        cunas = informe['escenarios']['cunas_list']
+        self.assertEqual(cunas['iteraciones'], 2)
+        self.assertLessEqual(cunas['p50_ms'], cunas['p95_ms'])
+        self.assertGreater(cunas['consultas_max'], 0)
+        self.assertIn('omitido', informe['escenarios']['contrato_pdf'])
+
+        peor = json.loads(json.dumps(informe))
+        peor['escenarios']['cunas_list']['consultas_max'] += 5
+        self.assertEqual([nombre for nombre, _ in comparar_informes(informe, peor)], ['cunas_list'])
+
+    def test_parsear_importtime(self):
+        """Test que el benchmark de arranque interpreta la salida de -X importtime"""
+        from .arranque import parsear_importtime
+
+        salida = (
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       120 |        120 |   _io\n"
+            "import time:      2500 |       9000 | xlwt\n"
+            "otra línea\n"
+        )
+        self.assertEqual(parsear_importtime(salida), [
+            {'modulo': '_io', 'propio_us': 120, 'acumulado_us': 120},
+            {'modulo': 'xlwt', 'propio_us': 2500, 'acumulado_us': 9000},
+        ])
+
+
+class DocumentosRenderizadosTest(TestCase):
+    """Tests de la cache de documentos generados por huella de plantilla y contexto"""
+
+    def setUp(self):
+        import tempfile
+        from django.test import override_settings
+
+        self.directorio = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directorio.cleanup)
+        ajustes = override_settings(MEDIA_ROOT=self.directorio.name)
+        ajustes.enable()
+        self.addCleanup(ajustes.disable)
+
+    def crear_plantilla(self, texto='Fallecido: {{ NOMBRE_FALLECIDO }}'):
+        import io
+        from docx import Document
+
+        documento = Document()
+        documento.add_paragraph(texto)
+        contenido = io.BytesIO()
+        documento.save(contenido)
+        return contenido.getvalue()
+
+    def plantilla_en_disco(self, contenido, nombre='plantilla.docx'):
+        import os
+        from types import SimpleNamespace
+
+        ruta = os.path.join(self.directorio.name, nombre)
+        with open(ruta, 'wb') as archivo:
+            archivo.write(contenido)
+        return SimpleNamespace(path=ruta)
+
+    def test_reutiliza_y_comparte_contenido(self):
+        """Test que la misma huella no se vuelve a convertir y salidas iguales comparten archivo"""
+        from unittest import mock
+        from django.core.files.storage import default_storage
+        from .documentos import generar_documento
+        from .models import DocumentoRenderizado
+
+        plantilla = self.plantilla_en_disco(self.crear_plantilla())
+        with mock.patch('apps.system_configuration.documentos.convertir_a_pdf',
+                        return_value=(b'%PDF-1.4 prueba', True)) as convertir:
+            ruta, reutilizado = generar_documento('parte', plantilla, {'NOMBRE_FALLECIDO': 'Ana'}, 'p1')
+            self.assertFalse(reutilizado)
+            self.assertTrue(default_storage.exists(ruta))
+
+            self.assertEqual(generar_documento('parte', plantilla, {'NOMBRE_FALLECIDO': 'Ana'}, 'p1'), (ruta, True))
+            self.assertEqual(convertir.call_count, 1)
+
+            # Otro contexto con la misma salida: nueva huella, mismo archivo
+            otra, reutilizado = generar_documento('parte', plantilla, {'NOMBRE_FALLECIDO': 'Luis'}, 'p2')
+            self.assertFalse(reutilizado)
+            self.assertEqual(otra, ruta)
+            self.assertEqual(convertir.call_count, 2)
+
+            # Cambiar la plantilla invalida la huella
+            plantilla = self.plantilla_en_disco(self.crear_plantilla('Nombre: {{ NOMBRE_FALLECIDO }}'))
+            generar_documento('parte', plantilla, {'NOMBRE_FALLECIDO': 'Ana'}, 'p1')
+            self.assertEqual(convertir.call_count, 3)
+
+        self.assertEqual(DocumentoRenderizado.objects.count(), 3)
+        self.assertEqual(DocumentoRenderizado.objects.get(usos=1).archivo, ruta)
+
+    def test_respaldo_docx_no_se_registra(self):
+        """Test que el DOCX de respaldo no queda en la cache y se reintenta la conversión"""
+        from unittest import mock
+        from .documentos import generar_documento
+        from .models import DocumentoRenderizado
+
+        plantilla = self.plantilla_en_disco(self.crear_plantilla())
+        with mock.patch('apps.system_configuration.documentos.convertir_a_pdf',
+                        return_value=(b'docx de respaldo', False)) as convertir:
+            ruta, _ = generar_documento('orden', plantilla, {'NOMBRE_FALLECIDO': 'Ana'}, 'o1', permitir_docx=True)
+            generar_documento('orden', plantilla, {'NOMBRE_FALLECIDO': 'Ana'}, 'o1', permitir_docx=True)
+
+        self.assertTrue(ruta.endswith('.docx'))
+        self.assertEqual(convertir.call_count, 2)
+        self.assertFalse(DocumentoRenderizado.objects.exists())
+
+    def test_parte_generado_y_puede_regenerar(self):
+        """Test que regenerar un parte sin cambios reutiliza el PDF y uno emitido no se regenera"""
+        from unittest import mock
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        from apps.parte_mortorios.models import ParteMortorioGenerado, PlantillaParteMortorio
+
+        cliente = User.objects.create_user(
+            username='cliente_documentos', email='documentos@test.com', password='testpass123', rol='cliente'
+        )
+        parte = ParteMortorio.objects.create(
+            cliente=cliente, nombre_fallecido='Ana Torres', fecha_fallecimiento=date.today(),
+            precio_total=Decimal('20.00')
+        )
+        plantilla = PlantillaParteMortorio.objects.create(
+            nombre='Plantilla prueba',
+            archivo_plantilla=SimpleUploadedFile('parte.docx', self.crear_plantilla())
+        )
+        generado = ParteMortorioGenerado.objects.create(parte_mortorio=parte, plantilla_usada=plantilla)
+
+        with mock.patch('apps.system_configuration.documentos.convertir_a_pdf',
+                        return_value=(b'%PDF-1.4 parte', True)) as convertir:
+            self.assertTrue(generado.generar_parte_pdf())
+            ruta = generado.archivo_parte_pdf.name
+            self.assertTrue(generado.generar_parte_pdf())
+            self.assertEqual(generado.archivo_parte_pdf.name, ruta)
+            self.assertEqual(convertir.call_count, 1)
 
-# Create your tests here.
+            generado.estado = 'validado'
+            with mock.patch('apps.system_configuration.documentos.generar_documento') as generar:
+                self.assertTrue(generado.generar_parte_pdf())
+            generar.assert_not_called()
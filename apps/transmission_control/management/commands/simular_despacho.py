@@ -0,0 +1,105 @@
+"""
+Management command para simular el despacho de transmisiones
+Sistema PubliTrack - Latencia hasta el aire de los partes urgentes con la cola
+con prioridad frente al despacho secuencial, sin tocar la base de datos
+"""
+
+import json
+from datetime import timedelta
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.transmission_control.scheduler.simulacion import POLITICAS, comparar_politicas
+from apps.transmission_control.scheduler.transmission_scheduler import latencia_maxima_urgentes
+
+
+class Command(BaseCommand):
+    help = 'Simula el despacho de transmisiones y mide la latencia de las urgentes'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--horas',
+            type=float,
+            default=8,
+            help='Horas de aire simuladas'
+        )
+
+        parser.add_argument(
+            '--carga',
+            type=float,
+            default=0.75,
+            help='Fracción del aire ocupada por cuñas comerciales (0-1)'
+        )
+
+        parser.add_argument(
+            '--urgentes-por-hora',
+            type=float,
+            default=4,
+            help='Partes mortorios urgentes que llegan por hora'
+        )
+
+        parser.add_argument(
+            '--semilla',
+            type=int,
+            default=42,
+            help='Semilla de las llegadas aleatorias'
+        )
+
+        parser.add_argument(
+            '--latencia-maxima',
+            type=int,
+            help='Cota de latencia de las urgentes en segundos (por defecto la configurada)'
+        )
+
+        parser.add_argument(
+            '--salida',
+            type=str,
+            help='Archivo JSON donde guardar el informe'
+        )
+
+        parser.add_argument(
+            '--fallar-si-excede',
+            action='store_true',
+            help='Terminar con error si alguna urgente supera la cota con la cola con prioridad'
+        )
+
+    def handle(self, *args, **options):
+        if options['horas'] <= 0 or not 0 < options['carga'] < 1:
+            raise CommandError("--horas debe ser positivo y --carga estar entre 0 y 1")
+
+        latencia_maxima = (
+            timedelta(seconds=options['latencia_maxima'])
+            if options['latencia_maxima'] else latencia_maxima_urgentes()
+        )
+        informe = comparar_politicas(
+            horas=options['horas'],
+            carga=options['carga'],
+            urgentes_por_hora=options['urgentes_por_hora'],
+            semilla=options['semilla'],
+            latencia_maxima=latencia_maxima
+        )
+
+        self.stdout.write(f"Cota de latencia para urgentes: {latencia_maxima.total_seconds():.0f} s")
+        for politica in POLITICAS:
+            datos = informe[politica]
+            urgentes, resto = datos['urgentes'], datos['resto']
+            self.stdout.write(self.style.SUCCESS(
+                f"{politica}: urgentes {urgentes['emitidas']}/{urgentes['total']} al aire, "
+                f"p50 {urgentes['p50_s']} s, p95 {urgentes['p95_s']} s, máx {urgentes['max_s']} s, "
+                f"{urgentes['fuera_de_cota']} fuera de cota"
+            ))
+            self.stdout.write(
+                f"  resto {resto['emitidas']}/{resto['total']} al aire, p50 {resto['p50_s']} s, "
+                f"p95 {resto['p95_s']} s; {datos['desplazamientos']} desplazamientos"
+            )
+
+        if options['salida']:
+            ruta = Path(options['salida'])
+            ruta.parent.mkdir(parents=True, exist_ok=True)
+            ruta.write_text(json.dumps(informe, indent=2, ensure_ascii=False), encoding='utf-8')
+            self.stdout.write(f"Resultados guardados en {ruta}")
+
+        excedidas = informe['prioridad']['urgentes']['fuera_de_cota']
+        if options['fallar_si_excede'] and excedidas:
+            raise CommandError(f"{excedidas} urgente(s) superan la cota de latencia")
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-19 19:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('transmission_control', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='transmisionactual',
+            name='vencimiento',
+            field=models.DateTimeField(blank=True, help_text='Hora en que la programación debía salir al aire', null=True, verbose_name='Vencimiento'),
+        ),
+    ]
@@ -3,6 +3,7 @@ Modelos para el módulo de Control de Transmisiones
 Sistema PubliTrack - Gestión y programación de transmisiones de publicidad radial
 """
 
+import math
 import uuid
 from datetime import datetime, timedelta, time
 from decimal import Decimal
@@ -387,15 +388,9 @@ class ProgramacionTransmision(models.Model):
         super().save(*args, **kwargs)
     
     def generar_codigo(self):
-        """Genera un código único para la programación"""
-        año = timezone.now().year
-        mes = timezone.now().month
-        count = ProgramacionTransmision.objects.filter(
-            created_at__year=año,
-            created_at__month=mes
-        ).count() + 1
-        
-        return f"PT{año}{mes:02d}{count:04d}"
+        """Genera un código único para la programación (PT + AAAAMM + contador)"""
+        from apps.system_configuration.secuencias import generar_codigo, periodo_mensual
+        return generar_codigo(ProgramacionTransmision, 'codigo', 'PT', 4, periodo_mensual())
     
     def clean(self):
         """Validaciones personalizadas"""
@@ -627,6 +622,13 @@ class TransmisionActual(models.Model):
         help_text='Hora programada para iniciar la transmisión'
     )
     
+    vencimiento = models.DateTimeField(
+        'Vencimiento',
+        null=True,
+        blank=True,
+        help_text='Hora en que la programación debía salir al aire'
+    )
+    
     inicio_real = models.DateTimeField(
         'Inicio Real',
         null=True,
@@ -738,8 +740,7 @@ class TransmisionActual(models.Model):
     def save(self, *args, **kwargs):
         # Calcular fin programado si no está definido
         if not self.fin_programado and self.cuña and self.cuña.archivo_audio:
-            duracion = self.cuña.archivo_audio.duracion_segundos or self.cuña.duracion_planeada
-            self.fin_programado = self.inicio_programado + timedelta(seconds=duracion)
+            self.fin_programado = self.inicio_programado + self.cuña.duracion_emision
         
         super().save(*args, **kwargs)
     
@@ -780,7 +781,7 @@ class TransmisionActual(models.Model):
         self.inicio_real = timezone.now()
         
         if self.cuña and self.cuña.archivo_audio:
-            self.duracion_segundos = self.cuña.archivo_audio.duracion_segundos
+            self.duracion_segundos = math.ceil(self.cuña.duracion_emision.total_seconds())
         
         self.save()
         
@@ -1030,7 +1031,7 @@ class LogTransmision(models.Model):
             usuario=usuario,
             datos=datos or {},
             ip_address=ip_address,
-            user_agent=user_agent
+            user_agent=user_agent or ''
         )
     
     @classmethod
@@ -1183,7 +1184,7 @@ class TransmisionManager(models.Manager):
 
 
 # Asignar el manager personalizado
-TransmisionActual.objects = TransmisionManager()
+TransmisionActual.add_to_class('objects', TransmisionManager())
 
 
 # Funciones de utilidad
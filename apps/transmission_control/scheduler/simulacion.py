@@ -0,0 +1,242 @@
+"""
+Simulación del despacho de transmisiones
+Sistema PubliTrack - Reproduce horas de aire con llegadas aleatorias (semilla
+fija) y el ciclo de un minuto de procesar_transmisiones_programadas para
+medir la latencia hasta el aire. Una transmisión sale al aire en el ciclo
+que la inicia, no en su inicio planificado: la latencia es inicio real -
+vencimiento. Compara la cola con prioridad, que en cada ciclo inicia las
+preparadas cuyo inicio llegó, con el despacho secuencial anterior: orden de
+la consulta, la programación se salta si hay conflicto y se pierde tras 5
+minutos de retraso, y la que no se inicia al crearse espera a que el
+monitor la encuentre con 5 minutos de retraso.
+"""
+
+import random
+from datetime import datetime, timedelta
+
+from .transmission_scheduler import (
+    RANGO_PREEMPTIVO,
+    VENTANA_INICIO,
+    latencia_maxima_urgentes,
+    planificar_despacho,
+    rango_prioridad,
+)
+
+POLITICAS = ('secuencial', 'prioridad')
+
+CICLO = timedelta(minutes=1)
+VENTANA_ADELANTO = timedelta(minutes=1)
+TOLERANCIA_RETRASO = timedelta(minutes=5)
+
+# Peso de cada prioridad entre las cuñas comerciales
+MEZCLA_PRIORIDADES = {'baja': 1, 'normal': 6, 'alta': 2}
+
+# Peso de cada urgencia entre los partes mortorios urgentes
+MEZCLA_URGENCIAS = {'urgente': 3, 'muy_urgente': 1}
+
+DURACION_COMERCIAL = (20, 60)
+DURACION_PARTE = (60, 120)
+
+# Las programaciones comerciales se conocen con esta anticipación; los
+# partes urgentes aparecen en el momento en que deben salir al aire
+ANTICIPACION_COMERCIAL = timedelta(hours=1)
+
+
+def generar_llegadas(horas=8, carga=0.75, urgentes_por_hora=4, semilla=42):
+    """
+    Solicitudes del escenario: cuñas comerciales con una tasa que ocupa
+    `carga` del aire y partes mortorios urgentes
+    """
+    azar = random.Random(semilla)
+    inicio = datetime(2025, 1, 6, 6, 0)
+    fin = inicio + timedelta(hours=horas)
+    duracion_media = sum(DURACION_COMERCIAL) / 2
+    solicitudes = []
+
+    def agregar(tasa_por_segundo, crear):
+        momento = inicio
+        while True:
+            momento += timedelta(seconds=azar.expovariate(tasa_por_segundo))
+            if momento >= fin:
+                return
+            solicitudes.append(dict(crear(), clave=len(solicitudes), vencimiento=momento))
+
+    agregar(carga / duracion_media, lambda: {
+        'rango': rango_prioridad(azar.choices(*zip(*MEZCLA_PRIORIDADES.items()))[0]),
+        'duracion': timedelta(seconds=azar.randint(*DURACION_COMERCIAL)),
+        'anticipacion': ANTICIPACION_COMERCIAL,
+    })
+    if urgentes_por_hora:
+        agregar(urgentes_por_hora / 3600, lambda: {
+            'rango': rango_prioridad('normal', azar.choices(*zip(*MEZCLA_URGENCIAS.items()))[0]),
+            'duracion': timedelta(seconds=azar.randint(*DURACION_PARTE)),
+            'anticipacion': timedelta(0),
+        })
+
+    # El despacho secuencial las recorre en el orden en que se crearon
+    return sorted(solicitudes, key=lambda s: s['vencimiento'] - s['anticipacion'])
+
+
+def _se_solapa(agenda, inicio, fin):
+    return any(o['inicio'] < fin and o['fin'] > inicio for o in agenda)
+
+
+def _ciclo_secuencial(visibles, agenda, ahora, perdidas):
+    nuevas = []
+    for solicitud in visibles:
+        if solicitud['vencimiento'] < ahora - TOLERANCIA_RETRASO:
+            perdidas.add(solicitud['clave'])
+            continue
+        inicio = max(solicitud['vencimiento'], ahora)
+        fin = inicio + solicitud['duracion']
+        if _se_solapa(agenda.values(), inicio, fin):
+            continue
+        agenda[solicitud['clave']] = {'clave': solicitud['clave'], 'rango': solicitud['rango'],
+                                      'inicio': inicio, 'fin': fin, 'iniciada': False}
+        nuevas.append(agenda[solicitud['clave']])
+    return nuevas, 0
+
+
+def _ciclo_prioridad(visibles, agenda, ahora):
+    ocupaciones = [
+        dict(o, desplazable=not o['iniciada'] and o['inicio'] > ahora) for o in agenda.values()
+    ]
+    asignaciones, desplazamientos, _ = planificar_despacho(visibles, ocupaciones, ahora)
+    for desplazamiento in desplazamientos:
+        ocupacion = agenda[desplazamiento['clave']]
+        duracion = ocupacion['fin'] - ocupacion['inicio']
+        ocupacion.update(inicio=desplazamiento['inicio_nuevo'], fin=desplazamiento['inicio_nuevo'] + duracion)
+    rangos = {s['clave']: s['rango'] for s in visibles}
+    nuevas = []
+    for asignacion in asignaciones:
+        agenda[asignacion['clave']] = {
+            'clave': asignacion['clave'],
+            'rango': rangos[asignacion['clave']],
+            'inicio': asignacion['inicio'],
+            'fin': asignacion['fin'],
+            'iniciada': False,
+        }
+        nuevas.append(agenda[asignacion['clave']])
+    return nuevas, len(desplazamientos)
+
+
+def _iniciar(ocupaciones, hasta, ahora, inicios):
+    """
+    Inicia en este ciclo las transmisiones preparadas con inicio hasta `hasta`
+    """
+    for ocupacion in ocupaciones:
+        if not ocupacion['iniciada'] and ocupacion['inicio'] <= hasta:
+            ocupacion['iniciada'] = True
+            inicios[ocupacion['clave']] = ahora
+
+
+def simular_despacho(politica, solicitudes, ciclo=CICLO):
+    """
+    Ejecuta el ciclo de despacho sobre las solicitudes. Devuelve el inicio
+    real al aire de cada clave (el ciclo que la inició), las perdidas y la
+    cantidad de desplazamientos.
+    """
+    if politica not in POLITICAS:
+        raise ValueError(f'Política no soportada: {politica}')
+
+    pendientes = list(solicitudes)
+    agenda = {}
+    preparadas = {}
+    inicios = {}
+    perdidas = set()
+    desplazamientos = 0
+    if not pendientes:
+        return inicios, perdidas, desplazamientos
+
+    ahora = min(s['vencimiento'] - s['anticipacion'] for s in pendientes)
+    limite = max(s['vencimiento'] for s in pendientes) + timedelta(hours=24)
+
+    while (pendientes or preparadas) and ahora <= limite:
+        visibles = [
+            s for s in pendientes
+            if s['vencimiento'] - s['anticipacion'] <= ahora and s['vencimiento'] <= ahora + VENTANA_ADELANTO
+        ]
+        nuevas = []
+        if visibles:
+            if politica == 'secuencial':
+                nuevas, movidas = _ciclo_secuencial(visibles, agenda, ahora, perdidas)
+            else:
+                nuevas, movidas = _ciclo_prioridad(visibles, agenda, ahora)
+            desplazamientos += movidas
+            preparadas.update((o['clave'], o) for o in nuevas)
+            pendientes = [s for s in pendientes if s['clave'] not in preparadas and s['clave'] not in perdidas]
+
+        if politica == 'secuencial':
+            # Solo se iniciaba al crearse; las demás las inicia el monitor
+            _iniciar(nuevas, ahora + VENTANA_INICIO, ahora, inicios)
+            _iniciar(preparadas.values(), ahora - TOLERANCIA_RETRASO, ahora, inicios)
+        else:
+            _iniciar(preparadas.values(), ahora + VENTANA_INICIO, ahora, inicios)
+        preparadas = {clave: o for clave, o in preparadas.items() if not o['iniciada']}
+
+        # Lo que ya terminó no vuelve a consultarse
+        agenda = {clave: o for clave, o in agenda.items() if o['fin'] > ahora}
+        ahora += ciclo
+
+    perdidas.update(s['clave'] for s in pendientes)
+    perdidas.update(preparadas)
+    return inicios, perdidas, desplazamientos
+
+
+def _percentil(valores, fraccion):
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(round((len(ordenados) - 1) * fraccion)))]
+
+
+def _resumen(solicitudes, inicios, perdidas, latencia_maxima=None):
+    """
+    Percentiles de latencia hasta el aire (segundos); con `latencia_maxima`
+    cuenta las que la superan o nunca salieron al aire
+    """
+    latencias = [
+        (inicios[s['clave']] - s['vencimiento']).total_seconds()
+        for s in solicitudes if s['clave'] in inicios
+    ]
+    resumen = {
+        'total': len(solicitudes),
+        'emitidas': len(latencias),
+        'perdidas': sum(1 for s in solicitudes if s['clave'] in perdidas),
+        'p50_s': round(_percentil(latencias, 0.50), 1) if latencias else None,
+        'p95_s': round(_percentil(latencias, 0.95), 1) if latencias else None,
+        'max_s': round(max(latencias), 1) if latencias else None,
+    }
+    if latencia_maxima is not None:
+        cota = latencia_maxima.total_seconds()
+        resumen['fuera_de_cota'] = (
+            sum(1 for latencia in latencias if latencia > cota) + len(solicitudes) - len(latencias)
+        )
+    return resumen
+
+
+def comparar_politicas(horas=8, carga=0.75, urgentes_por_hora=4, semilla=42, latencia_maxima=None):
+    """
+    Simula el mismo escenario con cada política y resume la latencia hasta
+    el aire de las urgentes y del resto
+    """
+    latencia_maxima = latencia_maxima or latencia_maxima_urgentes()
+    solicitudes = generar_llegadas(horas, carga, urgentes_por_hora, semilla)
+    urgentes = [s for s in solicitudes if s['rango'] >= RANGO_PREEMPTIVO]
+    resto = [s for s in solicitudes if s['rango'] < RANGO_PREEMPTIVO]
+
+    informe = {
+        'parametros': {
+            'horas': horas,
+            'carga': carga,
+            'urgentes_por_hora': urgentes_por_hora,
+            'semilla': semilla,
+            'latencia_maxima_s': latencia_maxima.total_seconds(),
+        },
+    }
+    for politica in POLITICAS:
+        inicios, perdidas, desplazamientos = simular_despacho(politica, solicitudes)
+        informe[politica] = {
+            'urgentes': _resumen(urgentes, inicios, perdidas, latencia_maxima),
+            'resto': _resumen(resto, inicios, perdidas),
+            'desplazamientos': desplazamientos,
+        }
+    return informe
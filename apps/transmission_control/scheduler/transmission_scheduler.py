@@ -0,0 +1,349 @@
+"""
+Despacho de transmisiones con prioridad
+Sistema PubliTrack - Ordena las programaciones vencidas por (prioridad,
+retraso) y asigna a cada una el primer hueco libre del aire en lugar de
+saltarla cuando hay un conflicto. Las urgentes (programaciones urgentes o
+críticas y partes mortorios urgentes) toman el primer inicio posible
+desplazando a las transmisiones de menor prioridad que aún no empezaron;
+las desplazadas pasan al siguiente hueco libre y el cambio queda registrado
+en el log de transmisiones. En cada ciclo se inician las transmisiones
+preparadas cuyo inicio llegó, y la latencia real hasta el aire de las
+urgentes (inicio real - vencimiento) se compara con una cota configurable
+(ver scheduler/simulacion.py).
+"""
+
+import logging
+import math
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+RANGO_PRIORIDAD = {
+    'baja': 0,
+    'normal': 1,
+    'alta': 2,
+    'urgente': 3,
+    'critica': 4,
+}
+
+# Urgencia del parte mortorio -> prioridad mínima de su transmisión
+PRIORIDAD_POR_URGENCIA = {
+    'urgente': 'urgente',
+    'muy_urgente': 'critica',
+}
+
+# Desde este rango una solicitud puede desplazar transmisiones de menor rango
+RANGO_PREEMPTIVO = RANGO_PRIORIDAD['urgente']
+
+# Latencia máxima (segundos) esperada para una urgente hasta salir al aire;
+# se puede cambiar con TRANSMISION_LATENCIA_MAXIMA_URGENTES
+LATENCIA_MAXIMA_URGENTES = 180
+
+# Los huecos más lejanos quedan para el siguiente ciclo del despacho
+HORIZONTE_DESPACHO = timedelta(minutes=15)
+
+# Una transmisión preparada se inicia si su inicio cae dentro de esta ventana
+VENTANA_INICIO = timedelta(seconds=30)
+
+ESTADOS_OCUPADOS = ('preparando', 'transmitiendo')
+
+
+def latencia_maxima_urgentes():
+    """
+    Latencia máxima configurada para las transmisiones urgentes
+    """
+    return timedelta(seconds=getattr(settings, 'TRANSMISION_LATENCIA_MAXIMA_URGENTES', LATENCIA_MAXIMA_URGENTES))
+
+
+def rango_prioridad(prioridad, urgencia=None):
+    """
+    Rango numérico de una prioridad, elevado por la urgencia del parte
+    mortorio si la cuña transmite uno
+    """
+    rango = RANGO_PRIORIDAD.get(prioridad, RANGO_PRIORIDAD['normal'])
+    if urgencia in PRIORIDAD_POR_URGENCIA:
+        rango = max(rango, RANGO_PRIORIDAD[PRIORIDAD_POR_URGENCIA[urgencia]])
+    return rango
+
+
+# ==================== PLANIFICACIÓN ====================
+
+def ordenar_solicitudes(solicitudes):
+    """
+    Mayor prioridad primero y, a igual prioridad, la más atrasada
+    """
+    return sorted(solicitudes, key=lambda s: (-s['rango'], s['vencimiento']))
+
+
+def primer_hueco(ocupaciones, desde, duracion):
+    """
+    Inicio del primer intervalo libre de `duracion` a partir de `desde`
+    """
+    inicio = desde
+    for ocupacion in sorted(ocupaciones, key=lambda o: o['inicio']):
+        if ocupacion['fin'] <= inicio:
+            continue
+        if ocupacion['inicio'] >= inicio + duracion:
+            break
+        inicio = ocupacion['fin']
+    return inicio
+
+
+def planificar_despacho(solicitudes, ocupaciones, ahora, solapamiento=False,
+                        horizonte=HORIZONTE_DESPACHO):
+    """
+    Asigna un inicio a cada solicitud sin acceder a la base de datos.
+
+    solicitudes: dicts con clave, rango, vencimiento y duracion (timedelta).
+    ocupaciones: transmisiones ya en el aire o preparadas, dicts con clave,
+    rango, inicio, fin y desplazable (aún no empezó).
+
+    Devuelve (asignaciones, desplazamientos, pospuestas): asignaciones con
+    clave, inicio, fin y latencia (inicio - vencimiento); desplazamientos de ocupaciones existentes con clave,
+    inicio_anterior, inicio_nuevo y desplazada_por; y las claves que no
+    tienen hueco dentro del horizonte.
+    """
+    ocupaciones = [dict(ocupacion, existente=True) for ocupacion in ocupaciones]
+    asignaciones = {}
+    desplazamientos = []
+    pospuestas = []
+
+    for solicitud in ordenar_solicitudes(solicitudes):
+        deseado = max(solicitud['vencimiento'], ahora)
+        duracion = solicitud['duracion']
+        desplazadas = []
+
+        if solapamiento:
+            inicio = deseado
+        else:
+            inicio = primer_hueco(ocupaciones, deseado, duracion)
+            if solicitud['rango'] >= RANGO_PREEMPTIVO and inicio > deseado:
+                # Solo las de menor rango que no empezaron ceden su lugar
+                cedibles = [
+                    o for o in ocupaciones
+                    if o['desplazable'] and o['rango'] < solicitud['rango']
+                ]
+                fijas = [o for o in ocupaciones if not any(o is c for c in cedibles)]
+                inicio = primer_hueco(fijas, deseado, duracion)
+                desplazadas = [
+                    o for o in cedibles
+                    if o['inicio'] < inicio + duracion and o['fin'] > inicio
+                ]
+
+        if inicio > ahora + horizonte:
+            pospuestas.append(solicitud['clave'])
+            continue
+
+        ocupaciones = [o for o in ocupaciones if not any(o is d for d in desplazadas)]
+        asignacion = {
+            'clave': solicitud['clave'],
+            'inicio': inicio,
+            'fin': inicio + duracion,
+            'latencia': inicio - solicitud['vencimiento'],
+        }
+        asignaciones[solicitud['clave']] = asignacion
+        ocupaciones.append({
+            'clave': solicitud['clave'],
+            'rango': solicitud['rango'],
+            'inicio': inicio,
+            'fin': inicio + duracion,
+            'desplazable': True,
+            'existente': False,
+        })
+
+        for ocupacion in sorted(desplazadas, key=lambda o: o['inicio']):
+            duracion_desplazada = ocupacion['fin'] - ocupacion['inicio']
+            nuevo_inicio = primer_hueco(ocupaciones, ocupacion['inicio'], duracion_desplazada)
+            movida = dict(ocupacion, inicio=nuevo_inicio, fin=nuevo_inicio + duracion_desplazada)
+            ocupaciones.append(movida)
+            if ocupacion['existente']:
+                desplazamientos.append({
+                    'clave': ocupacion['clave'],
+                    'inicio_anterior': ocupacion['inicio'],
+                    'inicio_nuevo': nuevo_inicio,
+                    'desplazada_por': solicitud['clave'],
+                })
+            else:
+                # Asignada en este mismo ciclo: solo cambia su inicio
+                asignacion_movida = asignaciones[ocupacion['clave']]
+                asignacion_movida['latencia'] += nuevo_inicio - asignacion_movida['inicio']
+                asignacion_movida.update(inicio=nuevo_inicio, fin=movida['fin'])
+
+    return list(asignaciones.values()), desplazamientos, pospuestas
+
+
+# ==================== DESPACHO ====================
+
+def _urgencia_parte(cuña):
+    return cuña.parte_mortorio.urgencia if cuña.parte_mortorio_id else None
+
+
+def crear_transmision_desde_programacion(programacion, inicio=None):
+    """
+    Crea una nueva transmisión a partir de una programación, en `inicio` o en
+    su próxima reproducción. Queda preparada hasta que el ciclo de despacho
+    la inicia (ver iniciar_transmisiones_pendientes).
+    """
+    from ..models import TransmisionActual
+
+    try:
+        # Verificar que no haya transmisión activa de la misma cuña
+        transmision_existente = TransmisionActual.objects.filter(
+            cuña=programacion.cuña,
+            estado__in=ESTADOS_OCUPADOS
+        ).first()
+
+        if transmision_existente:
+            logger.warning(f"Ya existe transmisión activa para cuña {programacion.cuña.codigo}")
+            return None
+
+        # Calcular tiempos
+        vencimiento = programacion.proxima_reproduccion or timezone.now()
+        inicio_programado = inicio or vencimiento
+
+        duracion = programacion.cuña.duracion_emision
+        fin_programado = inicio_programado + duracion
+
+        # Crear transmisión
+        transmision = TransmisionActual.objects.create(
+            programacion=programacion,
+            cuña=programacion.cuña,
+            inicio_programado=inicio_programado,
+            vencimiento=vencimiento,
+            fin_programado=fin_programado,
+            duracion_segundos=math.ceil(duracion.total_seconds())
+        )
+
+        return transmision
+
+    except Exception as exc:
+        logger.error(f"Error creando transmisión: {exc}")
+        return None
+
+
+def iniciar_transmisiones_pendientes(ahora=None):
+    """
+    Inicia las transmisiones preparadas cuyo inicio asignado llegó, incluidas
+    las que un conflicto o una urgente movieron a un hueco posterior. Mide la
+    latencia real de las urgentes contra la cota configurada.
+    """
+    from ..models import TransmisionActual
+
+    ahora = ahora or timezone.now()
+    latencia_maxima = latencia_maxima_urgentes()
+    iniciadas = 0
+    fuera_de_cota = 0
+
+    pendientes = TransmisionActual.objects.filter(
+        estado='preparando',
+        inicio_programado__lte=ahora + VENTANA_INICIO
+    ).select_related('programacion', 'cuña__parte_mortorio').order_by('inicio_programado')
+
+    for transmision in pendientes:
+        # Las de cuñas inactivas las cancela monitorear_transmisiones_activas
+        if not transmision.cuña.esta_activa:
+            continue
+        transmision.iniciar_transmision()
+        iniciadas += 1
+
+        rango = rango_prioridad(transmision.programacion.prioridad, _urgencia_parte(transmision.cuña))
+        latencia = transmision.inicio_real - (transmision.vencimiento or transmision.inicio_programado)
+        if rango >= RANGO_PREEMPTIVO and latencia > latencia_maxima:
+            fuera_de_cota += 1
+            logger.warning(
+                f"Transmisión urgente de {transmision.cuña.codigo} salió al aire con "
+                f"{latencia.total_seconds():.0f} s de retraso"
+            )
+
+    return {'transmisiones_iniciadas': iniciadas, 'urgentes_fuera_de_cota': fuera_de_cota}
+
+
+def despachar_programaciones(programaciones, ahora=None):
+    """
+    Crea las transmisiones de las programaciones vencidas siguiendo la cola
+    de prioridad, mueve las transmisiones preparadas que cedan su lugar e
+    inicia las que llegaron a su inicio. Devuelve las estadísticas del ciclo.
+    """
+    from ..models import ConfiguracionTransmision, LogTransmision, TransmisionActual
+
+    ahora = ahora or timezone.now()
+    configuracion = ConfiguracionTransmision.get_configuracion_activa()
+    solapamiento = not configuracion or configuracion.permitir_solapamiento
+
+    transmisiones = {
+        t.pk: t for t in TransmisionActual.objects.filter(
+            estado__in=ESTADOS_OCUPADOS,
+            fin_programado__gt=ahora
+        ).select_related('programacion', 'cuña__parte_mortorio')
+    }
+    ocupaciones = [{
+        'clave': ('transmision', t.pk),
+        'rango': rango_prioridad(t.programacion.prioridad, _urgencia_parte(t.cuña)),
+        'inicio': t.inicio_programado,
+        'fin': t.fin_programado,
+        'desplazable': t.estado == 'preparando' and t.inicio_programado > ahora,
+    } for t in transmisiones.values()]
+
+    # Una cuña con transmisión pendiente no se vuelve a despachar
+    cuñas_ocupadas = {t.cuña_id for t in transmisiones.values()}
+    por_clave = {}
+    solicitudes = {}
+    for programacion in programaciones:
+        if programacion.cuña_id in cuñas_ocupadas:
+            continue
+        cuñas_ocupadas.add(programacion.cuña_id)
+        clave = ('programacion', programacion.pk)
+        por_clave[clave] = programacion
+        solicitudes[clave] = {
+            'clave': clave,
+            'rango': rango_prioridad(programacion.prioridad, _urgencia_parte(programacion.cuña)),
+            'vencimiento': programacion.proxima_reproduccion or ahora,
+            'duracion': programacion.cuña.duracion_emision,
+        }
+
+    asignaciones, desplazamientos, pospuestas = planificar_despacho(
+        solicitudes.values(), ocupaciones, ahora, solapamiento
+    )
+
+    # Primero se liberan los lugares, luego se crean las transmisiones
+    for desplazamiento in desplazamientos:
+        transmision = transmisiones[desplazamiento['clave'][1]]
+        urgente = por_clave[desplazamiento['desplazada_por']]
+        transmision.fin_programado = desplazamiento['inicio_nuevo'] + (
+            transmision.fin_programado - transmision.inicio_programado
+        )
+        transmision.inicio_programado = desplazamiento['inicio_nuevo']
+        transmision.save(update_fields=['inicio_programado', 'fin_programado'])
+        LogTransmision.log_evento(
+            accion='orden_cambiado',
+            descripcion=(
+                f'Transmisión de {transmision.cuña.codigo} desplazada de '
+                f'{timezone.localtime(desplazamiento["inicio_anterior"]):%H:%M:%S} a '
+                f'{timezone.localtime(desplazamiento["inicio_nuevo"]):%H:%M:%S} '
+                f'por la programación urgente {urgente.codigo}'
+            ),
+            transmision=transmision,
+            programacion=transmision.programacion,
+            cuña=transmision.cuña,
+            nivel='warning',
+            datos={
+                'inicio_anterior': desplazamiento['inicio_anterior'].isoformat(),
+                'inicio_nuevo': desplazamiento['inicio_nuevo'].isoformat(),
+                'desplazada_por': urgente.codigo,
+            }
+        )
+
+    creadas = 0
+    for asignacion in sorted(asignaciones, key=lambda a: a['inicio']):
+        if crear_transmision_desde_programacion(por_clave[asignacion['clave']], asignacion['inicio']):
+            creadas += 1
+
+    return {
+        'transmisiones_creadas': creadas,
+        'desplazadas': len(desplazamientos),
+        'pospuestas': len(pospuestas),
+        **iniciar_transmisiones_pendientes(ahora),
+    }
@@ -21,6 +21,7 @@ from .models import (
     verificar_sistema_listo_para_transmitir
 )
 from apps.content_management.models import CuñaPublicitaria
+from .scheduler.transmission_scheduler import despachar_programaciones
 
 logger = get_task_logger(__name__)
 
@@ -43,41 +44,39 @@ def procesar_transmisiones_programadas(self):
             return {'status': 'sistema_no_listo', 'mensaje': mensaje}
         
         ahora = timezone.now()
-        transmisiones_creadas = 0
         
         # Buscar programaciones que deben ejecutarse ahora
         programaciones_activas = ProgramacionTransmision.objects.filter(
             estado='activa',
             proxima_reproduccion__lte=ahora + timedelta(minutes=1),  # 1 minuto de ventana
             proxima_reproduccion__gte=ahora - timedelta(minutes=5)   # No más de 5 minutos tarde
-        ).select_related('cuña', 'cuña__archivo_audio')
+        ).select_related('cuña', 'cuña__archivo_audio', 'cuña__parte_mortorio')
         
+        listas = []
         for programacion in programaciones_activas:
             if programacion.puede_reproducir_ahora():
                 # Verificar que la cuña esté disponible
                 if not programacion.cuña.esta_activa:
                     logger.warning(f"Cuña {programacion.cuña.codigo} no está activa, saltando programación {programacion.codigo}")
                     continue
-                
-                # Verificar que no haya conflictos
-                if hay_conflicto_transmision(programacion):
-                    logger.warning(f"Conflicto detectado para programación {programacion.codigo}, postponiendo")
-                    continue
-                
-                # Crear transmisión
-                transmision = crear_transmision_desde_programacion(programacion)
-                if transmision:
-                    transmisiones_creadas += 1
-                    logger.info(f"Transmisión creada: {transmision.session_id}")
+                listas.append(programacion)
+        
+        # Cola por (prioridad, retraso): los conflictos pasan al siguiente hueco
+        # y las urgentes pueden desplazar transmisiones de menor prioridad
+        resultado = despachar_programaciones(listas, ahora)
+        transmisiones_creadas = resultado['transmisiones_creadas']
         
         # Actualizar cache de próximas transmisiones
         cache.delete('proximas_transmisiones')
         
-        logger.info(f"Procesamiento completado. Transmisiones creadas: {transmisiones_creadas}")
+        logger.info(
+            f"Procesamiento completado. Transmisiones creadas: {transmisiones_creadas}, "
+            f"iniciadas: {resultado['transmisiones_iniciadas']}"
+        )
         
         return {
             'status': 'completado',
-            'transmisiones_creadas': transmisiones_creadas,
+            **resultado,
             'timestamp': ahora.isoformat()
         }
         
@@ -419,74 +418,6 @@ def generar_estadisticas_diarias():
         return {'status': 'error', 'mensaje': str(exc)}
 
 
-# ==================== FUNCIONES DE UTILIDAD ====================
-
-def crear_transmision_desde_programacion(programacion):
-    """
-    Crea una nueva transmisión a partir de una programación
-    """
-    try:
-        # Verificar que no haya transmisión activa de la misma cuña
-        transmision_existente = TransmisionActual.objects.filter(
-            cuña=programacion.cuña,
-            estado__in=['preparando', 'transmitiendo']
-        ).first()
-        
-        if transmision_existente:
-            logger.warning(f"Ya existe transmisión activa para cuña {programacion.cuña.codigo}")
-            return None
-        
-        # Calcular tiempos
-        ahora = timezone.now()
-        inicio_programado = programacion.proxima_reproduccion or ahora
-        
-        duracion = programacion.cuña.archivo_audio.duracion_segundos if programacion.cuña.archivo_audio else programacion.cuña.duracion_planeada
-        fin_programado = inicio_programado + timedelta(seconds=duracion)
-        
-        # Crear transmisión
-        transmision = TransmisionActual.objects.create(
-            programacion=programacion,
-            cuña=programacion.cuña,
-            inicio_programado=inicio_programado,
-            fin_programado=fin_programado,
-            duracion_segundos=duracion
-        )
-        
-        # Iniciar automáticamente si es el momento
-        if inicio_programado <= ahora + timedelta(seconds=30):  # 30 segundos de ventana
-            transmision.iniciar_transmision()
-        
-        return transmision
-        
-    except Exception as exc:
-        logger.error(f"Error creando transmisión: {exc}")
-        return None
-
-
-def hay_conflicto_transmision(programacion):
-    """
-    Verifica si hay conflictos de tiempo con otras transmisiones
-    """
-    configuracion = ConfiguracionTransmision.get_configuracion_activa()
-    if not configuracion or configuracion.permitir_solapamiento:
-        return False
-    
-    # Verificar transmisiones activas en el período
-    inicio = programacion.proxima_reproduccion
-    if not inicio:
-        return False
-    
-    duracion = programacion.cuña.archivo_audio.duracion_segundos if programacion.cuña.archivo_audio else programacion.cuña.duracion_planeada
-    fin = inicio + timedelta(seconds=duracion)
-    
-    conflictos = TransmisionActual.objects.filter(
-        Q(inicio_programado__lt=fin) & Q(fin_programado__gt=inicio),
-        estado__in=['preparando', 'transmitiendo']
-    ).exclude(programacion=programacion)
-    
-    return conflictos.exists()
-
-
 # ==================== CONFIGURACIÓN DE TAREAS PERIÓDICAS ====================
 
 # Para usar con Celery Beat, agregar en settings.py:
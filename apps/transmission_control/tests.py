@@ -1,3 +1,202 @@
-from django.test import TestCase
+"""
+Tests para el módulo de Control de Transmisiones
+Sistema PubliTrack - Cola de despacho con prioridad y su simulación
+"""
 
-# Create your tests here.
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+
+from apps.content_management.models import CuñaPublicitaria
+from apps.parte_mortorios.models import ParteMortorio
+from .models import ConfiguracionTransmision, LogTransmision, ProgramacionTransmision, TransmisionActual
+from .scheduler.simulacion import comparar_politicas, simular_despacho
+from .scheduler.transmission_scheduler import (
+    RANGO_PRIORIDAD,
+    despachar_programaciones,
+    planificar_despacho,
+)
+
+User = get_user_model()
+
+AHORA = datetime(2025, 1, 6, 10, 0)
+
+
+def segundos(cantidad):
+    return timedelta(seconds=cantidad)
+
+
+def solicitud(clave, prioridad, vencimiento=0, duracion=30):
+    return {
+        'clave': clave,
+        'rango': RANGO_PRIORIDAD[prioridad],
+        'vencimiento': AHORA + segundos(vencimiento),
+        'duracion': segundos(duracion),
+    }
+
+
+def ocupacion(clave, prioridad, inicio, fin, desplazable=True):
+    return {
+        'clave': clave,
+        'rango': RANGO_PRIORIDAD[prioridad],
+        'inicio': AHORA + segundos(inicio),
+        'fin': AHORA + segundos(fin),
+        'desplazable': desplazable,
+    }
+
+
+class PlanificacionDespachoTest(SimpleTestCase):
+    """Tests de la planificación sin base de datos"""
+
+    def inicios(self, asignaciones):
+        return {a['clave']: (a['inicio'] - AHORA).total_seconds() for a in asignaciones}
+
+    def test_conflicto_pasa_al_siguiente_hueco(self):
+        """Test que una solicitud en conflicto se asigna al primer hueco en lugar de saltarse"""
+        asignaciones, desplazamientos, _ = planificar_despacho(
+            [solicitud('a', 'normal')],
+            [ocupacion('aire', 'normal', -10, 20, desplazable=False), ocupacion('prep', 'normal', 20, 50)],
+            AHORA
+        )
+        self.assertEqual(self.inicios(asignaciones), {'a': 50})
+        self.assertEqual(desplazamientos, [])
+
+    def test_orden_por_prioridad_y_retraso(self):
+        """Test que la cola atiende primero la mayor prioridad y luego la más atrasada"""
+        asignaciones, _, _ = planificar_despacho([
+            solicitud('baja', 'baja', vencimiento=-120),
+            solicitud('normal_reciente', 'normal', vencimiento=-10),
+            solicitud('normal_atrasada', 'normal', vencimiento=-60),
+        ], [], AHORA)
+        self.assertEqual(self.inicios(asignaciones), {'normal_atrasada': 0, 'normal_reciente': 30, 'baja': 60})
+
+    def test_urgente_desplaza_a_las_de_menor_prioridad(self):
+        """Test que la urgente toma el primer inicio posible y la desplazada pasa al siguiente hueco"""
+        asignaciones, desplazamientos, _ = planificar_despacho(
+            [solicitud('parte', 'critica', duracion=60)],
+            [
+                ocupacion('aire', 'normal', -10, 20, desplazable=False),
+                ocupacion('prep', 'normal', 20, 80),
+                ocupacion('otra', 'alta', 80, 140),
+            ],
+            AHORA
+        )
+        self.assertEqual(self.inicios(asignaciones), {'parte': 20})
+        self.assertEqual(len(desplazamientos), 1)
+        self.assertEqual(desplazamientos[0]['clave'], 'prep')
+        self.assertEqual(desplazamientos[0]['inicio_nuevo'], AHORA + segundos(140))
+        self.assertEqual(desplazamientos[0]['desplazada_por'], 'parte')
+
+    def test_simulacion_urgentes_dentro_de_la_cota(self):
+        """Test que en la simulación ninguna urgente supera la cota con la cola con prioridad"""
+        informe = comparar_politicas(horas=4, semilla=42, latencia_maxima=segundos(180))
+        self.assertEqual(informe['prioridad']['urgentes']['fuera_de_cota'], 0)
+        self.assertEqual(informe['prioridad']['resto']['perdidas'], 0)
+        self.assertGreater(informe['secuencial']['urgentes']['fuera_de_cota'], 0)
+
+    def test_simulacion_mide_el_inicio_real(self):
+        """Test que la simulación registra el ciclo que inicia la transmisión, no su inicio planificado"""
+        solicitudes = [
+            dict(solicitud('a', 'normal', duracion=150), anticipacion=segundos(0)),
+            dict(solicitud('b', 'normal', vencimiento=1), anticipacion=segundos(0)),
+        ]
+        inicios, perdidas, _ = simular_despacho('prioridad', solicitudes)
+        # b queda planificada a los 150 s y el ciclo de los 120 s la inicia
+        self.assertEqual(inicios, {'a': AHORA, 'b': AHORA + segundos(120)})
+        self.assertEqual(perdidas, set())
+
+
+class DespachoProgramacionesTest(TestCase):
+    """Tests del despacho sobre programaciones y transmisiones"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.cliente = User.objects.create_user(
+            username='cliente_despacho', email='despacho@test.com', password='testpass123', rol='cliente'
+        )
+        ConfiguracionTransmision.objects.create(nombre_configuracion='Principal')
+
+    def crear_parte(self, nombre):
+        return ParteMortorio.objects.create(
+            nombre_fallecido=nombre,
+            fecha_fallecimiento=date.today(),
+            precio_total=Decimal('20.00'),
+            urgencia='muy_urgente'
+        )
+
+    def crear_programacion(self, titulo, prioridad='normal', parte=None, vencimiento=None):
+        cuña = CuñaPublicitaria.objects.create(
+            titulo=titulo,
+            cliente=self.cliente,
+            duracion_planeada=60,
+            precio_total=Decimal('10.00'),
+            fecha_inicio=date.today(),
+            fecha_fin=date.today() + timedelta(days=7),
+            estado='activa',
+            parte_mortorio=parte
+        )
+        return ProgramacionTransmision.objects.create(
+            nombre=titulo,
+            cuña=cuña,
+            estado='activa',
+            prioridad=prioridad,
+            tipo_programacion='unica',
+            fecha_inicio=timezone.now() - timedelta(hours=1),
+            proxima_reproduccion=vencimiento or timezone.now()
+        )
+
+    def test_parte_muy_urgente_desplaza_transmision_preparada(self):
+        """Test que un parte muy urgente toma el lugar de una transmisión preparada y se registra"""
+        ahora = timezone.now()
+        comercial = self.crear_programacion('Comercial')
+        preparada = TransmisionActual.objects.create(
+            programacion=comercial,
+            cuña=comercial.cuña,
+            inicio_programado=ahora + timedelta(seconds=10),
+            fin_programado=ahora + timedelta(seconds=70)
+        )
+        urgente = self.crear_programacion('Parte Ana Torres', parte=self.crear_parte('Ana Torres'), vencimiento=ahora)
+
+        resultado = despachar_programaciones([urgente], ahora)
+
+        self.assertEqual(resultado['transmisiones_creadas'], 1)
+        self.assertEqual(resultado['desplazadas'], 1)
+        self.assertEqual(resultado['transmisiones_iniciadas'], 1)
+        transmision = TransmisionActual.objects.get(programacion=urgente)
+        self.assertEqual(transmision.inicio_programado, ahora)
+        self.assertEqual(transmision.estado, 'transmitiendo')
+        preparada.refresh_from_db()
+        self.assertEqual(preparada.inicio_programado, transmision.fin_programado)
+        self.assertEqual(preparada.estado, 'preparando')
+        self.assertTrue(LogTransmision.objects.filter(transmision=preparada, accion='orden_cambiado').exists())
+
+    def test_ciclo_inicia_preparadas_cuyo_inicio_llego(self):
+        """Test que el ciclo inicia una transmisión movida a un hueco y mide su latencia real"""
+        ahora = timezone.now()
+        urgente = self.crear_programacion('Parte Luis Mora', parte=self.crear_parte('Luis Mora'))
+        movida = TransmisionActual.objects.create(
+            programacion=urgente,
+            cuña=urgente.cuña,
+            vencimiento=ahora - timedelta(minutes=4),
+            inicio_programado=ahora - timedelta(minutes=2),
+            fin_programado=ahora - timedelta(minutes=1)
+        )
+        futura = self.crear_programacion('Comercial futuro')
+        TransmisionActual.objects.create(
+            programacion=futura,
+            cuña=futura.cuña,
+            inicio_programado=ahora + timedelta(minutes=2),
+            fin_programado=ahora + timedelta(minutes=3)
+        )
+
+        resultado = despachar_programaciones([], ahora)
+
+        self.assertEqual(resultado['transmisiones_iniciadas'], 1)
+        self.assertEqual(resultado['urgentes_fuera_de_cota'], 1)
+        movida.refresh_from_db()
+        self.assertEqual(movida.estado, 'transmitiendo')
+        self.assertGreaterEqual(movida.inicio_real, ahora)
+        self.assertEqual(TransmisionActual.objects.filter(estado='preparando').count(), 1)
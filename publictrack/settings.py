@@ -67,6 +67,7 @@ INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
+    'apps.custom_admin.middleware.InstrumentacionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -206,6 +207,20 @@ FILE_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024
 DATA_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024
 FILE_UPLOAD_PERMISSIONS = 0o644
 
+# Los audios se escriben al temporal calculando su SHA-256 durante la subida
+FILE_UPLOAD_HANDLERS = [
+    'apps.content_management.storage.audio_handlers.AudioUploadHandler',
+    'apps.content_management.storage.audio_handlers.MemoriaUploadHandler',
+    'apps.content_management.storage.audio_handlers.TemporalUploadHandler',
+]
+
+# Entrega de media (apps/entrega_archivos.py): 'python' envía los bytes desde
+# gunicorn (os.sendfile vía wsgi.file_wrapper); 'x-accel' delega en nginx a
+# través de una location internal que apunte a MEDIA_ROOT; 'x-sendfile' para
+# Apache / lighttpd
+MEDIA_ENTREGA_MODO = config('MEDIA_ENTREGA_MODO', default='python')
+MEDIA_ACCEL_PREFIJO = config('MEDIA_ACCEL_PREFIJO', default='/media-interna/')
+
 # CONFIGURACIÓN ADICIONAL PARA SERVIR MEDIA EN PRODUCCIÓN
 # Esta configuración permite que Django sirva archivos media de forma segura
 # en producción sin necesidad de nginx adicional
@@ -385,6 +400,28 @@ AUDIO_FORMATS_ALLOWED = ['mp3', 'wav', 'aac', 'm4a', 'ogg']
 DEFAULT_CURRENCY = config('DEFAULT_CURRENCY', default='USD')
 TAX_RATE = config('TAX_RATE', default=12.0, cast=float)
 
+# Configuración de gráficas de reportes
+# 'div': HTML generado por Plotly en el servidor; 'cliente': solo JSON, dibujado en el navegador
+REPORTES_GRAFICAS_FORMATO = config('REPORTES_GRAFICAS_FORMATO', default='div')
+
+# Instrumentación de peticiones (Server-Timing y panel de rendimiento)
+INSTRUMENTACION_ACTIVA = config('INSTRUMENTACION_ACTIVA', default=True, cast=bool)
+INSTRUMENTACION_MUESTRAS = config('INSTRUMENTACION_MUESTRAS', default=50, cast=int)
+# Fracción de peticiones que se guardan para el panel (la cabecera y los presupuestos aplican a todas)
+INSTRUMENTACION_FRACCION_MUESTREO = config('INSTRUMENTACION_FRACCION_MUESTREO', default=0.05, cast=float)
+
+# Máximo de consultas por vista (nombre de URL con namespace; '*' para el resto).
+# Al superarse se registra una advertencia, o falla la petición si es estricto.
+PRESUPUESTOS_CONSULTAS = {
+    'custom_admin:usuarios_list': 20,
+    'custom_admin:clientes_list': 15,
+    'custom_admin:cunas_list': 25,
+    'custom_admin:orders_list': 20,
+    'custom_admin:parte_mortorios_list': 25,
+    'custom_admin:grilla_publicitaria_list': 40,
+}
+PRESUPUESTOS_CONSULTAS_ESTRICTOS = config('PRESUPUESTOS_CONSULTAS_ESTRICTOS', default=False, cast=bool)
+
 # =============================================================================
 # CONFIGURACIÓN FINAL
 # =============================================================================
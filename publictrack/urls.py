@@ -12,7 +12,7 @@ from django.http import HttpResponse, JsonResponse
 from django.views.generic import TemplateView
 from django.views.decorators.cache import cache_control
 from django.templatetags.static import static as static_url
-from django.views.static import serve
+from apps.entrega_archivos import servir_media
 from django.urls import re_path
 
 def home_redirect(request):
@@ -291,9 +291,10 @@ urlpatterns = [
 # Esto es necesario porque Django con DEBUG=False no sirve media por defecto
 # En un entorno con nginx, esto sería manejado por el servidor web
 
-# Servir archivos media tanto en desarrollo como producción
+# Servir archivos media tanto en desarrollo como producción, con rangos (206),
+# GET condicional y delegación a nginx (MEDIA_ENTREGA_MODO = 'x-accel')
 urlpatterns += [
-    re_path(r'^media/(?P<path>.*)$', serve, {'document_root': settings.MEDIA_ROOT}),
+    re_path(r'^media/(?P<path>.*)$', servir_media, name='media'),
 ]
 
 # Servir archivos STATIC solo en desarrollo (Whitenoise los maneja en producción)